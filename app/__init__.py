@@ -265,7 +265,9 @@ def create_app(config=None):
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*")
+    from app.utils.realtime import resolve_message_queue
+
+    socketio.init_app(app, cors_allowed_origins="*", message_queue=resolve_message_queue(app.config))
     oauth.init_app(app)
 
     # Fast-path for migration/bootstrap runs:
@@ -332,6 +334,77 @@ def create_app(config=None):
 
     logger.info("Audit logging event listeners registered")
 
+    # Settings snapshot cache: invalidate on any write to the settings row
+    from app.utils import settings_cache
+
+    _listen_once(Session, "after_flush", settings_cache.receive_after_flush)
+    _listen_once(Session, "after_transaction_end", settings_cache.receive_after_transaction_end)
+    settings_cache.clear_settings_cache(app)
+
+    # Compiled permission / enabled-module sets: invalidate on writes to roles, permissions, role assignments
+    from app.utils import access_cache
+
+    _listen_once(Session, "after_flush", access_cache.receive_after_flush)
+    _listen_once(Session, "after_transaction_end", access_cache.receive_after_transaction_end)
+    access_cache.clear_access_cache(app)
+
+    # Webhook outbox: wake the delivery workers when queued deliveries commit
+    from app.utils import webhook_worker
+
+    _listen_once(Session, "after_commit", webhook_worker.receive_after_commit)
+
+    # Time-entry rollups (per-user totals, daily totals): apply deltas in the same flush
+    from app.utils import time_daily_rollup, time_entry_changes, user_time_stats
+
+    _listen_once(Session, "before_flush", time_entry_changes.receive_before_flush)
+    _listen_once(Session, "after_flush", user_time_stats.receive_after_flush)
+    _listen_once(Session, "after_flush", time_daily_rollup.receive_after_flush)
+    _listen_once(Session, "after_flush_postexec", time_entry_changes.receive_after_flush_postexec)
+
+    # Stored tracked-time/cost totals on tasks and projects, maintained in the same flush
+    from app.utils import tracked_totals
+
+    _listen_once(Session, "before_flush", tracked_totals.receive_before_flush)
+    _listen_once(Session, "after_flush", tracked_totals.receive_after_flush)
+    _listen_once(Session, "after_flush_postexec", tracked_totals.receive_after_flush_postexec)
+
+    # User -> project access (time entries, assigned tasks, user_clients), maintained in the same flush
+    from app.utils import user_project_access
+
+    _listen_once(Session, "before_flush", user_project_access.receive_before_flush)
+    _listen_once(Session, "after_flush", user_project_access.receive_after_flush)
+
+    # Timer state: version per user for ETags, pushed to the user's room on commit
+    from app.utils import timer_state
+
+    _listen_once(Session, "after_flush", timer_state.receive_after_flush)
+    _listen_once(Session, "after_commit", timer_state.receive_after_commit)
+    _listen_once(Session, "after_transaction_end", timer_state.receive_after_transaction_end)
+
+    # Indexed invoice line -> time entry links (mirror of InvoiceItem.time_entry_ids)
+    from app.utils import invoice_time_entry_links
+
+    _listen_once(Session, "after_flush", invoice_time_entry_links.receive_after_flush)
+
+    # Invoice PDF cache: queue a background render of finalized invoices once their change is committed
+    from app.utils import pdf_cache
+
+    _listen_once(Session, "after_flush", pdf_cache.receive_after_flush)
+    _listen_once(Session, "after_commit", pdf_cache.receive_after_commit)
+    _listen_once(Session, "after_transaction_end", pdf_cache.receive_after_transaction_end)
+
+    # Change log behind /api/v1/sync (time entries, projects, tasks)
+    from app.utils import sync_changes
+
+    _listen_once(Session, "after_flush", sync_changes.receive_after_flush)
+    _listen_once(Session, "before_commit", sync_changes.receive_before_commit)
+    _listen_once(Session, "after_transaction_end", sync_changes.receive_after_transaction_end)
+
+    # Indexed integration refs (mirror of Project/Task custom_fields["integration"])
+    from app.utils import integration_refs
+
+    _listen_once(Session, "after_flush", integration_refs.receive_after_flush)
+
     # OpenTelemetry (traces + OTLP metrics) — same OTLP credentials as manual log export
     try:
         from app.telemetry.otel_setup import init_opentelemetry
@@ -370,6 +443,22 @@ def create_app(config=None):
             # Register tasks after app context is available, passing app instance
             with app.app_context():
                 register_scheduled_tasks(scheduler, app=app)
+                try:
+                    webhook_worker.start_worker_pool(app)
+                except Exception as e:
+                    app.logger.warning(f"Could not start webhook delivery workers: {e}")
+                try:
+                    from app.utils import job_queue
+
+                    job_queue.start_worker_pool(app)
+                except Exception as e:
+                    app.logger.warning(f"Could not start background job workers: {e}")
+                try:
+                    from app.utils import email_outbox
+
+                    email_outbox.start_worker(app)
+                except Exception as e:
+                    app.logger.warning(f"Could not start email outbox worker: {e}")
                 # Base telemetry: send first_seen once per install (idempotent)
                 try:
                     from app.telemetry.service import send_base_first_seen
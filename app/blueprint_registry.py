@@ -69,6 +69,7 @@ def register_all_blueprints(app, logger=None):
     from app.routes.api_v1_mileage import api_v1_mileage_bp
     from app.routes.api_v1_payments import api_v1_payments_bp
     from app.routes.api_v1_projects import api_v1_projects_bp
+    from app.routes.api_v1_sync import api_v1_sync_bp
     from app.routes.api_v1_tasks import api_v1_tasks_bp
     from app.routes.api_v1_time_entries import api_v1_time_entries_bp
     from app.routes.auth import auth_bp
@@ -176,6 +177,7 @@ def register_all_blueprints(app, logger=None):
     app.register_blueprint(api_v1_leads_bp)
     app.register_blueprint(api_v1_contacts_bp)
     app.register_blueprint(api_v1_issues_bp)
+    app.register_blueprint(api_v1_sync_bp)
     app.register_blueprint(api_docs_bp)
     app.register_blueprint(swaggerui_blueprint)
     app.register_blueprint(analytics_bp)
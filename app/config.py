@@ -258,16 +258,95 @@ class Config:
     PERF_LOG_SLOW_REQUESTS_MS = int(os.getenv("PERF_LOG_SLOW_REQUESTS_MS", "0"))
     # When true, track DB query count per request and include in slow-request logs
     PERF_QUERY_PROFILE = os.getenv("PERF_QUERY_PROFILE", "false").lower() == "true"
+    # Max age (seconds) of the per-process Settings snapshot before it is re-read from the DB
+    SETTINGS_CACHE_TTL = int(os.getenv("SETTINGS_CACHE_TTL", "60"))
+    # Max age (seconds) of a compiled per-user permission / enabled-module set. Role and permission
+    # changes invalidate sets in every process through the cache_versions table; the TTL is a backstop
+    PERMISSION_CACHE_TTL = int(os.getenv("PERMISSION_CACHE_TTL", "60"))
+    # Serve report/dashboard day totals from the time_daily_rollup table instead of scanning time_entries
+    TIME_ROLLUP_ENABLED = os.getenv("TIME_ROLLUP_ENABLED", "true").lower() == "true"
+    # /api/v1/sync change log: days of history kept
+    SYNC_CHANGE_RETENTION_DAYS = int(os.getenv("SYNC_CHANGE_RETENTION_DAYS", "30"))
+
+    # Background scheduler: jobs run only in the process holding the scheduler lease, so several
+    # workers/replicas can share one database. Catch-up runs missed cron jobs once after a failover.
+    SCHEDULER_LEADER_ELECTION = os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() == "true"
+    SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "60"))
+    SCHEDULER_CATCHUP = os.getenv("SCHEDULER_CATCHUP", "once")  # once | skip
+    SCHEDULER_CATCHUP_MAX_AGE_HOURS = float(os.getenv("SCHEDULER_CATCHUP_MAX_AGE_HOURS", "24"))
+    SCHEDULER_RUN_HISTORY_DAYS = int(os.getenv("SCHEDULER_RUN_HISTORY_DAYS", "30"))
 
     # Rate limiting
     RATELIMIT_DEFAULT = os.getenv("RATELIMIT_DEFAULT", "")  # e.g., "200 per day;50 per hour"
     RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
 
+    # Webhook delivery workers (drain the webhook outbox off the request path; 0 = scheduler fallback only)
+    WEBHOOK_DELIVERY_WORKERS = int(os.getenv("WEBHOOK_DELIVERY_WORKERS", "2"))
+    WEBHOOK_MAX_CONCURRENCY_PER_HOST = int(os.getenv("WEBHOOK_MAX_CONCURRENCY_PER_HOST", "2"))
+    WEBHOOK_POLL_INTERVAL_SECONDS = float(os.getenv("WEBHOOK_POLL_INTERVAL_SECONDS", "2"))
+    # In-flight deliveries older than this are considered abandoned and re-queued
+    WEBHOOK_DELIVERY_LEASE_SECONDS = int(os.getenv("WEBHOOK_DELIVERY_LEASE_SECONDS", "300"))
+
+    # Background job queue for imports, exports and restores (0 = run only in `flask job-worker` processes)
+    JOB_QUEUE_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", "1"))
+    JOB_QUEUE_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_QUEUE_POLL_INTERVAL_SECONDS", "2"))
+    # A running job whose worker stops heartbeating for this long is retried or failed
+    JOB_QUEUE_LEASE_SECONDS = int(os.getenv("JOB_QUEUE_LEASE_SECONDS", "300"))
+    JOB_QUEUE_RETRY_BACKOFF_SECONDS = int(os.getenv("JOB_QUEUE_RETRY_BACKOFF_SECONDS", "30"))
+
+    # Scheduled integration syncs run concurrently (threads per run, caps per provider and per server host)
+    INTEGRATION_SYNC_WORKERS = int(os.getenv("INTEGRATION_SYNC_WORKERS", "4"))
+    INTEGRATION_SYNC_PER_PROVIDER = int(os.getenv("INTEGRATION_SYNC_PER_PROVIDER", "2"))
+    # Per-provider overrides, e.g. "jira=1,caldav_calendar=1"
+    INTEGRATION_SYNC_PROVIDER_LIMITS = os.getenv("INTEGRATION_SYNC_PROVIDER_LIMITS", "")
+    INTEGRATION_SYNC_PER_HOST = int(os.getenv("INTEGRATION_SYNC_PER_HOST", "2"))
+    # A sync still running after this long is reported as timed out and no longer waited for
+    INTEGRATION_SYNC_TIMEOUT_SECONDS = float(os.getenv("INTEGRATION_SYNC_TIMEOUT_SECONDS", "900"))
+    # Random delay before each sync starts
+    INTEGRATION_SYNC_JITTER_SECONDS = float(os.getenv("INTEGRATION_SYNC_JITTER_SECONDS", "10"))
+
+    # Email outbox: send_email queues rows that a worker sends in batches over one SMTP connection
+    # (off = only `flask email-worker` processes send queued emails)
+    EMAIL_OUTBOX_WORKER = os.getenv("EMAIL_OUTBOX_WORKER", "true").lower() == "true"
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", "5"))
+    # Messages sent per SMTP connection
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+    EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS", "60"))
+    # A batch whose worker died is sent again after this long
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+    EMAIL_OUTBOX_RETENTION_DAYS = int(os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", "30"))
+    # Messages per minute per SMTP server (0 = unlimited); MAIL_RATE_LIMITS overrides per host,
+    # e.g. "smtp.gmail.com=20,smtp.office365.com=30"
+    MAIL_RATE_LIMIT_PER_MINUTE = float(os.getenv("MAIL_RATE_LIMIT_PER_MINUTE", "0"))
+    MAIL_RATE_LIMITS = os.getenv("MAIL_RATE_LIMITS", "")
+
+    # Rendered invoice PDFs, keyed by a hash of invoice content, template and settings
+    PDF_CACHE_ENABLED = os.getenv("PDF_CACHE_ENABLED", "true").lower() == "true"
+    # If unset, the cache defaults to: <UPLOAD_FOLDER>/pdf_cache
+    PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR")
+    # Least recently used PDFs are removed above this size
+    PDF_CACHE_MAX_MB = int(os.getenv("PDF_CACHE_MAX_MB", "256"))
+    # Render finalized invoices in the background job queue when they change
+    PDF_PRERENDER = os.getenv("PDF_PRERENDER", "true").lower() == "true"
+    # Invoices accepted per POST /api/v1/invoices/pdf/render request
+    PDF_BULK_RENDER_MAX = int(os.getenv("PDF_BULK_RENDER_MAX", "500"))
+
     # Redis configuration
     REDIS_ENABLED = os.getenv("REDIS_ENABLED", "true").lower() == "true"
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
     REDIS_DEFAULT_TTL = int(os.getenv("REDIS_DEFAULT_TTL", 3600))  # 1 hour default
+    # Shared connection pool used by the cache and API rate limiter
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1"))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+    # After a connection error, skip Redis (use in-memory fallbacks) for this many seconds
+    REDIS_CIRCUIT_BREAKER_SECONDS = int(os.getenv("REDIS_CIRCUIT_BREAKER_SECONDS", "30"))
+
+    # Socket.IO message queue shared by all app processes: "auto" (Redis when reachable),
+    # "none" (in-process only) or an explicit redis:// / amqp:// / kafka:// URL
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "auto")
 
     # Internationalization
     LANGUAGES = {
@@ -162,13 +162,11 @@ class AsanaConnector(BaseConnector):
     def sync_data(self, sync_type: str = "full") -> Dict[str, Any]:
         """Sync tasks and projects with Asana."""
         from app import db
-        from app.models import Project, Task
+        from app.models import Project
         from app.utils.integration_sync_context import (
             ensure_project_integration_fields,
             find_project_by_integration_ref,
-            find_task_by_integration_ref,
             require_sync_context,
-            set_task_integration_ref,
         )
 
         try:
@@ -185,10 +183,12 @@ class AsanaConnector(BaseConnector):
                 return {"success": False, "message": "Workspace GID not configured"}
 
             synced_count = 0
+            unchanged_count = 0
             errors = []
 
             # Sync projects from Asana
-            projects_response = requests.get(
+            projects_response = self.http_request(
+                "GET",
                 f"{self.BASE_URL}/projects",
                 headers=headers,
                 params={"workspace": workspace_gid, "opt_fields": "name,notes,archived"},
@@ -224,70 +224,82 @@ class AsanaConnector(BaseConnector):
                             description=(asana_project.get("notes") or "") or None,
                         )
 
-                        # Sync tasks from Asana project
-                        tasks_response = requests.get(
-                            f"{self.BASE_URL}/projects/{asana_project.get('gid')}/tasks",
-                            headers=headers,
-                            params={"opt_fields": "name,notes,completed,due_on"},
+                        result = self.run_incremental_sync(
+                            f"tasks:{ap_gid}",
+                            lambda since, offset, ap_gid=ap_gid: self._fetch_tasks_page(headers, ap_gid, since, offset),
+                            lambda task_data, _, project=project: self._upsert_task(task_data, project, actor_id),
+                            record_id=lambda task_data: task_data.get("gid"),
+                            record_updated=lambda task_data: task_data.get("modified_at"),
+                            record_content=lambda task_data: {k: v for k, v in task_data.items() if k != "modified_at"},
+                            sync_type=sync_type,
                         )
-
-                        if tasks_response.status_code == 200:
-                            asana_tasks = tasks_response.json().get("data", [])
-
-                            for asana_task in asana_tasks:
-                                try:
-                                    at_gid = str(asana_task.get("gid") or "")
-                                    if not at_gid:
-                                        continue
-                                    task_response = requests.get(
-                                        f"{self.BASE_URL}/tasks/{at_gid}",
-                                        headers=headers,
-                                        params={"opt_fields": "name,notes,completed,due_on,assignee"},
-                                    )
-
-                                    if task_response.status_code == 200:
-                                        task_data = task_response.json().get("data", {})
-                                        tname = (task_data.get("name") or "Task").strip()[:200]
-                                        tstatus = "done" if task_data.get("completed") else "todo"
-
-                                        task = find_task_by_integration_ref(project.id, at_gid, source="asana")
-                                        if not task:
-                                            task = Task(
-                                                project_id=project.id,
-                                                name=tname,
-                                                description=(task_data.get("notes") or "") or None,
-                                                status=tstatus,
-                                                created_by=actor_id,
-                                            )
-                                            db.session.add(task)
-                                            db.session.flush()
-                                        else:
-                                            task.name = tname
-                                            task.description = (task_data.get("notes") or "") or None
-                                            task.status = tstatus
-
-                                        set_task_integration_ref(
-                                            task,
-                                            source="asana",
-                                            ref=at_gid,
-                                            extra={"asana_task_gid": at_gid},
-                                        )
-                                        synced_count += 1
-                                except Exception as e:
-                                    errors.append(
-                                        f"Error syncing task in project {asana_project.get('name')}: {str(e)}"
-                                    )
-
+                        synced_count += result.synced
+                        unchanged_count += result.unchanged
+                        errors.extend(result.errors)
                     except Exception as e:
                         errors.append(f"Error syncing project {asana_project.get('name')}: {str(e)}")
 
             db.session.commit()
 
-            return {"success": True, "synced_count": synced_count, "errors": errors}
+            return {
+                "success": True,
+                "synced_count": synced_count,
+                "unchanged_items": unchanged_count,
+                "errors": errors,
+            }
 
         except Exception as e:
             return {"success": False, "message": f"Sync failed: {str(e)}"}
 
+    def _fetch_tasks_page(
+        self, headers: Dict[str, str], project_gid: str, since: Optional[datetime], offset: Optional[str]
+    ):
+        """One page of a project's tasks with the fields that are synced; the cursor is Asana's ``next_page.offset``."""
+        params = {"project": project_gid, "opt_fields": "name,notes,completed,due_on,modified_at", "limit": 100}
+        if since:
+            params["modified_since"] = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+        if offset:
+            params["offset"] = offset
+        response = self.http_request("GET", f"{self.BASE_URL}/tasks", headers=headers, params=params)
+        if response.status_code != 200:
+            raise ValueError(f"Asana tasks for project {project_gid}: HTTP {response.status_code}")
+        data = response.json()
+        return data.get("data", []), (data.get("next_page") or {}).get("offset")
+
+    def _upsert_task(self, task_data: Dict[str, Any], project, actor_id: int) -> int:
+        """Create or update the task of one Asana task."""
+        from app import db
+        from app.models import Task
+        from app.utils.integration_sync_context import find_task_by_integration_ref, set_task_integration_ref
+
+        at_gid = str(task_data.get("gid") or "")
+        tname = (task_data.get("name") or "Task").strip()[:200]
+        tstatus = "done" if task_data.get("completed") else "todo"
+
+        task = find_task_by_integration_ref(project.id, at_gid, source="asana")
+        if not task:
+            task = Task(
+                project_id=project.id,
+                name=tname,
+                description=(task_data.get("notes") or "") or None,
+                status=tstatus,
+                created_by=actor_id,
+            )
+            db.session.add(task)
+            db.session.flush()
+        else:
+            task.name = tname
+            task.description = (task_data.get("notes") or "") or None
+            task.status = tstatus
+
+        set_task_integration_ref(
+            task,
+            source="asana",
+            ref=at_gid,
+            extra={"asana_task_gid": at_gid},
+        )
+        return 1
+
     def get_config_schema(self) -> Dict[str, Any]:
         """Get configuration schema."""
         return {
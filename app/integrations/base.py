@@ -2,9 +2,18 @@
 Base connector interface for integrations.
 """
 
+import logging
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from app.utils.integration_http import integration_session, session_request
+from app.utils.integration_sync_state import IncrementalSyncResult
+
+logger = logging.getLogger(__name__)
 
 
 class BaseConnector(ABC):
@@ -15,6 +24,14 @@ class BaseConnector(ABC):
     a consistent interface for integration management.
     """
 
+    # Subtracted from the watermark when asking the provider for changed records, for
+    # providers whose filters are coarser than the mark (minutes, user time zone). Records
+    # in the overlap are dropped again by the (updated, id) comparison.
+    SYNC_WATERMARK_OVERLAP = timedelta(0)
+
+    # Safety stop for a provider that keeps returning a next-page cursor
+    SYNC_MAX_PAGES = 500
+
     def __init__(self, integration, credentials):
         """
         Initialize connector with integration and credentials.
@@ -120,6 +137,159 @@ class BaseConnector(ABC):
         # Default implementation - override in subclasses
         return {"success": False, "message": "Sync not implemented for this connector"}
 
+    @property
+    def http(self) -> requests.Session:
+        """Pooled session (retries on 429/5xx, default timeouts) shared by this connector's requests."""
+        session = getattr(self, "_http_session", None)
+        if session is None:
+            session = self._http_session = integration_session()
+        return session
+
+    def http_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """``session_request`` on the connector's pooled session."""
+        return session_request(self.http, method, url, **kwargs)
+
+    def sync_content_salt(self) -> Dict[str, Any]:
+        """
+        Settings that change how records are mapped. They are part of every content
+        hash, so changing a mapping re-applies it to records that did not change.
+        """
+        return {"status_mappings": self.get_status_mappings(), "field_mappings": self.get_field_mappings()}
+
+    def run_incremental_sync(
+        self,
+        resource: str,
+        fetch_page: Callable[[Optional[datetime], Any], Tuple[Iterable[Any], Any]],
+        upsert: Callable[[Any, Any], int],
+        *,
+        record_id: Callable[[Any], Any],
+        record_updated: Callable[[Any], Any],
+        record_content: Optional[Callable[[Any], Any]] = None,
+        prepare_page: Optional[Callable[[List[Any]], Any]] = None,
+        sync_type: str = "incremental",
+    ) -> IncrementalSyncResult:
+        """
+        Page through the records of ``resource`` and upsert the ones that changed.
+
+        Args:
+            resource: Name the watermark and hashes are stored under (e.g. ``"issues"``,
+                ``"issues:owner/repo"``)
+            fetch_page: ``fetch_page(since, cursor) -> (records, next_cursor)``; ``since`` is
+                ``None`` for a full sync, ``cursor`` is ``None`` for the first page and a
+                ``None`` next cursor ends the run
+            upsert: ``upsert(record, page_context) -> int`` (number of local records written);
+                runs in a savepoint, so a failing record does not undo the rest of the page
+            record_id: Stable id of a record (tie-breaker for equal ``updated`` times)
+            record_updated: Provider ``updated`` time of a record (ISO string or datetime)
+            record_content: Part of the record that is mapped locally (default: all of it)
+            prepare_page: Called with the records of a page that will be upserted; its return
+                value is passed to ``upsert`` (e.g. prefetched local tasks)
+            sync_type: ``"incremental"`` resumes from the watermark and skips unchanged
+                records; anything else fetches and upserts everything
+
+        Records older than the watermark less ``SYNC_WATERMARK_OVERLAP`` are skipped; inside
+        that window the content hash decides, so a record missed by an earlier run is still
+        picked up. A watermark stored under a different ``sync_content_salt()`` is dropped.
+
+        Each page is committed on its own. The watermark advances only when every page
+        and record synced without error. A run stopped by ``SYNC_MAX_PAGES`` keeps the
+        mark reached so far when the provider returned the records oldest first, so the
+        next run continues where this one stopped.
+        """
+        from app import db
+        from app.utils.integration_sync_state import (
+            SyncWatermark,
+            content_hash,
+            get_watermark,
+            load_sync_records,
+            parse_timestamp,
+            remember_sync_record,
+            set_watermark,
+        )
+
+        result = IncrementalSyncResult()
+        incremental = sync_type == "incremental"
+        salt = self.sync_content_salt()
+        salt_digest = content_hash(salt)
+        stored = get_watermark(self.integration, resource)
+        if stored is not None and stored.salt != salt_digest:
+            # The mappings changed since the mark was stored: map every record again
+            stored = None
+        active = stored if incremental else None
+        since = active.updated_at - self.SYNC_WATERMARK_OVERLAP if active else None
+        high = stored
+        cursor = None
+        clean = True
+        capped = False
+        ascending = True
+        previous = None
+
+        while True:
+            if result.pages >= self.SYNC_MAX_PAGES:
+                result.errors.append(f"Stopped {resource} after {result.pages} pages; the rest follows next sync")
+                capped = True
+                break
+            try:
+                records, cursor = fetch_page(since, cursor)
+            except Exception as e:
+                logger.warning("Fetching %s for integration %s failed: %s", resource, self.integration.id, e)
+                result.errors.append(f"Error fetching {resource}: {e}")
+                clean = False
+                break
+            result.pages += 1
+            records = list(records or [])
+            result.fetched += len(records)
+
+            keyed = [(str(record_id(r) or ""), parse_timestamp(record_updated(r)), r) for r in records]
+            known = load_sync_records(self.integration.id, resource, [k for k, _, _ in keyed])
+            changed = []
+            for ext_id, updated_at, record in keyed:
+                mark = SyncWatermark(updated_at, ext_id) if updated_at else None
+                if mark:
+                    ascending = ascending and (previous is None or mark.key >= previous.key)
+                    previous = mark
+                if not ext_id or (since and updated_at and updated_at < since):
+                    result.skipped += 1
+                    continue
+                digest = content_hash([salt, record_content(record) if record_content else record])
+                row = known.get(ext_id)
+                if incremental and row is not None and row.content_hash == digest:
+                    result.unchanged += 1
+                    high = _later_watermark(high, mark)
+                    continue
+                changed.append((ext_id, updated_at, mark, digest, record))
+
+            context = prepare_page([c[-1] for c in changed]) if prepare_page and changed else None
+            for ext_id, updated_at, mark, digest, record in changed:
+                try:
+                    with db.session.begin_nested():
+                        result.synced += int(upsert(record, context) or 0)
+                        remember_sync_record(known, self.integration.id, resource, ext_id, digest, updated_at)
+                except Exception as e:
+                    logger.warning("Syncing %s record %s failed: %s", resource, ext_id, e, exc_info=True)
+                    result.errors.append(f"Error syncing {resource} record {ext_id}: {e}")
+                    clean = False
+                    known.pop(ext_id, None)
+                    continue
+                high = _later_watermark(high, mark)
+
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Committing %s for integration %s failed: %s", resource, self.integration.id, e)
+                result.errors.append(f"Database error while syncing {resource}: {e}")
+                clean = False
+                break
+            if cursor is None:
+                break
+
+        result.complete = clean and not capped
+        if clean and (ascending or not capped) and high is not None and (stored is None or high.key > stored.key):
+            set_watermark(self.integration, resource, replace(high, salt=salt_digest))
+            db.session.commit()
+        return result
+
     def handle_webhook(
         self, payload: Dict[str, Any], headers: Dict[str, str], raw_body: Optional[bytes] = None
     ) -> Dict[str, Any]:
@@ -303,3 +473,11 @@ class BaseConnector(ABC):
         if not self.integration or not self.integration.config:
             return {}
         return self.integration.config.get("status_mappings", {})
+
+
+def _later_watermark(current, candidate):
+    if candidate is None:
+        return current
+    if current is None or candidate.key > current.key:
+        return candidate
+    return current
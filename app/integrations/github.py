@@ -143,13 +143,11 @@ class GitHubConnector(BaseConnector):
         from datetime import datetime, timedelta
 
         from app import db
-        from app.models import Project, Task
+        from app.models import Project
         from app.utils.integration_sync_context import (
             ensure_project_integration_fields,
             find_project_by_integration_ref,
-            find_task_by_integration_ref,
             require_sync_context,
-            set_task_integration_ref,
         )
 
         logger = logging.getLogger(__name__)
@@ -168,10 +166,10 @@ class GitHubConnector(BaseConnector):
         if not repos_str:
             # Get user's repositories
             try:
-                repos_response = requests.get(
+                repos_response = self.http_request(
+                    "GET",
                     "https://api.github.com/user/repos",
                     headers={"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"},
-                    timeout=30,
                 )
                 if repos_response.status_code == 200:
                     repos = repos_response.json()
@@ -201,6 +199,7 @@ class GitHubConnector(BaseConnector):
             return {"success": False, "message": "No repositories configured or found"}
 
         synced_count = 0
+        unchanged_count = 0
         errors = []
 
         try:
@@ -238,101 +237,22 @@ class GitHubConnector(BaseConnector):
                         description=f"GitHub repository: {repo}",
                     )
 
-                    # Fetch issues
-                    try:
-                        issues_response = requests.get(
-                            f"https://api.github.com/repos/{repo}/issues",
-                            headers={"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"},
-                            params={"state": "open", "per_page": "100"},
-                            timeout=30,
-                        )
-
-                        if issues_response.status_code == 404:
-                            errors.append(f"Repository {repo} not found or access denied")
-                            continue
-                        elif issues_response.status_code == 401:
-                            errors.append(f"Authentication failed for repository {repo}")
-                            continue
-                        elif issues_response.status_code != 200:
-                            error_text = issues_response.text[:200] if issues_response.text else ""
-                            errors.append(
-                                f"Error fetching issues for {repo}: {issues_response.status_code} - {error_text}"
-                            )
-                            continue
-
-                        issues = issues_response.json()
-                    except requests.exceptions.Timeout:
-                        errors.append(f"Timeout fetching issues for {repo}")
-                        continue
-                    except requests.exceptions.ConnectionError as e:
-                        errors.append(f"Connection error for {repo}: {str(e)}")
-                        continue
-                    except Exception as e:
-                        errors.append(f"Error fetching issues for {repo}: {str(e)}")
-                        logger.error(f"Error fetching issues for {repo}: {e}", exc_info=True)
-                        continue
-
-                    for issue in issues:
-                        try:
-                            if issue.get("pull_request"):
-                                continue
-                            issue_number = issue.get("number")
-                            issue_title = (issue.get("title") or "").strip() or "Issue"
-                            issue_title = issue_title[:180]
-
-                            if not issue_number:
-                                continue
-
-                            issue_ref = f"{repo}#{issue_number}"
-                            body = (issue.get("body") or "").strip()
-                            url = issue.get("html_url") or ""
-                            if url:
-                                body = f"{body}\n\nGitHub: {url}" if body else f"GitHub: {url}"
-                            gh_state = (issue.get("state") or "").lower()
-                            task_status = "done" if gh_state == "closed" else "todo"
-
-                            task = find_task_by_integration_ref(project.id, issue_ref, source="github")
-                            if not task:
-                                try:
-                                    task_name = f"#{issue_number}: {issue_title}"[:200]
-                                    task = Task(
-                                        project_id=project.id,
-                                        name=task_name,
-                                        description=body or None,
-                                        status=task_status,
-                                        created_by=actor_id,
-                                    )
-                                    db.session.add(task)
-                                    db.session.flush()
-                                except Exception as e:
-                                    errors.append(f"Error creating task for issue #{issue_number} in {repo}: {str(e)}")
-                                    logger.error(
-                                        f"Error creating task for issue #{issue_number} in {repo}: {e}", exc_info=True
-                                    )
-                                    continue
-                            else:
-                                task.name = f"#{issue_number}: {issue_title}"[:200]
-                                task.description = body or None
-                                task.status = task_status
-
-                            set_task_integration_ref(
-                                task,
-                                source="github",
-                                ref=issue_ref,
-                                extra={
-                                    "issue_number": issue_number,
-                                    "issue_id": issue.get("id"),
-                                    "url": url,
-                                    "repo": repo,
-                                },
-                            )
-
-                            synced_count += 1
-                        except Exception as e:
-                            errors.append(f"Error syncing issue #{issue.get('number', 'unknown')} in {repo}: {str(e)}")
-                            logger.error(
-                                f"Error syncing issue #{issue.get('number', 'unknown')} in {repo}: {e}", exc_info=True
-                            )
+                    result = self.run_incremental_sync(
+                        f"issues:{repo}",
+                        lambda since, cursor, repo=repo: self._fetch_issues_page(token, repo, since, cursor),
+                        lambda issue, _, repo=repo, project=project: self._upsert_task_from_issue(
+                            issue, repo, project, actor_id
+                        ),
+                        record_id=lambda issue: issue.get("id"),
+                        record_updated=lambda issue: issue.get("updated_at"),
+                        record_content=lambda issue: {
+                            k: issue.get(k) for k in ("number", "title", "body", "state", "html_url", "pull_request")
+                        },
+                        sync_type=sync_type,
+                    )
+                    synced_count += result.synced
+                    unchanged_count += result.unchanged
+                    errors.extend(result.errors)
                 except ValueError as e:
                     errors.append(f"Invalid repository format: {repo} - {str(e)}")
                 except Exception as e:
@@ -353,13 +273,15 @@ class GitHubConnector(BaseConnector):
                     "success": True,
                     "message": f"Sync completed with {len(errors)} error(s). Synced {synced_count} issues.",
                     "synced_items": synced_count,
+                    "unchanged_items": unchanged_count,
                     "errors": errors,
                 }
 
             return {
                 "success": True,
-                "message": f"Sync completed. Synced {synced_count} issues.",
+                "message": f"Sync completed. Synced {synced_count} issues ({unchanged_count} unchanged).",
                 "synced_items": synced_count,
+                "unchanged_items": unchanged_count,
                 "errors": errors,
             }
         except Exception as e:
@@ -375,6 +297,79 @@ class GitHubConnector(BaseConnector):
                 "synced_items": synced_count,
             }
 
+    def _fetch_issues_page(self, token: str, repo: str, since: Optional[datetime], cursor: Optional[str]):
+        """
+        One page of a repository's issues, least recently updated first. Without a watermark
+        only open issues are listed; incremental pages include closed ones so closing an issue
+        reaches its task. The next-page cursor is the URL from the ``Link`` header.
+        """
+        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+        if cursor:
+            response = self.http_request("GET", cursor, headers=headers)
+        else:
+            params = {"state": "all" if since else "open", "sort": "updated", "direction": "asc", "per_page": "100"}
+            if since:
+                params["since"] = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+            response = self.http_request(
+                "GET", f"https://api.github.com/repos/{repo}/issues", headers=headers, params=params
+            )
+
+        if response.status_code == 404:
+            raise ValueError(f"Repository {repo} not found or access denied")
+        if response.status_code == 401:
+            raise ValueError(f"Authentication failed for repository {repo}")
+        if response.status_code != 200:
+            error_text = response.text[:200] if response.text else ""
+            raise ValueError(f"Error fetching issues for {repo}: {response.status_code} - {error_text}")
+        return response.json(), (response.links.get("next") or {}).get("url")
+
+    def _upsert_task_from_issue(self, issue: Dict[str, Any], repo: str, project, actor_id: int) -> int:
+        """Create or update the task of one GitHub issue; returns 0 for pull requests."""
+        from app import db
+        from app.models import Task
+        from app.utils.integration_sync_context import find_task_by_integration_ref, set_task_integration_ref
+
+        issue_number = issue.get("number")
+        if issue.get("pull_request") or not issue_number:
+            return 0
+        issue_title = ((issue.get("title") or "").strip() or "Issue")[:180]
+        issue_ref = f"{repo}#{issue_number}"
+        body = (issue.get("body") or "").strip()
+        url = issue.get("html_url") or ""
+        if url:
+            body = f"{body}\n\nGitHub: {url}" if body else f"GitHub: {url}"
+        gh_state = (issue.get("state") or "").lower()
+        task_status = "done" if gh_state == "closed" else "todo"
+
+        task = find_task_by_integration_ref(project.id, issue_ref, source="github")
+        if not task:
+            task = Task(
+                project_id=project.id,
+                name=f"#{issue_number}: {issue_title}"[:200],
+                description=body or None,
+                status=task_status,
+                created_by=actor_id,
+            )
+            db.session.add(task)
+            db.session.flush()
+        else:
+            task.name = f"#{issue_number}: {issue_title}"[:200]
+            task.description = body or None
+            task.status = task_status
+
+        set_task_integration_ref(
+            task,
+            source="github",
+            ref=issue_ref,
+            extra={
+                "issue_number": issue_number,
+                "issue_id": issue.get("id"),
+                "url": url,
+                "repo": repo,
+            },
+        )
+        return 1
+
     def handle_webhook(
         self, payload: Dict[str, Any], headers: Dict[str, str], raw_body: Optional[bytes] = None
     ) -> Dict[str, Any]:
@@ -192,13 +192,11 @@ class GitLabConnector(BaseConnector):
     def sync_data(self, sync_type: str = "full") -> Dict[str, Any]:
         """Sync issues from GitLab repositories into TimeTracker projects and tasks."""
         from app import db
-        from app.models import Project, Task
+        from app.models import Project
         from app.utils.integration_sync_context import (
             ensure_project_integration_fields,
             find_project_by_integration_ref,
-            find_task_by_integration_ref,
             require_sync_context,
-            set_task_integration_ref,
         )
 
         token = self.get_access_token()
@@ -213,6 +211,7 @@ class GitLabConnector(BaseConnector):
         base_url = self._get_base_url()
         headers = {"Authorization": f"Bearer {token}"}
         synced_count = 0
+        unchanged_count = 0
         errors = []
 
         raw_ids = self.integration.config.get("repository_ids", []) if self.integration else []
@@ -231,11 +230,11 @@ class GitLabConnector(BaseConnector):
 
         try:
             if not repo_ids:
-                projects_response = requests.get(
+                projects_response = self.http_request(
+                    "GET",
                     f"{base_url}/api/v4/projects",
                     headers=headers,
                     params={"membership": True, "per_page": 100},
-                    timeout=30,
                 )
                 if projects_response.status_code != 200:
                     return {
@@ -246,7 +245,7 @@ class GitLabConnector(BaseConnector):
 
             for repo_id in repo_ids:
                 try:
-                    pr = requests.get(f"{base_url}/api/v4/projects/{repo_id}", headers=headers, timeout=30)
+                    pr = self.http_request("GET", f"{base_url}/api/v4/projects/{repo_id}", headers=headers)
                     if pr.status_code != 200:
                         errors.append(f"GitLab project {repo_id}: HTTP {pr.status_code}")
                         continue
@@ -275,66 +274,38 @@ class GitLabConnector(BaseConnector):
                         description=(gl_project.get("description") or "") or f"GitLab: {path}",
                     )
 
-                    issues_response = requests.get(
-                        f"{base_url}/api/v4/projects/{repo_id}/issues",
-                        headers=headers,
-                        params={"state": "opened", "per_page": "100"},
-                        timeout=30,
+                    result = self.run_incremental_sync(
+                        f"issues:{repo_id}",
+                        lambda since, cursor, repo_id=repo_id: self._fetch_issues_page(
+                            base_url, headers, repo_id, since, cursor
+                        ),
+                        lambda issue, _, repo_id=repo_id, project=project: self._upsert_task_from_issue(
+                            issue, repo_id, project, actor_id
+                        ),
+                        record_id=lambda issue: issue.get("id"),
+                        record_updated=lambda issue: issue.get("updated_at"),
+                        record_content=lambda issue: {
+                            k: issue.get(k) for k in ("iid", "title", "description", "state", "web_url")
+                        },
+                        sync_type=sync_type,
                     )
-                    if issues_response.status_code != 200:
-                        errors.append(f"GitLab issues for project {repo_id}: HTTP {issues_response.status_code}")
-                        continue
-
-                    for issue in issues_response.json():
-                        iid = issue.get("iid")
-                        if not iid:
-                            continue
-                        title = (issue.get("title") or "Issue").strip()[:180]
-                        issue_ref = f"{repo_id}:{iid}"
-                        desc = (issue.get("description") or "").strip()
-                        web_url = issue.get("web_url") or ""
-                        if web_url:
-                            desc = f"{desc}\n\nGitLab: {web_url}" if desc else f"GitLab: {web_url}"
-                        state = (issue.get("state") or "").lower()
-                        task_status = "done" if state in ("closed", "merged") else "todo"
-                        task_name = f"#{iid}: {title}"[:200]
-
-                        task = find_task_by_integration_ref(project.id, issue_ref, source="gitlab")
-                        if not task:
-                            task = Task(
-                                project_id=project.id,
-                                name=task_name,
-                                description=desc or None,
-                                status=task_status,
-                                created_by=actor_id,
-                            )
-                            db.session.add(task)
-                            db.session.flush()
-                        else:
-                            task.name = task_name
-                            task.description = desc or None
-                            task.status = task_status
-
-                        set_task_integration_ref(
-                            task,
-                            source="gitlab",
-                            ref=issue_ref,
-                            extra={
-                                "gitlab_project_id": repo_id,
-                                "iid": iid,
-                                "id": issue.get("id"),
-                                "url": web_url,
-                            },
-                        )
-                        synced_count += 1
+                    synced_count += result.synced
+                    unchanged_count += result.unchanged
+                    errors.extend(result.errors)
                 except Exception as e:
                     errors.append(f"Error syncing repository {repo_id}: {str(e)}")
 
             db.session.commit()
-            msg = f"Sync completed. Upserted {synced_count} issue(s)."
+            msg = f"Sync completed. Upserted {synced_count} issue(s), {unchanged_count} unchanged."
             if errors:
                 msg += f" {len(errors)} error(s)."
-            return {"success": True, "message": msg, "synced_items": synced_count, "errors": errors}
+            return {
+                "success": True,
+                "message": msg,
+                "synced_items": synced_count,
+                "unchanged_items": unchanged_count,
+                "errors": errors,
+            }
         except Exception as e:
             try:
                 db.session.rollback()
@@ -342,6 +313,77 @@ class GitLabConnector(BaseConnector):
                 pass
             return {"success": False, "message": f"Sync failed: {str(e)}", "errors": errors}
 
+    def _fetch_issues_page(
+        self, base_url: str, headers: Dict[str, str], repo_id: int, since: Optional[datetime], cursor: Optional[str]
+    ):
+        """
+        One page of a project's issues, least recently updated first. Without a watermark only
+        open issues are listed; incremental pages include closed ones so closing an issue
+        reaches its task. The next-page cursor is the URL from the ``Link`` header.
+        """
+        if cursor:
+            response = self.http_request("GET", cursor, headers=headers)
+        else:
+            params = {"order_by": "updated_at", "sort": "asc", "per_page": "100"}
+            if since:
+                params["updated_after"] = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+            else:
+                params["state"] = "opened"
+            response = self.http_request(
+                "GET", f"{base_url}/api/v4/projects/{repo_id}/issues", headers=headers, params=params
+            )
+        if response.status_code != 200:
+            raise ValueError(f"GitLab issues for project {repo_id}: HTTP {response.status_code}")
+        return response.json(), (response.links.get("next") or {}).get("url")
+
+    def _upsert_task_from_issue(self, issue: Dict[str, Any], repo_id: int, project, actor_id: int) -> int:
+        """Create or update the task of one GitLab issue."""
+        from app import db
+        from app.models import Task
+        from app.utils.integration_sync_context import find_task_by_integration_ref, set_task_integration_ref
+
+        iid = issue.get("iid")
+        if not iid:
+            return 0
+        title = (issue.get("title") or "Issue").strip()[:180]
+        issue_ref = f"{repo_id}:{iid}"
+        desc = (issue.get("description") or "").strip()
+        web_url = issue.get("web_url") or ""
+        if web_url:
+            desc = f"{desc}\n\nGitLab: {web_url}" if desc else f"GitLab: {web_url}"
+        state = (issue.get("state") or "").lower()
+        task_status = "done" if state in ("closed", "merged") else "todo"
+        task_name = f"#{iid}: {title}"[:200]
+
+        task = find_task_by_integration_ref(project.id, issue_ref, source="gitlab")
+        if not task:
+            task = Task(
+                project_id=project.id,
+                name=task_name,
+                description=desc or None,
+                status=task_status,
+                created_by=actor_id,
+            )
+            db.session.add(task)
+            db.session.flush()
+        else:
+            task.name = task_name
+            task.description = desc or None
+            task.status = task_status
+
+        set_task_integration_ref(
+            task,
+            source="gitlab",
+            ref=issue_ref,
+            extra={
+                "gitlab_project_id": repo_id,
+                "iid": iid,
+                "id": issue.get("id"),
+                "url": web_url,
+            },
+        )
+        return 1
+
     def get_config_schema(self) -> Dict[str, Any]:
         """Get configuration schema."""
         return {
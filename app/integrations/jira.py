@@ -9,7 +9,7 @@ import logging
 import os
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 
@@ -20,6 +20,11 @@ logger = logging.getLogger(__name__)
 # Jira issue key format: PROJECT_KEY-NUMBER (e.g. PROJ-123, MYPROJ-1)
 JIRA_ISSUE_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+-[0-9]+$")
 
+DEFAULT_JQL = "assignee = currentUser() AND status != Done ORDER BY updated DESC"
+JQL_ORDER_BY_PATTERN = re.compile(r"(^|\s+)ORDER\s+BY\s+.*$", re.IGNORECASE | re.DOTALL)
+JIRA_ISSUE_FIELDS = "summary,description,status,assignee,project,created,updated"
+JIRA_PAGE_SIZE = 100
+
 
 class JiraConnector(BaseConnector):
     """Jira integration connector."""
@@ -28,6 +33,9 @@ class JiraConnector(BaseConnector):
     description = "Sync issues and track time in Jira"
     icon = "jira"
 
+    # JQL dates have minute precision and are read in the Jira user's time zone
+    SYNC_WATERMARK_OVERLAP = timedelta(hours=14)
+
     @property
     def provider_name(self) -> str:
         return "jira"
@@ -172,10 +180,41 @@ class JiraConnector(BaseConnector):
             pass
         return None
 
-    def _upsert_task_from_issue(self, issue: Dict[str, Any], actor_id: int, client_id: int) -> int:
+    @staticmethod
+    def _issue_project_key(issue: Dict[str, Any]) -> str:
+        return ((issue.get("fields") or {}).get("project") or {}).get("key") or "Jira"
+
+    def _prefetch_issue_tasks(self, issues: List[Dict[str, Any]], client_id: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve the tasks of a page of issues up front: ``{project_id: {issue_key: Task}}``
+        for projects that already exist, with one indexed query per Jira project.
+        """
+        from app.utils.integration_sync_context import (
+            find_projects_by_integration_refs,
+            find_tasks_by_integration_refs,
+        )
+
+        keys_by_project: Dict[str, List[str]] = {}
+        for issue in issues:
+            if issue.get("key"):
+                keys_by_project.setdefault(self._issue_project_key(issue), []).append(issue["key"])
+        projects = find_projects_by_integration_refs(client_id, "jira", keys_by_project)
+        return {
+            project.id: find_tasks_by_integration_refs(project.id, keys_by_project[project_key], source="jira")
+            for project_key, project in projects.items()
+        }
+
+    def _upsert_task_from_issue(
+        self,
+        issue: Dict[str, Any],
+        actor_id: int,
+        client_id: int,
+        known_tasks: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> int:
         """
         Find or create Project and Task from a single Jira issue dict.
         Reuses same mapping logic as sync_data. Returns 1 if upserted, 0 on skip/error.
+        ``known_tasks`` is the result of ``_prefetch_issue_tasks`` for the page being synced.
         """
         from app import db
         from app.models import Project, Task
@@ -190,8 +229,7 @@ class JiraConnector(BaseConnector):
         if not issue_key:
             return 0
         issue_fields = issue.get("fields") or {}
-        project_key = (issue_fields.get("project") or {}).get("key") or ""
-        project_key = project_key or "Jira"
+        project_key = self._issue_project_key(issue)
 
         project = find_project_by_integration_ref(client_id, "jira", project_key)
         if not project:
@@ -221,7 +259,11 @@ class JiraConnector(BaseConnector):
         if description_text:
             desc = f"{summary}\n\n{description_text}" if summary else description_text
 
-        task = find_task_by_integration_ref(project.id, issue_key, source="jira")
+        page_tasks = known_tasks.get(project.id) if known_tasks is not None else None
+        if page_tasks is not None:
+            task = page_tasks.get(issue_key)
+        else:
+            task = find_task_by_integration_ref(project.id, issue_key, source="jira")
         if not task:
             task = Task(
                 project_id=project.id,
@@ -232,6 +274,8 @@ class JiraConnector(BaseConnector):
             )
             db.session.add(task)
             db.session.flush()
+            if page_tasks is not None:
+                page_tasks[issue_key] = task
         else:
             task.description = desc or None
             task.status = mapped_status
@@ -246,10 +290,17 @@ class JiraConnector(BaseConnector):
 
         return 1
 
-    def sync_data(self, sync_type: str = "full") -> Dict[str, Any]:
-        """Sync issues from Jira and create tasks."""
-        from app import db
+    def _sync_jql(self, since: Optional[datetime]) -> str:
+        """Configured JQL restricted to issues updated since ``since``, oldest change first."""
+        jql = (self.integration.config.get("jql") or DEFAULT_JQL).strip()
+        jql = JQL_ORDER_BY_PATTERN.sub("", jql).strip()
+        if since is not None:
+            condition = f'updated >= "{since.strftime("%Y-%m-%d %H:%M")}"'
+            jql = f"({jql}) AND {condition}" if jql else condition
+        return f"{jql} ORDER BY updated ASC, key ASC"
 
+    def sync_data(self, sync_type: str = "full") -> Dict[str, Any]:
+        """Sync issues from Jira and create tasks (``incremental`` resumes from the last synced change)."""
         token = self.get_access_token()
         if not token:
             return {"success": False, "message": "No access token available"}
@@ -262,50 +313,47 @@ class JiraConnector(BaseConnector):
             return {"success": False, "message": str(e)}
 
         base_url = self.integration.config.get("jira_url", "https://your-domain.atlassian.net")
-        api_url = f"{base_url}/rest/api/3/search"
-
-        synced_count = 0
-        errors = []
+        api_url = f"{base_url}/rest/api/3/search/jql"
+        headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+
+        def fetch_page(since, cursor):
+            params = {"jql": self._sync_jql(since), "maxResults": JIRA_PAGE_SIZE, "fields": JIRA_ISSUE_FIELDS}
+            if cursor:
+                params["nextPageToken"] = cursor
+            response = self.http_request("GET", api_url, headers=headers, params=params)
+            if response.status_code != 200:
+                raise ValueError(f"Jira API returned status {response.status_code}")
+            data = response.json()
+            next_token = None if data.get("isLast", True) else data.get("nextPageToken")
+            return data.get("issues", []), next_token
 
         try:
-            jql = self.integration.config.get(
-                "jql", "assignee = currentUser() AND status != Done ORDER BY updated DESC"
-            )
-            if sync_type == "incremental":
-                jql = f"{jql} AND updated >= -7d"
-
-            response = requests.get(
-                api_url,
-                headers={"Authorization": f"Bearer {token}", "Accept": "application/json"},
-                params={
-                    "jql": jql,
-                    "maxResults": 100,
-                    "fields": "summary,description,status,assignee,project,created,updated",
+            result = self.run_incremental_sync(
+                "issues",
+                fetch_page,
+                lambda issue, known_tasks: self._upsert_task_from_issue(issue, actor_id, client_id, known_tasks),
+                record_id=lambda issue: issue.get("id") or issue.get("key"),
+                record_updated=lambda issue: (issue.get("fields") or {}).get("updated"),
+                record_content=lambda issue: {
+                    "key": issue.get("key"),
+                    "fields": {k: v for k, v in (issue.get("fields") or {}).items() if k != "updated"},
                 },
+                prepare_page=lambda issues: self._prefetch_issue_tasks(issues, client_id),
+                sync_type=sync_type,
             )
-
-            if response.status_code != 200:
-                return {"success": False, "message": f"Jira API returned status {response.status_code}"}
-
-            issues = response.json().get("issues", [])
-
-            for issue in issues:
-                try:
-                    synced_count += self._upsert_task_from_issue(issue, actor_id, client_id)
-                except Exception as e:
-                    errors.append(f"Error syncing issue {issue.get('key', 'unknown')}: {str(e)}")
-
-            db.session.commit()
-
-            return {
-                "success": True,
-                "message": f"Sync completed. Synced {synced_count} issues.",
-                "synced_items": synced_count,
-                "errors": errors,
-            }
         except Exception as e:
             return {"success": False, "message": f"Sync failed: {str(e)}"}
 
+        if result.errors and not result.pages:
+            return {"success": False, "message": result.errors[0]}
+        return {
+            "success": True,
+            "message": f"Sync completed. Synced {result.synced} issues ({result.unchanged} unchanged).",
+            "synced_items": result.synced,
+            "unchanged_items": result.unchanged,
+            "errors": result.errors,
+        }
+
     def sync_issue(self, issue_key: str) -> Dict[str, Any]:
         """
         Fetch a single Jira issue by key and upsert it as a task.
@@ -336,7 +384,7 @@ class JiraConnector(BaseConnector):
 
         base_url = self.integration.config.get("jira_url", "https://your-domain.atlassian.net")
         api_url = f"{base_url}/rest/api/3/issue/{issue_key}"
-        fields = "summary,description,status,assignee,project,created,updated"
+        fields = JIRA_ISSUE_FIELDS
 
         try:
             response = requests.get(
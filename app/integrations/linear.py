@@ -10,7 +10,6 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from app.integrations.base import BaseConnector
-from app.utils.integration_http import integration_session, session_request
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +45,7 @@ class LinearConnector(BaseConnector):
         key = self._api_key()
         if not key:
             raise ValueError("No Linear API key configured.")
-        session = integration_session()
-        resp = session_request(
-            session,
+        resp = self.http_request(
             "POST",
             LINEAR_GRAPHQL,
             headers={"Authorization": key, "Content-Type": "application/json"},
@@ -96,45 +93,36 @@ class LinearConnector(BaseConnector):
             return {"success": False, "message": str(e)}
 
         q = """
-        query SyncIssues($after: String) {
-          issues(first: 100, after: $after) {
+        query SyncIssues($after: String, $filter: IssueFilter) {
+          issues(first: 100, after: $after, filter: $filter, orderBy: updatedAt) {
             pageInfo { hasNextPage endCursor }
             nodes {
               id
               identifier
               title
               url
+              updatedAt
               team { key name }
               state { name }
             }
           }
         }
         """
-        all_nodes: List[Dict] = []
-        after = None
-        try:
-            for _ in range(20):
-                data = self._graphql(q, {"after": after})
-                conn = data.get("issues") or {}
-                nodes = conn.get("nodes") or []
-                for n in nodes:
-                    tk = (n.get("team") or {}).get("key") or ""
-                    if team_keys and tk not in team_keys:
-                        continue
-                    all_nodes.append(n)
-                page = conn.get("pageInfo") or {}
-                if not page.get("hasNextPage"):
-                    break
-                after = page.get("endCursor")
-        except Exception as e:
-            logger.error("Linear sync fetch failed: %s", e, exc_info=True)
-            return {"success": False, "message": str(e)}
 
-        synced = 0
-        errors: List[str] = []
+        def fetch_page(since, after):
+            variables = {"after": after, "filter": None}
+            if since is not None:
+                variables["filter"] = {"updatedAt": {"gte": since.strftime("%Y-%m-%dT%H:%M:%S.000Z")}}
+            conn = self._graphql(q, variables).get("issues") or {}
+            nodes = [
+                n for n in conn.get("nodes") or [] if not team_keys or (n.get("team") or {}).get("key") in team_keys
+            ]
+            page = conn.get("pageInfo") or {}
+            return nodes, page.get("endCursor") if page.get("hasNextPage") else None
+
         projects_cache: Dict[str, Project] = {}
 
-        def project_for_team(team_key: str, team_name: str) -> Optional[Project]:
+        def project_for_team(team_key: str, team_name: str) -> Project:
             ref = f"{team_key}:{team_name}" if team_key else team_name or "default"
             if ref in projects_cache:
                 return projects_cache[ref]
@@ -143,18 +131,14 @@ class LinearConnector(BaseConnector):
                 display = f"Linear / {team_name or team_key or 'Issues'}"
                 p = Project.query.filter_by(client_id=client_id, name=display).first()
             if not p:
-                try:
-                    p = Project(
-                        name=f"Linear / {team_name or team_key or 'Issues'}",
-                        client_id=client_id,
-                        description=f"Linear workspace team {team_key or '—'}",
-                        status="active",
-                    )
-                    db.session.add(p)
-                    db.session.flush()
-                except Exception as ex:
-                    errors.append(f"Project create: {ex}")
-                    return None
+                p = Project(
+                    name=f"Linear / {team_name or team_key or 'Issues'}",
+                    client_id=client_id,
+                    description=f"Linear workspace team {team_key or '—'}",
+                    status="active",
+                )
+                db.session.add(p)
+                db.session.flush()
             ensure_project_integration_fields(
                 project=p,
                 source="linear",
@@ -165,70 +149,66 @@ class LinearConnector(BaseConnector):
             projects_cache[ref] = p
             return p
 
-        for n in all_nodes:
+        def upsert(n, _) -> int:
             issue_id = n.get("id")
-            if not issue_id:
-                continue
             team = n.get("team") or {}
             tk = team.get("key") or "unknown"
-            tn = team.get("name") or tk
-            project = project_for_team(tk, tn)
-            if not project:
-                continue
+            project = project_for_team(tk, team.get("name") or tk)
             title = (n.get("title") or "Untitled").strip()[:500]
             ident = n.get("identifier") or issue_id
-            try:
-                task = find_task_by_integration_ref(project.id, issue_id, source="linear")
-                state_name = (n.get("state") or {}).get("name") or ""
-                status = "done" if state_name.lower() in ("done", "completed", "canceled", "cancelled") else "todo"
-                if not task:
-                    task = Task(
-                        name=f"{ident}: {title}"[:500],
-                        description=(n.get("url") or "")[:2000],
-                        project_id=project.id,
-                        status=status,
-                        created_by=actor_id,
-                    )
-                    db.session.add(task)
-                    db.session.flush()
-                    set_task_integration_ref(
-                        task,
-                        source="linear",
-                        ref=issue_id,
-                        extra={"identifier": ident, "url": n.get("url")},
-                    )
-                    synced += 1
-                else:
-                    task.name = f"{ident}: {title}"[:500]
-                    task.status = status
-                    if n.get("url"):
-                        task.description = (n.get("url") or "")[:2000]
-                    set_task_integration_ref(
-                        task,
-                        source="linear",
-                        ref=issue_id,
-                        extra={"identifier": ident, "url": n.get("url")},
-                    )
-                    synced += 1
-            except Exception as ex:
-                errors.append(f"{ident}: {ex}")
-                logger.warning("Linear issue upsert failed: %s", ex, exc_info=True)
+            task = find_task_by_integration_ref(project.id, issue_id, source="linear")
+            state_name = (n.get("state") or {}).get("name") or ""
+            status = "done" if state_name.lower() in ("done", "completed", "canceled", "cancelled") else "todo"
+            if not task:
+                task = Task(
+                    name=f"{ident}: {title}"[:500],
+                    description=(n.get("url") or "")[:2000],
+                    project_id=project.id,
+                    status=status,
+                    created_by=actor_id,
+                )
+                db.session.add(task)
+                db.session.flush()
+            else:
+                task.name = f"{ident}: {title}"[:500]
+                task.status = status
+                if n.get("url"):
+                    task.description = (n.get("url") or "")[:2000]
+            set_task_integration_ref(
+                task,
+                source="linear",
+                ref=issue_id,
+                extra={"identifier": ident, "url": n.get("url")},
+            )
+            return 1
 
         try:
-            db.session.commit()
+            result = self.run_incremental_sync(
+                "issues",
+                fetch_page,
+                upsert,
+                record_id=lambda n: n.get("id"),
+                record_updated=lambda n: n.get("updatedAt"),
+                record_content=lambda n: {k: v for k, v in n.items() if k != "updatedAt"},
+                sync_type=sync_type,
+            )
         except Exception as e:
+            logger.error("Linear sync failed: %s", e, exc_info=True)
             db.session.rollback()
-            return {"success": False, "message": f"Database error: {e}"}
+            return {"success": False, "message": str(e)}
+        if result.errors and not result.pages:
+            return {"success": False, "message": result.errors[0]}
 
-        msg = f"Processed {len(all_nodes)} Linear issues."
-        if errors:
-            msg += f" ({len(errors)} errors)"
+        msg = f"Processed {result.fetched} Linear issues ({result.unchanged} unchanged)."
+        if result.errors:
+            msg += f" ({len(result.errors)} errors)"
         return {
             "success": True,
             "message": msg,
-            "synced_items": synced,
-            "synced_count": synced,
-            "errors": errors[:20],
+            "synced_items": result.synced,
+            "synced_count": result.synced,
+            "unchanged_items": result.unchanged,
+            "errors": result.errors[:20],
         }
 
     @classmethod
@@ -147,7 +147,7 @@ class TrelloConnector(BaseConnector):
             )
 
             if sync_direction in ("trello_to_timetracker", "bidirectional"):
-                trello_result = self._sync_trello_to_timetracker(api_key, token, actor_id, client_id)
+                trello_result = self._sync_trello_to_timetracker(api_key, token, actor_id, client_id, sync_type)
                 # If bidirectional, also sync TimeTracker to Trello
                 if sync_direction == "bidirectional":
                     tracker_result = self._sync_timetracker_to_trello(api_key, token, actor_id, client_id)
@@ -180,23 +180,24 @@ class TrelloConnector(BaseConnector):
         except Exception as e:
             return {"success": False, "message": f"Sync failed: {str(e)}"}
 
-    def _sync_trello_to_timetracker(self, api_key: str, token: str, actor_id: int, client_id: int) -> Dict[str, Any]:
+    def _sync_trello_to_timetracker(
+        self, api_key: str, token: str, actor_id: int, client_id: int, sync_type: str = "full"
+    ) -> Dict[str, Any]:
         """Sync Trello boards and cards to TimeTracker projects and tasks."""
         from app import db
-        from app.models import Project, Task
+        from app.models import Project
         from app.utils.integration_sync_context import (
             ensure_project_integration_fields,
             find_project_by_integration_ref,
-            find_task_by_integration_ref,
-            set_task_integration_ref,
         )
 
         synced_count = 0
+        unchanged_count = 0
         errors = []
 
         # Get boards
-        boards_response = requests.get(
-            f"{self.BASE_URL}/members/me/boards", params={"key": api_key, "token": token, "filter": "open"}
+        boards_response = self.http_request(
+            "GET", f"{self.BASE_URL}/members/me/boards", params={"key": api_key, "token": token, "filter": "open"}
         )
 
         if boards_response.status_code == 200:
@@ -234,43 +235,17 @@ class TrelloConnector(BaseConnector):
                         description=(board.get("desc") or "") or None,
                     )
 
-                    cards_response = requests.get(
-                        f"{self.BASE_URL}/boards/{board.get('id')}/cards",
-                        params={"key": api_key, "token": token, "filter": "open"},
+                    result = self.run_incremental_sync(
+                        f"cards:{board_id}",
+                        lambda since, cursor, board_id=board_id: self._fetch_cards(api_key, token, board_id),
+                        lambda card, _, project=project: self._upsert_task_from_card(card, project, actor_id),
+                        record_id=lambda card: card.get("id"),
+                        record_updated=lambda card: card.get("dateLastActivity"),
+                        record_content=lambda card: {k: v for k, v in card.items() if k != "dateLastActivity"},
+                        sync_type=sync_type,
                     )
-
-                    if cards_response.status_code == 200:
-                        cards = cards_response.json()
-
-                        for card in cards:
-                            card_id = str(card.get("id") or "")
-                            if not card_id:
-                                continue
-                            cname = (card.get("name") or "Card").strip()[:200]
-                            new_status = self._map_trello_list_to_status(card.get("idList"))
-                            task = find_task_by_integration_ref(project.id, card_id, source="trello")
-                            if not task:
-                                task = Task(
-                                    project_id=project.id,
-                                    name=cname,
-                                    description=(card.get("desc") or "") or None,
-                                    status=new_status,
-                                    created_by=actor_id,
-                                )
-                                db.session.add(task)
-                                db.session.flush()
-                            else:
-                                if card.get("desc") is not None:
-                                    task.description = (card.get("desc") or "") or None
-                                task.name = cname
-                                task.status = new_status
-
-                            set_task_integration_ref(
-                                task,
-                                source="trello",
-                                ref=card_id,
-                                extra={"trello_list_id": card.get("idList")},
-                            )
+                    unchanged_count += result.unchanged
+                    errors.extend(result.errors)
 
                     synced_count += 1
                 except Exception as e:
@@ -278,7 +253,55 @@ class TrelloConnector(BaseConnector):
 
         db.session.commit()
 
-        return {"success": True, "synced_count": synced_count, "errors": errors}
+        return {"success": True, "synced_count": synced_count, "unchanged_items": unchanged_count, "errors": errors}
+
+    def _fetch_cards(self, api_key: str, token: str, board_id: str):
+        """
+        Open cards of a board. Trello has no changed-since filter or cursor for cards, so every
+        sync lists the board and unchanged cards are dropped by their activity date and hash.
+        """
+        response = self.http_request(
+            "GET",
+            f"{self.BASE_URL}/boards/{board_id}/cards",
+            params={"key": api_key, "token": token, "filter": "open", "fields": "name,desc,idList,dateLastActivity"},
+        )
+        if response.status_code != 200:
+            raise ValueError(f"Trello cards for board {board_id}: HTTP {response.status_code}")
+        return response.json(), None
+
+    def _upsert_task_from_card(self, card: Dict[str, Any], project, actor_id: int) -> int:
+        """Create or update the task of one Trello card."""
+        from app import db
+        from app.models import Task
+        from app.utils.integration_sync_context import find_task_by_integration_ref, set_task_integration_ref
+
+        card_id = str(card.get("id") or "")
+        cname = (card.get("name") or "Card").strip()[:200]
+        new_status = self._map_trello_list_to_status(card.get("idList"))
+        task = find_task_by_integration_ref(project.id, card_id, source="trello")
+        if not task:
+            task = Task(
+                project_id=project.id,
+                name=cname,
+                description=(card.get("desc") or "") or None,
+                status=new_status,
+                created_by=actor_id,
+            )
+            db.session.add(task)
+            db.session.flush()
+        else:
+            if card.get("desc") is not None:
+                task.description = (card.get("desc") or "") or None
+            task.name = cname
+            task.status = new_status
+
+        set_task_integration_ref(
+            task,
+            source="trello",
+            ref=card_id,
+            extra={"trello_list_id": card.get("idList")},
+        )
+        return 1
 
     def _sync_timetracker_to_trello(self, api_key: str, token: str, actor_id: int, client_id: int) -> Dict[str, Any]:
         """Sync TimeTracker tasks to Trello cards."""
@@ -444,7 +467,9 @@ class TrelloConnector(BaseConnector):
 
         try:
             # Fetch list name
-            list_response = requests.get(f"{self.BASE_URL}/lists/{list_id}", params={"key": api_key, "token": token})
+            list_response = self.http_request(
+                "GET", f"{self.BASE_URL}/lists/{list_id}", params={"key": api_key, "token": token}
+            )
 
             if list_response.status_code == 200:
                 list_data = list_response.json()
@@ -10,8 +10,10 @@ from .attendance_compliance import (
     AttendanceWorkPeriod,
     DailyAttendanceRecord,
 )
-from .audit_log import AuditLog
+from .audit_log import AuditLog, AuditSnapshot
+from .background_job import BackgroundJob
 from .budget_alert import BudgetAlert
+from .cache_version import CacheVersion
 from .calendar_event import CalendarEvent
 from .calendar_integration import CalendarIntegration, CalendarSyncEvent
 from .client import Client
@@ -33,6 +35,7 @@ from .deal import Deal
 from .deal_activity import DealActivity
 from .deleted_username import DeletedUsername
 from .donation_interaction import DonationInteraction
+from .email_outbox import EmailOutboxMessage
 from .expense import Expense
 from .expense_category import ExpenseCategory
 from .expense_gps import MileageTrack
@@ -42,7 +45,9 @@ from .gamification import Badge, Leaderboard, LeaderboardEntry, UserBadge
 from .import_export import DataExport, DataImport
 from .integration import Integration, IntegrationCredential, IntegrationEvent
 from .integration_external_event_link import IntegrationExternalEventLink
-from .invoice import Invoice, InvoiceItem
+from .integration_external_ref import IntegrationExternalRef
+from .integration_sync_record import IntegrationSyncRecord
+from .invoice import Invoice, InvoiceItem, InvoiceItemTimeEntry
 from .invoice_approval import InvoiceApproval
 from .invoice_email import InvoiceEmail
 from .invoice_image import InvoiceImage
@@ -79,6 +84,8 @@ from .recurring_task import RecurringTask
 from .reporting import ReportEmailSchedule, SavedReportView
 from .salesman_email_mapping import SalesmanEmailMapping
 from .saved_filter import SavedFilter
+from .scheduled_job_run import ScheduledJobRun
+from .scheduler_lease import SchedulerLease
 from .settings import Settings
 from .stock_item import StockItem
 from .stock_lot import StockLot, StockLotAllocation
@@ -86,11 +93,13 @@ from .stock_movement import StockMovement
 from .stock_reservation import StockReservation
 from .supplier import Supplier
 from .supplier_stock_item import SupplierStockItem
+from .sync_change import SyncChange, SyncChangeSequence
 from .task import Task
 from .task_activity import TaskActivity
 from .task_checklist_item import TaskChecklistItem
 from .tax_rule import TaxRule
 from .team_chat import ChatChannel, ChatChannelMember, ChatMessage, ChatReadReceipt
+from .time_daily_rollup import TimeDailyRollup
 from .time_entry import TimeEntry
 from .time_entry_approval import ApprovalPolicy, ApprovalStatus, TimeEntryApproval
 from .time_entry_template import TimeEntryTemplate
@@ -100,7 +109,10 @@ from .timesheet_policy import TimesheetPolicy
 from .user import User
 from .user_client import UserClient
 from .user_favorite_project import UserFavoriteProject
+from .user_project_access import UserProjectAccess
 from .user_smart_notification_dismissal import UserSmartNotificationDismissal
+from .user_time_stats import UserTimeStats
+from .user_timer_state import UserTimerState
 from .warehouse import Warehouse
 from .warehouse_stock import WarehouseStock
 from .webhook import Webhook, WebhookDelivery
@@ -112,12 +124,21 @@ from .working_time_violation import WorkingTimeViolation
 __all__ = [
     "User",
     "UserSmartNotificationDismissal",
+    "UserTimeStats",
+    "UserTimerState",
+    "UserProjectAccess",
     "Project",
     "TimeEntry",
+    "TimeDailyRollup",
+    "SyncChange",
+    "SyncChangeSequence",
+    "SchedulerLease",
+    "ScheduledJobRun",
     "Task",
     "Settings",
     "Invoice",
     "InvoiceItem",
+    "InvoiceItemTimeEntry",
     "Client",
     "TaskActivity",
     "TaskChecklistItem",
@@ -162,9 +183,13 @@ __all__ = [
     "BudgetAlert",
     "DataImport",
     "DataExport",
+    "BackgroundJob",
+    "CacheVersion",
+    "EmailOutboxMessage",
     "InvoicePDFTemplate",
     "ClientPrepaidConsumption",
     "AuditLog",
+    "AuditSnapshot",
     "RecurringInvoice",
     "InvoiceEmail",
     "InvoicePeppolTransmission",
@@ -210,6 +235,8 @@ __all__ = [
     "IntegrationCredential",
     "IntegrationEvent",
     "IntegrationExternalEventLink",
+    "IntegrationExternalRef",
+    "IntegrationSyncRecord",
     "WorkflowRule",
     "WorkflowTemplate",
     "WorkflowExecution",
@@ -91,31 +91,38 @@ class Activity(db.Model):
         )
         db.session.add(activity)
         try:
-            db.session.commit()
+            db.session.flush()
 
-            # Emit WebSocket event for real-time updates
+            # Queue webhooks for this activity in the same transaction (outbox)
             try:
-                from app import socketio
+                from app.utils.webhook_dispatcher import WebhookDispatcher
 
-                socketio.emit("activity_created", {"activity": activity.to_dict(), "user_id": user_id})
-            except Exception as socket_error:
-                # Don't let WebSocket errors break activity logging
+                WebhookDispatcher.on_activity_logged(activity, commit=False)
+            except Exception as webhook_error:
+                # Don't let webhook errors break activity logging
                 import logging
 
                 logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to emit activity WebSocket event: {socket_error}")
+                logger.warning(f"Failed to dispatch webhook for activity: {webhook_error}")
 
-            # Trigger webhooks for this activity
+            db.session.commit()
+
+            # Emit WebSocket event for real-time updates
             try:
-                from app.utils.webhook_dispatcher import WebhookDispatcher
+                from app import socketio
+                from app.utils.realtime import ACTIVITY_FEED_ROOM, user_room
 
-                WebhookDispatcher.on_activity_logged(activity)
-            except Exception as webhook_error:
-                # Don't let webhook errors break activity logging
+                socketio.emit(
+                    "activity_created",
+                    {"activity": activity.to_dict(), "user_id": user_id},
+                    room=[ACTIVITY_FEED_ROOM, user_room(user_id)],
+                )
+            except Exception as socket_error:
+                # Don't let WebSocket errors break activity logging
                 import logging
 
                 logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to dispatch webhook for activity: {webhook_error}")
+                logger.warning(f"Failed to emit activity WebSocket event: {socket_error}")
         except Exception as e:
             db.session.rollback()
             # Don't let activity logging break the main flow
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from datetime import datetime
 
@@ -5,6 +6,36 @@ from app import db
 from app.utils.timezone import now_in_app_timezone
 
 
+class AuditSnapshot(db.Model):
+    """Full entity state referenced by audit log rows
+
+    Snapshots are keyed by the SHA-256 of their JSON, so identical states (e.g.
+    the state after one update and before the next) are stored once.
+    """
+
+    __tablename__ = "audit_snapshots"
+
+    digest = db.Column(db.String(64), primary_key=True)
+    entity_type = db.Column(db.String(50), nullable=False)
+    state = db.Column(db.Text, nullable=False)  # JSON-encoded entity state
+    created_at = db.Column(db.DateTime, default=now_in_app_timezone, nullable=False)
+
+    def __repr__(self):
+        return f"<AuditSnapshot {self.entity_type} {self.digest[:12]}>"
+
+    @staticmethod
+    def encode(state):
+        """Return ``(digest, json)`` for a state dict"""
+        encoded = json.dumps(state, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest(), encoded
+
+    def get_state(self):
+        try:
+            return json.loads(self.state)
+        except (json.JSONDecodeError, TypeError):
+            return self.state
+
+
 class AuditLog(db.Model):
     """Audit log model for tracking detailed changes to entities
 
@@ -12,7 +43,8 @@ class AuditLog(db.Model):
     - Who made the change (user_id)
     - What entity was changed (entity_type, entity_id)
     - When the change occurred (created_at)
-    - What changed (field_name, old_value, new_value)
+    - What changed (changes: {field: {"old": ..., "new": ...}}; older rows use
+      one row per field with field_name, old_value, new_value)
     - Action type (created, updated, deleted)
     - Additional context (ip_address, user_agent, request_path)
     """
@@ -43,6 +75,9 @@ class AuditLog(db.Model):
     old_value = db.Column(db.Text, nullable=True)  # JSON-encoded old value
     new_value = db.Column(db.Text, nullable=True)  # JSON-encoded new value
 
+    # Field diff for the whole entity: {field: {"old": ..., "new": ...}}
+    changes = db.Column(db.JSON, nullable=True)
+
     # Human-readable change description
     change_description = db.Column(db.Text, nullable=True)
 
@@ -58,6 +93,10 @@ class AuditLog(db.Model):
     # Full entity state after change (JSON-encoded)
     full_new_state = db.Column(db.Text, nullable=True)
 
+    # Shared snapshots used instead of the inline states above
+    old_state_digest = db.Column(db.String(64), db.ForeignKey("audit_snapshots.digest"), nullable=True)
+    new_state_digest = db.Column(db.String(64), db.ForeignKey("audit_snapshots.digest"), nullable=True)
+
     # Additional context
     ip_address = db.Column(db.String(45), nullable=True)
     user_agent = db.Column(db.Text, nullable=True)
@@ -68,6 +107,8 @@ class AuditLog(db.Model):
 
     # Relationships
     user = db.relationship("User", backref="audit_logs")
+    old_snapshot = db.relationship("AuditSnapshot", foreign_keys=[old_state_digest])
+    new_snapshot = db.relationship("AuditSnapshot", foreign_keys=[new_state_digest])
 
     # Indexes for common queries
     __table_args__ = (
@@ -209,12 +250,24 @@ class AuditLog(db.Model):
             # If it's not valid JSON, return as string
             return value_str
 
+    def get_changes(self):
+        """Get the field diff as ``{field: {"old": ..., "new": ...}}`` (also for one-row-per-field logs)"""
+        if self.changes:
+            return self.changes
+        if self.field_name:
+            return {self.field_name: {"old": self.get_old_value(), "new": self.get_new_value()}}
+        return {}
+
     def get_old_value(self):
         """Get the decoded old value"""
+        if self.old_value is None and self.field_name and self.changes and self.field_name in self.changes:
+            return self.changes[self.field_name].get("old")
         return self._decode_value(self.old_value)
 
     def get_new_value(self):
         """Get the decoded new value"""
+        if self.new_value is None and self.field_name and self.changes and self.field_name in self.changes:
+            return self.changes[self.field_name].get("new")
         return self._decode_value(self.new_value)
 
     def get_entity_metadata(self):
@@ -227,10 +280,14 @@ class AuditLog(db.Model):
 
     def get_full_old_state(self):
         """Get the decoded full old state"""
+        if self.full_old_state is None and self.old_snapshot is not None:
+            return self.old_snapshot.get_state()
         return self._decode_value(self.full_old_state)
 
     def get_full_new_state(self):
         """Get the decoded full new state"""
+        if self.full_new_state is None and self.new_snapshot is not None:
+            return self.new_snapshot.get_state()
         return self._decode_value(self.full_new_state)
 
     @classmethod
@@ -278,6 +335,7 @@ class AuditLog(db.Model):
             "field_name": self.field_name,
             "old_value": self.get_old_value(),
             "new_value": self.get_new_value(),
+            "changes": self.get_changes(),
             "change_description": self.change_description,
             "reason": self.reason,
             "entity_metadata": self.get_entity_metadata(),
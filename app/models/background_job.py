@@ -0,0 +1,79 @@
+"""Persistent queue of long-running background jobs (imports, exports, restores).
+
+Rows are claimed by worker threads or ``flask job-worker`` processes with a
+conditional UPDATE that takes a lease (``locked_by`` / ``locked_until``); the
+worker extends the lease with heartbeats while the job runs. A job whose lease
+expires (worker died) is picked up again while attempts remain. See
+``app.utils.job_queue``.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class BackgroundJob(db.Model):
+    """A queued unit of work and its lease, retry and cancellation state"""
+
+    __tablename__ = "background_jobs"
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CANCELLED = "cancelled"
+    FINAL_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED)
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Record the job reports progress into ("data_import" / "data_export")
+    target_type = db.Column(db.String(30), nullable=True)
+    target_id = db.Column(db.Integer, nullable=True)
+
+    status = db.Column(db.String(20), default=STATUS_QUEUED, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=1, nullable=False)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False)
+
+    locked_by = db.Column(db.String(128), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    last_error = db.Column(db.Text, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_background_jobs_status_run_after", "status", "run_after"),
+        db.Index("ix_background_jobs_target", "target_type", "target_id"),
+    )
+
+    @property
+    def is_final(self):
+        return self.status in self.FINAL_STATUSES
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "cancel_requested": self.cancel_requested,
+            "target_type": self.target_type,
+            "target_id": self.target_id,
+            "last_error": self.last_error,
+            "result": self.result,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+        }
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} {self.job_type} {self.status}>"
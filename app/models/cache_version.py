@@ -0,0 +1,23 @@
+"""Version counters of in-process caches, shared by every worker.
+
+A process that changes data behind a cache increments the counter in the same
+transaction; other processes read it once per request and treat a changed
+value as "drop what you compiled" (see ``app.utils.access_cache``).
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class CacheVersion(db.Model):
+    """Named version counter of a cache"""
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
@@ -92,8 +92,12 @@ class DonationInteraction(db.Model):
 
     @staticmethod
     def get_user_engagement_metrics(user_id: int) -> dict:
-        """Get user engagement metrics for smart prompts"""
-        from app.models import TimeEntry, User
+        """Get user engagement metrics for smart prompts.
+
+        Entry count and total hours come from the incrementally maintained
+        ``user_time_stats`` rollup instead of aggregating the user's history.
+        """
+        from app.models import User, UserTimeStats
 
         user = User.query.get(user_id)
         if not user:
@@ -102,14 +106,10 @@ class DonationInteraction(db.Model):
         # Days since signup
         days_since_signup = (datetime.utcnow() - user.created_at).days if user.created_at else 0
 
-        # Time entries count
-        time_entries_count = TimeEntry.query.filter_by(user_id=user_id).count()
-
-        # Total hours
-        total_hours = user.total_hours if hasattr(user, "total_hours") else 0.0
+        stats = UserTimeStats.get_for_user(user_id)
 
         return {
             "days_since_signup": days_since_signup,
-            "time_entries_count": time_entries_count,
-            "total_hours": total_hours,
+            "time_entries_count": int(stats.entry_count or 0),
+            "total_hours": stats.total_hours,
         }
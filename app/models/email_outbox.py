@@ -0,0 +1,61 @@
+"""Persistent outbox of notification emails waiting to be sent.
+
+``send_email`` writes a row instead of starting a thread per message; the
+outbox worker (``app.utils.email_outbox``) claims due rows with a conditional
+UPDATE that takes a lease (``locked_by`` / ``locked_until``) and sends them in
+batches over one SMTP connection. Rows whose lease expired (worker died
+mid-batch) are claimed again, so queued emails survive restarts.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class EmailOutboxMessage(db.Model):
+    """A queued email and its delivery state"""
+
+    __tablename__ = "email_outbox"
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(998), nullable=False)
+    sender = db.Column(db.String(320), nullable=True)
+    recipients = db.Column(db.JSON, nullable=False)
+    body = db.Column(db.Text, nullable=True)
+    html = db.Column(db.Text, nullable=True)
+    # [{"filename", "content_type", "data" (base64)}]
+    attachments = db.Column(db.JSON, nullable=True)
+
+    status = db.Column(db.String(20), default=STATUS_PENDING, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(128), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (db.Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "subject": self.subject,
+            "recipients": self.recipients,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
+
+    def __repr__(self):
+        return f"<EmailOutboxMessage {self.id} {self.status}>"
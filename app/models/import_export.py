@@ -114,6 +114,28 @@ class DataImport(db.Model):
         self.error_log = json.dumps(errors)
         db.session.commit()
 
+    def add_errors(self, entries):
+        """Add several ``(error_message, record_data)`` pairs to the error log with one commit"""
+        import json
+
+        errors = []
+        if self.error_log:
+            try:
+                errors = json.loads(self.error_log)
+            except (json.JSONDecodeError, TypeError, ValueError) as e:
+                import logging
+
+                logging.getLogger(__name__).warning(f"Could not parse error_log: {e}")
+
+        timestamp = datetime.utcnow().isoformat()
+        for error_message, record_data in entries:
+            error_entry = {"error": error_message, "timestamp": timestamp}
+            if record_data:
+                error_entry["record"] = record_data
+            errors.append(error_entry)
+        self.error_log = json.dumps(errors)
+        db.session.commit()
+
     def set_summary(self, summary_dict):
         """Set import summary"""
         import json
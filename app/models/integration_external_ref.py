@@ -0,0 +1,31 @@
+"""Index of projects and tasks linked to an external system (Jira, GitHub, ...).
+
+The link itself is kept in ``custom_fields["integration"]`` of the project or
+task; this table mirrors it so connectors can find the local record for an
+external key with an index lookup (see ``app.utils.integration_refs``).
+"""
+
+from app import db
+
+
+class IntegrationExternalRef(db.Model):
+    """``(source, external_ref)`` of one project or task"""
+
+    __tablename__ = "integration_external_refs"
+
+    ENTITY_PROJECT = "project"
+    ENTITY_TASK = "task"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    source = db.Column(db.String(50), nullable=False)
+    external_ref = db.Column(db.String(255), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("entity_type", "entity_id", name="uq_integration_external_refs_entity"),
+        db.Index("ix_integration_external_refs_lookup", "entity_type", "external_ref", "source"),
+    )
+
+    def __repr__(self):
+        return f"<IntegrationExternalRef {self.source}:{self.external_ref} -> {self.entity_type}:{self.entity_id}>"
@@ -0,0 +1,35 @@
+"""Content hash of each record an integration has synced (incremental sync state).
+
+``BaseConnector.run_incremental_sync`` compares the hash of a record returned
+by the provider with the stored one and skips the record when nothing in it
+changed (see ``app.utils.integration_sync_state``).
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class IntegrationSyncRecord(db.Model):
+    """Last synced content of one external record of an integration"""
+
+    __tablename__ = "integration_sync_records"
+
+    id = db.Column(db.Integer, primary_key=True)
+    integration_id = db.Column(
+        db.Integer, db.ForeignKey("integrations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    resource = db.Column(db.String(255), nullable=False)
+    external_id = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    source_updated_at = db.Column(db.DateTime, nullable=True)
+    synced_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "integration_id", "resource", "external_id", name="uq_integration_sync_records_integration_record"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<IntegrationSyncRecord {self.integration_id}:{self.resource}:{self.external_id}>"
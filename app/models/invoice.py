@@ -307,7 +307,7 @@ class InvoiceItem(db.Model):
     unit_price = db.Column(db.Numeric(10, 2), nullable=False)  # Hourly rate
     total_amount = db.Column(db.Numeric(10, 2), nullable=False)
 
-    # Time entry reference (optional)
+    # Time entry reference (optional); mirrored into invoice_item_time_entries on flush
     time_entry_ids = db.Column(db.String(500), nullable=True)  # Comma-separated IDs
 
     # Inventory integration
@@ -341,20 +341,19 @@ class InvoiceItem(db.Model):
     @property
     def task_name_from_time_entries(self):
         """Task name from first linked time entry, or None for project-level groups."""
-        if not self.time_entry_ids:
-            return None
-        first_id = self.time_entry_ids.split(",")[0].strip()
-        if not first_id:
-            return None
-        try:
-            from app.models import TimeEntry
+        from app.utils.invoice_time_entry_links import parse_time_entry_ids
 
-            entry = TimeEntry.query.get(int(first_id))
-            if entry and entry.task:
-                return entry.task.name
-            return None
-        except (ValueError, TypeError):
+        entry_ids = parse_time_entry_ids(self.time_entry_ids)
+        if not entry_ids:
             return None
+        from app.models import Task, TimeEntry
+
+        return (
+            db.session.query(Task.name)
+            .join(TimeEntry, TimeEntry.task_id == Task.id)
+            .filter(TimeEntry.id == entry_ids[0])
+            .scalar()
+        )
 
     def to_dict(self):
         """Convert invoice item to dictionary"""
@@ -371,3 +370,17 @@ class InvoiceItem(db.Model):
             "is_stock_item": self.is_stock_item,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class InvoiceItemTimeEntry(db.Model):
+    """Time entry billed on an invoice line (indexed mirror of ``InvoiceItem.time_entry_ids``)"""
+
+    __tablename__ = "invoice_item_time_entries"
+
+    invoice_item_id = db.Column(db.Integer, db.ForeignKey("invoice_items.id", ondelete="CASCADE"), primary_key=True)
+    time_entry_id = db.Column(db.Integer, db.ForeignKey("time_entries.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (db.Index("ix_invoice_item_time_entries_time_entry_id", "time_entry_id"),)
+
+    def __repr__(self):
+        return f"<InvoiceItemTimeEntry item={self.invoice_item_id} entry={self.time_entry_id}>"
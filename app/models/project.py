@@ -34,6 +34,11 @@ class Project(db.Model):
     archived_reason = db.Column(db.Text, nullable=True)
     # Gantt chart bar color (hex e.g. #3b82f6)
     color = db.Column(db.String(7), nullable=True)
+    # Stored totals, maintained on TimeEntry/ProjectCost flushes (see app.utils.tracked_totals)
+    tracked_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    billable_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    costs_total = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default="0")
+    billable_costs_total = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default="0")
 
     # Relationships
     time_entries = db.relationship("TimeEntry", backref="project", lazy="dynamic", cascade="all, delete-orphan")
@@ -142,29 +147,13 @@ class Project(db.Model):
 
     @property
     def total_hours(self):
-        """Calculate total hours spent on this project"""
-        from .time_entry import TimeEntry
-
-        total_seconds = (
-            db.session.query(db.func.sum(TimeEntry.duration_seconds))
-            .filter(TimeEntry.project_id == self.id, TimeEntry.end_time.isnot(None))
-            .scalar()
-            or 0
-        )
-        return round(total_seconds / 3600, 2)
+        """Total hours of completed time entries on this project"""
+        return round((self.tracked_seconds or 0) / 3600, 2)
 
     @property
     def total_billable_hours(self):
-        """Calculate total billable hours spent on this project"""
-        from .time_entry import TimeEntry
-
-        total_seconds = (
-            db.session.query(db.func.sum(TimeEntry.duration_seconds))
-            .filter(TimeEntry.project_id == self.id, TimeEntry.end_time.isnot(None), TimeEntry.billable == True)
-            .scalar()
-            or 0
-        )
-        return round(total_seconds / 3600, 2)
+        """Total billable hours of completed time entries on this project"""
+        return round((self.billable_seconds or 0) / 3600, 2)
 
     @property
     def estimated_cost(self):
@@ -175,26 +164,13 @@ class Project(db.Model):
 
     @property
     def total_costs(self):
-        """Calculate total project costs (expenses)"""
-        from .project_cost import ProjectCost
-
-        total = (
-            db.session.query(db.func.sum(ProjectCost.amount)).filter(ProjectCost.project_id == self.id).scalar() or 0
-        )
-        return float(total)
+        """Total project costs (expenses)"""
+        return float(self.costs_total or 0)
 
     @property
     def total_billable_costs(self):
-        """Calculate total billable project costs"""
-        from .project_cost import ProjectCost
-
-        total = (
-            db.session.query(db.func.sum(ProjectCost.amount))
-            .filter(ProjectCost.project_id == self.id, ProjectCost.billable == True)
-            .scalar()
-            or 0
-        )
-        return float(total)
+        """Total billable project costs"""
+        return float(self.billable_costs_total or 0)
 
     @property
     def total_project_value(self):
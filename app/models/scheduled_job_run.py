@@ -0,0 +1,49 @@
+"""Run history of scheduled background jobs.
+
+One row per execution of a job registered by ``register_scheduled_tasks``,
+written by the leader process (see ``app.utils.scheduler_leader``). The last
+run of each job is also what missed-run catch-up compares against after a
+failover.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class ScheduledJobRun(db.Model):
+    """A single execution of a scheduled job"""
+
+    __tablename__ = "scheduled_job_runs"
+
+    STATUS_RUNNING = "running"
+    STATUS_SUCCESS = "success"
+    STATUS_ERROR = "error"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(100), nullable=False)
+    owner = db.Column(db.String(128), nullable=False)
+    catch_up = db.Column(db.Boolean, default=False, nullable=False)
+    status = db.Column(db.String(20), default=STATUS_RUNNING, nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (db.Index("ix_scheduled_job_runs_job_started", "job_id", "started_at"),)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job_id": self.job_id,
+            "owner": self.owner,
+            "catch_up": self.catch_up,
+            "status": self.status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        return f"<ScheduledJobRun {self.job_id} {self.status} at {self.started_at}>"
@@ -0,0 +1,26 @@
+"""Lease row that elects the process allowed to run scheduled jobs.
+
+Every web process starts the APScheduler instance, but jobs only execute in
+the process that holds the ``scheduler`` lease (see
+``app.utils.scheduler_leader``). The holder renews ``expires_at`` on a short
+interval; when it stops renewing, another process takes the lease over once
+it has expired.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class SchedulerLease(db.Model):
+    """Named lease held by one process until ``expires_at``"""
+
+    __tablename__ = "scheduler_leases"
+
+    name = db.Column(db.String(64), primary_key=True)
+    owner = db.Column(db.String(128), nullable=False)
+    acquired_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<SchedulerLease {self.name} owner={self.owner} expires_at={self.expires_at}>"
@@ -0,0 +1,56 @@
+"""Change log behind the ``/api/v1/sync`` delta feed.
+
+One row per created, updated or deleted time entry, project or task, written
+in the same transaction as the change itself (see ``app.utils.sync_changes``).
+The feed is ordered by ``(commit_seq, id)``: ``commit_seq`` is drawn from
+``SyncChangeSequence`` while the transaction commits, so a transaction that
+flushed earlier but committed later still sorts after everything a client has
+already read. Rows without a ``commit_seq`` have not been committed yet.
+``user_id`` and ``project_id`` carry the scope of the record at the time of the
+change so the feed can be filtered by the caller's access without loading the
+records themselves.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class SyncChange(db.Model):
+    """A single create/update/delete of a synced record"""
+
+    __tablename__ = "sync_changes"
+
+    OP_UPSERT = "upsert"
+    OP_DELETE = "delete"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    project_id = db.Column(db.Integer, nullable=True)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    commit_seq = db.Column(db.BigInteger, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_sync_changes_commit_seq", "commit_seq", "id"),
+        db.Index("ix_sync_changes_type_id", "entity_type", "id"),
+        db.Index("ix_sync_changes_user_id", "user_id", "id"),
+        db.Index("ix_sync_changes_project_id", "project_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<SyncChange {self.id} {self.op} {self.entity_type}:{self.entity_id}>"
+
+
+class SyncChangeSequence(db.Model):
+    """Single-row counter handing out ``SyncChange.commit_seq`` in commit order"""
+
+    __tablename__ = "sync_change_sequence"
+
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<SyncChangeSequence {self.value}>"
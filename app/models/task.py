@@ -35,6 +35,9 @@ class Task(db.Model):
     # integrations (e.g. "github_issue_42"). Indexed so connectors can
     # cheaply de-duplicate when syncing.
     external_ref = db.Column(db.String(200), nullable=True, index=True)
+    # Seconds of completed time entries, maintained on TimeEntry flushes (see app.utils.tracked_totals)
+    tracked_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    billable_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
 
     # Relationships
     # project relationship is defined via backref in Project model
@@ -104,40 +107,13 @@ class Task(db.Model):
 
     @property
     def total_hours(self):
-        """Calculate total hours spent on this task"""
-        # Use cached value if available (set by TaskService.list_tasks for performance)
-        if hasattr(self, "_cached_total_hours"):
-            return self._cached_total_hours
-
-        try:
-            from .time_entry import TimeEntry
-
-            total_seconds = (
-                db.session.query(db.func.sum(TimeEntry.duration_seconds))
-                .filter(TimeEntry.task_id == self.id, TimeEntry.end_time.isnot(None))
-                .scalar()
-                or 0
-            )
-
-            return round(total_seconds / 3600, 2)
-        except Exception:
-            return 0.0
+        """Total hours of completed time entries on this task"""
+        return round((self.tracked_seconds or 0) / 3600, 2)
 
     @property
     def total_billable_hours(self):
-        """Calculate total billable hours spent on this task"""
-        try:
-            from .time_entry import TimeEntry
-
-            total_seconds = (
-                db.session.query(db.func.sum(TimeEntry.duration_seconds))
-                .filter(TimeEntry.task_id == self.id, TimeEntry.end_time.isnot(None), TimeEntry.billable == True)
-                .scalar()
-                or 0
-            )
-            return round(total_seconds / 3600, 2)
-        except Exception:
-            return 0.0
+        """Total billable hours of completed time entries on this task"""
+        return round((self.billable_seconds or 0) / 3600, 2)
 
     @property
     def progress_percentage(self):
@@ -41,7 +41,8 @@ class ChatChannel(db.Model):
     def __repr__(self):
         return f"<ChatChannel {self.name} ({self.channel_type})>"
 
-    def to_dict(self):
+    def to_dict(self, message_count=None, member_count=None):
+        """Serialize the channel; pass precomputed counts to avoid two COUNT queries per channel"""
         return {
             "id": self.id,
             "name": self.name,
@@ -51,8 +52,8 @@ class ChatChannel(db.Model):
             "project_id": self.project_id,
             "is_archived": self.is_archived,
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "message_count": self.messages.count(),
-            "member_count": self.members.count(),
+            "message_count": self.messages.count() if message_count is None else message_count,
+            "member_count": self.members.count() if member_count is None else member_count,
         }
 
 
@@ -75,6 +76,8 @@ class ChatChannelMember(db.Model):
     # Metadata
     joined_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_read_at = db.Column(db.DateTime, nullable=True)
+    # Read watermark: every message up to this id counts as read by this member
+    last_read_message_id = db.Column(db.Integer, nullable=True)
 
     # Relationships
     user = db.relationship("User", backref=db.backref("chat_channel_memberships", lazy="dynamic"))
@@ -87,6 +90,52 @@ class ChatChannelMember(db.Model):
     def __repr__(self):
         return f"<ChatChannelMember channel={self.channel_id} user={self.user_id}>"
 
+    @classmethod
+    def mark_read(cls, channel_id, user_id, message_id):
+        """Advance a member's read watermark to ``message_id`` (never moves it back).
+
+        Returns True if the watermark moved.
+        """
+        if not message_id:
+            return False
+        result = db.session.execute(
+            db.update(cls)
+            .where(
+                cls.channel_id == channel_id,
+                cls.user_id == user_id,
+                db.or_(cls.last_read_message_id.is_(None), cls.last_read_message_id < message_id),
+            )
+            .values(last_read_message_id=message_id, last_read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return bool(result.rowcount)
+
+    @classmethod
+    def unread_counts(cls, user_id, channel_ids=None):
+        """Return ``{channel_id: unread}`` for the user's channels in one query.
+
+        Unread messages are the other members' non-deleted messages above the
+        watermark: a range count on ``(channel_id, id)`` that does not grow with
+        channel history.
+        """
+        query = (
+            db.session.query(cls.channel_id, db.func.count(ChatMessage.id))
+            .outerjoin(
+                ChatMessage,
+                db.and_(
+                    ChatMessage.channel_id == cls.channel_id,
+                    ChatMessage.id > db.func.coalesce(cls.last_read_message_id, 0),
+                    ChatMessage.is_deleted.is_(False),
+                    ChatMessage.user_id != cls.user_id,
+                ),
+            )
+            .filter(cls.user_id == user_id)
+            .group_by(cls.channel_id)
+        )
+        if channel_ids is not None:
+            query = query.filter(cls.channel_id.in_(channel_ids))
+        return {channel_id: count for channel_id, count in query.all()}
+
 
 class ChatMessage(db.Model):
     """Individual chat message"""
@@ -128,7 +177,10 @@ class ChatMessage(db.Model):
     user = db.relationship("User", backref=db.backref("chat_messages", lazy="dynamic"))
     reply_to = db.relationship("ChatMessage", remote_side=[id], backref=db.backref("replies", lazy="dynamic"))
 
-    __table_args__ = (Index("ix_chat_messages_channel_created", "channel_id", "created_at"),)
+    __table_args__ = (
+        Index("ix_chat_messages_channel_created", "channel_id", "created_at"),
+        Index("ix_chat_messages_channel_id_id", "channel_id", "id"),
+    )
 
     def __repr__(self):
         return f"<ChatMessage {self.id} in channel {self.channel_id}>"
@@ -173,7 +225,11 @@ class ChatMessage(db.Model):
 
 
 class ChatReadReceipt(db.Model):
-    """Track read receipts for messages"""
+    """Legacy per-message read receipts.
+
+    No longer written: reads are tracked by ``ChatChannelMember.last_read_message_id``
+    and migration 180 collapsed the existing receipts into it.
+    """
 
     __tablename__ = "chat_read_receipts"
 
@@ -0,0 +1,43 @@
+"""Materialized per-day totals of completed time entries.
+
+One row per (day, user, project, task, client, billable) combination holding
+the tracked seconds and number of completed entries that started on that day
+(application timezone, the same naive convention as ``TimeEntry.start_time``).
+Missing project/task/client are stored as ``0`` so the key can be a primary
+key. Rows are maintained incrementally from ``TimeEntry`` flushes; see
+``app.utils.time_daily_rollup``.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class TimeDailyRollup(db.Model):
+    """Daily time totals per user/project/task/client/billable"""
+
+    __tablename__ = "time_daily_rollup"
+
+    day = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    project_id = db.Column(db.Integer, primary_key=True, default=0)
+    task_id = db.Column(db.Integer, primary_key=True, default=0)
+    client_id = db.Column(db.Integer, primary_key=True, default=0)
+    billable = db.Column(db.Boolean, primary_key=True, default=True)
+    total_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    entry_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_time_daily_rollup_user_day", "user_id", "day"),
+        db.Index("ix_time_daily_rollup_project_day", "project_id", "day"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<TimeDailyRollup {self.day} user={self.user_id} project={self.project_id} seconds={self.total_seconds}>"
+        )
+
+    @property
+    def total_hours(self):
+        return round((self.total_seconds or 0) / 3600, 2)
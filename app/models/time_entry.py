@@ -14,6 +14,23 @@ def local_now():
     return now.replace(tzinfo=None)
 
 
+def _whole_day_bounds(start_date, end_date):
+    """``(first_day, last_day)`` if the period covers whole days, else None.
+
+    ``start_date`` must be a date or a midnight datetime; ``end_date`` must be
+    empty or the last moment (23:59:59) of a day, matching ``start_time <= end_date``.
+    """
+    if isinstance(start_date, datetime):
+        if start_date.time() != datetime.min.time():
+            return None
+        start_date = start_date.date()
+    if end_date is not None:
+        if not isinstance(end_date, datetime) or end_date.time() < datetime.max.time().replace(microsecond=0):
+            return None
+        end_date = end_date.date()
+    return start_date, end_date
+
+
 class TimeEntry(db.Model):
     """Time entry model for manual and automatic time tracking"""
 
@@ -38,6 +55,17 @@ class TimeEntry(db.Model):
     created_at = db.Column(db.DateTime, default=local_now, nullable=False)
     updated_at = db.Column(db.DateTime, default=local_now, onupdate=local_now, nullable=False)
 
+    __table_args__ = (
+        # Invoicing candidates; "unbilled" is an anti-join on invoice_item_time_entries
+        db.Index(
+            "ix_time_entries_billable_completed",
+            "project_id",
+            "start_time",
+            postgresql_where=db.text("billable = true AND end_time IS NOT NULL"),
+            sqlite_where=db.text("billable = 1 AND end_time IS NOT NULL"),
+        ),
+    )
+
     # Relationships
     # user and project relationships are defined via backref in their respective models
     # client relationship is defined via backref in Client model
@@ -221,21 +249,23 @@ class TimeEntry(db.Model):
         break_sec = self.break_seconds or 0
         raw_seconds = max(0, raw_seconds - break_sec)
 
-        # Apply per-user rounding if user preferences are set
-        if self.user and hasattr(self.user, "time_rounding_enabled"):
-            from app.utils.time_rounding import apply_user_rounding
-
-            self.duration_seconds = apply_user_rounding(raw_seconds, self.user)
+        # Apply per-user rounding if user preferences are set. Loading the user must not
+        # autoflush end_time on its own, or one stop is written (and audited) in two flushes.
+        with db.session.no_autoflush:
+            if self.user and hasattr(self.user, "time_rounding_enabled"):
+                from app.utils.time_rounding import apply_user_rounding
+
+                self.duration_seconds = apply_user_rounding(raw_seconds, self.user)
+                return
+        # Fallback to global rounding setting for backward compatibility
+        rounding_minutes = Config.ROUNDING_MINUTES
+        if rounding_minutes > 1:
+            # Round to nearest interval
+            minutes = raw_seconds / 60
+            rounded_minutes = round(minutes / rounding_minutes) * rounding_minutes
+            self.duration_seconds = int(rounded_minutes * 60)
         else:
-            # Fallback to global rounding setting for backward compatibility
-            rounding_minutes = Config.ROUNDING_MINUTES
-            if rounding_minutes > 1:
-                # Round to nearest interval
-                minutes = raw_seconds / 60
-                rounded_minutes = round(minutes / rounding_minutes) * rounding_minutes
-                self.duration_seconds = int(rounded_minutes * 60)
-            else:
-                self.duration_seconds = raw_seconds
+            self.duration_seconds = raw_seconds
 
     def stop_timer(self, end_time=None):
         """Stop an active timer"""
@@ -374,7 +404,26 @@ class TimeEntry(db.Model):
     def get_total_hours_for_period(
         cls, start_date=None, end_date=None, user_id=None, project_id=None, client_id=None, billable_only=False
     ):
-        """Calculate total hours for a period with optional filters"""
+        """Calculate total hours for a period with optional filters.
+
+        Whole-day periods (``start_date`` a date or midnight, ``end_date`` empty
+        or the last moment of a day) are answered from the daily rollup when
+        ``TIME_ROLLUP_ENABLED`` is on.
+        """
+        from app.utils import time_daily_rollup
+
+        days = _whole_day_bounds(start_date, end_date)
+        if days is not None and time_daily_rollup.time_rollup_enabled():
+            total_seconds = time_daily_rollup.total_seconds(
+                start_day=days[0],
+                end_day=days[1],
+                user_id=user_id,
+                project_id=project_id,
+                client_id=client_id,
+                billable_only=billable_only,
+            )
+            return round(total_seconds / 3600, 2)
+
         query = db.session.query(db.func.sum(cls.duration_seconds))
 
         if start_date:
@@ -397,3 +446,22 @@ class TimeEntry(db.Model):
 
         total_seconds = query.scalar() or 0
         return round(total_seconds / 3600, 2)
+
+    @classmethod
+    def get_hours_by_project_for_period(cls, start_date=None, user_id=None):
+        """Total hours per project id for entries starting on/after ``start_date`` (one grouped query)"""
+        from app.utils import time_daily_rollup
+
+        days = _whole_day_bounds(start_date, None)
+        if days is not None and time_daily_rollup.time_rollup_enabled():
+            by_project = time_daily_rollup.seconds_by_project(start_day=days[0], user_id=user_id)
+        else:
+            query = db.session.query(cls.project_id, db.func.sum(cls.duration_seconds)).filter(
+                cls.project_id.isnot(None)
+            )
+            if start_date:
+                query = query.filter(cls.start_time >= start_date)
+            if user_id:
+                query = query.filter(cls.user_id == user_id)
+            by_project = dict(query.group_by(cls.project_id).all())
+        return {project_id: round((seconds or 0) / 3600, 2) for project_id, seconds in by_project.items()}
@@ -469,34 +469,9 @@ class User(UserMixin, db.Model):
     # Permission and role helpers
     def has_permission(self, permission_name):
         """Check if user has a specific permission through any of their roles"""
-        # Legacy admin bypass: a user with role="admin" and no explicit
-        # roles assigned should have all permissions for backward
-        # compatibility. Check this BEFORE _auto_assign_role_from_legacy
-        # — that helper appends a Role row to self.roles as a side effect,
-        # and an empty seeded "admin" role would otherwise mask the
-        # bypass and leave the user with no effective permissions.
-        if self.role == "admin" and not self.roles:
-            return True
-
-        # Auto-assign role from legacy role field if user has no roles assigned
-        if not self.roles and self.role:
-            self._auto_assign_role_from_legacy()
-
-        # Check if any of the user's roles have this permission
-        for role in self.roles:
-            if role.has_permission(permission_name):
-                return True
-
-        # Fallback: Check legacy role field if no roles assigned
-        # This handles cases where role assignment failed or user is in transition
-        if not self.roles and self.role:
-            from app.models import Role
+        from app.utils.access_cache import permissions_for
 
-            legacy_role = Role.query.filter_by(name=self.role).first()
-            if legacy_role and legacy_role.has_permission(permission_name):
-                return True
-
-        return False
+        return permission_name in permissions_for(self)
 
     def _auto_assign_role_from_legacy(self):
         """Auto-assign role from legacy role field if user has no roles assigned"""
@@ -515,11 +490,17 @@ class User(UserMixin, db.Model):
 
     def has_any_permission(self, *permission_names):
         """Check if user has any of the specified permissions"""
-        return any(self.has_permission(perm) for perm in permission_names)
+        from app.utils.access_cache import permissions_for
+
+        permissions = permissions_for(self)
+        return any(perm in permissions for perm in permission_names)
 
     def has_all_permissions(self, *permission_names):
         """Check if user has all of the specified permissions"""
-        return all(self.has_permission(perm) for perm in permission_names)
+        from app.utils.access_cache import permissions_for
+
+        permissions = permissions_for(self)
+        return all(perm in permissions for perm in permission_names)
 
     def add_role(self, role):
         """Add a role to this user"""
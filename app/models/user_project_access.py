@@ -0,0 +1,35 @@
+"""Materialized user → project access.
+
+One row per (user, project) pair holding why the user can reach the project:
+the number of their time entries on it, the number of its tasks assigned to
+them, and whether the project belongs to one of their ``user_clients``. Rows
+are maintained incrementally from flushes (see
+``app.utils.user_project_access``) so access checks and "my projects" lists
+select from a primary-key range instead of running ``DISTINCT`` over
+``time_entries`` and ``tasks`` on every request.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class UserProjectAccess(db.Model):
+    """Why a user can reach a project (entries, assigned tasks, assigned client)"""
+
+    __tablename__ = "user_project_access"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    entry_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    task_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    via_client = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (db.Index("ix_user_project_access_project_id", "project_id"),)
+
+    def __repr__(self):
+        return (
+            f"<UserProjectAccess user_id={self.user_id} project_id={self.project_id} "
+            f"entries={self.entry_count} tasks={self.task_count} via_client={self.via_client}>"
+        )
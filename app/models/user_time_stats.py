@@ -0,0 +1,47 @@
+"""Per-user rollup of time-entry totals.
+
+One row per user holding the entry count, the tracked seconds of completed
+entries and the start of the latest entry. Rows are maintained incrementally
+from ``TimeEntry`` flushes (see ``app.utils.user_time_stats``) so the layout
+support UI does not aggregate a user's whole history on every page view.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class UserTimeStats(db.Model):
+    """Incrementally maintained time-entry totals for one user"""
+
+    __tablename__ = "user_time_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entry_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    total_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    last_entry_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<UserTimeStats user_id={self.user_id} entries={self.entry_count}>"
+
+    @property
+    def total_hours(self):
+        return round((self.total_seconds or 0) / 3600, 2)
+
+    @classmethod
+    def get_for_user(cls, user_id):
+        """Return the stats row for ``user_id``.
+
+        Users without a row yet (no entries since the table was backfilled) get
+        an unsaved instance computed from ``time_entries``; the row itself is
+        created by the next flush that touches one of their entries.
+        """
+        stats = db.session.get(cls, user_id)
+        if stats is not None:
+            return stats
+
+        from app.utils.user_time_stats import aggregate_user_time_stats
+
+        count, seconds, last = aggregate_user_time_stats(db.session.connection(), user_id)
+        return cls(user_id=user_id, entry_count=count, total_seconds=seconds, last_entry_at=last)
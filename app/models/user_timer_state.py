@@ -0,0 +1,24 @@
+"""Per-user version of the running-timer state.
+
+``version`` is incremented whenever one of the user's active timers is
+started, stopped, paused, resumed or edited (see ``app.utils.timer_state``).
+Timer status endpoints use it as an ETag so polling clients get ``304 Not
+Modified`` without the active entry being resolved.
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class UserTimerState(db.Model):
+    """Timer-state version counter for one user"""
+
+    __tablename__ = "user_timer_states"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<UserTimerState user_id={self.user_id} version={self.version}>"
@@ -221,14 +221,16 @@ class TimeEntryRepository(BaseRepository[TimeEntry]):
 
     def get_distinct_project_ids_for_user(self, user_id: int) -> List[int]:
         """Return distinct project IDs the user has time entries for (excludes None)."""
-        rows = (
-            self.model.query.with_entities(TimeEntry.project_id)
-            .filter_by(user_id=user_id)
-            .filter(TimeEntry.project_id.isnot(None))
-            .distinct()
-            .all()
-        )
-        return [r[0] for r in rows]
+        return list(db.session.execute(self.get_project_ids_select_for_user(user_id)).scalars())
+
+    def get_project_ids_select_for_user(self, user_id: int):
+        """SELECT of the project IDs the user has time entries for, for ``Column.in_()`` filters.
+
+        Reads the materialized ``user_project_access`` table instead of scanning ``time_entries``.
+        """
+        from app.utils.user_project_access import project_ids_select
+
+        return project_ids_select(user_id, entries=True)
 
     def get_total_duration(
         self,
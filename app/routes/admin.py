@@ -49,6 +49,7 @@ from app.utils.permissions import admin_or_permission_required
 from app.utils.safe_template_render import render_sandboxed_string
 from app.utils.telemetry import get_telemetry_fingerprint, is_telemetry_enabled
 from app.utils.timezone import get_available_timezones
+from app.utils.user_project_access import rebuild_user_project_access
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -1026,6 +1027,8 @@ def edit_user(user_id):
         # Subcontractor: sync assigned clients (only when role is subcontractor)
         assigned_client_ids = [int(x) for x in request.form.getlist("assigned_client_ids") if x and x.isdigit()]
         UserClient.query.filter_by(user_id=user.id).delete()
+        # The bulk delete bypasses the flush hooks; the clients added below are picked up on flush
+        rebuild_user_project_access([user.id])
         if role_name == "subcontractor" and assigned_client_ids:
             valid_client_ids = {c.id for c in Client.query.filter(Client.id.in_(assigned_client_ids)).all()}
             for cid in assigned_client_ids:
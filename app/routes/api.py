@@ -7,6 +7,7 @@ from datetime import datetime, time, timedelta
 from flask import Blueprint, current_app, jsonify, make_response, request, send_from_directory, session
 from flask_babel import gettext as _
 from flask_login import current_user, login_required
+from flask_socketio import join_room, leave_room
 from sqlalchemy import func, or_
 from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.utils import secure_filename
@@ -31,7 +32,9 @@ from app.services.llm_service import AIServiceError, LLMService
 from app.services.time_tracking_service import TimeTrackingService
 from app.utils.api_deprecation import deprecated_session_api
 from app.utils.db import safe_commit
+from app.utils.realtime import ACTIVITY_FEED_ROOM, client_portal_room, project_board_room, user_room
 from app.utils.scope_filter import apply_client_scope, apply_project_scope, user_can_access_project
+from app.utils.timer_state import timer_status_response
 from app.utils.timezone import convert_app_datetime_to_user, parse_local_datetime, utc_to_local
 
 api_bp = Blueprint("api", __name__)
@@ -316,13 +319,14 @@ def api_version_dismiss():
 @deprecated_session_api("/api/v1/timer/status")
 def timer_status():
     """Get current timer status"""
-    active_timer = current_user.active_timer
 
-    if not active_timer:
-        return jsonify({"active": False, "timer": None})
+    def build():
+        active_timer = current_user.active_timer
 
-    return jsonify(
-        {
+        if not active_timer:
+            return {"active": False, "timer": None}
+
+        return {
             "active": True,
             "timer": {
                 "id": active_timer.id,
@@ -334,7 +338,8 @@ def timer_status():
                 "duration_formatted": active_timer.duration_formatted,
             },
         }
-    )
+
+    return timer_status_response(current_user.id, build)
 
 
 @api_bp.route("/api/tags")
@@ -512,6 +517,7 @@ def api_start_timer():
             "task_id": tid,
             "start_time": new_timer.start_time.isoformat(),
         },
+        room=user_room(current_user.id),
     )
 
     try:
@@ -551,6 +557,7 @@ def api_stop_timer():
     socketio.emit(
         "timer_stopped",
         {"user_id": current_user.id, "timer_id": entry.id, "duration": entry.duration_formatted},
+        room=user_room(current_user.id),
     )
 
     try:
@@ -610,6 +617,7 @@ def api_stop_timer_at():
     socketio.emit(
         "timer_stopped",
         {"user_id": current_user.id, "timer_id": active_timer.id, "duration": active_timer.duration_formatted},
+        room=user_room(current_user.id),
     )
 
     return jsonify({"success": True, "duration": active_timer.duration_formatted})
@@ -673,6 +681,7 @@ def api_resume_timer():
             "task_id": task_id,
             "start_time": new_timer.start_time.isoformat(),
         },
+        room=user_room(current_user.id),
     )
 
     return jsonify({"success": True, "timer_id": new_timer.id})
@@ -1480,23 +1489,18 @@ def calendar_export():
     if project_id:
         q = q.filter(TimeEntry.project_id == project_id)
 
-    items = q.order_by(TimeEntry.start_time.asc()).all()
+    q = q.order_by(TimeEntry.start_time.asc())
 
     if format_type == "csv":
-        import csv
-        from io import StringIO
+        from app.utils.streaming_export import csv_response, iter_time_entry_export_rows, stream_csv
 
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            ["Date", "Start Time", "End Time", "Project", "Task", "Duration (hours)", "Notes", "Tags", "Billable"]
-        )
+        header = ["Date", "Start Time", "End Time", "Project", "Task", "Duration (hours)", "Notes", "Tags", "Billable"]
 
-        for entry in items:
-            start_local = convert_app_datetime_to_user(entry.start_time, user=current_user)
-            end_local = convert_app_datetime_to_user(entry.end_time, user=current_user) if entry.end_time else None
-            writer.writerow(
-                [
+        def rows():
+            for entry in iter_time_entry_export_rows(q):
+                start_local = convert_app_datetime_to_user(entry.start_time, user=current_user)
+                end_local = convert_app_datetime_to_user(entry.end_time, user=current_user) if entry.end_time else None
+                yield [
                     start_local.strftime("%Y-%m-%d") if start_local else "",
                     start_local.strftime("%H:%M") if start_local else "",
                     end_local.strftime("%H:%M") if end_local else "Active",
@@ -1507,16 +1511,12 @@ def calendar_export():
                     entry.tags or "",
                     "Yes" if entry.billable else "No",
                 ]
-            )
 
-        response = make_response(output.getvalue())
-        response.headers["Content-Type"] = "text/csv"
-        response.headers["Content-Disposition"] = (
-            f'attachment; filename=calendar_export_{start_dt.strftime("%Y%m%d")}_to_{end_dt.strftime("%Y%m%d")}.csv'
-        )
-        return response
+        filename = f'calendar_export_{start_dt.strftime("%Y%m%d")}_to_{end_dt.strftime("%Y%m%d")}.csv'
+        return csv_response(stream_csv(header, rows()), filename)
 
     elif format_type == "ical":
+        items = q.all()
         # Generate iCal format
         ical_lines = [
             "BEGIN:VCALENDAR",
@@ -2559,32 +2559,78 @@ def save_user_theme():
 # WebSocket event handlers
 @socketio.on("connect")
 def handle_connect():
-    """Handle WebSocket connection"""
-    print(f"Client connected: {request.sid}")
+    """Handle WebSocket connection: put the socket in its user's room (and client portal room)"""
+    if current_user.is_authenticated:
+        join_room(user_room(current_user.id))
+    client_id = _get_client_id_from_session()
+    if client_id is not None:
+        join_room(client_portal_room(client_id))
+    current_app.logger.debug("Socket connected: %s", request.sid)
 
 
 @socketio.on("disconnect")
 def handle_disconnect():
-    """Handle WebSocket disconnection"""
-    print(f"Client disconnected: {request.sid}")
+    """Handle WebSocket disconnection (rooms are left automatically)"""
+    current_app.logger.debug("Socket disconnected: %s", request.sid)
 
 
 @socketio.on("join_user_room")
 def handle_join_user_room(data):
     """Join user-specific room for real-time updates"""
-    user_id = data.get("user_id")
+    user_id = (data or {}).get("user_id")
     if user_id and current_user.is_authenticated and current_user.id == user_id:
-        socketio.join_room(f"user_{user_id}")
-        print(f"User {user_id} joined room")
+        join_room(user_room(user_id))
 
 
 @socketio.on("leave_user_room")
 def handle_leave_user_room(data):
     """Leave user-specific room"""
-    user_id = data.get("user_id")
+    user_id = (data or {}).get("user_id")
     if user_id:
-        socketio.leave_room(f"user_{user_id}")
-        print(f"User {user_id} left room")
+        leave_room(user_room(user_id))
+
+
+def _board_room_for(data):
+    """Room of the Kanban board in ``data`` if the current user may see it, else None"""
+    if not current_user.is_authenticated:
+        return None
+    project_id = (data or {}).get("project_id")
+    if project_id:
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            return None
+        if not user_can_access_project(current_user, project_id):
+            return None
+    return project_board_room(project_id or None)
+
+
+@socketio.on("join_project_board")
+def handle_join_project_board(data):
+    """Receive column changes of a Kanban board (``project_id`` null for the global columns)"""
+    room = _board_room_for(data)
+    if room:
+        join_room(room)
+
+
+@socketio.on("leave_project_board")
+def handle_leave_project_board(data):
+    """Stop receiving column changes of a Kanban board"""
+    room = _board_room_for(data)
+    if room:
+        leave_room(room)
+
+
+@socketio.on("join_activity_feed")
+def handle_join_activity_feed(data=None):
+    """Receive activities logged by any user while the feed is shown"""
+    if current_user.is_authenticated:
+        join_room(ACTIVITY_FEED_ROOM)
+
+
+@socketio.on("leave_activity_feed")
+def handle_leave_activity_feed(data=None):
+    leave_room(ACTIVITY_FEED_ROOM)
 
 
 # Client portal real-time: join/leave client-specific room (auth via session)
@@ -2611,8 +2657,7 @@ def handle_join_client_room(data):
     client_id = _get_client_id_from_session()
     if client_id is None:
         return
-    room = f"client_portal_{client_id}"
-    socketio.join_room(room)
+    join_room(client_portal_room(client_id))
 
 
 @socketio.on("leave_client_room")
@@ -2620,4 +2665,4 @@ def handle_leave_client_room(data):
     """Leave client portal room."""
     client_id = _get_client_id_from_session()
     if client_id is not None:
-        socketio.leave_room(f"client_portal_{client_id}")
+        leave_room(client_portal_room(client_id))
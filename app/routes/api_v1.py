@@ -2853,7 +2853,7 @@ def list_users():
     query = User.query.filter_by(is_active=True).order_by(User.username)
 
     # Paginate
-    result = paginate_query(query)
+    result = paginate_query(query, keyset=(User.username, User.id))
     items = result["items"]
     if not items:
         return jsonify({"users": [], "pagination": result["pagination"]})
@@ -2918,7 +2918,7 @@ def list_webhooks():
     query = query.order_by(Webhook.created_at.desc())
 
     # Paginate
-    result = paginate_query(query)
+    result = paginate_query(query, keyset=(Webhook.created_at.desc(), Webhook.id.desc()))
 
     return jsonify({"webhooks": [w.to_dict() for w in result["items"]], "pagination": result["pagination"]})
 
@@ -3157,7 +3157,7 @@ def list_webhook_deliveries(webhook_id):
       - name: status
         in: query
         type: string
-        enum: [pending, success, failed, retrying]
+        enum: [pending, delivering, success, failed, retrying]
       - name: page
         in: query
         type: integer
@@ -3188,7 +3188,7 @@ def list_webhook_deliveries(webhook_id):
     query = query.order_by(WebhookDelivery.started_at.desc())
 
     # Paginate
-    result = paginate_query(query)
+    result = paginate_query(query, keyset=(WebhookDelivery.started_at.desc(), WebhookDelivery.id.desc()))
 
     return jsonify({"deliveries": [d.to_dict() for d in result["items"]], "pagination": result["pagination"]})
 
@@ -3236,7 +3236,7 @@ def list_stock_items_api():
     if category:
         query = query.filter_by(category=category)
 
-    result = paginate_query(query.order_by(StockItem.name))
+    result = paginate_query(query.order_by(StockItem.name), keyset=(StockItem.name, StockItem.id))
     result["items"] = [item.to_dict() for item in result["items"]]
 
     return jsonify(result)
@@ -3383,7 +3383,7 @@ def list_warehouses_api():
     if active_only:
         query = query.filter_by(is_active=True)
 
-    result = paginate_query(query.order_by(Warehouse.code))
+    result = paginate_query(query.order_by(Warehouse.code), keyset=(Warehouse.code, Warehouse.id))
     result["items"] = [wh.to_dict() for wh in result["items"]]
 
     return jsonify(result)
@@ -4029,7 +4029,7 @@ def list_suppliers_api():
         like = f"%{search}%"
         query = query.filter(or_(Supplier.code.ilike(like), Supplier.name.ilike(like)))
 
-    result = paginate_query(query.order_by(Supplier.name))
+    result = paginate_query(query.order_by(Supplier.name), keyset=(Supplier.name, Supplier.id))
     result["items"] = [supplier.to_dict() for supplier in result["items"]]
 
     return jsonify(result)
@@ -4189,7 +4189,10 @@ def list_purchase_orders_api():
     if supplier_id:
         query = query.filter_by(supplier_id=supplier_id)
 
-    result = paginate_query(query.order_by(PurchaseOrder.order_date.desc()))
+    result = paginate_query(
+        query.order_by(PurchaseOrder.order_date.desc()),
+        keyset=(PurchaseOrder.order_date.desc(), PurchaseOrder.id.desc()),
+    )
     result["items"] = [po.to_dict() for po in result["items"]]
 
     return jsonify(result)
@@ -4999,10 +5002,8 @@ def delete_holiday_api(holiday_id):
 @api_v1_bp.route("/exports/payroll", methods=["GET"])
 @require_api_token("read:reports")
 def export_payroll_csv():
-    import csv
-    import io
-
     from app.services.workforce_governance_service import WorkforceGovernanceService
+    from app.utils.streaming_export import csv_response, stream_csv
 
     start = _parse_date(request.args.get("start_date"))
     end = _parse_date(request.args.get("end_date"))
@@ -5023,43 +5024,20 @@ def export_payroll_csv():
         approved_only=approved_only,
         closed_only=closed_only,
     )
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        [
-            "user_id",
-            "username",
-            "week_year",
-            "week_number",
-            "period_start",
-            "period_end",
-            "hours",
-            "billable_hours",
-            "non_billable_hours",
-        ]
-    )
-    for row in rows:
-        writer.writerow(
-            [
-                row.get("user_id"),
-                row.get("username"),
-                row.get("week_year"),
-                row.get("week_number"),
-                row.get("period_start"),
-                row.get("period_end"),
-                row.get("hours"),
-                row.get("billable_hours"),
-                row.get("non_billable_hours"),
-            ]
-        )
+    columns = [
+        "user_id",
+        "username",
+        "week_year",
+        "week_number",
+        "period_start",
+        "period_end",
+        "hours",
+        "billable_hours",
+        "non_billable_hours",
+    ]
 
     filename = f"payroll_export_{start.isoformat()}_{end.isoformat()}.csv"
-    return Response(
-        output.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    return csv_response(stream_csv(columns, ([row.get(c) for c in columns] for row in rows)), filename)
 
 
 # ==================== Capacity and Compliance ====================
@@ -6,27 +6,18 @@ Used by api_v1.py and by domain-specific sub-blueprints (e.g. api_v1_time_entrie
 from flask import g, jsonify, request
 
 
-def paginate_query(query, page=None, per_page=None):
-    """Paginate a SQLAlchemy query."""
+def paginate_query(query, page=None, per_page=None, keyset=None):
+    """Paginate a SQLAlchemy query.
+
+    Offset mode (``page``/``per_page``) by default. Endpoints that pass ``keyset`` also accept
+    ``cursor`` (empty for the first page, then ``next_cursor``) for keyset pagination; both
+    modes honour ``include_total=false``. See ``app.utils.pagination``.
+    """
+    from app.utils.pagination import paginate_query as _paginate_query
+
     page = page or int(request.args.get("page", 1))
     per_page = per_page or int(request.args.get("per_page", 50))
-    per_page = min(per_page, 100)
-
-    paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-
-    return {
-        "items": paginated.items,
-        "pagination": {
-            "page": paginated.page,
-            "per_page": paginated.per_page,
-            "total": paginated.total,
-            "pages": paginated.pages,
-            "has_next": paginated.has_next,
-            "has_prev": paginated.has_prev,
-            "next_page": paginated.page + 1 if paginated.has_next else None,
-            "prev_page": paginated.page - 1 if paginated.has_prev else None,
-        },
-    }
+    return _paginate_query(query, page, per_page, max_per_page=100, keyset=keyset)
 
 
 def parse_datetime(dt_str):
@@ -279,6 +279,63 @@ def export_invoice_pdf_api(invoice_id):
     )
 
 
+@api_v1_invoices_bp.route("/invoices/pdf/render", methods=["POST"])
+@require_api_token("read:invoices")
+def render_invoice_pdfs_api():
+    """Render many invoice PDFs in the background; later downloads are served from the PDF cache."""
+    data = request.get_json() or {}
+    invoice_ids = data.get("invoice_ids")
+    try:
+        invoice_ids = [int(x) for x in invoice_ids]
+    except (TypeError, ValueError):
+        invoice_ids = None
+    if not invoice_ids:
+        return validation_error_response(
+            errors={"invoice_ids": ["invoice_ids must be a non-empty list of ids"]},
+            message="invoice_ids is required",
+        )
+    max_ids = current_app.config.get("PDF_BULK_RENDER_MAX", 500)
+    if len(invoice_ids) > max_ids:
+        return validation_error_response(
+            errors={"invoice_ids": [f"At most {max_ids} invoices per request"]},
+            message="Too many invoices",
+        )
+    result = _invoice_service().queue_pdf_render(
+        invoice_ids=invoice_ids,
+        user_id=g.api_user.id,
+        is_admin=g.api_user.is_admin,
+        page_size=data.get("page_size") or "A4",
+    )
+    if not result.get("success"):
+        return error_response(result.get("message", "Could not queue rendering"), status_code=404)
+    job = result["job"]
+    return (
+        jsonify(
+            {
+                "job_id": job.id,
+                "status": job.status,
+                "invoice_ids": result["invoice_ids"],
+                "status_url": f"/api/v1/invoices/pdf/render/{job.id}",
+            }
+        ),
+        202,
+    )
+
+
+@api_v1_invoices_bp.route("/invoices/pdf/render/<int:job_id>", methods=["GET"])
+@require_api_token("read:invoices")
+def render_invoice_pdfs_status(job_id):
+    """Status and result counts of a bulk PDF render job."""
+    from app.models import BackgroundJob
+
+    job = db.session.get(BackgroundJob, job_id)
+    if job is None or job.job_type != "render_invoice_pdfs":
+        return error_response("Job not found", status_code=404)
+    if not g.api_user.is_admin and job.user_id != g.api_user.id:
+        return error_response("Job not found", status_code=404)
+    return jsonify({"job": job.to_dict()})
+
+
 def _approval_to_api_dict(approval):
     """Serialize invoice approval with invoice summary for mobile clients."""
     from app.models import Invoice
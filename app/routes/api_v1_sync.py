@@ -0,0 +1,112 @@
+"""
+API v1 - Delta sync sub-blueprint.
+Route /api/v1/sync: created, updated and deleted time entries, projects and tasks since a watermark.
+"""
+
+from flask import Blueprint, g, jsonify, request
+
+from app.utils.api_auth import require_api_token
+from app.utils.api_responses import error_response
+
+api_v1_sync_bp = Blueprint("api_v1_sync", __name__, url_prefix="/api/v1")
+
+
+def _sync_scopes(types):
+    """entity_type -> (user_id, project_ids) restrictions for the current token, per requested type."""
+    from app.utils.scope_filter import get_allowed_project_ids
+    from app.utils.sync_changes import SYNC_ENTITIES
+
+    user = g.api_user
+    allowed_project_ids = None if user.is_admin else get_allowed_project_ids(user)
+    scopes = {}
+    for name in types:
+        entity = SYNC_ENTITIES[name]
+        if not g.api_token.has_scope(entity.scope):
+            continue
+        if entity.entity_type == "time_entry":
+            # Same visibility as GET /time-entries: non-admins only see their own entries
+            scopes[entity.entity_type] = (None if user.is_admin else user.id, None)
+        else:
+            scopes[entity.entity_type] = (None, allowed_project_ids)
+    return scopes
+
+
+def _load_records(changes):
+    """Current state of the upserted records, one query per entity type."""
+    from sqlalchemy.orm import joinedload
+
+    from app.models import Project, Task, TimeEntry
+
+    loaders = {
+        "time_entry": TimeEntry.query.options(
+            joinedload(TimeEntry.project), joinedload(TimeEntry.user), joinedload(TimeEntry.task)
+        ),
+        "project": Project.query,
+        "task": Task.query.options(joinedload(Task.project), joinedload(Task.assigned_user)),
+    }
+    models = {"time_entry": TimeEntry, "project": Project, "task": Task}
+    records = {}
+    for entity_type, query in loaders.items():
+        ids = [c.entity_id for c in changes if c.entity_type == entity_type and c.op == "upsert"]
+        if ids:
+            model = models[entity_type]
+            for obj in query.filter(model.id.in_(ids)).all():
+                records[(entity_type, obj.id)] = obj
+    return records
+
+
+@api_v1_sync_bp.route("/sync", methods=["GET"])
+@require_api_token(("read:time_entries", "read:projects", "read:tasks"))
+def sync_changes():
+    """Changes since a watermark.
+
+    Without ``since`` only the current ``watermark`` is returned: take it before a full fetch of the
+    lists, then pass it back as ``since``. Each response carries the ``watermark`` to use next; keep
+    calling while ``has_more`` is true. ``reset`` means the watermark is older than the change log
+    and the client must refetch everything.
+    """
+    from app.utils.sync_changes import (
+        SYNC_ENTITIES,
+        InvalidWatermarkError,
+        collapse_changes,
+        current_watermark,
+        decode_watermark,
+        read_changes,
+        watermark_expired,
+    )
+
+    types_arg = (request.args.get("types") or "").strip()
+    types = [t.strip() for t in types_arg.split(",") if t.strip()] if types_arg else list(SYNC_ENTITIES)
+    unknown = [t for t in types if t not in SYNC_ENTITIES]
+    if unknown:
+        return error_response(f"Unknown sync types: {', '.join(unknown)}", error_code="invalid_types")
+    limit = min(max(request.args.get("limit", 500, type=int), 1), 1000)
+
+    since = request.args.get("since")
+    if not since:
+        return jsonify({"changes": [], "watermark": current_watermark(), "has_more": False, "reset": False})
+    try:
+        position, as_of = decode_watermark(since)
+    except InvalidWatermarkError as e:
+        return error_response(str(e), error_code="invalid_watermark")
+    if watermark_expired(as_of):
+        return jsonify({"changes": [], "watermark": current_watermark(), "has_more": False, "reset": True})
+
+    entity_names = {entity.entity_type: name for name, entity in SYNC_ENTITIES.items()}
+    rows, has_more, watermark = read_changes(position, _sync_scopes(types), limit)
+    changes = collapse_changes(rows)
+    records = _load_records(changes)
+
+    out = []
+    for change in changes:
+        item = {"type": entity_names[change.entity_type], "id": change.entity_id}
+        record = records.get((change.entity_type, change.entity_id)) if change.op == "upsert" else None
+        if record is None:
+            # Deleted (possibly after this change was logged)
+            item["op"] = "delete"
+        else:
+            item["op"] = "upsert"
+            item["data"] = record.to_dict()
+        out.append(item)
+
+    return jsonify({"changes": out, "watermark": watermark, "has_more": has_more, "reset": False})
@@ -68,7 +68,7 @@ def list_time_entries():
         query = query.filter(TimeEntry.end_time.isnot(None))
 
     query = query.order_by(TimeEntry.start_time.desc())
-    result = paginate_query(query, page, per_page)
+    result = paginate_query(query, page, per_page, keyset=(TimeEntry.start_time.desc(), TimeEntry.id.desc()))
     return jsonify(
         {
             "time_entries": [e.to_dict() for e in result["items"]],
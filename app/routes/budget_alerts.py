@@ -43,7 +43,7 @@ def budget_dashboard():
     else:
         # For non-admin users, show only projects they've worked on
         time_entry_repo = TimeEntryRepository()
-        user_project_ids = time_entry_repo.get_distinct_project_ids_for_user(current_user.id)
+        user_project_ids = time_entry_repo.get_project_ids_select_for_user(current_user.id)
 
         projects = (
             Project.query.filter(
@@ -65,16 +65,11 @@ def budget_dashboard():
         active_alerts = BudgetAlert.get_active_alerts(acknowledged=False)
     else:
         # For non-admin, get alerts for their projects
-        if user_project_ids:
-            active_alerts = (
-                BudgetAlert.query.filter(
-                    BudgetAlert.is_acknowledged == False, BudgetAlert.project_id.in_(user_project_ids)
-                )
-                .order_by(BudgetAlert.created_at.desc())
-                .all()
-            )
-        else:
-            active_alerts = []
+        active_alerts = (
+            BudgetAlert.query.filter(BudgetAlert.is_acknowledged == False, BudgetAlert.project_id.in_(user_project_ids))
+            .order_by(BudgetAlert.created_at.desc())
+            .all()
+        )
 
     # Get alert statistics
     alert_stats = {
@@ -241,7 +236,7 @@ def get_alerts():
     else:
         # For non-admin, get alerts for their projects
         time_entry_repo = TimeEntryRepository()
-        user_project_ids = time_entry_repo.get_distinct_project_ids_for_user(current_user.id)
+        user_project_ids = time_entry_repo.get_project_ids_select_for_user(current_user.id)
 
         query = BudgetAlert.query.filter(
             BudgetAlert.is_acknowledged == acknowledged, BudgetAlert.project_id.in_(user_project_ids)
@@ -382,7 +377,7 @@ def get_budget_summary():
     else:
         # For non-admin, get projects they've worked on
         time_entry_repo = TimeEntryRepository()
-        user_project_ids = time_entry_repo.get_distinct_project_ids_for_user(current_user.id)
+        user_project_ids = time_entry_repo.get_project_ids_select_for_user(current_user.id)
 
         projects = Project.query.filter(
             Project.id.in_(user_project_ids), Project.budget_amount.isnot(None), Project.status == "active"
@@ -412,7 +407,7 @@ def get_budget_summary():
         alert_stats = BudgetAlert.get_alert_summary()
     else:
         time_entry_repo = TimeEntryRepository()
-        user_project_ids = time_entry_repo.get_distinct_project_ids_for_user(current_user.id)
+        user_project_ids = time_entry_repo.get_project_ids_select_for_user(current_user.id)
 
         total_alerts = BudgetAlert.query.filter(BudgetAlert.project_id.in_(user_project_ids)).count()
 
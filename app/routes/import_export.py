@@ -11,22 +11,29 @@ from flask_login import current_user, login_required
 from werkzeug.utils import secure_filename
 
 from app import db
-from app.models import DataExport, DataImport, User
-from app.utils.backup import restore_backup as restore_backup_archive
-from app.utils.data_export import create_backup, export_filtered_data, export_user_data_gdpr
+from app.models import BackgroundJob, DataExport, DataImport, User
+from app.utils.data_export import export_filtered_data
 from app.utils.data_import import ImportError as DataImportError
-from app.utils.data_import import (
-    import_csv_clients,
-    import_csv_time_entries,
-    import_from_harvest,
-    import_from_toggl,
-    restore_from_backup,
-)
+from app.utils.data_import import import_csv_clients
+from app.utils.import_export_jobs import job_upload_path, protect_secret
+from app.utils.job_queue import cancel_job, enqueue, find_job_for_target
 from app.utils.module_helpers import module_enabled
 
 import_export_bp = Blueprint("import_export", __name__)
 
 
+def _queued_response(job, import_id=None, export_id=None):
+    """202 response for an operation handed to the background job queue"""
+    body = {"success": True, "job_id": job.id, "status": job.status}
+    if import_id is not None:
+        body["import_id"] = import_id
+        body["status_url"] = f"/api/import/status/{import_id}"
+    if export_id is not None:
+        body["export_id"] = export_id
+        body["status_url"] = f"/api/export/status/{export_id}"
+    return jsonify(body), 202
+
+
 # ============================================================================
 # Import Routes
 # ============================================================================
@@ -61,8 +68,15 @@ def import_csv():
         return jsonify({"error": "File must be a CSV"}), 400
 
     try:
-        # Read file content
+        # Read file content (validates the encoding before anything is queued)
         csv_content = file.read().decode("utf-8")
+    except UnicodeDecodeError:
+        return jsonify({"error": "File must be UTF-8 encoded"}), 400
+
+    try:
+        path = job_upload_path(file.filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(csv_content)
 
         # Create import record
         import_record = DataImport(
@@ -71,13 +85,14 @@ def import_csv():
         db.session.add(import_record)
         db.session.commit()
 
-        # Perform import
-        summary = import_csv_time_entries(user_id=current_user.id, csv_content=csv_content, import_record=import_record)
-
-        return jsonify({"success": True, "import_id": import_record.id, "summary": summary}), 200
+        job = enqueue(
+            "import_csv",
+            {"path": path, "files": [path]},
+            user_id=current_user.id,
+            target=import_record,
+        )
+        return _queued_response(job, import_id=import_record.id)
 
-    except DataImportError as e:
-        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"CSV import error: {str(e)}")
         return jsonify({"error": "Import failed. Please check the file format."}), 500
@@ -112,10 +127,13 @@ def import_toggl():
         return jsonify({"error": "Missing required fields"}), 400
 
     try:
-        # Parse dates
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-        end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+        # Validate dates before queueing
+        datetime.strptime(start_date_str, "%Y-%m-%d")
+        datetime.strptime(end_date_str, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"error": "Dates must be in YYYY-MM-DD format"}), 400
 
+    try:
         # Create import record
         import_record = DataImport(
             user_id=current_user.id, import_type="toggl", source_file=f"Toggl Workspace {workspace_id}"
@@ -123,20 +141,19 @@ def import_toggl():
         db.session.add(import_record)
         db.session.commit()
 
-        # Perform import
-        summary = import_from_toggl(
+        job = enqueue(
+            "import_toggl",
+            {
+                "api_token": protect_secret(api_token),
+                "workspace_id": workspace_id,
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+            },
             user_id=current_user.id,
-            api_token=api_token,
-            workspace_id=workspace_id,
-            start_date=start_date,
-            end_date=end_date,
-            import_record=import_record,
+            target=import_record,
         )
+        return _queued_response(job, import_id=import_record.id)
 
-        return jsonify({"success": True, "import_id": import_record.id, "summary": summary}), 200
-
-    except DataImportError as e:
-        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Toggl import error: {str(e)}")
         return jsonify({"error": "Import failed. Please check your credentials and try again."}), 500
@@ -171,10 +188,13 @@ def import_harvest():
         return jsonify({"error": "Missing required fields"}), 400
 
     try:
-        # Parse dates
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-        end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+        # Validate dates before queueing
+        datetime.strptime(start_date_str, "%Y-%m-%d")
+        datetime.strptime(end_date_str, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"error": "Dates must be in YYYY-MM-DD format"}), 400
 
+    try:
         # Create import record
         import_record = DataImport(
             user_id=current_user.id, import_type="harvest", source_file=f"Harvest Account {account_id}"
@@ -182,20 +202,19 @@ def import_harvest():
         db.session.add(import_record)
         db.session.commit()
 
-        # Perform import
-        summary = import_from_harvest(
+        job = enqueue(
+            "import_harvest",
+            {
+                "account_id": account_id,
+                "api_token": protect_secret(api_token),
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+            },
             user_id=current_user.id,
-            account_id=account_id,
-            api_token=api_token,
-            start_date=start_date,
-            end_date=end_date,
-            import_record=import_record,
+            target=import_record,
         )
+        return _queued_response(job, import_id=import_record.id)
 
-        return jsonify({"success": True, "import_id": import_record.id, "summary": summary}), 200
-
-    except DataImportError as e:
-        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Harvest import error: {str(e)}")
         return jsonify({"error": "Import failed. Please check your credentials and try again."}), 500
@@ -212,7 +231,10 @@ def import_status(import_id):
     if not current_user.is_admin and import_record.user_id != current_user.id:
         return jsonify({"error": "Unauthorized"}), 403
 
-    return jsonify(import_record.to_dict()), 200
+    data = import_record.to_dict()
+    job = find_job_for_target("data_import", import_record.id)
+    data["job"] = job.to_dict() if job else None
+    return jsonify(data), 200
 
 
 @import_export_bp.route("/api/import/history")
@@ -259,26 +281,8 @@ def export_gdpr():
         db.session.add(export_record)
         db.session.commit()
 
-        export_record.start_processing()
-
-        # Perform export
-        result = export_user_data_gdpr(user_id=current_user.id, export_format=export_format)
-
-        export_record.complete(
-            file_path=result["filepath"], file_size=result["file_size"], record_count=result["record_count"]
-        )
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "export_id": export_record.id,
-                    "filename": result["filename"],
-                    "download_url": f"/api/export/download/{export_record.id}",
-                }
-            ),
-            200,
-        )
+        job = enqueue("export_gdpr", {"format": export_format}, user_id=current_user.id, target=export_record)
+        return _queued_response(job, export_id=export_record.id)
 
     except Exception as e:
         current_app.logger.error(f"GDPR export error: {str(e)}")
@@ -371,26 +375,8 @@ def export_backup():
         db.session.add(export_record)
         db.session.commit()
 
-        export_record.start_processing()
-
-        # Create backup
-        result = create_backup(user_id=current_user.id)
-
-        export_record.complete(
-            file_path=result["filepath"], file_size=result["file_size"], record_count=result["record_count"]
-        )
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "export_id": export_record.id,
-                    "filename": result["filename"],
-                    "download_url": f"/api/export/download/{export_record.id}",
-                }
-            ),
-            200,
-        )
+        job = enqueue("export_backup", user_id=current_user.id, target=export_record)
+        return _queued_response(job, export_id=export_record.id)
 
     except Exception as e:
         current_app.logger.error(f"Backup creation error: {str(e)}")
@@ -438,7 +424,12 @@ def export_status(export_id):
     if not current_user.is_admin and export_record.user_id != current_user.id:
         return jsonify({"error": "Unauthorized"}), 403
 
-    return jsonify(export_record.to_dict()), 200
+    data = export_record.to_dict()
+    job = find_job_for_target("data_export", export_record.id)
+    data["job"] = job.to_dict() if job else None
+    if export_record.status == "completed":
+        data["download_url"] = f"/api/export/download/{export_record.id}"
+    return jsonify(data), 200
 
 
 @import_export_bp.route("/api/export/history")
@@ -487,64 +478,48 @@ def restore_backup():
 
     filepath = None
     try:
-        # Save uploaded file temporarily
-        backup_dir = os.path.join(current_app.config.get("UPLOAD_FOLDER", "/data/uploads"), "backups")
-        os.makedirs(backup_dir, exist_ok=True)
-
+        # Save the upload where the worker can read it; the queue removes it when the job is final
         filename = secure_filename(file.filename)
-        filepath = os.path.join(backup_dir, f"restore_{filename}")
+        filepath = job_upload_path(f"restore_{filename}")
         file.save(filepath)
 
-        is_zip = fn_lower.endswith(".zip")
-
-        if is_zip:
-            # Full system backup (same as Admin restore)
-            app_obj = current_app._get_current_object()
-            success, message = restore_backup_archive(app_obj, filepath)
-            if not success:
-                return jsonify({"error": message}), 400
-            return (
-                jsonify(
-                    {
-                        "success": True,
-                        "import_id": None,
-                        "statistics": {"message": message},
-                        "message": "Backup restored successfully",
-                    }
-                ),
-                200,
-            )
-        else:
-            # JSON backup (Import/Export style)
-            import_record = DataImport(user_id=current_user.id, import_type="backup", source_file=filename)
-            db.session.add(import_record)
-            db.session.commit()
+        import_record = DataImport(user_id=current_user.id, import_type="backup", source_file=filename)
+        db.session.add(import_record)
+        db.session.commit()
 
-            statistics = restore_from_backup(user_id=current_user.id, backup_file_path=filepath)
-
-            return (
-                jsonify(
-                    {
-                        "success": True,
-                        "import_id": import_record.id,
-                        "statistics": statistics,
-                        "message": "Backup restored successfully",
-                    }
-                ),
-                200,
-            )
+        job = enqueue(
+            "restore_backup",
+            {"path": filepath, "archive": fn_lower.endswith(".zip"), "files": [filepath]},
+            user_id=current_user.id,
+            target=import_record,
+        )
+        return _queued_response(job, import_id=import_record.id)
 
-    except DataImportError as e:
-        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Backup restore error: {str(e)}")
-        return jsonify({"error": "Restore failed. Please check the backup file."}), 500
-    finally:
         if filepath and os.path.exists(filepath):
             try:
                 os.remove(filepath)
             except OSError:
                 pass
+        return jsonify({"error": "Restore failed. Please check the backup file."}), 500
+
+
+@import_export_bp.route("/api/jobs/<int:job_id>/cancel", methods=["POST"])
+@login_required
+@module_enabled("import_export")
+def cancel_background_job(job_id):
+    """Cancel a queued import/export job, or stop a running one at its next checkpoint"""
+    job = BackgroundJob.query.get_or_404(job_id)
+
+    # Check permissions
+    if not current_user.is_admin and job.user_id != current_user.id:
+        return jsonify({"error": "Unauthorized"}), 403
+
+    if not cancel_job(job):
+        return jsonify({"error": f"Job already {job.status}"}), 409
+
+    return jsonify({"success": True, "job": job.to_dict()}), 200
 
 
 # ============================================================================
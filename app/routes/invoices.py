@@ -1190,15 +1190,11 @@ def export_invoice_pdf(invoice_id):
     )
 
     try:
-        from app.utils.pdf_generator import InvoicePDFGenerator
+        from app.utils.pdf_cache import render_invoice_pdf
 
         settings = Settings.get_settings()
         current_app.logger.info(
-            f"[PDF_EXPORT] Creating InvoicePDFGenerator - PageSize: '{page_size}', InvoiceID: {invoice_id}"
-        )
-        pdf_generator = InvoicePDFGenerator(invoice, settings=settings, page_size=page_size)
-        current_app.logger.info(
-            f"[PDF_EXPORT] Starting PDF generation - PageSize: '{page_size}', InvoiceID: {invoice_id}"
+            f"[PDF_EXPORT] Starting PDF generation (cached) - PageSize: '{page_size}', InvoiceID: {invoice_id}"
         )
         from opentelemetry import trace
 
@@ -1206,12 +1202,9 @@ def export_invoice_pdf(invoice_id):
 
         _pdf_t0 = time.monotonic()
         with business_span("invoice.generate_pdf", user_id=current_user.id, page_size=page_size):
-            pdf_bytes = pdf_generator.generate_pdf()
+            pdf_bytes, embed_err, pdfa_err = render_invoice_pdf(invoice, settings, page_size=page_size)
             trace.get_current_span().set_attribute("pdf_size_bytes", len(pdf_bytes))
         record_invoice_duration_seconds(time.monotonic() - _pdf_t0, "pdf")
-        from app.utils.invoice_pdf_postprocess import postprocess_invoice_pdf_bytes
-
-        pdf_bytes, embed_err, pdfa_err = postprocess_invoice_pdf_bytes(pdf_bytes, invoice, settings)
         if embed_err:
             current_app.logger.warning(
                 f"[PDF_EXPORT] Factur-X embed failed - InvoiceID: {invoice_id}, Error: {embed_err}"
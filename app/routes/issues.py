@@ -14,7 +14,11 @@ from app.models import Client, Issue, Project, Task, User
 from app.utils.db import safe_commit
 from app.utils.module_helpers import module_enabled
 from app.utils.pagination import get_pagination_params
-from app.utils.scope_filter import get_accessible_project_and_client_ids_for_user
+from app.utils.scope_filter import (
+    accessible_client_ids_select,
+    accessible_project_ids_select,
+    get_accessible_project_and_client_ids_for_user,
+)
 
 issues_bp = Blueprint("issues", __name__)
 
@@ -67,14 +71,11 @@ def list_issues():
         )
 
         if not has_view_all_issues:
-            accessible_project_ids, accessible_client_ids = get_accessible_project_and_client_ids_for_user(
-                current_user.id
-            )
             query = query.filter(
                 db.or_(
                     Issue.assigned_to == current_user.id,
-                    Issue.client_id.in_(accessible_client_ids),
-                    Issue.project_id.in_(accessible_project_ids),
+                    Issue.client_id.in_(accessible_client_ids_select(current_user.id)),
+                    Issue.project_id.in_(accessible_project_ids_select(current_user.id)),
                 )
             )
 
@@ -100,32 +101,11 @@ def list_issues():
             current_user.has_permission("view_all_issues") if hasattr(current_user, "has_permission") else False
         )
         if not has_view_all_issues:
-            from app.models.time_entry import TimeEntry
-
-            user_project_ids = (
-                db.session.query(TimeEntry.project_id).filter_by(user_id=current_user.id).distinct().subquery()
-            )
-            accessible_client_ids = (
-                db.session.query(Project.client_id)
-                .filter(
-                    db.or_(
-                        Project.id.in_(db.session.query(user_project_ids)),
-                        Project.id.in_(
-                            db.session.query(Task.project_id)
-                            .filter_by(assigned_to=current_user.id)
-                            .distinct()
-                            .subquery()
-                        ),
-                    )
-                )
-                .distinct()
-                .subquery()
-            )
             stats_query = stats_query.filter(
                 db.or_(
                     Issue.assigned_to == current_user.id,
-                    Issue.client_id.in_(db.session.query(accessible_client_ids)),
-                    Issue.project_id.in_(db.session.query(user_project_ids)),
+                    Issue.client_id.in_(accessible_client_ids_select(current_user.id)),
+                    Issue.project_id.in_(accessible_project_ids_select(current_user.id)),
                 )
             )
 
@@ -7,6 +7,7 @@ from app.models import KanbanBoardTemplate, KanbanColumn, Task
 from app.utils.db import safe_commit
 from app.utils.module_helpers import module_enabled
 from app.utils.permissions import admin_or_permission_required
+from app.utils.realtime import project_board_room
 from app.utils.scope_filter import get_active_projects_for_user
 
 kanban_bp = Blueprint("kanban", __name__)
@@ -214,13 +215,13 @@ def create_column():
         flash(f'Column "{label}" created successfully', "success")
         # Clear any SQLAlchemy cache to ensure fresh data on next load
         db.session.expire_all()
-        # Notify all connected clients to refresh kanban boards
+        # Notify clients showing the affected board
         try:
             print(f"[KANBAN] Emitting kanban_columns_updated event: created column '{key}'")
             socketio.emit(
                 "kanban_columns_updated",
                 {"action": "created", "column_key": key, "project_id": project_id},
-                broadcast=True,
+                room=project_board_room(project_id),
             )
             print(f"[KANBAN] Event emitted successfully")
         except Exception as e:
@@ -287,13 +288,13 @@ def edit_column(column_id):
         flash(f'Column "{label}" updated successfully', "success")
         # Clear any SQLAlchemy cache to ensure fresh data on next load
         db.session.expire_all()
-        # Notify all connected clients to refresh kanban boards
+        # Notify clients showing the affected board
         try:
             print(f"[KANBAN] Emitting kanban_columns_updated event: updated column ID {column_id}")
             socketio.emit(
                 "kanban_columns_updated",
                 {"action": "updated", "column_id": column_id, "project_id": column.project_id},
-                broadcast=True,
+                room=project_board_room(column.project_id),
             )
             print(f"[KANBAN] Event emitted successfully")
         except Exception as e:
@@ -364,13 +365,13 @@ def delete_column(column_id):
     flash(f'Column "{column_name}" deleted successfully', "success")
     # Clear any SQLAlchemy cache to ensure fresh data on next load
     db.session.expire_all()
-    # Notify all connected clients to refresh kanban boards
+    # Notify clients showing the affected board
     try:
         print(f"[KANBAN] Emitting kanban_columns_updated event: deleted column ID {column_id}")
         socketio.emit(
             "kanban_columns_updated",
             {"action": "deleted", "column_id": column_id, "project_id": project_id},
-            broadcast=True,
+            room=project_board_room(project_id),
         )
         print(f"[KANBAN] Event emitted successfully")
     except Exception as e:
@@ -412,13 +413,13 @@ def toggle_column(column_id):
     flash(f'Column "{column.label}" {status} successfully', "success")
     # Clear any SQLAlchemy cache to ensure fresh data on next load
     db.session.expire_all()
-    # Notify all connected clients to refresh kanban boards
+    # Notify clients showing the affected board
     try:
         print(f"[KANBAN] Emitting kanban_columns_updated event: toggled column ID {column_id}")
         socketio.emit(
             "kanban_columns_updated",
             {"action": "toggled", "column_id": column_id, "project_id": column.project_id},
-            broadcast=True,
+            room=project_board_room(column.project_id),
         )
         print(f"[KANBAN] Event emitted successfully")
     except Exception as e:
@@ -458,10 +459,14 @@ def reorder_columns():
         # Clear all caches to force fresh reads
         db.session.expire_all()
 
-        # Notify all connected clients to refresh kanban boards
+        # Notify clients showing the affected board
         try:
             print(f"[KANBAN] Emitting kanban_columns_updated event: reordered columns")
-            socketio.emit("kanban_columns_updated", {"action": "reordered", "project_id": project_id}, broadcast=True)
+            socketio.emit(
+                "kanban_columns_updated",
+                {"action": "reordered", "project_id": project_id},
+                room=project_board_room(project_id),
+            )
             print(f"[KANBAN] Event emitted successfully")
         except Exception as e:
             print(f"[KANBAN] Failed to emit event: {e}")
@@ -583,7 +588,7 @@ def apply_template(template_id):
         socketio.emit(
             "kanban_columns_updated",
             {"action": "template_applied", "template_id": template_id, "project_id": project_id},
-            broadcast=True,
+            room=project_board_room(project_id),
         )
     except Exception as e:
         print(f"[KANBAN] Failed to emit event: {e}")
@@ -1,4 +1,3 @@
-import csv
 import io
 import time
 from datetime import datetime, timedelta
@@ -27,6 +26,7 @@ from app.repositories import TimeEntryRepository
 from app.services.scheduled_report_service import ScheduledReportService
 from app.utils.excel_export import create_project_report_excel, create_time_entries_excel
 from app.utils.posthog_monitoring import track_error, track_export_performance, track_validation_error
+from app.utils.streaming_export import CountingRows, csv_response, iter_time_entry_export_rows, stream_csv
 from app.utils.support_report_generation import record_report_generation_for_current_user
 
 # Optional PowerPoint export - only import if available
@@ -390,88 +390,71 @@ def export_csv():
     if project_id:
         query = query.filter(TimeEntry.project_id == project_id)
 
-    entries = (
-        query.options(
-            joinedload(TimeEntry.project).joinedload(Project.client_obj),
-            joinedload(TimeEntry.user),
-            joinedload(TimeEntry.task),
-        )
-        .order_by(TimeEntry.start_time.desc())
-        .all()
-    )
+    entries = iter_time_entry_export_rows(query.order_by(TimeEntry.start_time.desc()))
 
-    try:
-        # Get settings for delimiter
-        settings = Settings.get_settings()
-        delimiter = settings.export_delimiter
-
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.writer(output, delimiter=delimiter)
-
-        # Write header with task column
-        writer.writerow(
-            [
-                "ID",
-                "User",
-                "Project",
-                "Client",
-                "Task",
-                "Start Time",
-                "End Time",
-                "Duration (hours)",
-                "Duration (formatted)",
-                "Notes",
-                "Tags",
-                "Source",
-                "Billable",
-                "Created At",
-                "Updated At",
-            ]
-        )
+    # Get settings for delimiter
+    settings = Settings.get_settings()
+    delimiter = settings.export_delimiter
+
+    # Header with task column
+    header = [
+        "ID",
+        "User",
+        "Project",
+        "Client",
+        "Task",
+        "Start Time",
+        "End Time",
+        "Duration (hours)",
+        "Duration (formatted)",
+        "Notes",
+        "Tags",
+        "Source",
+        "Billable",
+        "Created At",
+        "Updated At",
+    ]
 
-        # Write data (null-safe: user/project/client can be missing)
+    def rows():
+        # Null-safe: user/project/client can be missing
         for entry in entries:
-            # Project.client is a property returning the client name string; use client_obj for the relationship
+            # Project.client is a property returning the client name string
             client_name = (entry.client.name if entry.client else "") or (entry.project.client if entry.project else "")
-            writer.writerow(
-                [
-                    entry.id,
-                    (entry.user.display_name if entry.user else ""),
-                    (entry.project.name if entry.project else ""),
-                    client_name,
-                    (entry.task.name if entry.task else ""),
-                    entry.start_time.isoformat(),
-                    entry.end_time.isoformat() if entry.end_time else "",
-                    entry.duration_hours,
-                    entry.duration_formatted,
-                    entry.notes or "",
-                    entry.tags or "",
-                    entry.source,
-                    "Yes" if entry.billable else "No",
-                    entry.created_at.isoformat(),
-                    entry.updated_at.isoformat() if entry.updated_at else "",
-                ]
-            )
-
-        output.seek(0)
+            yield [
+                entry.id,
+                (entry.user.display_name if entry.user else ""),
+                (entry.project.name if entry.project else ""),
+                client_name,
+                (entry.task.name if entry.task else ""),
+                entry.start_time.isoformat(),
+                entry.end_time.isoformat() if entry.end_time else "",
+                entry.duration_hours,
+                entry.duration_formatted,
+                entry.notes or "",
+                entry.tags or "",
+                entry.source,
+                "Yes" if entry.billable else "No",
+                entry.created_at.isoformat(),
+                entry.updated_at.isoformat() if entry.updated_at else "",
+            ]
 
-        # Create filename with filters indication
-        filename_parts = [f"timetracker_export_{start_date}_to_{end_date}"]
-        if project_id:
-            filename_parts.append("project")
-        if client_id:
-            filename_parts.append("client")
-        if task_id:
-            filename_parts.append("task")
-        filename = "_".join(filename_parts) + ".csv"
+    # Create filename with filters indication
+    filename_parts = [f"timetracker_export_{start_date}_to_{end_date}"]
+    if project_id:
+        filename_parts.append("project")
+    if client_id:
+        filename_parts.append("client")
+    if task_id:
+        filename_parts.append("task")
+    filename = "_".join(filename_parts) + ".csv"
 
-        # Track CSV export event with enhanced metadata
+    def on_complete(row_count, byte_count):
+        # Runs after the last chunk is streamed; row count and size are only known then
         log_event(
             "export.csv",
             user_id=current_user.id,
             export_type="time_entries",
-            num_rows=len(entries),
+            num_rows=row_count,
             date_range_days=(end_dt - start_dt).days,
             filters_applied={
                 "user_id": user_id,
@@ -488,7 +471,7 @@ def export_csv():
             "export.csv",
             {
                 "export_type": "time_entries",
-                "num_rows": len(entries),
+                "num_rows": row_count,
                 "date_range_days": (end_dt - start_dt).days,
                 "has_project_filter": project_id is not None,
                 "has_client_filter": client_id is not None,
@@ -498,27 +481,27 @@ def export_csv():
                 "has_tags_filter": bool(tags),
             },
         )
-
-        # Track performance
         try:
-            duration_ms = (time.time() - start_time) * 1000
-            csv_content = output.getvalue().encode("utf-8")
             track_export_performance(
                 current_user.id,
                 "csv",
-                row_count=len(entries),
-                duration_ms=duration_ms,
-                file_size_bytes=len(csv_content),
+                row_count=row_count,
+                duration_ms=(time.time() - start_time) * 1000,
+                file_size_bytes=byte_count,
             )
         except Exception:
             # Don't let tracking errors break the export
             pass
 
-        record_report_generation_for_current_user()
-        return send_file(io.BytesIO(csv_content), mimetype="text/csv", as_attachment=True, download_name=filename)
-    except Exception:
-        current_app.logger.exception("CSV export failed (reports.export_csv)")
-        raise
+    def chunks():
+        try:
+            yield from stream_csv(header, rows(), delimiter=delimiter, on_complete=on_complete)
+        except Exception:
+            current_app.logger.exception("CSV export failed (reports.export_csv)")
+            raise
+
+    record_report_generation_for_current_user()
+    return csv_response(chunks(), filename)
 
 
 @reports_bp.route("/reports/summary/export/pdf")
@@ -545,11 +528,8 @@ def export_summary_pdf():
         projects_query = projects_query.filter(scope_p)
     elif not current_user.is_admin:
         time_entry_repo = TimeEntryRepository()
-        project_ids = time_entry_repo.get_distinct_project_ids_for_user(current_user.id)
-        projects_query = (
-            projects_query.filter(Project.id.in_(project_ids))
-            if project_ids
-            else projects_query.filter(Project.id.in_([]))
+        projects_query = projects_query.filter(
+            Project.id.in_(time_entry_repo.get_project_ids_select_for_user(current_user.id))
         )
     projects = projects_query.all()
     project_stats = []
@@ -612,22 +592,18 @@ def summary_report():
         projects_query = projects_query.filter(scope_p)
     elif not current_user.is_admin:
         time_entry_repo = TimeEntryRepository()
-        project_ids = time_entry_repo.get_distinct_project_ids_for_user(current_user.id)
-        projects_query = (
-            projects_query.filter(Project.id.in_(project_ids))
-            if project_ids
-            else projects_query.filter(Project.id.in_([]))
+        projects_query = projects_query.filter(
+            Project.id.in_(time_entry_repo.get_project_ids_select_for_user(current_user.id))
         )
     projects = projects_query.all()
 
     # Sort projects by total hours
+    hours_by_project = TimeEntry.get_hours_by_project_for_period(
+        start_date=start_date.date(), user_id=current_user.id if not current_user.is_admin else None
+    )
     project_stats = []
     for project in projects:
-        hours = TimeEntry.get_total_hours_for_period(
-            start_date=start_date.date(),
-            project_id=project.id,
-            user_id=current_user.id if not current_user.is_admin else None,
-        )
+        hours = hours_by_project.get(project.id, 0)
         if hours > 0:
             project_stats.append({"project": project, "hours": hours})
 
@@ -959,10 +935,13 @@ def time_entries_export_excel():
         flash(_("You do not have permission to export other users' time entries"), "error")
         return redirect(url_for("reports.time_entries_report"))
 
-    entries, start_dt, end_dt, start_date, end_date = _time_entries_report_query(request, require_dates=True)
-    if entries is None:
+    query, start_dt, end_dt, start_date, end_date = _time_entries_report_query(
+        request, require_dates=True, return_query=True
+    )
+    if query is None:
         flash(_("Invalid date format"), "error")
         return redirect(url_for("reports.time_entries_report"))
+    entries = CountingRows(iter_time_entry_export_rows(query.order_by(TimeEntry.start_time.desc())))
 
     columns = ["date", "start_time", "end_time", "duration_hours", "project", "task", "notes", "billed", "client"]
     if can_view_all:
@@ -972,13 +951,13 @@ def time_entries_export_excel():
         "export.excel",
         user_id=current_user.id,
         export_type="time_entries_report",
-        num_rows=len(entries),
+        num_rows=entries.count,
         date_range_days=(end_dt - start_dt).days,
     )
     track_event(
         current_user.id,
         "export.excel",
-        {"export_type": "time_entries_report", "num_rows": len(entries)},
+        {"export_type": "time_entries_report", "num_rows": entries.count},
     )
     record_report_generation_for_current_user()
     return send_file(
@@ -1000,15 +979,16 @@ def time_entries_export_csv():
         flash(_("You do not have permission to export other users' time entries"), "error")
         return redirect(url_for("reports.time_entries_report"))
 
-    entries, start_dt, end_dt, start_date, end_date = _time_entries_report_query(request, require_dates=True)
-    if entries is None:
+    query, start_dt, end_dt, start_date, end_date = _time_entries_report_query(
+        request, require_dates=True, return_query=True
+    )
+    if query is None:
         flash(_("Invalid date format"), "error")
         return redirect(url_for("reports.time_entries_report"))
+    entries = iter_time_entry_export_rows(query.order_by(TimeEntry.start_time.desc()))
 
     settings = Settings.get_settings()
     delimiter = settings.export_delimiter
-    output = io.StringIO()
-    writer = csv.writer(output, delimiter=delimiter)
     headers = [
         _("Date"),
         _("Start"),
@@ -1022,34 +1002,30 @@ def time_entries_export_csv():
     ]
     if can_view_all:
         headers.insert(2, _("User"))  # after End
-    writer.writerow(headers)
-    for entry in entries:
-        client_name = (
-            (entry.client.name if entry.client else "") or (entry.project.client if entry.project else "") or ""
-        )
-        row = [
-            entry.start_time.date().isoformat() if entry.start_time else "",
-            entry.start_time.isoformat() if entry.start_time else "",
-            entry.end_time.isoformat() if entry.end_time else "",
-            entry.duration_hours if entry.end_time else "",
-            entry.project.name if entry.project else "",
-            entry.task.name if entry.task else "",
-            entry.notes or "",
-            _("Yes") if entry.paid else _("No"),
-            client_name,
-        ]
-        if can_view_all:
-            row.insert(2, entry.user.display_name if entry.user else "Unknown")
-        writer.writerow(row)
-    output.seek(0)
+
+    def rows():
+        for entry in entries:
+            client_name = (
+                (entry.client.name if entry.client else "") or (entry.project.client if entry.project else "") or ""
+            )
+            row = [
+                entry.start_time.date().isoformat() if entry.start_time else "",
+                entry.start_time.isoformat() if entry.start_time else "",
+                entry.end_time.isoformat() if entry.end_time else "",
+                entry.duration_hours if entry.end_time else "",
+                entry.project.name if entry.project else "",
+                entry.task.name if entry.task else "",
+                entry.notes or "",
+                _("Yes") if entry.paid else _("No"),
+                client_name,
+            ]
+            if can_view_all:
+                row.insert(2, entry.user.display_name if entry.user else "Unknown")
+            yield row
+
     filename = f"time_entries_report_{start_date}_to_{end_date}.csv"
     record_report_generation_for_current_user()
-    return send_file(
-        io.BytesIO(output.getvalue().encode("utf-8")),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name=filename,
-    )
+    return csv_response(stream_csv(headers, rows(), delimiter=delimiter), filename)
 
 
 @reports_bp.route("/reports/export/excel")
@@ -1096,15 +1072,7 @@ def export_excel():
     if project_id:
         query = query.filter(TimeEntry.project_id == project_id)
 
-    entries = (
-        query.options(
-            joinedload(TimeEntry.project).joinedload(Project.client_obj),
-            joinedload(TimeEntry.user),
-            joinedload(TimeEntry.task),
-        )
-        .order_by(TimeEntry.start_time.desc())
-        .all()
-    )
+    entries = CountingRows(iter_time_entry_export_rows(query.order_by(TimeEntry.start_time.desc())))
 
     # Create Excel file
     output, filename = create_time_entries_excel(entries, filename_prefix="timetracker_export")
@@ -1114,13 +1082,13 @@ def export_excel():
         "export.excel",
         user_id=current_user.id,
         export_type="time_entries",
-        num_rows=len(entries),
+        num_rows=entries.count,
         date_range_days=(end_dt - start_dt).days,
     )
     track_event(
         current_user.id,
         "export.excel",
-        {"export_type": "time_entries", "num_rows": len(entries), "date_range_days": (end_dt - start_dt).days},
+        {"export_type": "time_entries", "num_rows": entries.count, "date_range_days": (end_dt - start_dt).days},
     )
 
     record_report_generation_for_current_user()
@@ -1448,15 +1416,7 @@ def export_user_entries_excel():
     if project_id:
         query = query.filter(TimeEntry.project_id == project_id)
 
-    entries = (
-        query.options(
-            joinedload(TimeEntry.project).joinedload(Project.client_obj),
-            joinedload(TimeEntry.user),
-            joinedload(TimeEntry.task),
-        )
-        .order_by(TimeEntry.start_time.desc())
-        .all()
-    )
+    entries = CountingRows(iter_time_entry_export_rows(query.order_by(TimeEntry.start_time.desc())))
 
     # Create Excel file (row-per-entry)
     output, filename = create_time_entries_excel(entries, filename_prefix="user_entries", columns=columns)
@@ -1465,14 +1425,14 @@ def export_user_entries_excel():
         "export.excel",
         user_id=current_user.id,
         export_type="user_entries",
-        num_rows=len(entries),
+        num_rows=entries.count,
         filters_applied={"user_id": user_id, "project_id": project_id, "start_date": start_date, "end_date": end_date},
         columns=columns,
     )
     track_event(
         current_user.id,
         "export.excel",
-        {"export_type": "user_entries", "num_rows": len(entries), "columns": columns},
+        {"export_type": "user_entries", "num_rows": entries.count, "columns": columns},
     )
 
     return send_file(
@@ -1773,36 +1733,17 @@ def export_unpaid_hours_excel():
     if not can_view_all:
         query = query.filter(TimeEntry.user_id == current_user.id)
 
-    all_entries = query.all()
+    # Only entries that are NOT on lines of fully paid invoices
+    from app.utils.invoice_time_entry_links import billed_clause
+
+    all_entries = query.filter(~billed_clause(TimeEntry.id, Invoice.payment_status == "fully_paid")).all()
 
     # Filter by client if specified (check both entry.client_id and project.client_id)
     if client_id:
         all_entries = [
             e for e in all_entries if (e.client_id == client_id) or (e.project and e.project.client_id == client_id)
         ]
-
-    # Get all invoice items to check which time entries are already invoiced
-    from app.models.invoice import InvoiceItem
-
-    all_invoice_items = (
-        InvoiceItem.query.join(Invoice)
-        .filter(InvoiceItem.time_entry_ids.isnot(None), InvoiceItem.time_entry_ids != "")
-        .all()
-    )
-
-    # Build a set of time entry IDs that are in fully paid invoices
-    billed_entry_ids = set()
-
-    for item in all_invoice_items:
-        if not item.time_entry_ids:
-            continue
-        entry_ids = [int(eid.strip()) for eid in item.time_entry_ids.split(",") if eid.strip().isdigit()]
-        invoice = item.invoice
-        if invoice and invoice.payment_status == "fully_paid":
-            billed_entry_ids.update(entry_ids)
-
-    # Filter entries: only include those that are NOT in fully paid invoices
-    unpaid_entries = [e for e in all_entries if e.id not in billed_entry_ids]
+    unpaid_entries = all_entries
 
     # Debug: Check if we have any entries
     if not unpaid_entries:
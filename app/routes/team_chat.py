@@ -4,19 +4,41 @@ Team Chat routes
 
 from datetime import datetime
 
-from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
 from flask_babel import gettext as _
 from flask_login import current_user, login_required
 from sqlalchemy import and_, or_
 
 from app import db
 from app.models import Project, User
-from app.models.team_chat import ChatChannel, ChatChannelMember, ChatMessage, ChatReadReceipt
+from app.models.team_chat import ChatChannel, ChatChannelMember, ChatMessage
 from app.utils.module_helpers import module_enabled
+from app.utils.realtime import user_room
 
 team_chat_bp = Blueprint("team_chat", __name__)
 
 
+def _notify_members(channel, message):
+    """Tell the channel's other members (their user rooms) that a message arrived"""
+    try:
+        from app import socketio
+
+        member_ids = [
+            user_id
+            for (user_id,) in db.session.query(ChatChannelMember.user_id).filter(
+                ChatChannelMember.channel_id == channel.id, ChatChannelMember.user_id != message.user_id
+            )
+        ]
+        if member_ids:
+            socketio.emit(
+                "chat_message",
+                {"channel_id": channel.id, "message_id": message.id},
+                room=[user_room(user_id) for user_id in member_ids],
+            )
+    except Exception as e:
+        current_app.logger.debug("Chat message push skipped: %s", e)
+
+
 @team_chat_bp.route("/chat")
 @login_required
 @module_enabled("team_chat")
@@ -41,6 +63,10 @@ def chat_index():
         .all()
     )
 
+    unread = ChatChannelMember.unread_counts(current_user.id)
+    for channel in channels + direct_channels:
+        channel.unread_count = unread.get(channel.id, 0)
+
     return render_template("chat/index.html", channels=channels, direct_channels=direct_channels)
 
 
@@ -69,22 +95,9 @@ def chat_channel(channel_id):
     # Get channel members
     members = ChatChannelMember.query.filter_by(channel_id=channel_id).all()
 
-    # Mark messages as read (batch load receipts to avoid N+1)
-    message_ids = [m.id for m in messages]
-    existing_receipts = (
-        ChatReadReceipt.query.filter(
-            ChatReadReceipt.message_id.in_(message_ids),
-            ChatReadReceipt.user_id == current_user.id,
-        ).all()
-        if message_ids
-        else []
-    )
-    receipt_by_message = {r.message_id: r for r in existing_receipts}
-    for message in messages:
-        if message.id not in receipt_by_message:
-            db.session.add(ChatReadReceipt(message_id=message.id, user_id=current_user.id))
-
-    db.session.commit()
+    # Mark the displayed messages as read (one watermark update)
+    if membership and messages and ChatChannelMember.mark_read(channel_id, current_user.id, messages[-1].id):
+        db.session.commit()
 
     return render_template("chat/channel.html", channel=channel, messages=messages, members=members)
 
@@ -154,6 +167,7 @@ def send_message(channel_id):
     channel.updated_at = datetime.utcnow()
 
     db.session.commit()
+    _notify_members(channel, message)
 
     # Notify mentioned users
     if mentions:
@@ -209,15 +223,41 @@ def api_channels():
 
         return jsonify({"success": True, "channel": channel.to_dict()})
 
-    # GET - List channels
-    channels = (
-        ChatChannel.query.join(ChatChannelMember)
+    # GET - List channels with unread counts (a fixed number of queries, whatever the channel count)
+    rows = (
+        db.session.query(ChatChannel, ChatChannelMember.last_read_message_id)
+        .join(ChatChannelMember)
         .filter(ChatChannelMember.user_id == current_user.id, ChatChannel.is_archived == False)
         .order_by(ChatChannel.updated_at.desc())
         .all()
     )
+    channel_ids = [channel.id for channel, _ in rows]
+    unread, message_counts, member_counts = {}, {}, {}
+    if channel_ids:
+        unread = ChatChannelMember.unread_counts(current_user.id, channel_ids)
+        message_counts = dict(
+            db.session.query(ChatMessage.channel_id, db.func.count(ChatMessage.id))
+            .filter(ChatMessage.channel_id.in_(channel_ids))
+            .group_by(ChatMessage.channel_id)
+            .all()
+        )
+        member_counts = dict(
+            db.session.query(ChatChannelMember.channel_id, db.func.count(ChatChannelMember.id))
+            .filter(ChatChannelMember.channel_id.in_(channel_ids))
+            .group_by(ChatChannelMember.channel_id)
+            .all()
+        )
+
+    channels = []
+    for channel, last_read_message_id in rows:
+        data = channel.to_dict(
+            message_count=message_counts.get(channel.id, 0), member_count=member_counts.get(channel.id, 0)
+        )
+        data["unread_count"] = unread.get(channel.id, 0)
+        data["last_read_message_id"] = last_read_message_id
+        channels.append(data)
 
-    return jsonify({"channels": [c.to_dict() for c in channels]})
+    return jsonify({"channels": channels, "unread_total": sum(unread.values())})
 
 
 @team_chat_bp.route("/api/chat/channels/<int:channel_id>/messages", methods=["GET", "POST"])
@@ -283,6 +323,7 @@ def api_messages(channel_id):
         # Update channel updated_at
         channel.updated_at = datetime.utcnow()
         db.session.commit()
+        _notify_members(channel, message)
 
         # Notify mentioned users
         if mentions:
@@ -312,24 +353,48 @@ def api_messages(channel_id):
     messages = query.order_by(ChatMessage.created_at.desc()).limit(limit).all()
     messages.reverse()  # Return in chronological order
 
-    # Mark as read (batch load receipts to avoid N+1)
-    message_ids = [m.id for m in messages]
-    existing_receipts = (
-        ChatReadReceipt.query.filter(
-            ChatReadReceipt.message_id.in_(message_ids),
-            ChatReadReceipt.user_id == current_user.id,
-        ).all()
-        if message_ids
-        else []
+    # Read-only: clients advance the watermark with POST .../read
+    return jsonify(
+        {
+            "messages": [m.to_dict() for m in messages],
+            "last_read_message_id": membership.last_read_message_id if membership else None,
+        }
     )
-    receipt_by_message = {r.message_id: r for r in existing_receipts}
-    for message in messages:
-        if message.id not in receipt_by_message:
-            db.session.add(ChatReadReceipt(message_id=message.id, user_id=current_user.id))
 
-    db.session.commit()
 
-    return jsonify({"messages": [m.to_dict() for m in messages]})
+@team_chat_bp.route("/api/chat/channels/<int:channel_id>/read", methods=["POST"])
+@login_required
+@module_enabled("team_chat")
+def api_mark_read(channel_id):
+    """Mark messages read up to ``message_id`` (default: the newest message in the channel)"""
+    ChatChannel.query.get_or_404(channel_id)
+    membership = ChatChannelMember.query.filter_by(channel_id=channel_id, user_id=current_user.id).first()
+    if not membership:
+        return jsonify({"error": "Access denied"}), 403
+
+    data = request.get_json(silent=True) or {}
+    message_id = data.get("message_id")
+    if message_id is not None:
+        try:
+            message_id = int(message_id)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid message_id", "error_code": "validation_error"}), 400
+        if not ChatMessage.query.filter_by(id=message_id, channel_id=channel_id).first():
+            return jsonify({"error": "Message not found in this channel"}), 404
+    else:
+        message_id = db.session.query(db.func.max(ChatMessage.id)).filter(ChatMessage.channel_id == channel_id).scalar()
+
+    if ChatChannelMember.mark_read(channel_id, current_user.id, message_id):
+        db.session.commit()
+    db.session.refresh(membership)
+
+    return jsonify(
+        {
+            "success": True,
+            "last_read_message_id": membership.last_read_message_id,
+            "unread_count": ChatChannelMember.unread_counts(current_user.id, [channel_id]).get(channel_id, 0),
+        }
+    )
 
 
 @team_chat_bp.route("/api/chat/messages/<int:message_id>", methods=["PUT", "DELETE"])
@@ -16,7 +16,9 @@ from app.services.time_tracking_service import TimeTrackingService
 from app.utils.db import safe_commit
 from app.utils.error_handling import safe_log
 from app.utils.posthog_funnels import track_onboarding_first_time_entry, track_onboarding_first_timer
+from app.utils.realtime import user_room
 from app.utils.scope_filter import user_can_access_client, user_can_access_project
+from app.utils.timer_state import timer_status_response
 from app.utils.timezone import parse_local_datetime, parse_user_local_datetime, utc_to_local
 
 _project_service = ProjectService()
@@ -325,7 +327,7 @@ def start_timer():
         if task:
             payload["task_id"] = task.id
             payload["task_name"] = task.name
-        socketio.emit("timer_started", payload)
+        socketio.emit("timer_started", payload, room=user_room(current_user.id))
     except Exception as e:
         current_app.logger.warning("Socket emit failed for timer_started: %s", e)
 
@@ -529,6 +531,7 @@ def start_timer_for_project(project_id):
                 "task_id": task_id,
                 "start_time": new_timer.start_time.isoformat(),
             },
+            room=user_room(current_user.id),
         )
     except Exception as e:
         current_app.logger.warning("Socket emit failed for timer_started (GET): %s", e)
@@ -633,6 +636,7 @@ def stop_timer():
             socketio.emit(
                 "timer_stopped",
                 {"user_id": current_user.id, "timer_id": active_timer.id, "duration": active_timer.duration_formatted},
+                room=user_room(current_user.id),
             )
         except Exception as e:
             current_app.logger.warning("Socket emit failed for timer_stopped: %s", e)
@@ -777,13 +781,14 @@ def adjust_timer():
 @login_required
 def timer_status():
     """Get current timer status as JSON"""
-    active_timer = current_user.active_timer
 
-    if not active_timer:
-        return jsonify({"active": False, "timer": None})
+    def build():
+        active_timer = current_user.active_timer
 
-    return jsonify(
-        {
+        if not active_timer:
+            return {"active": False, "timer": None}
+
+        return {
             "active": True,
             "timer": {
                 "id": active_timer.id,
@@ -798,7 +803,8 @@ def timer_status():
                 "break_formatted": getattr(active_timer, "break_formatted", "00:00:00"),
             },
         }
-    )
+
+    return timer_status_response(current_user.id, build)
 
 
 @timer_bp.route("/timer/edit/<int:timer_id>", methods=["GET", "POST"])
@@ -2147,7 +2153,7 @@ def resume_timer_by_id(timer_id):
             if task:
                 payload["task_id"] = task_id
                 payload["task_name"] = task.name
-        socketio.emit("timer_started", payload)
+        socketio.emit("timer_started", payload, room=user_room(current_user.id))
     except Exception as e:
         current_app.logger.warning("Socket emit failed for timer_resumed: %s", e)
 
@@ -2541,14 +2547,11 @@ def time_entries_overview():
 @login_required
 def export_time_entries_csv():
     """Export (filtered) time entries as CSV. Mirrors the /time-entries filters."""
-    import csv
-    import io
-
-    from flask import abort, send_file
+    from flask import abort
     from sqlalchemy import desc, or_
-    from sqlalchemy.orm import joinedload
 
     from app.utils.client_lock import enforce_locked_client_id
+    from app.utils.streaming_export import csv_response, iter_time_entry_export_rows, stream_csv
 
     # Get filter parameters (same as time_entries_overview)
     user_id = request.args.get("user_id", type=int)
@@ -2573,12 +2576,7 @@ def export_time_entries_csv():
 
     can_view_all = current_user.is_admin or current_user.has_permission("view_all_time_entries")
 
-    query = TimeEntry.query.options(
-        joinedload(TimeEntry.user),
-        joinedload(TimeEntry.project),
-        joinedload(TimeEntry.client),
-        joinedload(TimeEntry.task),
-    ).filter(
+    query = TimeEntry.query.filter(
         or_(
             TimeEntry.end_time.isnot(None),
             db.and_(TimeEntry.duration_seconds.isnot(None), TimeEntry.source == TimeEntrySource.MANUAL.value),
@@ -2660,94 +2658,81 @@ def export_time_entries_csv():
         query = query.filter(or_(TimeEntry.notes.ilike(search_pattern), TimeEntry.tags.ilike(search_pattern)))
 
     query = query.order_by(desc(TimeEntry.start_time))
-    entries = query.all()
+    entries = iter_time_entry_export_rows(query)
 
     # SQLite (or non-JSONB) custom-field filtering fallback (same semantics as overview)
     if client_custom_field and not is_postgres:
-        filtered = []
-        for entry in entries:
+
+        def client_matches(entry):
             if not entry.client:
-                continue
-            matches = True
+                return False
             for field_key, field_value in client_custom_field.items():
                 if not field_key or not field_value:
                     continue
                 client_value = entry.client.custom_fields.get(field_key) if entry.client.custom_fields else None
                 if str(client_value) != str(field_value):
-                    matches = False
-                    break
-            if matches:
-                filtered.append(entry)
-        entries = filtered
+                    return False
+            return True
 
-    # CSV output (null-safe: user/project/client can be missing; wrap in try/except for Docker log visibility)
-    try:
-        settings = Settings.get_settings()
-        delimiter = getattr(settings, "export_delimiter", ",") or ","
-        output = io.StringIO()
-        writer = csv.writer(output, delimiter=delimiter)
-
-        writer.writerow(
-            [
-                "ID",
-                "User",
-                "Project",
-                "Client",
-                "Task",
-                "Start Time",
-                "End Time",
-                "Duration (hours)",
-                "Duration (formatted)",
-                "Notes",
-                "Tags",
-                "Source",
-                "Billable",
-                "Paid",
-                "Created At",
-                "Updated At",
-            ]
-        )
+        entries = filter(client_matches, entries)
 
+    settings = Settings.get_settings()
+    delimiter = getattr(settings, "export_delimiter", ",") or ","
+    header = [
+        "ID",
+        "User",
+        "Project",
+        "Client",
+        "Task",
+        "Start Time",
+        "End Time",
+        "Duration (hours)",
+        "Duration (formatted)",
+        "Notes",
+        "Tags",
+        "Source",
+        "Billable",
+        "Paid",
+        "Created At",
+        "Updated At",
+    ]
+
+    def rows():
+        # Null-safe: user/project/client can be missing
         for entry in entries:
             # Project.client is a property returning the client name string
             client_name = (entry.client.name if entry.client else "") or (entry.project.client if entry.project else "")
-            writer.writerow(
-                [
-                    entry.id,
-                    (entry.user.display_name if entry.user else ""),
-                    (entry.project.name if entry.project else ""),
-                    client_name,
-                    (entry.task.name if entry.task else ""),
-                    entry.start_time.isoformat() if entry.start_time else "",
-                    entry.end_time.isoformat() if entry.end_time else "",
-                    getattr(entry, "duration_hours", ""),
-                    getattr(entry, "duration_formatted", ""),
-                    entry.notes or "",
-                    entry.tags or "",
-                    entry.source or "",
-                    "Yes" if entry.billable else "No",
-                    "Yes" if entry.paid else "No",
-                    entry.created_at.isoformat() if entry.created_at else "",
-                    entry.updated_at.isoformat() if entry.updated_at else "",
-                ]
-            )
-
-        csv_bytes = output.getvalue().encode("utf-8")
+            yield [
+                entry.id,
+                (entry.user.display_name if entry.user else ""),
+                (entry.project.name if entry.project else ""),
+                client_name,
+                (entry.task.name if entry.task else ""),
+                entry.start_time.isoformat() if entry.start_time else "",
+                entry.end_time.isoformat() if entry.end_time else "",
+                entry.duration_hours,
+                entry.duration_formatted,
+                entry.notes or "",
+                entry.tags or "",
+                entry.source or "",
+                "Yes" if entry.billable else "No",
+                "Yes" if entry.paid else "No",
+                entry.created_at.isoformat() if entry.created_at else "",
+                entry.updated_at.isoformat() if entry.updated_at else "",
+            ]
 
-        # Filename includes optional date range
-        start_part = start_date or "all"
-        end_part = end_date or "all"
-        filename = f"time_entries_{start_part}_to_{end_part}.csv"
+    def chunks():
+        # Wrapped for Docker log visibility: errors now surface while streaming
+        try:
+            yield from stream_csv(header, rows(), delimiter=delimiter)
+        except Exception:
+            current_app.logger.exception("CSV export failed (timer.export_time_entries_csv)")
+            raise
 
-        return send_file(
-            io.BytesIO(csv_bytes),
-            mimetype="text/csv",
-            as_attachment=True,
-            download_name=filename,
-        )
-    except Exception:
-        current_app.logger.exception("CSV export failed (timer.export_time_entries_csv)")
-        raise
+    # Filename includes optional date range
+    start_part = start_date or "all"
+    end_part = end_date or "all"
+    return csv_response(chunks(), f"time_entries_{start_part}_to_{end_part}.csv")
 
 
 @timer_bp.route("/time-entries/export/pdf")
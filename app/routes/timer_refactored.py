@@ -20,6 +20,7 @@ from app.utils.api_responses import error_response, success_response
 from app.utils.db import safe_commit
 from app.utils.event_bus import emit_event
 from app.utils.posthog_funnels import track_onboarding_first_timer
+from app.utils.realtime import user_room
 
 timer_bp = Blueprint("timer", __name__)
 
@@ -101,7 +102,7 @@ def start_timer():
         if task:
             payload["task_id"] = task.id
             payload["task_name"] = task.name
-        socketio.emit("timer_started", payload)
+        socketio.emit("timer_started", payload, room=user_room(current_user.id))
     except Exception as e:
         current_app.logger.warning("Socket emit failed for timer_started: %s", e)
 
@@ -157,6 +158,7 @@ def stop_timer():
         socketio.emit(
             "timer_stopped",
             {"user_id": current_user.id, "entry_id": entry.id, "duration_seconds": entry.duration_seconds},
+            room=user_room(current_user.id),
         )
     except Exception as e:
         current_app.logger.warning("Socket emit failed for timer_stopped: %s", e)
@@ -12,6 +12,7 @@ from sqlalchemy.orm import joinedload
 from app import db
 from app.models import Project, TimeEntry, WorkdaySession
 from app.repositories import ExpenseRepository, InvoiceRepository, ProjectRepository, TimeEntryRepository
+from app.utils.time_daily_rollup import seconds_by_day, time_rollup_enabled
 
 
 class AnalyticsService:
@@ -177,19 +178,23 @@ class AnalyticsService:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
 
-        # Get entries
-        entries = self.time_entry_repo.get_by_date_range(
-            start_date=start_date, end_date=end_date, user_id=user_id, include_relations=False
-        )
-
-        # Group by date
         daily_hours = {}
-        for entry in entries:
-            entry_date = entry.start_time.date()
-            hours = (entry.duration_seconds or 0) / 3600
-            if entry_date not in daily_hours:
-                daily_hours[entry_date] = 0.0
-            daily_hours[entry_date] += hours
+        if time_rollup_enabled():
+            # Whole days from the daily rollup: one row per day instead of every entry
+            for day, totals in seconds_by_day(start_date.date(), end_date.date(), user_id=user_id).items():
+                daily_hours[day] = totals["seconds"] / 3600
+        else:
+            entries = self.time_entry_repo.get_by_date_range(
+                start_date=start_date, end_date=end_date, user_id=user_id, include_relations=False
+            )
+
+            # Group by date
+            for entry in entries:
+                entry_date = entry.start_time.date()
+                hours = (entry.duration_seconds or 0) / 3600
+                if entry_date not in daily_hours:
+                    daily_hours[entry_date] = 0.0
+                daily_hours[entry_date] += hours
 
         # Create trend data
         trend_data = []
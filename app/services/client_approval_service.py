@@ -54,11 +54,12 @@ class ClientApprovalService:
         # Real-time: emit to client portal room
         try:
             from app import socketio
+            from app.utils.realtime import client_portal_room
 
             socketio.emit(
                 "client_approval_update",
                 {"approval_id": approval.id, "status": approval.status.value, "event": "requested"},
-                room=f"client_portal_{client.id}",
+                room=client_portal_room(client.id),
             )
         except Exception as e:
             logger.debug("SocketIO emit for client approval skipped: %s", e)
@@ -131,11 +132,12 @@ class ClientApprovalService:
             return
         try:
             from app import socketio
+            from app.utils.realtime import client_portal_room
 
             socketio.emit(
                 "client_approval_update",
                 {"approval_id": approval.id, "status": approval.status.value, "event": event},
-                room=f"client_portal_{approval.client_id}",
+                room=client_portal_room(approval.client_id),
             )
         except Exception as e:
             logger.debug("SocketIO emit for client approval update skipped: %s", e)
@@ -45,6 +45,7 @@ class ClientNotificationService:
         # Real-time: emit to client portal room
         try:
             from app import socketio
+            from app.utils.realtime import client_portal_room
 
             socketio.emit(
                 "client_notification",
@@ -56,7 +57,7 @@ class ClientNotificationService:
                     "link_url": notification.link_url,
                     "link_text": notification.link_text,
                 },
-                room=f"client_portal_{client_id}",
+                room=client_portal_room(client_id),
             )
         except Exception as e:
             logger.debug("SocketIO emit for client notification skipped: %s", e)
@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 
 from app.models import Expense, Invoice, Project, TimeEntry
 from app.repositories import ExpenseRepository, InvoiceRepository, ProjectRepository, TimeEntryRepository
+from app.utils.streaming_export import iter_time_entry_export_rows, write_csv_bytes
 
 
 class ExportService:
@@ -33,44 +34,40 @@ class ExportService:
         Returns:
             BytesIO object with CSV data
         """
-        # Get entries
+        # Same selection as the repository lookups, streamed as column-only rows
+        query = TimeEntry.query
         if start_date and end_date:
-            entries = self.time_entry_repo.get_by_date_range(
-                start_date=start_date, end_date=end_date, user_id=user_id, project_id=project_id, include_relations=True
-            )
+            query = query.filter(TimeEntry.start_time >= start_date, TimeEntry.start_time <= end_date)
+            if user_id:
+                query = query.filter(TimeEntry.user_id == user_id)
+            if project_id:
+                query = query.filter(TimeEntry.project_id == project_id)
         elif project_id:
-            entries = self.time_entry_repo.get_by_project(project_id=project_id, include_relations=True)
+            query = query.filter(TimeEntry.project_id == project_id)
         elif user_id:
-            entries = self.time_entry_repo.get_by_user(user_id=user_id, include_relations=True)
+            query = query.filter(TimeEntry.user_id == user_id)
         else:
-            entries = []
-
-        # Create CSV in a text buffer then return bytes for binary download.
-        text_buffer = StringIO()
-        writer = csv.writer(text_buffer)
-
-        # Write header
-        writer.writerow(
-            [
-                "Date",
-                "User",
-                "Project",
-                "Task",
-                "Start Time",
-                "End Time",
-                "Duration (hours)",
-                "Notes",
-                "Tags",
-                "Billable",
-                "Source",
-            ]
-        )
-
-        # Write rows
-        for entry in entries:
-            duration_hours = (entry.duration_seconds or 0) / 3600
-            writer.writerow(
-                [
+            query = None
+        entries = iter_time_entry_export_rows(query.order_by(TimeEntry.start_time.desc())) if query is not None else []
+
+        header = [
+            "Date",
+            "User",
+            "Project",
+            "Task",
+            "Start Time",
+            "End Time",
+            "Duration (hours)",
+            "Notes",
+            "Tags",
+            "Billable",
+            "Source",
+        ]
+
+        def rows():
+            for entry in entries:
+                duration_hours = (entry.duration_seconds or 0) / 3600
+                yield [
                     entry.start_time.date().isoformat() if entry.start_time else "",
                     entry.user.username if entry.user else "",
                     entry.project.name if entry.project else "",
@@ -83,10 +80,9 @@ class ExportService:
                     "Yes" if entry.billable else "No",
                     entry.source or "",
                 ]
-            )
 
-        output = BytesIO(text_buffer.getvalue().encode("utf-8"))
-        return output
+        # Written straight into the byte buffer (no intermediate text copy)
+        return write_csv_bytes(header, rows())
 
     def export_projects_csv(self, status: Optional[str] = None, client_id: Optional[int] = None) -> BytesIO:
         """
@@ -49,18 +49,15 @@ class GanttService:
         Returns:
             dict with "data" (list of gantt items), "start_date", "end_date" (formatted strings).
         """
-        from sqlalchemy import false
-
         query = Project.query.filter_by(status="active")
         if project_id:
             query = query.filter_by(id=project_id)
         if not has_view_all_projects:
             time_entry_repo = TimeEntryRepository()
-            user_project_ids = time_entry_repo.get_distinct_project_ids_for_user(user_id)
             query = query.filter(
                 db.or_(
                     Project.created_by == user_id,
-                    Project.id.in_(user_project_ids) if user_project_ids else false(),
+                    Project.id.in_(time_entry_repo.get_project_ids_select_for_user(user_id)),
                 )
             )
         projects = query.all()
@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 
 from app import db
 from app.constants import WebhookEvent
-from app.models import Integration, IntegrationCredential, IntegrationEvent, User
+from app.models import Integration, IntegrationCredential, IntegrationEvent, IntegrationSyncRecord, User
 from app.utils.db import safe_commit
 from app.utils.event_bus import emit_event
 
@@ -208,6 +208,9 @@ class IntegrationService:
         for event in events:
             db.session.delete(event)
 
+        # Incremental sync state (content hashes)
+        IntegrationSyncRecord.query.filter_by(integration_id=integration_id).delete(synchronize_session=False)
+
         # Delete the integration
         provider = integration.provider  # Save before deletion
         db.session.delete(integration)
@@ -323,7 +326,7 @@ class IntegrationService:
         message: Optional[str] = None,
         metadata: Optional[Dict] = None,
     ):
-        """Log an integration event."""
+        """Log an integration event and return it."""
         event = IntegrationEvent(
             integration_id=integration_id,
             event_type=event_type,
@@ -333,6 +336,7 @@ class IntegrationService:
         )
         db.session.add(event)
         safe_commit("log_integration_event", {"integration_id": integration_id})
+        return event
 
     def update_integration_active_status(self, integration_id: int):
         """Update integration is_active status based on credentials."""
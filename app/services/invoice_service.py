@@ -300,20 +300,13 @@ class InvoiceService:
         Returns:
             Number of time entries marked as paid
         """
-        time_entry_ids = set()
+        from app.utils.invoice_time_entry_links import billed_time_entry_ids_select
 
-        # Collect all time entry IDs from invoice items
-        for item in InvoiceItem.query.filter_by(invoice_id=invoice.id).all():
-            if item.time_entry_ids:
-                # Parse comma-separated IDs
-                ids = [int(id_str.strip()) for id_str in item.time_entry_ids.split(",") if id_str.strip().isdigit()]
-                time_entry_ids.update(ids)
-
-        if not time_entry_ids:
+        # Time entries linked to the invoice's lines
+        entries = TimeEntry.query.filter(TimeEntry.id.in_(billed_time_entry_ids_select(Invoice.id == invoice.id))).all()
+        if not entries:
             return 0
 
-        # Mark all time entries as paid
-        entries = TimeEntry.query.filter(TimeEntry.id.in_(time_entry_ids)).all()
         marked_count = 0
 
         for entry in entries:
@@ -514,15 +507,10 @@ class InvoiceService:
         project_id = invoice.project_id
         client_id = invoice.client_id
 
-        billed_on_client = self._billed_time_entry_ids_for_client(client_id) if client_id else set()
-        on_this_invoice: set = set()
-        for item in invoice.items.all():
-            if not item.time_entry_ids:
-                continue
-            for part in item.time_entry_ids.split(","):
-                part = part.strip()
-                if part.isdigit():
-                    on_this_invoice.add(int(part))
+        from app.utils.invoice_time_entry_links import billed_time_entry_ids_select
+
+        billed_on_client = self._billed_time_entry_ids_for_client(client_id, project_id) if client_id else set()
+        on_this_invoice = set(db.session.execute(billed_time_entry_ids_select(Invoice.id == invoice.id)).scalars())
 
         all_project_entries = (
             TimeEntry.query.filter(TimeEntry.project_id == project_id).order_by(TimeEntry.start_time.asc()).all()
@@ -639,25 +627,17 @@ class InvoiceService:
             return Decimal("0")
         return Decimal(str(entry.duration_seconds)) / Decimal("3600")
 
-    def _billed_time_entry_ids_for_client(self, client_id: int) -> set:
-        """IDs of time entries already linked to any invoice line for this client."""
-        from app.models import InvoiceItem
+    def _billed_time_entry_ids_for_client(self, client_id: int, project_id: Optional[int] = None) -> set:
+        """IDs of time entries (optionally of one project) already linked to any invoice line for this client."""
+        from app.models import InvoiceItemTimeEntry
+        from app.utils.invoice_time_entry_links import billed_time_entry_ids_select
 
-        billed: set = set()
-        rows = (
-            db.session.query(InvoiceItem.time_entry_ids)
-            .join(Invoice, Invoice.id == InvoiceItem.invoice_id)
-            .filter(Invoice.client_id == client_id, InvoiceItem.time_entry_ids.isnot(None))
-            .all()
-        )
-        for (tids,) in rows:
-            if not tids:
-                continue
-            for part in tids.split(","):
-                p = part.strip()
-                if p.isdigit():
-                    billed.add(int(p))
-        return billed
+        query = billed_time_entry_ids_select(Invoice.client_id == client_id)
+        if project_id is not None:
+            query = query.join(TimeEntry, TimeEntry.id == InvoiceItemTimeEntry.time_entry_id).where(
+                TimeEntry.project_id == project_id
+            )
+        return set(db.session.execute(query).scalars())
 
     def _client_unbilled_invoice_state(self, client_id: int) -> Dict[str, Any]:
         """
@@ -669,6 +649,7 @@ class InvoiceService:
         from sqlalchemy import or_
 
         from app.models import Client, Project, Settings
+        from app.utils.invoice_time_entry_links import billed_clause
 
         client = Client.query.get(client_id)
         if not client:
@@ -682,19 +663,17 @@ class InvoiceService:
         if project_ids:
             conditions.append(TimeEntry.project_id.in_(project_ids))
 
-        candidates = (
+        unbilled = (
             TimeEntry.query.filter(
                 or_(*conditions),
                 TimeEntry.end_time.isnot(None),
                 TimeEntry.billable == True,
+                ~billed_clause(TimeEntry.id, Invoice.client_id == client_id),
             )
             .order_by(TimeEntry.start_time.asc())
             .all()
         )
 
-        billed_ids = self._billed_time_entry_ids_for_client(client_id)
-        unbilled = [e for e in candidates if e.id not in billed_ids]
-
         orphans = [e for e in unbilled if e.project_id is None]
         if orphans:
             return {
@@ -921,6 +900,27 @@ class InvoiceService:
         """Return True if the user may read or modify the invoice."""
         return bool(is_admin or invoice.created_by == user_id)
 
+    def queue_pdf_render(
+        self, invoice_ids: List[int], user_id: int, is_admin: bool, page_size: str = "A4"
+    ) -> Dict[str, Any]:
+        """Queue a background job that renders the given invoices into the PDF cache."""
+        from app.utils.job_queue import enqueue
+
+        if page_size not in ("A4", "Letter", "Legal", "A3", "A5", "Tabloid"):
+            page_size = "A4"
+        query = Invoice.query.filter(Invoice.id.in_(invoice_ids))
+        if not is_admin:
+            query = query.filter(Invoice.created_by == user_id)
+        allowed = sorted(row.id for row in query.with_entities(Invoice.id))
+        if not allowed:
+            return {"success": False, "message": "No accessible invoices", "error": "not_found"}
+        job = enqueue(
+            "render_invoice_pdfs",
+            {"invoice_ids": allowed, "page_size": page_size},
+            user_id=user_id,
+        )
+        return {"success": True, "job": job, "invoice_ids": allowed}
+
     def get_invoice_detail(self, invoice_id: int, user_id: int, is_admin: bool) -> Dict[str, Any]:
         """Load invoice with line items and payments for API detail responses."""
         from sqlalchemy.orm import joinedload
@@ -1082,13 +1082,10 @@ class InvoiceService:
 
         try:
             from app.models import Settings
-            from app.utils.invoice_pdf_postprocess import postprocess_invoice_pdf_bytes
-            from app.utils.pdf_generator import InvoicePDFGenerator
+            from app.utils.pdf_cache import render_invoice_pdf
 
             settings = Settings.get_settings()
-            pdf_generator = InvoicePDFGenerator(invoice, settings=settings, page_size=page_size)
-            pdf_bytes = pdf_generator.generate_pdf()
-            pdf_bytes, embed_err, pdfa_err = postprocess_invoice_pdf_bytes(pdf_bytes, invoice, settings)
+            pdf_bytes, embed_err, pdfa_err = render_invoice_pdf(invoice, settings, page_size=page_size)
             if embed_err or pdfa_err:
                 return {
                     "success": False,
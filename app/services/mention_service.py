@@ -138,7 +138,8 @@ def _emit_socket(user, note):
     """Emit a real-time mention event to the user's Socket.IO room."""
     try:
         from app import socketio
+        from app.utils.realtime import user_room
 
-        socketio.emit("user_mentioned", note, room=f"user_{user.id}")
+        socketio.emit("user_mentioned", note, room=user_room(user.id))
     except Exception:
         pass
@@ -16,6 +16,7 @@ from sqlalchemy import func
 
 from app import db
 from app.models import Project, TimeEntry, WorkdaySession
+from app.utils.time_daily_rollup import seconds_by_day, time_rollup_enabled
 from app.utils.timezone import get_timezone_for_user, get_timezone_obj, now_in_user_timezone
 
 logger = logging.getLogger(__name__)
@@ -107,6 +108,15 @@ def _to_user_local(dt, user_tz, app_tz):
         return None
 
 
+def _rollup_days_match_user(user_tz, app_tz) -> bool:
+    """Whether app-timezone rollup days are the user's calendar days (same zone)."""
+    if not time_rollup_enabled():
+        return False
+    return user_tz is app_tz or (getattr(user_tz, "key", None) or str(user_tz)) == (
+        getattr(app_tz, "key", None) or str(app_tz)
+    )
+
+
 def _format_active_timer(timer) -> Optional[Dict[str, Any]]:
     if timer is None:
         return None
@@ -286,35 +296,41 @@ class ProductivityService:
             user_tz = get_timezone_for_user(user)
             app_tz = get_timezone_obj()
 
-            rows = (
-                db.session.query(
-                    TimeEntry.start_time,
-                    TimeEntry.duration_seconds,
-                    TimeEntry.billable,
-                )
-                .filter(
-                    TimeEntry.user_id == uid,
-                    TimeEntry.end_time.isnot(None),
-                    TimeEntry.start_time >= start_dt,
-                    TimeEntry.start_time < end_dt,
-                )
-                .all()
-            )
-
             by_day_seconds: Dict[date, int] = defaultdict(int)
             by_day_billable: Dict[date, int] = defaultdict(int)
             by_day_count: Dict[date, int] = defaultdict(int)
 
-            for start_time, duration_seconds, billable in rows:
-                local_dt = _to_user_local(start_time, user_tz, app_tz)
-                if local_dt is None:
-                    continue
-                d = local_dt.date()
-                sec = int(duration_seconds or 0)
-                by_day_seconds[d] += sec
-                if billable:
-                    by_day_billable[d] += sec
-                by_day_count[d] += 1
+            if _rollup_days_match_user(user_tz, app_tz):
+                for d, totals in seconds_by_day(start_day, today, user_id=uid).items():
+                    by_day_seconds[d] = totals["seconds"]
+                    by_day_billable[d] = totals["billable_seconds"]
+                    by_day_count[d] = totals["entries"]
+            else:
+                rows = (
+                    db.session.query(
+                        TimeEntry.start_time,
+                        TimeEntry.duration_seconds,
+                        TimeEntry.billable,
+                    )
+                    .filter(
+                        TimeEntry.user_id == uid,
+                        TimeEntry.end_time.isnot(None),
+                        TimeEntry.start_time >= start_dt,
+                        TimeEntry.start_time < end_dt,
+                    )
+                    .all()
+                )
+
+                for start_time, duration_seconds, billable in rows:
+                    local_dt = _to_user_local(start_time, user_tz, app_tz)
+                    if local_dt is None:
+                        continue
+                    d = local_dt.date()
+                    sec = int(duration_seconds or 0)
+                    by_day_seconds[d] += sec
+                    if billable:
+                        by_day_billable[d] += sec
+                    by_day_count[d] += 1
 
             standard_hours = float(getattr(user, "standard_hours_per_day", 8.0) or 8.0)
 
@@ -599,23 +615,27 @@ class ProductivityService:
             user_tz = get_timezone_for_user(user)
             app_tz = get_timezone_obj()
 
-            rows = (
-                db.session.query(TimeEntry.start_time, TimeEntry.duration_seconds)
-                .filter(
-                    TimeEntry.user_id == uid,
-                    TimeEntry.end_time.isnot(None),
-                    TimeEntry.start_time >= start_dt,
-                    TimeEntry.start_time < end_dt,
+            by_day: Dict[date, int] = defaultdict(int)
+            if _rollup_days_match_user(user_tz, app_tz):
+                for d, totals in seconds_by_day(start_day, today, user_id=uid).items():
+                    by_day[d] = totals["seconds"]
+            else:
+                rows = (
+                    db.session.query(TimeEntry.start_time, TimeEntry.duration_seconds)
+                    .filter(
+                        TimeEntry.user_id == uid,
+                        TimeEntry.end_time.isnot(None),
+                        TimeEntry.start_time >= start_dt,
+                        TimeEntry.start_time < end_dt,
+                    )
+                    .all()
                 )
-                .all()
-            )
 
-            by_day: Dict[date, int] = defaultdict(int)
-            for start_time, duration_seconds in rows:
-                local_dt = _to_user_local(start_time, user_tz, app_tz)
-                if local_dt is None:
-                    continue
-                by_day[local_dt.date()] += int(duration_seconds or 0)
+                for start_time, duration_seconds in rows:
+                    local_dt = _to_user_local(start_time, user_tz, app_tz)
+                    if local_dt is None:
+                        continue
+                    by_day[local_dt.date()] += int(duration_seconds or 0)
 
             out: List[Dict[str, Any]] = []
             cur = start_day
@@ -86,30 +86,23 @@ class RecurringInvoiceService:
 
     def _add_time_entry_items(self, recurring_invoice, invoice):
         """Add invoice items from unbilled time entries for the recurring invoice's project."""
-        time_entries = (
+        from app.utils.invoice_time_entry_links import billed_clause
+
+        # Not yet on a line of another invoice of the project
+        billed_elsewhere = billed_clause(
+            TimeEntry.id, Invoice.project_id == recurring_invoice.project_id, Invoice.id != invoice.id
+        )
+        unbilled_entries = (
             TimeEntry.query.filter(
                 TimeEntry.project_id == recurring_invoice.project_id,
                 TimeEntry.end_time.isnot(None),
                 TimeEntry.billable == True,
+                ~billed_elsewhere,
             )
             .order_by(TimeEntry.start_time.desc())
             .all()
         )
 
-        unbilled_entries = []
-        for entry in time_entries:
-            already_billed = False
-            for other_invoice in recurring_invoice.project.invoices:
-                if other_invoice.id != invoice.id:
-                    for item in other_invoice.items:
-                        if item.time_entry_ids and str(entry.id) in item.time_entry_ids.split(","):
-                            already_billed = True
-                            break
-                if already_billed:
-                    break
-            if not already_billed:
-                unbilled_entries.append(entry)
-
         if not unbilled_entries:
             return
 
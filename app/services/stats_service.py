@@ -10,10 +10,11 @@ from sqlalchemy.orm import aliased
 
 from app import db
 from app.config import Config
-from app.models import Client, Project, TimeEntry
+from app.models import Client, Project, TimeDailyRollup, TimeEntry
 from app.models.time_entry import local_now
 from app.utils.cache_redis import cache_key, get_cache, set_cache
 from app.utils.overtime import get_week_start_for_date
+from app.utils.time_daily_rollup import seconds_by_day, time_rollup_enabled
 
 _CACHE_PREFIX = "value_dashboard"
 _CACHE_TTL_SEC = 600
@@ -55,6 +56,55 @@ class StatsService:
         month_start_dt = datetime.combine(month_start, time.min)
         range_start_dt = datetime.combine(range_start_date, time.min)
 
+        if time_rollup_enabled():
+            agg = cls._aggregates_from_rollup(user_id, week_start, month_start, range_start_date, today)
+        else:
+            agg = cls._aggregates_from_entries(
+                user_id, week_start_dt, month_start_dt, range_start_dt, end_exclusive, range_start_date, today
+            )
+
+        total_sec = agg["total_sec"]
+        entries_count = agg["entry_count"]
+        active_days = agg["active_days"]
+        total_hours = round(total_sec / 3600.0, 2)
+        this_week_hours = round(agg["week_sec"] / 3600.0, 2)
+        this_month_hours = round(agg["month_sec"] / 3600.0, 2)
+        avg_session_length = round(total_hours / entries_count, 2) if entries_count else 0.0
+
+        most_productive_day = agg["most_productive_day"]
+        last_7_days = agg["last_7_days"]
+        estimated_value_tracked = agg["estimated_value_tracked"]
+
+        settings = Settings.get_settings()
+        currency = (getattr(settings, "currency", None) or Config.CURRENCY or "EUR").strip()[:3] or "EUR"
+
+        payload: Dict[str, Any] = {
+            "total_hours": total_hours,
+            "entries_count": entries_count,
+            "active_days": active_days,
+            "avg_session_length": avg_session_length,
+            "most_productive_day": most_productive_day,
+            "this_week_hours": this_week_hours,
+            "this_month_hours": this_month_hours,
+            "last_7_days": last_7_days,
+            "estimated_value_tracked": (
+                round(estimated_value_tracked, 2) if estimated_value_tracked and estimated_value_tracked > 0 else None
+            ),
+            "estimated_value_currency": currency,
+        }
+        return payload
+
+    @classmethod
+    def _aggregates_from_entries(
+        cls,
+        user_id: int,
+        week_start_dt: datetime,
+        month_start_dt: datetime,
+        range_start_dt: datetime,
+        end_exclusive: datetime,
+        range_start_date: date,
+        today: date,
+    ) -> Dict[str, Any]:
         base_filter = and_(TimeEntry.user_id == user_id, TimeEntry.end_time.isnot(None))
 
         week_cond = and_(TimeEntry.start_time >= week_start_dt, TimeEntry.start_time < end_exclusive)
@@ -78,36 +128,70 @@ class StatsService:
             .one()
         )
 
-        total_sec = int(main_row.total_sec or 0)
-        entries_count = int(main_row.entry_count or 0)
-        active_days = int(main_row.active_days or 0)
-        total_hours = round(total_sec / 3600.0, 2)
-        this_week_hours = round(int(main_row.week_sec or 0) / 3600.0, 2)
-        this_month_hours = round(int(main_row.month_sec or 0) / 3600.0, 2)
-        avg_session_length = round(total_hours / entries_count, 2) if entries_count else 0.0
+        return {
+            "total_sec": int(main_row.total_sec or 0),
+            "entry_count": int(main_row.entry_count or 0),
+            "active_days": int(main_row.active_days or 0),
+            "week_sec": int(main_row.week_sec or 0),
+            "month_sec": int(main_row.month_sec or 0),
+            "most_productive_day": cls._most_productive_day_english(base_filter),
+            "last_7_days": cls._last_7_days_hours(base_filter, range_start_dt, end_exclusive, range_start_date, today),
+            "estimated_value_tracked": cls._estimated_value_tracked(base_filter),
+        }
 
-        most_productive_day = cls._most_productive_day_english(base_filter)
-        last_7_days = cls._last_7_days_hours(base_filter, range_start_dt, end_exclusive, range_start_date, today)
-        estimated_value_tracked = cls._estimated_value_tracked(base_filter)
+    @classmethod
+    def _aggregates_from_rollup(
+        cls, user_id: int, week_start: date, month_start: date, range_start_date: date, today: date
+    ) -> Dict[str, Any]:
+        """Same aggregates as ``_aggregates_from_entries``, from one row per active day."""
+        by_day = seconds_by_day(user_id=user_id)
 
-        settings = Settings.get_settings()
-        currency = (getattr(settings, "currency", None) or Config.CURRENCY or "EUR").strip()[:3] or "EUR"
+        def period_seconds(first: date) -> int:
+            return sum(t["seconds"] for d, t in by_day.items() if first <= d <= today)
 
-        payload: Dict[str, Any] = {
-            "total_hours": total_hours,
-            "entries_count": entries_count,
-            "active_days": active_days,
-            "avg_session_length": avg_session_length,
+        by_dow = [0] * 7
+        for d, totals in by_day.items():
+            by_dow[(d.weekday() + 1) % 7] += totals["seconds"]
+        best_sec = max(by_dow)
+        most_productive_day = _DOW_ENGLISH[by_dow.index(best_sec)] if best_sec > 0 else None
+
+        last_7_days: List[Dict[str, Any]] = []
+        cur = range_start_date
+        while cur <= today:
+            sec = by_day.get(cur, {}).get("seconds", 0)
+            last_7_days.append({"date": cur.isoformat(), "hours": round(sec / 3600.0, 2)})
+            cur += timedelta(days=1)
+
+        return {
+            "total_sec": sum(t["seconds"] for t in by_day.values()),
+            "entry_count": sum(t["entries"] for t in by_day.values()),
+            "active_days": sum(1 for t in by_day.values() if t["entries"]),
+            "week_sec": period_seconds(week_start),
+            "month_sec": period_seconds(month_start),
             "most_productive_day": most_productive_day,
-            "this_week_hours": this_week_hours,
-            "this_month_hours": this_month_hours,
             "last_7_days": last_7_days,
-            "estimated_value_tracked": (
-                round(estimated_value_tracked, 2) if estimated_value_tracked and estimated_value_tracked > 0 else None
-            ),
-            "estimated_value_currency": currency,
+            "estimated_value_tracked": cls._estimated_value_from_rollup(user_id),
         }
-        return payload
+
+    @classmethod
+    def _estimated_value_from_rollup(cls, user_id: int) -> float:
+        """``_estimated_value_tracked`` over the daily rollup (project rate, else client defaults)."""
+        ClientDirect = aliased(Client)
+        ClientProj = aliased(Client)
+        hours = TimeDailyRollup.total_seconds / 3600.0
+        rate = func.coalesce(Project.hourly_rate, ClientDirect.default_hourly_rate, ClientProj.default_hourly_rate, 0)
+
+        total = (
+            db.session.query(func.coalesce(func.sum(hours * rate), 0))
+            .select_from(TimeDailyRollup)
+            .outerjoin(Project, Project.id == TimeDailyRollup.project_id)
+            .outerjoin(ClientDirect, ClientDirect.id == TimeDailyRollup.client_id)
+            .outerjoin(ClientProj, ClientProj.id == Project.client_id)
+            .filter(TimeDailyRollup.user_id == user_id)
+            .scalar()
+        )
+
+        return float(total or 0)
 
     @classmethod
     def _dow_expression(cls):
@@ -357,34 +357,14 @@ class TaskService:
         )
 
         step_start = time.time()
-        # Pre-calculate total_hours for all tasks in a single query to avoid N+1
-        # This prevents the template from triggering individual queries for each task
+        # total_hours reads the stored Task.tracked_seconds; only status_display needs preloading
         tasks = pagination.items
         logger.debug(
             f"[TaskService.list_tasks] Step 6: Getting pagination items took {(time.time() - step_start) * 1000:.2f}ms ({len(tasks)} tasks)"
         )
 
         if tasks:
-            from app.models import KanbanColumn, TimeEntry
-
-            step_start = time.time()
-            task_ids = [task.id for task in tasks]
-            logger.debug(
-                f"[TaskService.list_tasks] Step 7: Extracting task IDs took {(time.time() - step_start) * 1000:.2f}ms"
-            )
-
-            step_start = time.time()
-            # Calculate total hours for all tasks in one query
-            results = (
-                db.session.query(TimeEntry.task_id, db.func.sum(TimeEntry.duration_seconds).label("total_seconds"))
-                .filter(TimeEntry.task_id.in_(task_ids), TimeEntry.end_time.isnot(None))
-                .group_by(TimeEntry.task_id)
-                .all()
-            )
-            total_hours_map = {task_id: total_seconds for task_id, total_seconds in results}
-            logger.debug(
-                f"[TaskService.list_tasks] Step 8: Calculating total hours query took {(time.time() - step_start) * 1000:.2f}ms ({len(results)} results)"
-            )
+            from app.models import KanbanColumn
 
             step_start = time.time()
             # Pre-load kanban columns to avoid N+1 queries in status_display property
@@ -407,12 +387,8 @@ class TaskService:
             }
 
             step_start = time.time()
-            # Cache the calculated values on task objects to avoid property queries
+            # Cache status_display on task objects to avoid N+1 queries
             for task in tasks:
-                total_seconds = total_hours_map.get(task.id, 0) or 0
-                task._cached_total_hours = round(total_seconds / 3600, 2) if total_seconds else 0.0
-
-                # Cache status_display to avoid N+1 queries
                 task._cached_status_display = status_display_map.get(
                     task.status, fallback_status_map.get(task.status, task.status.replace("_", " ").title())
                 )
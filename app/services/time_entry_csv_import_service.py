@@ -4,11 +4,24 @@ from __future__ import annotations
 
 import csv
 import io
+import logging
+from bisect import bisect_left
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from itertools import islice
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from app.services import TimeTrackingService
+from app import db
+from app.constants import TimeEntrySource
+from app.models import Project, Settings, Task, TimeEntry, User
+from app.services.workforce_governance_service import WorkforceGovernanceService
+from app.utils.bulk_import import IMPORT_CHUNK_SIZE, add_isolated
+from app.utils.db import safe_commit
 from app.utils.scope_filter import user_can_access_project
+from app.utils.time_entry_validation import validate_time_entry_requirements
+from app.utils.workflow_bridge import fire_time_logged_workflow
+
+logger = logging.getLogger(__name__)
 
 
 def _parse_dt(val: Any):
@@ -31,6 +44,37 @@ def _parse_bool(val: Any) -> bool:
     return str(val).strip().lower() in {"1", "true", "yes", "y"}
 
 
+class _OverlapIndex:
+    """Overlap test against a chunk's existing entries plus the entries accepted from the import so far."""
+
+    def __init__(self, existing: List[Tuple[datetime, datetime]]):
+        existing = sorted(existing)
+        self._starts = [s for s, _ in existing]
+        # Latest end among entries starting at or before each position
+        self._max_end: List[datetime] = []
+        for _, end in existing:
+            self._max_end.append(max(end, self._max_end[-1]) if self._max_end else end)
+        # Accepted rows never overlap each other, so their ends are sorted like their starts
+        self._acc_starts: List[datetime] = []
+        self._acc_ends: List[datetime] = []
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        i = bisect_left(self._starts, end)
+        if i and self._max_end[i - 1] > start:
+            return True
+        j = bisect_left(self._acc_starts, end)
+        return bool(j) and self._acc_ends[j - 1] > start
+
+    def add(self, start: datetime, end: datetime) -> None:
+        k = bisect_left(self._acc_starts, start)
+        self._acc_starts.insert(k, start)
+        self._acc_ends.insert(k, end)
+
+
+def _naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
 def import_time_entries_from_csv_text(
     csv_text: str,
     *,
@@ -43,6 +87,13 @@ def import_time_entries_from_csv_text(
     Required columns: start_time, end_time, project_id
     Optional: task_id, notes, tags, billable
 
+    Applies the same checks as ``TimeTrackingService.create_manual_entry``
+    (project access, task, entry requirements, closed periods, overlaps;
+    requirements and overlaps are skipped for admins), but a chunk at a time:
+    projects, tasks, closed periods and existing entries are loaded with one
+    query each per chunk and the chunk's valid rows are inserted in one flush
+    (see ``app.utils.bulk_import``).
+
     Returns (result_dict, http_status).
     """
     if not csv_text or not csv_text.strip():
@@ -61,59 +112,56 @@ def import_time_entries_from_csv_text(
                 return orig
         return name
 
-    svc = TimeTrackingService()
+    user = User.query.get(user_id)
+    allowed = _allowed_project_ids(user)
+    settings = None if is_admin else Settings.get_settings()
+    is_locked = WorkforceGovernanceService().time_entry_lock_checker(user_id)
+    known_projects: Set[int] = set()
+
     created = 0
     failed: List[Dict[str, Any]] = []
     row_num = 1
+    rows = iter(reader)
 
-    for row in reader:
-        row_num += 1
-        try:
-            pid_raw = row.get(col("project_id")) or row.get(col("project id"))
-            if pid_raw is None or str(pid_raw).strip() == "":
-                failed.append({"row": row_num, "error": "project_id is required"})
-                continue
-            project_id = int(str(pid_raw).strip())
-
-            if not user_can_access_project_by_id(user_id, project_id, is_admin):
-                failed.append({"row": row_num, "error": "no access to project"})
-                continue
-
-            st = _parse_dt(row.get(col("start_time")) or row.get(col("start")))
-            et = _parse_dt(row.get(col("end_time")) or row.get(col("end")))
-            if not st or not et:
-                failed.append({"row": row_num, "error": "start_time and end_time required (ISO 8601)"})
-                continue
-
-            task_id = None
-            tr = row.get(col("task_id")) or row.get(col("task id"))
-            if tr is not None and str(tr).strip() != "":
-                task_id = int(str(tr).strip())
-
-            notes = (row.get(col("notes")) or row.get(col("description")) or "").strip() or None
-            tags = (row.get(col("tags")) or "").strip() or None
-            billable = _parse_bool(row.get(col("billable")))
-
-            res = svc.create_manual_entry(
-                user_id=user_id,
-                project_id=project_id,
-                client_id=None,
-                start_time=st,
-                end_time=et,
-                task_id=task_id,
-                notes=notes,
-                tags=tags,
-                billable=billable,
-                paid=False,
-                skip_entry_requirements=is_admin,
-            )
-            if res.get("success"):
-                created += 1
-            else:
-                failed.append({"row": row_num, "error": res.get("message", "create failed")})
-        except Exception as e:
-            failed.append({"row": row_num, "error": str(e)})
+    while True:
+        chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        parsed = []
+        for row in chunk:
+            row_num += 1
+            try:
+                pid_raw = row.get(col("project_id")) or row.get(col("project id"))
+                if pid_raw is None or str(pid_raw).strip() == "":
+                    failed.append({"row": row_num, "error": "project_id is required"})
+                    continue
+                project_id = int(str(pid_raw).strip())
+
+                if allowed is not None and project_id not in allowed:
+                    failed.append({"row": row_num, "error": "no access to project"})
+                    continue
+
+                st = _parse_dt(row.get(col("start_time")) or row.get(col("start")))
+                et = _parse_dt(row.get(col("end_time")) or row.get(col("end")))
+                if not st or not et:
+                    failed.append({"row": row_num, "error": "start_time and end_time required (ISO 8601)"})
+                    continue
+
+                task_id = None
+                tr = row.get(col("task_id")) or row.get(col("task id"))
+                if tr is not None and str(tr).strip() != "":
+                    task_id = int(str(tr).strip())
 
+                notes = (row.get(col("notes")) or row.get(col("description")) or "").strip() or None
+                tags = (row.get(col("tags")) or "").strip() or None
+                billable = _parse_bool(row.get(col("billable")))
+                parsed.append((row_num, project_id, task_id, st, et, notes, tags, billable))
+            except Exception as e:
+                failed.append({"row": row_num, "error": str(e)})
+
+        created += _create_chunk(parsed, user_id, is_admin, settings, is_locked, known_projects, failed)
+
+    failed.sort(key=lambda item: item["row"])
     return (
         {
             "success": True,
@@ -125,9 +173,114 @@ def import_time_entries_from_csv_text(
     )
 
 
-def user_can_access_project_by_id(user_id: int, project_id: int, is_admin: bool) -> bool:
-    from app.models import User
+def _create_chunk(parsed, user_id, is_admin, settings, is_locked, known_projects, failed):
+    """Validate one chunk of parsed rows against batched lookups, insert the valid ones and commit; returns rows created."""
+    if not parsed:
+        return 0
+    project_ids = {p[1] for p in parsed} - known_projects
+    if project_ids:
+        known_projects.update(pid for (pid,) in db.session.query(Project.id).filter(Project.id.in_(project_ids)))
+    task_ids = {p[2] for p in parsed if p[2] is not None}
+    task_projects = (
+        dict(db.session.query(Task.id, Task.project_id).filter(Task.id.in_(task_ids)).all()) if task_ids else {}
+    )
+    overlap = None
+    if not is_admin:
+        window_start = min(_naive(p[3]) for p in parsed)
+        window_end = max(_naive(p[4]) for p in parsed)
+        overlap = _OverlapIndex(
+            db.session.query(TimeEntry.start_time, TimeEntry.end_time)
+            .filter(
+                TimeEntry.user_id == user_id,
+                TimeEntry.start_time < window_end,
+                TimeEntry.end_time > window_start,
+                TimeEntry.end_time.isnot(None),
+            )
+            .all()
+        )
+
+    entries = []
+    for row_num, project_id, task_id, st, et, notes, tags, billable in parsed:
+        error = None
+        if project_id not in known_projects:
+            error = "Invalid project"
+        elif task_id and task_projects.get(task_id) != project_id:
+            error = "Invalid task for selected project"
+        elif settings is not None:
+            err = validate_time_entry_requirements(
+                settings, project_id=project_id, client_id=None, task_id=task_id, notes=notes
+            )
+            error = err["message"] if err else None
+        if error is None:
+            if is_locked(st, et):
+                error = "Timesheet period is closed for the selected date range"
+            elif et <= st:
+                error = "End time must be after start time"
+            elif overlap is not None and overlap.overlaps(_naive(st), _naive(et)):
+                error = (
+                    "This time overlaps with an existing entry. Please choose a different time range "
+                    "or edit the existing entry."
+                )
+        if error:
+            failed.append({"row": row_num, "error": error})
+            continue
+        if overlap is not None:
+            overlap.add(_naive(st), _naive(et))
+        entries.append(
+            (
+                row_num,
+                {
+                    "user_id": user_id,
+                    "project_id": project_id,
+                    "task_id": task_id,
+                    "start_time": st,
+                    "end_time": et,
+                    "break_seconds": 0,
+                    "notes": notes,
+                    "tags": tags,
+                    "billable": billable,
+                    "paid": False,
+                    "source": TimeEntrySource.MANUAL.value,
+                },
+            )
+        )
+
+    added, errors = add_isolated(TimeEntry, entries)
+    for row_num, exc in errors.items():
+        logger.warning("CSV import row %s could not be inserted: %s", row_num, exc)
+        failed.append({"row": row_num, "error": "Could not create time entry due to a database error"})
+    # Workflow payloads are read before the commit expires the entries
+    logged = [
+        SimpleNamespace(
+            id=e.id,
+            project_id=e.project_id,
+            client_id=e.client_id,
+            task_id=e.task_id,
+            duration_seconds=e.duration_seconds,
+        )
+        for e in added.values()
+    ]
+    if not safe_commit("import_time_entries_csv", {"user_id": user_id, "rows": len(added)}):
+        failed.extend(
+            {"row": row_num, "error": "Could not create time entry due to a database error"} for row_num in added
+        )
+        return 0
+    for entry in logged:
+        fire_time_logged_workflow(entry, user_id)
+    return len(logged)
 
+
+def _allowed_project_ids(user) -> Optional[Set[int]]:
+    """Project ids ``user`` may log time on, or None for all (mirrors ``user_can_access_project``)."""
+    if not user:
+        return set()
+    if user.is_admin:
+        return None
+    allowed = user.get_allowed_project_ids()
+    return None if allowed is None else set(allowed)
+
+
+def user_can_access_project_by_id(user_id: int, project_id: int, is_admin: bool) -> bool:
     u = User.query.get(user_id)
     if not u:
         return False
@@ -15,7 +15,8 @@ from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import joinedload
 
 from app import db
-from app.models import Client, InvoiceItem, Project, TimeEntry
+from app.models import Client, Project, TimeEntry
+from app.utils.invoice_time_entry_links import billed_clause
 
 
 class UnpaidHoursService:
@@ -36,7 +37,7 @@ class UnpaidHoursService:
         Unpaid means:
         - billable = True
         - paid = False
-        - Not referenced in any InvoiceItem.time_entry_ids
+        - Not linked to any invoice line (invoice_item_time_entries)
 
         Args:
             start_date: Filter entries from this date
@@ -71,22 +72,12 @@ class UnpaidHoursService:
         if user_id:
             query = query.filter(TimeEntry.user_id == user_id)
 
-        # Get all entries first
-        all_entries = query.options(joinedload(TimeEntry.project), joinedload(TimeEntry.client)).all()
-
-        # Get all billed time entry IDs from invoice items
-        billed_entry_ids = set()
-        invoice_items = InvoiceItem.query.filter(InvoiceItem.time_entry_ids.isnot(None)).all()
-        for item in invoice_items:
-            if item.time_entry_ids:
-                try:
-                    entry_ids = [int(id_str.strip()) for id_str in item.time_entry_ids.split(",") if id_str.strip()]
-                    billed_entry_ids.update(entry_ids)
-                except (ValueError, AttributeError):
-                    continue
-
-        # Filter out billed entries
-        unpaid_entries = [entry for entry in all_entries if entry.id not in billed_entry_ids]
+        # Leave out entries on any invoice line
+        unpaid_entries = (
+            query.filter(~billed_clause(TimeEntry.id))
+            .options(joinedload(TimeEntry.project), joinedload(TimeEntry.client))
+            .all()
+        )
 
         # Apply custom field filter if provided
         if custom_field_filter:
@@ -11,10 +11,14 @@ class UsageStatsService:
     """Read/write lightweight counters and engagement metrics for support UI."""
 
     @staticmethod
-    def get_for_user(user_id: int, month_hours: Optional[float] = None) -> Dict[str, Any]:
+    def get_for_user(
+        user_id: int, month_hours: Optional[float] = None, engagement: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Usage stats for the support UI; pass ``engagement`` to reuse already loaded metrics."""
         from app.models import DonationInteraction, User
 
-        base = DonationInteraction.get_user_engagement_metrics(user_id) or {}
+        base = engagement if engagement is not None else DonationInteraction.get_user_engagement_metrics(user_id)
+        base = base or {}
         reports_count = 0
         try:
             u = db.session.get(User, user_id)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
@@ -159,6 +160,30 @@ class WorkforceGovernanceService:
         ).first()
         return locked is not None
 
+    def time_entry_lock_checker(self, user_id: int):
+        """Return ``check(start_time, end_time) -> bool`` answering ``is_time_entry_locked`` from memory.
+
+        Loads the user's closed periods once, for callers that check many entries (bulk imports).
+        """
+        periods = (
+            db.session.query(TimesheetPeriod.period_start, TimesheetPeriod.period_end)
+            .filter(TimesheetPeriod.user_id == user_id, TimesheetPeriod.status == TimesheetPeriodStatus.CLOSED)
+            .order_by(TimesheetPeriod.period_end)
+            .all()
+        )
+        ends = [p.period_end for p in periods]
+        # Earliest period start among the periods ending at or after each position
+        min_start_from = [p.period_start for p in periods]
+        for i in range(len(min_start_from) - 2, -1, -1):
+            min_start_from[i] = min(min_start_from[i], min_start_from[i + 1])
+
+        def check(start_time: datetime, end_time: Optional[datetime] = None) -> bool:
+            end_date = (end_time or start_time).date()
+            i = bisect_left(ends, start_time.date())
+            return i < len(ends) and min_start_from[i] <= end_date
+
+        return check
+
     def apply_auto_lock(self, actor_id: Optional[int] = None) -> int:
         policy = self.get_or_create_default_policy()
         if policy.auto_lock_days is None:
@@ -426,23 +451,41 @@ class WorkforceGovernanceService:
         approved_only: bool = False,
         closed_only: bool = False,
     ) -> List[Dict[str, Any]]:
-        entries_query = TimeEntry.query.filter(
-            TimeEntry.end_time.isnot(None),
-            TimeEntry.start_time >= datetime.combine(start_date, datetime.min.time()),
-            TimeEntry.start_time <= datetime.combine(end_date, datetime.max.time()),
+        # Column-only rows fetched in batches: payroll exports span whole teams and months
+        entries_query = (
+            TimeEntry.query.outerjoin(User, TimeEntry.user_id == User.id)
+            .filter(
+                TimeEntry.end_time.isnot(None),
+                TimeEntry.start_time >= datetime.combine(start_date, datetime.min.time()),
+                TimeEntry.start_time <= datetime.combine(end_date, datetime.max.time()),
+            )
+            .with_entities(
+                TimeEntry.user_id,
+                TimeEntry.start_time,
+                TimeEntry.duration_seconds,
+                TimeEntry.billable,
+                User.username,
+            )
+            .execution_options(yield_per=1000)
         )
         if user_id is not None:
             entries_query = entries_query.filter(TimeEntry.user_id == user_id)
 
         rows: Dict[tuple, Dict[str, Any]] = {}
-        for entry in entries_query.all():
+        # Weekly period status per (user, ISO week); looked up once rather than per entry
+        period_status: Dict[tuple, str] = {}
+        # Period lookups may create (and commit) missing periods, which would close a streamed result
+        entries = entries_query.all() if (approved_only or closed_only) else entries_query
+        for entry in entries:
             key = (entry.user_id, entry.start_time.date().isocalendar()[:2])
 
             if approved_only or closed_only:
-                period = self.get_or_create_period_for_date(
-                    entry.user_id, entry.start_time.date(), period_type="weekly"
-                )
-                status_value = period.status.value if hasattr(period.status, "value") else str(period.status)
+                if key not in period_status:
+                    period = self.get_or_create_period_for_date(
+                        entry.user_id, entry.start_time.date(), period_type="weekly"
+                    )
+                    period_status[key] = period.status.value if hasattr(period.status, "value") else str(period.status)
+                status_value = period_status[key]
                 if approved_only and status_value != TimesheetPeriodStatus.APPROVED.value:
                     continue
                 if closed_only and status_value != TimesheetPeriodStatus.CLOSED.value:
@@ -452,7 +495,7 @@ class WorkforceGovernanceService:
                 week_year, week_no = entry.start_time.date().isocalendar()[0], entry.start_time.date().isocalendar()[1]
                 rows[key] = {
                     "user_id": entry.user_id,
-                    "username": entry.user.username if entry.user else None,
+                    "username": entry.username,
                     "week_year": week_year,
                     "week_number": week_no,
                     "period_start": None,
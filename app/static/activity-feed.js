@@ -175,7 +175,9 @@ class ActivityFeed {
     setupWebSocket() {
         // Listen for real-time activity updates via WebSocket
         if (typeof io !== 'undefined') {
-            io.on('activity_created', (data) => {
+            this.socket = io();
+            this.socket.on('connect', () => this.socket.emit('join_activity_feed', {}));
+            this.socket.on('activity_created', (data) => {
                 if (data.activity) {
                     this.activities.unshift(data.activity);
                     if (this.activities.length > this.options.limit) {
@@ -218,8 +220,9 @@ class ActivityFeed {
         if (this.refreshTimer) {
             clearInterval(this.refreshTimer);
         }
-        if (typeof io !== 'undefined') {
-            io.off('activity_created');
+        if (this.socket) {
+            this.socket.disconnect();
+            this.socket = null;
         }
     }
 }
@@ -5,8 +5,13 @@
 (function () {
     'use strict';
 
+    // Fallback polling while the real-time socket is down; pushes replace it otherwise
     const POLL_INTERVAL_MS = 30000;
 
+    function realtimeConnected() {
+        return !!(window.ttRealtime && window.ttRealtime.connected);
+    }
+
     function syncFabDesktopHide(timerData) {
         try {
             var md = typeof window.matchMedia === 'function' && window.matchMedia('(min-width: 768px)').matches;
@@ -22,6 +27,9 @@
             this.elapsedInterval = null;
             this.timerData = null;
             this.startTime = null;
+            this.fetchedAt = 0;
+            this.etag = null;
+            this.version = null;
             this.startLabel = 'Start Timer';
             this.stopLabel = 'Stop';
             this.init();
@@ -34,14 +42,31 @@
             this.stopLabel = this.bar.dataset.stopLabel || 'Stop';
             this.render();
             this.fetchStatus();
-            this.pollTimer = setInterval(() => this.fetchStatus(), POLL_INTERVAL_MS);
+            this.pollTimer = setInterval(() => {
+                if (!realtimeConnected()) this.fetchStatus();
+            }, POLL_INTERVAL_MS);
             window.addEventListener('focus', () => this.fetchStatus());
+            // Pushed on start/stop/pause/resume of this user's timer (any tab, device or API client)
+            document.addEventListener('tt:timer-state', (e) => {
+                const version = e.detail && e.detail.version;
+                if (version == null || version !== this.version) this.fetchStatus();
+            });
+            // Catch up on changes missed while the socket was down
+            document.addEventListener('tt:realtime', (e) => {
+                if (e.detail && e.detail.connected) this.fetchStatus();
+            });
         }
 
         async fetchStatus() {
             try {
-                const res = await fetch('/timer/status', { credentials: 'same-origin' });
+                const headers = this.etag ? { 'If-None-Match': this.etag } : {};
+                const res = await fetch('/timer/status', { credentials: 'same-origin', cache: 'no-store', headers });
+                if (res.status === 304) return;
+                if (!res.ok) return;
                 const data = await res.json();
+                this.etag = res.headers.get('ETag');
+                this.version = data.version != null ? data.version : null;
+                this.fetchedAt = Date.now();
                 if (data.active && data.timer) {
                     this.timerData = data.timer;
                     this.startTime = new Date(data.timer.start_time).getTime();
@@ -66,8 +91,9 @@
                 if (this.timerData.paused) {
                     elapsedSec = this.timerData.current_duration || 0;
                 } else {
+                    // current_duration is as of the last 200 response; 304s keep it
                     elapsedSec = this.timerData.current_duration != null
-                        ? this.timerData.current_duration
+                        ? this.timerData.current_duration + Math.max(0, Math.floor((Date.now() - this.fetchedAt) / 1000))
                         : (this.startTime ? Math.floor((Date.now() - this.startTime) / 1000) : 0);
                 }
                 const h = Math.floor(elapsedSec / 3600);
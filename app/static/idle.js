@@ -24,6 +24,9 @@
   );
 
   async function getTimer(){
+    // The floating timer bar keeps the state current (socket pushes, polling fallback)
+    const bar = window.floatingTimerBar;
+    if (bar && bar.bar) return bar.timerData || null;
     try {
       const r = await fetch('/api/timer/status');
       if (!r.ok) return null; const j = await r.json();
@@ -116,6 +119,9 @@
   let lastNotificationsFetch = { at: 0, payload: null };
   let lastResetDay = new Date().toDateString();
 
+  // Timer changes alter which reminders apply: refetch on the next check
+  document.addEventListener('tt:timer-state', function(){ lastNotificationsFetch = { at: 0, payload: null }; });
+
   function resetReminderFlagsIfNewDay(){
     const today = new Date().toDateString();
     if (today !== lastResetDay){
@@ -362,6 +362,12 @@ class SmartNotificationManager {
         try {
             setTimeout(() => this.pollServerSmartNotifications(), 12000);
             setInterval(() => this.pollServerSmartNotifications(), this._serverSmartPollMs);
+            // Timer start/stop changes which nudges apply: poll soon after a pushed change
+            let timerStateDebounce = null;
+            document.addEventListener('tt:timer-state', () => {
+                clearTimeout(timerStateDebounce);
+                timerStateDebounce = setTimeout(() => this.pollServerSmartNotifications(), 2000);
+            });
         } catch (e) {
             console.error('[SmartNotifications] server poll init:', e);
         }
@@ -0,0 +1,225 @@
+"""
+Batched, asynchronous OTLP log exporter for product analytics events.
+
+``send_analytics_event`` and ``identify_user`` run inside request handlers, so
+posting every event synchronously added up to the collector timeout (5 s) to
+user requests. They now hand a ready-built OTLP log record to
+``OTLPLogBatchExporter.submit``, which only puts it on a bounded in-process
+queue:
+
+- a daemon thread drains the queue and posts one multi-record OTLP logs payload
+  per endpoint when ``TELEMETRY_EXPORT_BATCH_SIZE`` records are waiting or
+  ``TELEMETRY_EXPORT_FLUSH_SECONDS`` after the first record of a batch;
+- failed posts are retried ``TELEMETRY_EXPORT_MAX_RETRIES`` times with
+  exponential backoff, then the batch is dropped;
+- when the queue (``TELEMETRY_EXPORT_QUEUE_SIZE``) is full new records are
+  dropped, never blocking the caller;
+- the queue is flushed at interpreter exit.
+
+Prometheus metrics: ``tt_telemetry_export_queue_depth``,
+``tt_telemetry_export_batch_size``, ``tt_telemetry_export_latency_seconds``,
+``tt_telemetry_events_exported_total`` and ``tt_telemetry_events_dropped_total``
+(by reason). Base telemetry (first seen, heartbeat) stays synchronous: it runs
+off the request path and its callers record whether it was delivered.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib import request
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+EXPORT_QUEUE_DEPTH = Gauge("tt_telemetry_export_queue_depth", "Analytics events waiting to be exported")
+EXPORT_BATCH_SIZE = Histogram(
+    "tt_telemetry_export_batch_size",
+    "Analytics events per exported OTLP payload",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500),
+)
+EXPORT_LATENCY = Histogram("tt_telemetry_export_latency_seconds", "Duration of OTLP analytics exports (incl. retries)")
+EVENTS_EXPORTED = Counter("tt_telemetry_events_exported_total", "Analytics events delivered to the collector")
+EVENTS_DROPPED = Counter("tt_telemetry_events_dropped_total", "Analytics events dropped", ["reason"])
+
+_exporter: Optional["OTLPLogBatchExporter"] = None
+_exporter_lock = threading.Lock()
+
+
+def post_otlp_json(endpoint: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float = 5) -> int:
+    """POST an OTLP JSON payload; returns the HTTP status, raises on network and HTTP errors"""
+    req = request.Request(endpoint, data=json.dumps(payload).encode("utf-8"), method="POST", headers=headers)
+    with request.urlopen(req, timeout=timeout) as response:
+        return getattr(response, "status", 200)
+
+
+def otlp_logs_payload(resource_attributes: List[Dict[str, Any]], records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """OTLP logs payload of ``records`` under one resource"""
+    return {
+        "resourceLogs": [
+            {
+                "resource": {"attributes": resource_attributes},
+                "scopeLogs": [{"scope": {"name": "timetracker.telemetry"}, "logRecords": records}],
+            }
+        ]
+    }
+
+
+class OTLPLogBatchExporter:
+    """Bounded queue of OTLP log records drained by a background thread"""
+
+    def __init__(
+        self,
+        max_queue_size: int = 2000,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        timeout: float = 5.0,
+        sender: Optional[Callable[[str, Dict[str, str], Dict[str, Any], float], Any]] = None,
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff = max(0.0, float(retry_backoff))
+        self.timeout = float(timeout)
+        self.sender = sender or post_otlp_json
+
+        self._queue: "queue.Queue[Tuple[str, Tuple[Tuple[str, str], ...], str, Dict[str, Any]]]" = queue.Queue(
+            maxsize=max(1, int(max_queue_size))
+        )
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            # A thread started before a fork does not exist in the child
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="telemetry-exporter", daemon=True)
+            self._thread.start()
+
+    def submit(
+        self,
+        endpoint: str,
+        headers: Dict[str, str],
+        resource_attributes: List[Dict[str, Any]],
+        record: Dict[str, Any],
+    ) -> bool:
+        """Queue one log record without blocking; returns False if it was dropped"""
+        if not self.running:
+            self.start()
+        resource_key = json.dumps(resource_attributes, sort_keys=True)
+        try:
+            self._queue.put_nowait((endpoint, tuple(sorted(headers.items())), resource_key, record))
+        except queue.Full:
+            EVENTS_DROPPED.labels(reason="queue_full").inc()
+            return False
+        EXPORT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop the thread after exporting what is queued (waits up to ``timeout`` seconds)"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout=timeout)
+
+    def flush(self) -> int:
+        """Export everything queued on the calling thread; returns the number of records delivered"""
+        delivered = 0
+        while True:
+            batch = self._take(block=False)
+            if not batch:
+                return delivered
+            delivered += self._export(batch)
+
+    def _take(self, block: bool = True) -> list:
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                if not block or self._stop.is_set():
+                    # Draining: take what is queued without waiting
+                    item = self._queue.get_nowait()
+                elif batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if not block or batch or self._stop.is_set():
+                    break
+                continue
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        EXPORT_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take()
+            if batch:
+                self._export(batch)
+            elif self._stop.is_set():
+                break
+
+    def _export(self, batch: list) -> int:
+        groups: Dict[Tuple[str, tuple, str], List[Dict[str, Any]]] = {}
+        for endpoint, headers, resource_key, record in batch:
+            groups.setdefault((endpoint, headers, resource_key), []).append(record)
+
+        delivered = 0
+        for (endpoint, headers, resource_key), records in groups.items():
+            payload = otlp_logs_payload(json.loads(resource_key), records)
+            EXPORT_BATCH_SIZE.observe(len(records))
+            started = time.monotonic()
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.sender(endpoint, dict(headers), payload, self.timeout)
+                except Exception as exc:
+                    if attempt >= self.max_retries:
+                        logger.warning("telemetry.fail records=%s error=%s", len(records), exc)
+                        EVENTS_DROPPED.labels(reason="export_failed").inc(len(records))
+                        break
+                    # Shorter waits while shutting down so exit is not held up
+                    delay = self.retry_backoff * (2**attempt)
+                    time.sleep(min(delay, 0.5) if self._stop.is_set() else delay)
+                    continue
+                delivered += len(records)
+                EVENTS_EXPORTED.inc(len(records))
+                break
+            EXPORT_LATENCY.observe(time.monotonic() - started)
+        return delivered
+
+
+def get_exporter() -> OTLPLogBatchExporter:
+    """Process-wide exporter configured from ``TELEMETRY_EXPORT_*`` environment variables"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = OTLPLogBatchExporter(
+                    max_queue_size=int(os.getenv("TELEMETRY_EXPORT_QUEUE_SIZE", "2000")),
+                    batch_size=int(os.getenv("TELEMETRY_EXPORT_BATCH_SIZE", "100")),
+                    flush_interval=float(os.getenv("TELEMETRY_EXPORT_FLUSH_SECONDS", "2")),
+                    max_retries=int(os.getenv("TELEMETRY_EXPORT_MAX_RETRIES", "3")),
+                )
+                atexit.register(_exporter.shutdown)
+    return _exporter
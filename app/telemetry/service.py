@@ -6,16 +6,16 @@ Consent-aware telemetry service backed by Grafana Cloud OTLP.
 """
 
 import base64
-import json
 import logging
 import os
 import platform
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
-from urllib import request
 from urllib.parse import urlparse
 
+from app.telemetry.exporter import get_exporter, otlp_logs_payload, post_otlp_json
+
 logger = logging.getLogger(__name__)
 
 BASE_SCHEMA_KEYS = frozenset(
@@ -148,19 +148,21 @@ def _to_otlp_any_value(value: Any) -> Dict[str, Any]:
     return {"stringValue": str(value)}
 
 
-def _build_otlp_logs_payload(
+def _build_otlp_resource_attributes(service_version: str) -> List[Dict[str, Any]]:
+    return [
+        {"key": "service.name", "value": {"stringValue": "timetracker"}},
+        {"key": "service.version", "value": {"stringValue": str(service_version or "unknown")}},
+        {"key": "deployment.environment", "value": {"stringValue": os.getenv("FLASK_ENV", "production")}},
+    ]
+
+
+def _build_otlp_log_record(
     event_name: str,
     identity: str,
     detailed: bool,
     safe_props: Dict[str, Any],
-    service_version: str,
 ) -> Dict[str, Any]:
     now_nanos = str(int(time.time() * 1_000_000_000))
-    resource_attributes = [
-        {"key": "service.name", "value": {"stringValue": "timetracker"}},
-        {"key": "service.version", "value": {"stringValue": str(service_version or "unknown")}},
-        {"key": "deployment.environment", "value": {"stringValue": os.getenv("FLASK_ENV", "production")}},
-    ]
     record_attributes = [
         {"key": "event_name", "value": {"stringValue": event_name}},
         {"key": "identity", "value": {"stringValue": str(identity)}},
@@ -171,28 +173,32 @@ def _build_otlp_logs_payload(
         record_attributes.append({"key": str(key), "value": _to_otlp_any_value(value)})
 
     return {
-        "resourceLogs": [
-            {
-                "resource": {"attributes": resource_attributes},
-                "scopeLogs": [
-                    {
-                        "scope": {"name": "timetracker.telemetry"},
-                        "logRecords": [
-                            {
-                                "timeUnixNano": now_nanos,
-                                "severityText": "INFO",
-                                "body": {"stringValue": event_name},
-                                "attributes": record_attributes,
-                            }
-                        ],
-                    }
-                ],
-            }
-        ]
+        "timeUnixNano": now_nanos,
+        "severityText": "INFO",
+        "body": {"stringValue": event_name},
+        "attributes": record_attributes,
     }
 
 
+def _build_otlp_logs_payload(
+    event_name: str,
+    identity: str,
+    detailed: bool,
+    safe_props: Dict[str, Any],
+    service_version: str,
+) -> Dict[str, Any]:
+    return otlp_logs_payload(
+        _build_otlp_resource_attributes(service_version),
+        [_build_otlp_log_record(event_name, identity, detailed, safe_props)],
+    )
+
+
 def _send_otlp_event(event_name: str, identity: str, properties: Dict[str, Any], detailed: bool) -> bool:
+    """Send one event to the OTLP logs endpoint
+
+    Detailed (product analytics) events are queued on the batch exporter and
+    return True once queued; base telemetry is posted synchronously.
+    """
     from app.config.analytics_defaults import get_analytics_config
 
     config = get_analytics_config()
@@ -217,14 +223,13 @@ def _send_otlp_event(event_name: str, identity: str, properties: Dict[str, Any],
         endpoint = f"{endpoint}/v1/logs"
 
     safe_props = _remove_pii(properties) if detailed else properties
-    payload = _build_otlp_logs_payload(
+    resource_attributes = _build_otlp_resource_attributes(str(config.get("app_version", "unknown")))
+    record = _build_otlp_log_record(
         event_name=event_name,
         identity=str(identity),
         detailed=detailed,
         safe_props=safe_props,
-        service_version=str(config.get("app_version", "unknown")),
     )
-    body = json.dumps(payload).encode("utf-8")
     auth_header = _build_otlp_auth_header(token)
     headers = {
         "Content-Type": "application/json",
@@ -245,17 +250,17 @@ def _send_otlp_event(event_name: str, identity: str, properties: Dict[str, Any],
             len(safe_props),
         )
 
-    req = request.Request(
-        endpoint,
-        data=body,
-        method="POST",
-        headers=headers,
-    )
+    if detailed:
+        queued = get_exporter().submit(endpoint, headers, resource_attributes, record)
+        if not queued and _telemetry_debug_logging_enabled():
+            logger.info("telemetry.drop event=%s reason=queue_full", event_name)
+        return queued
+
     try:
-        with request.urlopen(req, timeout=5) as response:
-            if _telemetry_debug_logging_enabled():
-                logger.info("telemetry.ok event=%s status=%s", event_name, getattr(response, "status", "unknown"))
-            return True
+        status = post_otlp_json(endpoint, headers, otlp_logs_payload(resource_attributes, [record]), timeout=5)
+        if _telemetry_debug_logging_enabled():
+            logger.info("telemetry.ok event=%s status=%s", event_name, status)
+        return True
     except Exception as exc:
         logger.warning("telemetry.fail event=%s error=%s", event_name, exc)
         return False
@@ -0,0 +1,304 @@
+"""
+Compiled per-user permission sets and enabled-module sets.
+
+``User.has_permission`` and ``ModuleRegistry.is_enabled`` are called many
+times per request (every sidebar item, every ``module_enabled`` route, every
+permission-gated button). Instead of walking roles, permissions and module
+dependencies on each call, a user's effective access is compiled once into
+frozensets:
+
+- ``permissions_for(user)``: permission names, or ``ALL_PERMISSIONS`` for
+  legacy admins without roles;
+- ``enabled_modules_for(user, settings)``: module IDs enabled for the user
+  under ``settings.disabled_module_ids``.
+
+Compiled sets are cached per application in ``app.extensions`` under
+``(user_id, role_version, shared_version[, disabled_module_ids])`` and
+memoized on ``flask.g`` for the request. Whenever a flush writes a ``Role``,
+a ``Permission`` or a user's ``role``/``roles``:
+
+- the in-process role version is bumped;
+- the ``access`` row of ``cache_versions`` is incremented on the flush's
+  connection, so it commits with the change. Every worker reads that shared
+  version once per request, so a revoked permission stops applying everywhere
+  on the next request instead of after the TTL.
+
+A changed ``disabled_module_ids`` is a different key. Entries also expire
+after ``PERMISSION_CACHE_TTL`` seconds, which only matters when the shared
+version cannot be read (e.g. before the migration ran).
+
+Users (or their roles) with unflushed changes are compiled without caching,
+so an in-progress edit is never hidden by or leaked into the cache.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, FrozenSet, Hashable, Optional
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "access_cache"
+_DEFAULT_TTL_SECONDS = 60
+_MAX_ENTRIES = 4096
+_SESSION_INFO_KEY = "access_cache_dirty"
+_SHARED_VERSION_NAME = "access"
+# Outside requests the shared version is re-read at most this often
+_SHARED_VERSION_MAX_AGE = 1.0
+
+
+class _AllPermissions(frozenset):
+    """Permission set of a legacy admin: contains every permission name"""
+
+    def __contains__(self, item) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return "ALL_PERMISSIONS"
+
+
+ALL_PERMISSIONS = _AllPermissions()
+
+_version_lock = threading.Lock()
+_role_version = 0
+_cache_lock = threading.Lock()
+_shared_memo = (0.0, None)  # (read_at, version) for callers outside a request
+
+
+def get_role_version() -> int:
+    """Return the current in-process role/permission version."""
+    return _role_version
+
+
+def bump_role_version() -> int:
+    """Invalidate every compiled permission and module set in this process."""
+    global _role_version
+    with _version_lock:
+        _role_version += 1
+        return _role_version
+
+
+def _read_shared_version() -> Optional[int]:
+    from app import db
+    from app.models import CacheVersion
+
+    table = CacheVersion.__table__
+    try:
+        # Own connection: a failed read must not abort the request's transaction
+        with db.engine.connect() as connection:
+            version = connection.execute(
+                table.select().with_only_columns(table.c.version).where(table.c.name == _SHARED_VERSION_NAME)
+            ).scalar()
+    except Exception as e:
+        logger.debug(f"Could not read the shared access cache version: {e}")
+        return None
+    return int(version or 0)
+
+
+def get_shared_role_version() -> Optional[int]:
+    """Role version stored in ``cache_versions`` (None when it cannot be read); read once per request."""
+    global _shared_memo
+    if has_request_context():
+        if "_access_shared_version" not in g:
+            g._access_shared_version = _read_shared_version()
+        return g._access_shared_version
+    now = time.monotonic()
+    read_at, version = _shared_memo
+    if now - read_at >= _SHARED_VERSION_MAX_AGE:
+        version = _read_shared_version()
+        _shared_memo = (now, version)
+    return version
+
+
+def _bump_shared_version(connection) -> None:
+    """Increment the shared version on ``connection`` so it commits or rolls back with the change.
+
+    Runs in savepoints: a failure (e.g. table not migrated yet) must not abort the caller's transaction.
+    """
+    from app.models import CacheVersion
+
+    table = CacheVersion.__table__
+    now = datetime.utcnow()
+    increment = (
+        table.update().where(table.c.name == _SHARED_VERSION_NAME).values(version=table.c.version + 1, updated_at=now)
+    )
+    with connection.begin_nested():
+        if connection.execute(increment).rowcount:
+            return
+    try:
+        with connection.begin_nested():
+            connection.execute(table.insert().values(name=_SHARED_VERSION_NAME, version=1, updated_at=now))
+    except IntegrityError:
+        # Another transaction created the row first
+        with connection.begin_nested():
+            connection.execute(increment)
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(current_app.config.get("PERMISSION_CACHE_TTL", _DEFAULT_TTL_SECONDS))
+    except (TypeError, ValueError, RuntimeError):
+        return _DEFAULT_TTL_SECONDS
+
+
+def _has_pending_changes(user) -> bool:
+    """True if the user or one of its roles has changes not yet flushed (or is not persisted)."""
+    try:
+        state = sa_inspect(user)
+    except Exception:
+        return True
+    if not state.persistent:
+        return True
+    if state.attrs.role.history.has_changes() or state.attrs.roles.history.has_changes():
+        return True
+    for role in user.roles:
+        role_state = sa_inspect(role)
+        if not role_state.persistent or role_state.modified:
+            return True
+    return False
+
+
+def _cached(key: Hashable, compile_fn: Callable[[], Any]) -> Any:
+    if has_request_context():
+        memo = g.get("_access_cache")
+        if memo is None:
+            memo = g._access_cache = {}
+        if key in memo:
+            return memo[key]
+
+    cache = current_app.extensions.setdefault(_EXTENSION_KEY, OrderedDict())
+    now = time.monotonic()
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is not None and now - entry[0] < _ttl_seconds():
+            cache.move_to_end(key)
+            value = entry[1]
+        else:
+            value = None
+    if value is None:
+        value = compile_fn()
+        with _cache_lock:
+            cache[key] = (now, value)
+            cache.move_to_end(key)
+            while len(cache) > _MAX_ENTRIES:
+                cache.popitem(last=False)
+
+    if has_request_context():
+        g._access_cache[key] = value
+    return value
+
+
+def compile_permissions(user) -> FrozenSet[str]:
+    """Effective permission names of ``user`` (uncached)."""
+    # Legacy admin bypass: role="admin" without explicit roles has every permission.
+    # Checked before auto-assignment, which would otherwise attach a possibly empty "admin" role.
+    if user.role == "admin" and not user.roles:
+        return ALL_PERMISSIONS
+
+    if not user.roles and user.role:
+        user._auto_assign_role_from_legacy()
+
+    roles = list(user.roles)
+    if not roles and user.role:
+        # Role assignment failed or user is in transition: use the legacy role's permissions
+        from app.models import Role
+
+        legacy_role = Role.query.filter_by(name=user.role).first()
+        if legacy_role:
+            roles = [legacy_role]
+
+    return frozenset(p.name for role in roles for p in role.permissions)
+
+
+def permissions_for(user) -> FrozenSet[str]:
+    """Effective permission names of ``user``, compiled once per role version."""
+    user_id = getattr(user, "id", None)
+    if user_id is None or not has_app_context() or _has_pending_changes(user):
+        return compile_permissions(user)
+    key = ("perms", user_id, _role_version, get_shared_role_version())
+    return _cached(key, lambda: compile_permissions(user))
+
+
+def _disabled_key(settings) -> Optional[tuple]:
+    if settings is None:
+        return None
+    disabled = getattr(settings, "disabled_module_ids", None) or []
+    if not isinstance(disabled, list):
+        return ()
+    return tuple(sorted(str(module_id) for module_id in disabled))
+
+
+def enabled_modules_for(user, settings) -> Optional[FrozenSet[str]]:
+    """Module IDs enabled for an authenticated ``user`` under ``settings``.
+
+    Returns None when the result cannot be cached (anonymous user, no app
+    context, unflushed changes); callers then evaluate modules one by one.
+    """
+    from app.utils.module_registry import ModuleRegistry
+
+    if hasattr(user, "_get_current_object"):
+        user = user._get_current_object()  # current_user proxy
+    user_id = getattr(user, "id", None)
+    if user_id is None or not getattr(user, "is_authenticated", False) or not has_app_context():
+        return None
+    if _has_pending_changes(user):
+        return None
+    key = ("modules", user_id, _role_version, get_shared_role_version(), _disabled_key(settings))
+    return _cached(key, lambda: ModuleRegistry.compile_enabled_modules(settings, user))
+
+
+def clear_access_cache(app=None) -> None:
+    """Drop compiled sets for ``app`` (or the current app) and bump the role version."""
+    global _shared_memo
+    bump_role_version()
+    _shared_memo = (0.0, None)
+    target = app
+    if target is None and has_app_context():
+        target = current_app._get_current_object()
+    if target is not None:
+        target.extensions.pop(_EXTENSION_KEY, None)
+
+
+def _touches_access(session) -> bool:
+    from app.models import Permission, Role, User
+
+    for collection in (session.new, session.dirty, session.deleted):
+        for obj in collection:
+            if isinstance(obj, (Role, Permission)):
+                return True
+            if isinstance(obj, User) and obj in session.dirty:
+                state = sa_inspect(obj)
+                if state.attrs.role.history.has_changes() or state.attrs.roles.history.has_changes():
+                    return True
+    return False
+
+
+def receive_after_flush(session, flush_context):
+    """Invalidate compiled sets when roles, permissions or role assignments were written."""
+    try:
+        if not _touches_access(session):
+            return
+        session.info[_SESSION_INFO_KEY] = True
+        bump_role_version()
+    except Exception as e:
+        logger.debug(f"Access cache flush hook failed: {e}")
+        return
+    try:
+        _bump_shared_version(session.connection())
+    except Exception as e:
+        # Other workers fall back to PERMISSION_CACHE_TTL
+        logger.warning(f"Could not bump the shared access cache version: {e}")
+
+
+def receive_after_transaction_end(session, transaction):
+    """Bump again once that transaction ends, so sets compiled mid-transaction do not outlive it."""
+    if transaction.parent is not None:
+        return
+    if session.info.pop(_SESSION_INFO_KEY, False):
+        bump_role_version()
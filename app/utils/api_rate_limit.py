@@ -1,7 +1,8 @@
 """
 Per API token rate limiting (minute + hour windows).
 
-Uses Redis INCR when REDIS_URL is reachable; otherwise a process-local fallback
+Uses Redis INCR (one pipelined round-trip on a pooled connection) when REDIS_URL
+is reachable; otherwise a process-local fallback
 (suitable for single-worker dev; production should set Redis).
 """
 
@@ -31,28 +32,11 @@ def _limits_from_config() -> Tuple[int, int]:
 
 
 def _redis_client():
+    """Pooled client from the shared Redis manager (None when disabled or unreachable)."""
     try:
-        from urllib.parse import urlparse
-
-        import redis
-
-        if not current_app.config.get("REDIS_ENABLED", True):
-            return None
-        url = current_app.config.get("REDIS_URL", "redis://localhost:6379/0")
-        parsed = urlparse(url)
-        password = parsed.password or None
-        client = redis.Redis(
-            host=parsed.hostname or "localhost",
-            port=parsed.port or 6379,
-            password=password,
-            db=int(parsed.path.lstrip("/")) if parsed.path else 0,
-            decode_responses=True,
-            socket_connect_timeout=0.5,
-            socket_timeout=0.5,
-            retry_on_timeout=False,
-        )
-        client.ping()
-        return client
+        from app.utils.redis_pool import get_redis_manager
+
+        return get_redis_manager().client(decode_responses=True)
     except Exception as e:
         logger.debug("API rate limit Redis unavailable: %s", e)
         return None
@@ -116,6 +100,9 @@ def consume_api_token_rate_limit(token_id: int) -> Tuple[bool, Dict[str, Any]]:
                 "remaining_hour": max(0, per_hour - c_hour),
             }
         except Exception as e:
+            from app.utils.redis_pool import get_redis_manager
+
+            get_redis_manager().record_failure(e)
             logger.warning("Redis rate limit failed, using local fallback: %s", e)
 
     _cleanup_local(now)
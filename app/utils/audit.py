@@ -6,15 +6,19 @@ It uses SQLAlchemy event listeners to capture create, update, and delete operati
 """
 
 import logging
+from importlib import import_module
 
 from flask import has_request_context, request
 from flask_login import current_user
 from sqlalchemy import event
 from sqlalchemy import inspect as sqlalchemy_inspect
+from sqlalchemy import select
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
 
 from app import db
+from app.utils.timezone import now_in_app_timezone
 
 logger = logging.getLogger(__name__)
 
@@ -166,38 +170,73 @@ def serialize_value(value):
     return str(value)
 
 
-def capture_timeentry_metadata(entry):
+# TimeEntry relationship -> attribute used as its display name in audit states
+_TIMEENTRY_NAME_FIELDS = {"project": "name", "client": "name", "task": "name", "user": "username"}
+
+
+def _timeentry_names(entry):
+    """Names of a TimeEntry's project, client, task and user.
+
+    Loaded related objects are used as they are; the others (expired after a
+    commit, or never populated on a new entry) are read in one query by id.
+    """
+    mapper = inspect(type(entry))
+    entry_state = inspect(entry)
+    names = {}
+    missing = {}
+    for relationship, field in _TIMEENTRY_NAME_FIELDS.items():
+        obj = entry_state.attrs[relationship].loaded_value
+        if obj is not None and obj is not NO_VALUE and field in obj.__dict__:
+            names[relationship] = getattr(obj, field)
+            continue
+        prop = mapper.relationships[relationship]
+        related_id = getattr(entry, next(iter(prop.local_columns)).key, None)
+        names[relationship] = None
+        if related_id is not None:
+            target = prop.mapper.class_
+            missing[relationship] = select(getattr(target, field)).where(target.id == related_id).scalar_subquery()
+    if missing:
+        row = db.session.execute(select(*missing.values())).one()
+        names.update(zip(missing, row))
+    return names
+
+
+def capture_timeentry_metadata(entry, names=None):
     """Capture TimeEntry metadata for audit logging
 
     Args:
         entry: TimeEntry instance
+        names: related names from _timeentry_names (looked up when omitted)
 
     Returns:
         dict with client_id, project_id, created_at, and related entity names
     """
+    names = names or _timeentry_names(entry)
     metadata = {
         "client_id": entry.client_id,
-        "client_name": entry.client.name if entry.client else None,
+        "client_name": names["client"],
         "project_id": entry.project_id,
-        "project_name": entry.project.name if entry.project else None,
+        "project_name": names["project"],
         "task_id": entry.task_id,
-        "task_name": entry.task.name if entry.task else None,
+        "task_name": names["task"],
         "created_at": entry.created_at.isoformat() if hasattr(entry, "created_at") and entry.created_at else None,
         "user_id": entry.user_id,
-        "user_name": entry.user.username if entry.user else None,
+        "user_name": names["user"],
     }
     return metadata
 
 
-def capture_timeentry_state(entry):
+def capture_timeentry_state(entry, names=None):
     """Capture full TimeEntry state for audit logging
 
     Args:
         entry: TimeEntry instance
+        names: related names from _timeentry_names (looked up when omitted)
 
     Returns:
         dict with all TimeEntry fields and related entity information
     """
+    names = names or _timeentry_names(entry)
     state = {
         "id": entry.id if hasattr(entry, "id") else None,
         "user_id": entry.user_id,
@@ -216,10 +255,10 @@ def capture_timeentry_state(entry):
         "created_at": entry.created_at.isoformat() if hasattr(entry, "created_at") and entry.created_at else None,
         "updated_at": entry.updated_at.isoformat() if hasattr(entry, "updated_at") and entry.updated_at else None,
         # Related entity names for context
-        "project_name": entry.project.name if entry.project else None,
-        "client_name": entry.client.name if entry.client else None,
-        "task_name": entry.task.name if entry.task else None,
-        "user_name": entry.user.username if entry.user else None,
+        "project_name": names["project"],
+        "client_name": names["client"],
+        "task_name": names["task"],
+        "user_name": names["user"],
     }
     return state
 
@@ -227,21 +266,154 @@ def capture_timeentry_state(entry):
 # Call count for table-exists check (force recheck every 100) and warning/debug logs
 _audit_call_count = 0
 
+# session.info key set by receive_before_flush when this flush is audited; holds the
+# (metadata, state) of dirty and deleted TimeEntry instances before the flush
+_AUDIT_FLUSH_KEY = "_audit_flush_old_states"
+
+
+def _state_value(value):
+    """Format a raw column value the way capture_timeentry_state does"""
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _instance_changes(instance):
+    """Return ``(changes, old_values)`` for a dirty instance.
+
+    ``changes`` maps tracked fields to serialized ``{"old": ..., "new": ...}``;
+    ``old_values`` holds the raw previous value of every changed column
+    (excluded fields included) to rebuild the state before the change.
+    """
+    instance_state = inspect(instance)
+    changes = {}
+    old_values = {}
+    for attr_name in instance_state.mapper.column_attrs.keys():
+        history = instance_state.get_history(attr_name, True)
+        if not history.has_changes():
+            continue
+        old_value = history.deleted[0] if history.deleted else None
+        new_value = history.added[0] if history.added else None
+        if old_value == new_value:
+            continue
+        old_values[attr_name] = old_value
+        if should_track_field(attr_name):
+            changes[attr_name] = {"old": serialize_value(old_value), "new": serialize_value(new_value)}
+    return changes, old_values
+
+
+class _AuditBatch:
+    """Audit rows and shared state snapshots collected for one flush"""
+
+    def __init__(self):
+        self.user_id = get_current_user_id()
+        self.ip_address, self.user_agent, self.request_path = get_request_info()
+        self.created_at = now_in_app_timezone()
+        self.rows = []
+        self.snapshots = {}
+
+    def snapshot(self, entity_type, state):
+        from app.models.audit_log import AuditSnapshot
+
+        digest, encoded = AuditSnapshot.encode(state)
+        self.snapshots.setdefault(digest, {"digest": digest, "entity_type": entity_type, "state": encoded})
+        return digest
+
+    def add(self, action, instance, changes=None, old_state=None, new_state=None, metadata=None):
+        entity_type = get_entity_type(instance)
+        entity_id = getattr(instance, "id", None)
+        if entity_id is None:
+            return
+        entity_name = _timeentry_label(instance, metadata) if metadata else get_entity_name(instance)
+        description = f"{action.capitalize()} {entity_type.lower()} '{entity_name}'"
+        if changes:
+            description += f": {', '.join(changes)}"
+        # Single-field updates keep field_name so they stay filterable like per-field rows
+        field_name = next(iter(changes)) if changes and len(changes) == 1 else None
+        self.rows.append(
+            {
+                "user_id": self.user_id,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "entity_name": entity_name[:500],
+                "action": action,
+                "field_name": field_name,
+                "old_value": None,
+                "new_value": None,
+                "changes": changes or None,
+                "change_description": description,
+                "reason": None,
+                "entity_metadata": metadata,
+                "full_old_state": None,
+                "full_new_state": None,
+                "old_state_digest": self.snapshot(entity_type, old_state) if old_state else None,
+                "new_state_digest": self.snapshot(entity_type, new_state) if new_state else None,
+                "ip_address": self.ip_address,
+                "user_agent": self.user_agent,
+                "request_path": self.request_path,
+                "created_at": self.created_at,
+            }
+        )
+
+    def write(self, connection):
+        """Insert the snapshots that are not stored yet, then all audit rows, one executemany each"""
+        from app.models.audit_log import AuditLog, AuditSnapshot
+
+        if self.snapshots:
+            table = AuditSnapshot.__table__
+            snapshots = [dict(s, created_at=self.created_at) for s in self.snapshots.values()]
+            dialect = connection.dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                insert = import_module(f"sqlalchemy.dialects.{dialect}").insert
+                # Identical states are stored once: skip digests that already exist
+                connection.execute(insert(table).on_conflict_do_nothing(index_elements=["digest"]), snapshots)
+            else:
+                stored = set(
+                    connection.execute(select(table.c.digest).where(table.c.digest.in_(list(self.snapshots)))).scalars()
+                )
+                missing = [s for s in snapshots if s["digest"] not in stored]
+                if missing:
+                    connection.execute(table.insert(), missing)
+        if self.rows:
+            connection.execute(AuditLog.__table__.insert(), self.rows)
+
+
+def _timeentry_label(entry, metadata):
+    """TimeEntry display name (as its repr) built from captured metadata instead of lazy-loaded relationships"""
+    target = metadata.get("project_name") or metadata.get("client_name") or "unknown"
+    return f"<TimeEntry {entry.id}: {metadata.get('user_name') or 'deleted_user'} on {target}>"
 
-def receive_before_flush(session, flush_context, instances=None):
-    """Track updates and deletes before flush; stash new objects for receive_after_flush.
 
-    At before_flush, session.dirty, session.deleted, and attribute history are still
-    valid. session.new is present but new objects do not have ids yet, so we stash
-    them in session.info to be logged in after_flush when ids are available.
+def _timeentry_context(instance, old_values=None):
+    """Metadata and full state (before the pending change when ``old_values`` is given) of a TimeEntry"""
+    names = _timeentry_names(instance)
+    state = capture_timeentry_state(instance, names)
+    for field, value in (old_values or {}).items():
+        if field in state:
+            state[field] = _state_value(value)
+    return capture_timeentry_metadata(instance, names), state
 
-    Note: SQLAlchemy's before_flush passes (session, flush_context, instances);
-    we use session.new/dirty/deleted directly, so instances is not used.
+
+def receive_before_flush(session, flush_context, instances=None):
+    """Check that audit logging is available, reject hard deletes of immutable records
+    and capture TimeEntry states before the flush.
+
+    The audit rows themselves are collected and written in receive_after_flush,
+    where new objects have ids and attribute history is still available.
     """
     global _audit_call_count
+    info = getattr(session, "info", None)
+    if info is not None:
+        info.pop(_AUDIT_FLUSH_KEY, None)
+    if flush_context and getattr(flush_context, "nested", False):
+        return
+
     try:
-        if flush_context and getattr(flush_context, "nested", False):
-            return
+        for instance in list(session.deleted):
+            entity_type = get_entity_type(instance)
+            if entity_type in IMMUTABLE_DELETE_MODELS:
+                session.add(instance)
+                raise ValueError(
+                    f"Hard delete of {entity_type} is not allowed. Use the attendance correction workflow."
+                )
 
         _audit_call_count += 1
         force_check = _audit_call_count % 100 == 0
@@ -252,186 +424,74 @@ def receive_before_flush(session, flush_context, instances=None):
                     "audit_logs table does not exist - audit logging disabled. Run migration: flask db upgrade"
                 )
             return
-
-        user_id = get_current_user_id()
-        ip_address, user_agent, request_path = get_request_info()
-
-        # Track updates (dirty) - attribute history is still valid in before_flush
-        for instance in session.dirty:
-            if should_track_model(instance):
-                entity_type = get_entity_type(instance)
-                entity_id = instance.id if hasattr(instance, "id") else None
-                entity_name = get_entity_name(instance)
-
+        if info is None:
+            return
+        # TimeEntry states before the change are taken now, before onupdate defaults apply
+        old_contexts = {}
+        for instance in list(session.dirty) + list(session.deleted):
+            if get_entity_type(instance) == "TimeEntry":
                 try:
-                    # For TimeEntry, capture full old state before changes
-                    full_old_state = None
-                    entity_metadata = None
-                    if entity_type == "TimeEntry":
-                        try:
-                            full_old_state = capture_timeentry_state(instance)
-                            entity_metadata = capture_timeentry_metadata(instance)
-                        except Exception as e:
-                            logger.warning(f"Could not capture TimeEntry state for {entity_id}: {e}")
-
-                    instance_state = inspect(instance)
-                    changed_fields = []
-                    for attr_name in instance_state.mapper.column_attrs.keys():
-                        if should_track_field(attr_name):
-                            history = instance_state.get_history(attr_name, True)
-                            if history.has_changes():
-                                old_value = history.deleted[0] if history.deleted else None
-                                new_value = history.added[0] if history.added else None
-                                if old_value != new_value:
-                                    changed_fields.append({"field": attr_name, "old": old_value, "new": new_value})
-
-                    AuditLog = get_audit_log_model()
-                    if changed_fields:
-                        for change in changed_fields:
-                            AuditLog.log_change(
-                                user_id=user_id,
-                                action="updated",
-                                entity_type=entity_type,
-                                entity_id=entity_id,
-                                field_name=change["field"],
-                                old_value=serialize_value(change["old"]),
-                                new_value=serialize_value(change["new"]),
-                                entity_name=entity_name,
-                                change_description=f"Updated {entity_type.lower()} '{entity_name}': {change['field']}",
-                                entity_metadata=entity_metadata,
-                                full_old_state=full_old_state,
-                                ip_address=ip_address,
-                                user_agent=user_agent,
-                                request_path=request_path,
-                            )
-                    else:
-                        AuditLog.log_change(
-                            user_id=user_id,
-                            action="updated",
-                            entity_type=entity_type,
-                            entity_id=entity_id,
-                            entity_name=entity_name,
-                            change_description=f"Updated {entity_type.lower()} '{entity_name}'",
-                            entity_metadata=entity_metadata,
-                            full_old_state=full_old_state,
-                            ip_address=ip_address,
-                            user_agent=user_agent,
-                            request_path=request_path,
-                        )
+                    old_contexts[instance] = _timeentry_context(instance, _instance_changes(instance)[1])
                 except Exception as e:
-                    logger.warning(f"Could not inspect changes for {entity_type}#{entity_id}: {e}")
-                    AuditLog = get_audit_log_model()
-                    AuditLog.log_change(
-                        user_id=user_id,
-                        action="updated",
-                        entity_type=entity_type,
-                        entity_id=entity_id,
-                        entity_name=entity_name,
-                        change_description=f"Updated {entity_type.lower()} '{entity_name}'",
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_path=request_path,
-                    )
-
-        # Track deletes
-        for instance in list(session.deleted):
-            entity_type = get_entity_type(instance)
-            if entity_type in IMMUTABLE_DELETE_MODELS:
-                session.add(instance)
-                raise ValueError(
-                    f"Hard delete of {entity_type} is not allowed. Use the attendance correction workflow."
-                )
-            if should_track_model(instance):
-                entity_id = instance.id if hasattr(instance, "id") else None
-                entity_name = get_entity_name(instance)
-                try:
-                    # For TimeEntry, capture full state and metadata before deletion
-                    full_old_state = None
-                    entity_metadata = None
-                    if entity_type == "TimeEntry":
-                        try:
-                            full_old_state = capture_timeentry_state(instance)
-                            entity_metadata = capture_timeentry_metadata(instance)
-                        except Exception as e:
-                            logger.warning(f"Could not capture TimeEntry state for deletion of {entity_id}: {e}")
-
-                    AuditLog = get_audit_log_model()
-                    AuditLog.log_change(
-                        user_id=user_id,
-                        action="deleted",
-                        entity_type=entity_type,
-                        entity_id=entity_id,
-                        entity_name=entity_name,
-                        change_description=f"Deleted {entity_type.lower()} '{entity_name}'",
-                        entity_metadata=entity_metadata,
-                        full_old_state=full_old_state,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_path=request_path,
-                    )
-                except Exception as log_error:
-                    logger.error(
-                        f"Failed to log audit entry for deletion of {entity_type}#{entity_id}: {log_error}",
-                        exc_info=True,
-                    )
-
-        # Stash new (creates) for after_flush when instance.id is available
-        info = getattr(session, "info", None)
-        if info is not None:
-            info["_audit_pending_creates"] = [o for o in session.new if should_track_model(o)]
-
+                    logger.warning(f"Could not capture TimeEntry state for {getattr(instance, 'id', None)}: {e}")
+        info[_AUDIT_FLUSH_KEY] = old_contexts
     except Exception as e:
         logger.error(f"Error in audit logging (before_flush): {e}", exc_info=True)
 
 
 def receive_after_flush(session, flush_context):
-    """Log creates from stashed new objects (now with ids) and flush audit rows."""
-    try:
-        if flush_context and getattr(flush_context, "nested", False):
-            return
+    """Write one audit row per created, updated or deleted entity of this flush.
 
-        table_exists = check_audit_table_exists(force_check=False)
-        if not table_exists:
-            return
-
-        user_id = get_current_user_id()
-        ip_address, user_agent, request_path = get_request_info()
-
-        info = getattr(session, "info", None)
-        pending = info.pop("_audit_pending_creates", []) if info is not None else []
+    session.new/dirty/deleted and attribute history still describe the flush
+    here. Each row carries a field-diff map; TimeEntry states are stored once
+    in audit_snapshots and referenced by digest. Snapshots and rows are
+    inserted with one executemany each on the flush's connection.
+    """
+    info = getattr(session, "info", None)
+    old_contexts = info.pop(_AUDIT_FLUSH_KEY, None) if info is not None else None
+    if old_contexts is None:
+        return
+    try:
+        batch = _AuditBatch()
 
-        for instance in pending:
-            entity_type = get_entity_type(instance)
-            entity_id = getattr(instance, "id", None)
-            if entity_id is None:
+        for instance in session.new:
+            if not should_track_model(instance):
                 continue
-            entity_name = get_entity_name(instance)
+            entity_type = get_entity_type(instance)
+            metadata = new_state = None
+            if entity_type == "TimeEntry":
+                try:
+                    metadata, new_state = _timeentry_context(instance)
+                except Exception as e:
+                    logger.warning(f"Could not capture TimeEntry state for creation of {instance.id}: {e}")
+            batch.add("created", instance, new_state=new_state, metadata=metadata)
 
-            # For TimeEntry, capture full state and metadata
-            full_new_state = None
-            entity_metadata = None
+        for instance in session.dirty:
+            if not should_track_model(instance) or instance in session.deleted:
+                continue
+            entity_type = get_entity_type(instance)
+            try:
+                changes = _instance_changes(instance)[0]
+            except Exception as e:
+                logger.warning(f"Could not inspect changes for {entity_type}#{getattr(instance, 'id', None)}: {e}")
+                changes = {}
+            metadata = old_state = new_state = None
             if entity_type == "TimeEntry":
                 try:
-                    full_new_state = capture_timeentry_state(instance)
-                    entity_metadata = capture_timeentry_metadata(instance)
+                    metadata, new_state = _timeentry_context(instance)
+                    old_state = old_contexts.get(instance, (None, None))[1]
                 except Exception as e:
-                    logger.warning(f"Could not capture TimeEntry state for creation of {entity_id}: {e}")
-
-            AuditLog = get_audit_log_model()
-            AuditLog.log_change(
-                user_id=user_id,
-                action="created",
-                entity_type=entity_type,
-                entity_id=entity_id,
-                entity_name=entity_name,
-                change_description=f"Created {entity_type.lower()} '{entity_name}'",
-                entity_metadata=entity_metadata,
-                full_new_state=full_new_state,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_path=request_path,
-            )
+                    logger.warning(f"Could not capture TimeEntry state for {getattr(instance, 'id', None)}: {e}")
+            batch.add("updated", instance, changes=changes, old_state=old_state, new_state=new_state, metadata=metadata)
+
+        for instance in session.deleted:
+            if not should_track_model(instance):
+                continue
+            metadata, old_state = old_contexts.get(instance, (None, None))
+            batch.add("deleted", instance, old_state=old_state, metadata=metadata)
 
+        if batch.rows:
+            batch.write(session.connection())
     except Exception as e:
         logger.error(f"Error in audit logging (after_flush): {e}", exc_info=True)
 
@@ -0,0 +1,89 @@
+"""
+Chunked bulk-import helpers shared by the CSV importers.
+
+Rows are read from the CSV text in chunks instead of being materialised as
+one list; each chunk's lookups are resolved with a few ``IN`` queries by the
+caller and its records are added with ``add_isolated``:
+
+* the whole chunk is flushed inside one savepoint, so SQLAlchemy batches the
+  INSERTs (``insertmanyvalues``) while the session's flush listeners (audit
+  log, time rollups, sync change log) still see every record;
+* if that flush fails, the savepoint is rolled back and every record is
+  retried in its own savepoint, so one bad row only loses itself and the
+  good rows of the chunk are kept.
+
+Callers commit once per chunk.
+"""
+
+import csv
+from io import StringIO
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+from app import db
+
+IMPORT_CHUNK_SIZE = 1000
+
+
+def count_csv_rows(text: str) -> int:
+    """Number of data rows (after the header) in CSV text; raises ``csv.Error`` for malformed input"""
+    # Blank lines are skipped, as csv.DictReader does
+    return max(0, sum(1 for row in csv.reader(StringIO(text)) if row) - 1)
+
+
+def iter_csv_chunks(text: str, size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    """Yield lists of ``(index, row_dict)`` (0-based data-row index) of at most ``size`` rows"""
+    rows = enumerate(csv.DictReader(StringIO(text)))
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def add_isolated(
+    model: Callable[..., Any], rows: Iterable[Tuple[Hashable, Dict[str, Any]]]
+) -> Tuple[Dict[Hashable, Any], Dict[Hashable, Exception]]:
+    """Create ``model(**kwargs)`` for each ``(key, kwargs)`` and flush them as one batch.
+
+    Returns ``({key: obj}, {key: error})``. Construction errors fail only their
+    row; a failing batch flush is retried row by row in savepoints. Records are
+    rebuilt for the retry because a rolled-back savepoint leaves them detached.
+    """
+    rows = list(rows)
+    added: Dict[Hashable, Any] = {}
+    failed: Dict[Hashable, Exception] = {}
+
+    def build(batch):
+        objs = {}
+        for key, kwargs in batch:
+            try:
+                objs[key] = model(**kwargs)
+            except Exception as e:
+                failed[key] = e
+        return objs
+
+    if not rows:
+        return added, failed
+    try:
+        with db.session.begin_nested():
+            objs = build(rows)
+            db.session.add_all(objs.values())
+            db.session.flush()
+        added.update(objs)
+        return added, failed
+    except Exception:
+        pass
+
+    for key, kwargs in rows:
+        if key in failed:
+            continue
+        try:
+            with db.session.begin_nested():
+                obj = model(**kwargs)
+                db.session.add(obj)
+                db.session.flush()
+            added[key] = obj
+        except Exception as e:
+            failed[key] = e
+    return added, failed
@@ -8,7 +8,7 @@ import json
 import pickle
 import time
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from flask import current_app
 
@@ -56,6 +56,20 @@ class InMemoryCache:
         """Clear all cache"""
         self._cache.clear()
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values; missing keys are omitted"""
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Set several values"""
+        for key, value in mapping.items():
+            self.set(key, value, ttl)
+
     def exists(self, key: str) -> bool:
         """Check if a key exists in cache"""
         if key not in self._cache:
@@ -72,9 +86,23 @@ class InMemoryCache:
 class RedisCache:
     """Redis-backed cache implementation"""
 
-    def __init__(self, redis_url: str, default_ttl: int = 3600):
-        """Initialize Redis cache connection"""
+    def __init__(self, redis_url: str, default_ttl: int = 3600, manager=None):
+        """
+        Initialize Redis cache connection.
+
+        When ``manager`` (a ``RedisPoolManager``) is given, connections are
+        borrowed from its shared pool and operations fall back to the in-memory
+        cache while its circuit breaker is open. Otherwise a dedicated client is
+        created for ``redis_url``.
+        """
         self._default_ttl = default_ttl
+        self._manager = manager
+        self._fallback = InMemoryCache(default_ttl)
+        if manager is not None:
+            self._client = manager.client(decode_responses=False)
+            self._connected = self._client is not None
+            return
+
         try:
             # Parse Redis URL
             from urllib.parse import urlparse
@@ -103,73 +131,115 @@ class RedisCache:
             if current_app:
                 current_app.logger.warning(f"Redis connection failed, using in-memory cache: {e}")
             self._connected = False
-            self._fallback = InMemoryCache(default_ttl)
+
+    def _redis(self):
+        """Client to use for this operation, or None to use the in-memory fallback"""
+        if self._manager is not None:
+            return self._manager.client(decode_responses=False)
+        return self._client if self._connected else None
+
+    def _on_error(self, action: str, e: Exception) -> None:
+        if self._manager is not None:
+            self._manager.record_failure(e)
+        if current_app:
+            current_app.logger.error(f"Redis {action} error: {e}")
 
     def get(self, key: str) -> Optional[Any]:
         """Get a value from cache"""
-        if not self._connected:
+        client = self._redis()
+        if client is None:
             return self._fallback.get(key)
 
         try:
-            data = self._client.get(key)
+            data = client.get(key)
             if data is None:
                 return None
             # ``redis.Redis.get`` is typed as returning ``Awaitable | Any``; we use
             # the sync client so ``data`` is concretely ``bytes`` at runtime.
             return pickle.loads(data)  # type: ignore[arg-type]
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Redis get error: {e}")
+            self._on_error("get", e)
             return None
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set a value in cache"""
-        if not self._connected:
+        client = self._redis()
+        if client is None:
             self._fallback.set(key, value, ttl)
             return
 
         try:
             ttl = ttl or self._default_ttl
             data = pickle.dumps(value)
-            self._client.setex(key, ttl, data)
+            client.setex(key, ttl, data)
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Redis set error: {e}")
+            self._on_error("set", e)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values in one round-trip; missing keys are omitted"""
+        client = self._redis()
+        if client is None:
+            return self._fallback.get_many(keys)
+        if not keys:
+            return {}
+
+        try:
+            values = client.mget(keys)
+            return {key: pickle.loads(data) for key, data in zip(keys, values) if data is not None}
+        except Exception as e:
+            self._on_error("mget", e)
+            return {}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Set several values in one pipelined round-trip"""
+        client = self._redis()
+        if client is None:
+            self._fallback.set_many(mapping, ttl)
+            return
+
+        try:
+            ttl = ttl or self._default_ttl
+            pipe = client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.setex(key, ttl, pickle.dumps(value))
+            pipe.execute()
+        except Exception as e:
+            self._on_error("mset", e)
 
     def delete(self, key: str) -> None:
         """Delete a value from cache"""
-        if not self._connected:
+        client = self._redis()
+        if client is None:
             self._fallback.delete(key)
             return
 
         try:
-            self._client.delete(key)
+            client.delete(key)
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Redis delete error: {e}")
+            self._on_error("delete", e)
 
     def clear(self) -> None:
         """Clear all cache"""
-        if not self._connected:
+        client = self._redis()
+        if client is None:
             self._fallback.clear()
             return
 
         try:
-            self._client.flushdb()
+            client.flushdb()
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Redis clear error: {e}")
+            self._on_error("clear", e)
 
     def exists(self, key: str) -> bool:
         """Check if a key exists in cache"""
-        if not self._connected:
+        client = self._redis()
+        if client is None:
             return self._fallback.exists(key)
 
         try:
-            return bool(self._client.exists(key))
+            return bool(client.exists(key))
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Redis exists error: {e}")
+            self._on_error("exists", e)
             return False
 
 
@@ -187,9 +257,11 @@ def get_cache():
     # Try to initialize Redis if enabled
     try:
         if current_app and current_app.config.get("REDIS_ENABLED", True) and REDIS_AVAILABLE:
+            from app.utils.redis_pool import get_redis_manager
+
             redis_url = current_app.config.get("REDIS_URL", "redis://localhost:6379/0")
             default_ttl = current_app.config.get("REDIS_DEFAULT_TTL", 3600)
-            _cache = RedisCache(redis_url, default_ttl)
+            _cache = RedisCache(redis_url, default_ttl, manager=get_redis_manager())
             if _cache._connected:
                 return _cache
     except RuntimeError:
@@ -273,15 +345,15 @@ def invalidate_pattern(pattern: str) -> None:
         pattern: Pattern to match (supports * wildcard)
     """
     cache = get_cache()
-    if hasattr(cache, "_client") and cache._connected:
+    client = cache._redis() if isinstance(cache, RedisCache) else None
+    if client is not None:
         # Redis pattern matching
         try:
-            keys = cache._client.keys(pattern)
+            keys = client.keys(pattern)
             if keys:
-                cache._client.delete(*keys)
+                client.delete(*keys)
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Redis pattern delete error: {e}")
+            cache._on_error("pattern delete", e)
     else:
         # For in-memory, use simple clear (can be improved)
         cache.clear()
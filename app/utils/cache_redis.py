@@ -10,20 +10,15 @@ Note: This is a foundation implementation. Redis integration requires:
 
 import json
 import logging
-import os
 from datetime import timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
-logger = logging.getLogger(__name__)
+from app.utils.redis_pool import REDIS_AVAILABLE, get_redis_manager
 
-# Try to import redis, but don't fail if not available
-try:
-    import redis
+logger = logging.getLogger(__name__)
 
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
+if not REDIS_AVAILABLE:
     logger.warning("Redis not available. Install with: pip install redis")
 
 
@@ -31,22 +26,26 @@ def get_redis_client():
     """
     Get Redis client instance.
 
+    The client is borrowed from the shared connection pool (see
+    ``app.utils.redis_pool``); no connection is opened or pinged per call.
+
     Returns:
-        Redis client or None if Redis is not configured
+        Redis client or None if Redis is not configured or currently unreachable
     """
-    if not REDIS_AVAILABLE:
-        return None
+    return get_redis_manager().client(decode_responses=True)
+
 
-    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
 
+
+def _deserialize(value: Any) -> Any:
     try:
-        client = redis.from_url(redis_url, decode_responses=True)
-        # Test connection
-        client.ping()
-        return client
-    except Exception as e:
-        logger.warning(f"Redis connection failed: {e}. Caching disabled.")
-        return None
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
 
 
 def cache_key(prefix: str, *args, **kwargs) -> str:
@@ -93,11 +92,9 @@ def get_cache(key: str, default: Any = None) -> Optional[Any]:
             return default
 
         # Try to deserialize JSON
-        try:
-            return json.loads(value)
-        except (json.JSONDecodeError, TypeError):
-            return value
+        return _deserialize(value)
     except Exception as e:
+        get_redis_manager().record_failure(e)
         logger.warning(f"Cache get error for key {key}: {e}")
         return default
 
@@ -120,16 +117,46 @@ def set_cache(key: str, value: Any, ttl: int = 3600) -> bool:
 
     try:
         # Serialize value if needed
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value)
-
-        client.setex(key, ttl, value)
+        client.setex(key, ttl, _serialize(value))
         return True
     except Exception as e:
+        get_redis_manager().record_failure(e)
         logger.warning(f"Cache set error for key {key}: {e}")
         return False
 
 
+def get_many_cache(keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+    """
+    Get several values from cache in a single round-trip.
+
+    Args:
+        keys: Cache keys
+        default: Value used for keys that are missing
+
+    Returns:
+        Dict mapping every requested key to its cached value or ``default``
+    """
+    keys = list(keys)
+    values = get_redis_manager().mget(keys)
+    if values is None:
+        return {key: default for key in keys}
+    return {key: default if value is None else _deserialize(value) for key, value in zip(keys, values)}
+
+
+def set_many_cache(mapping: Dict[str, Any], ttl: int = 3600) -> bool:
+    """
+    Set several values in cache in a single round-trip.
+
+    Args:
+        mapping: Cache key -> value
+        ttl: Time to live in seconds (default: 1 hour)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return get_redis_manager().mset({key: _serialize(value) for key, value in mapping.items()}, ttl=ttl)
+
+
 def delete_cache(key: str) -> bool:
     """
     Delete value from cache.
@@ -154,6 +181,7 @@ def delete_cache(key: str) -> bool:
             client.delete(key)
         return True
     except Exception as e:
+        get_redis_manager().record_failure(e)
         logger.warning(f"Cache delete error for key {key}: {e}")
         return False
 
@@ -242,6 +242,266 @@ def register_cli_commands(app):
         db.session.commit()
         click.echo(f"Recurring generation complete. Created {created} entries.")
 
+    @app.cli.command("webhook-worker")
+    @with_appcontext
+    @click.option("--workers", default=None, type=int, help="Delivery threads (default WEBHOOK_DELIVERY_WORKERS)")
+    @click.option("--per-host", default=None, type=int, help="Max concurrent requests per host (default from config)")
+    def webhook_worker(workers, per_host):
+        """Run webhook delivery workers in the foreground until interrupted."""
+        import time
+
+        from flask import current_app
+
+        from app.utils.webhook_worker import WebhookDeliveryWorkerPool
+
+        cfg = current_app.config
+        pool = WebhookDeliveryWorkerPool(
+            current_app._get_current_object(),
+            workers=workers or cfg.get("WEBHOOK_DELIVERY_WORKERS", 2) or 2,
+            per_host_limit=per_host or cfg.get("WEBHOOK_MAX_CONCURRENCY_PER_HOST", 2),
+            poll_interval=cfg.get("WEBHOOK_POLL_INTERVAL_SECONDS", 2.0),
+        )
+        pool.start()
+        click.echo(f"Webhook worker running ({pool.workers} workers, {pool.per_host_limit} per host). Ctrl+C to stop.")
+        try:
+            while pool.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.stop()
+            click.echo("Webhook worker stopped")
+
+    @app.cli.command("job-worker")
+    @with_appcontext
+    @click.option("--workers", default=None, type=int, help="Job threads (default JOB_QUEUE_WORKERS, at least 1)")
+    @click.option("--once", is_flag=True, help="Run the jobs that are due now, then exit")
+    def job_worker(workers, once):
+        """Run background import/export jobs in the foreground until interrupted."""
+        import time
+
+        from flask import current_app
+
+        from app.utils.job_queue import JobWorkerPool, run_next_job
+
+        if once:
+            count = 0
+            while run_next_job() is not None:
+                count += 1
+            click.echo(f"Ran {count} job(s)")
+            return
+
+        cfg = current_app.config
+        pool = JobWorkerPool(
+            current_app._get_current_object(),
+            workers=workers or cfg.get("JOB_QUEUE_WORKERS", 1) or 1,
+            poll_interval=cfg.get("JOB_QUEUE_POLL_INTERVAL_SECONDS", 2.0),
+        )
+        pool.start()
+        click.echo(f"Job worker running ({pool.workers} workers). Ctrl+C to stop.")
+        try:
+            while pool.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.stop()
+            click.echo("Job worker stopped")
+
+    @app.cli.command("email-worker")
+    @with_appcontext
+    @click.option("--once", is_flag=True, help="Send the emails that are due now, then exit")
+    def email_worker(once):
+        """Send queued emails from the outbox in the foreground until interrupted."""
+        import time
+
+        from flask import current_app
+
+        from app.utils.email_outbox import EmailOutboxWorker, send_due_emails
+
+        if once:
+            sent = 0
+            while True:
+                counts = send_due_emails()
+                sent += counts["sent"]
+                if not counts["claimed"] or not counts["sent"]:
+                    break
+            click.echo(f"Sent {sent} email(s)")
+            return
+
+        worker = EmailOutboxWorker(
+            current_app._get_current_object(),
+            poll_interval=current_app.config.get("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", 5.0),
+        )
+        worker.start()
+        click.echo("Email worker running. Ctrl+C to stop.")
+        try:
+            while worker.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.stop()
+            click.echo("Email worker stopped")
+
+    @app.cli.command("rebuild-user-time-stats")
+    @with_appcontext
+    @click.option("--user-id", "user_ids", multiple=True, type=int, help="Only rebuild these users (repeatable)")
+    def rebuild_user_time_stats_cmd(user_ids):
+        """Recompute the per-user time-entry rollup (user_time_stats) from time_entries.
+
+        The rollup is maintained automatically on every time-entry change; run this
+        after bulk SQL maintenance or to backfill an existing installation.
+        """
+        from app.utils.user_time_stats import rebuild_user_time_stats
+
+        try:
+            written = rebuild_user_time_stats(list(user_ids) if user_ids else None)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Failed to rebuild user time stats: {e}")
+            raise SystemExit(1)
+        click.echo(f"✓ Rebuilt time stats for {written} user(s)")
+
+    @app.cli.command("rebuild-tracked-totals")
+    @with_appcontext
+    @click.option("--task-id", "task_ids", multiple=True, type=int, help="Only rebuild these tasks (repeatable)")
+    @click.option(
+        "--project-id", "project_ids", multiple=True, type=int, help="Only rebuild these projects (repeatable)"
+    )
+    def rebuild_tracked_totals_cmd(task_ids, project_ids):
+        """Recompute stored tracked time and cost totals on tasks and projects.
+
+        The totals are maintained automatically on time-entry and project-cost
+        changes; run this after bulk SQL maintenance.
+        """
+        from app.utils.tracked_totals import rebuild_tracked_totals
+
+        try:
+            if task_ids or project_ids:
+                tasks, projects = rebuild_tracked_totals(list(task_ids), list(project_ids))
+            else:
+                tasks, projects = rebuild_tracked_totals()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Failed to rebuild tracked totals: {e}")
+            raise SystemExit(1)
+        click.echo(f"✓ Rebuilt tracked totals for {tasks} task(s) and {projects} project(s)")
+
+    @app.cli.command("verify-tracked-totals")
+    @with_appcontext
+    @click.option("--task-id", "task_ids", multiple=True, type=int, help="Only verify these tasks (repeatable)")
+    @click.option(
+        "--project-id", "project_ids", multiple=True, type=int, help="Only verify these projects (repeatable)"
+    )
+    def verify_tracked_totals_cmd(task_ids, project_ids):
+        """Compare stored task/project totals with time entries and costs; exits 1 on any mismatch."""
+        from app.utils.tracked_totals import verify_tracked_totals
+
+        if task_ids or project_ids:
+            mismatches = verify_tracked_totals(list(task_ids), list(project_ids))
+        else:
+            mismatches = verify_tracked_totals()
+        if not mismatches:
+            click.echo("✓ Stored tracked totals match time entries and costs")
+            return
+        for m in mismatches[:50]:
+            click.echo(f"  {m['kind']} {m['id']} {m['column']}: expected {m['expected']}, stored {m['stored']}")
+        click.echo(f"✗ {len(mismatches)} mismatching total(s); run 'flask rebuild-tracked-totals' to fix")
+        raise SystemExit(1)
+
+    @app.cli.command("rebuild-user-project-access")
+    @with_appcontext
+    @click.option("--user-id", "user_ids", multiple=True, type=int, help="Only rebuild these users (repeatable)")
+    def rebuild_user_project_access_cmd(user_ids):
+        """Recompute the user -> project access table (user_project_access).
+
+        The table is maintained automatically on time-entry, task and user-client
+        changes; run this after bulk SQL maintenance or to backfill an existing installation.
+        """
+        from app.utils.user_project_access import rebuild_user_project_access
+
+        try:
+            written = rebuild_user_project_access(list(user_ids) if user_ids else None)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Failed to rebuild user project access: {e}")
+            raise SystemExit(1)
+        click.echo(f"✓ Rebuilt {written} user project access row(s)")
+
+    @app.cli.command("rebuild-invoice-time-entry-links")
+    @with_appcontext
+    @click.option(
+        "--item-id", "item_ids", multiple=True, type=int, help="Only rebuild these invoice lines (repeatable)"
+    )
+    def rebuild_invoice_time_entry_links_cmd(item_ids):
+        """Recompute invoice_item_time_entries from invoice_items.time_entry_ids.
+
+        The links are maintained automatically when invoice lines change; run this
+        after bulk SQL maintenance.
+        """
+        from app.utils.invoice_time_entry_links import rebuild_invoice_time_entry_links
+
+        try:
+            written = rebuild_invoice_time_entry_links(list(item_ids) if item_ids else None)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Failed to rebuild invoice time entry links: {e}")
+            raise SystemExit(1)
+        click.echo(f"✓ Rebuilt {written} invoice time entry link(s)")
+
+    @app.cli.command("rebuild-time-rollup")
+    @with_appcontext
+    @click.option("--user-id", "user_ids", multiple=True, type=int, help="Only rebuild these users (repeatable)")
+    @click.option("--since", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day to rebuild (YYYY-MM-DD)")
+    @click.option("--until", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day to rebuild (YYYY-MM-DD)")
+    def rebuild_time_rollup_cmd(user_ids, since, until):
+        """Recompute the daily time rollup (time_daily_rollup) from time_entries."""
+        from app.utils.time_daily_rollup import rebuild_time_daily_rollup
+
+        try:
+            written = rebuild_time_daily_rollup(
+                user_ids=list(user_ids) if user_ids else None,
+                start_day=since.date() if since else None,
+                end_day=until.date() if until else None,
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f"✗ Failed to rebuild daily time rollup: {e}")
+            raise SystemExit(1)
+        click.echo(f"✓ Rebuilt {written} daily rollup row(s)")
+
+    @app.cli.command("verify-time-rollup")
+    @with_appcontext
+    @click.option("--user-id", "user_ids", multiple=True, type=int, help="Only verify these users (repeatable)")
+    @click.option("--since", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day to verify (YYYY-MM-DD)")
+    @click.option("--until", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day to verify (YYYY-MM-DD)")
+    def verify_time_rollup_cmd(user_ids, since, until):
+        """Compare the daily time rollup with time_entries; exits 1 on any mismatch."""
+        from app.utils.time_daily_rollup import verify_time_daily_rollup
+
+        mismatches = verify_time_daily_rollup(
+            user_ids=list(user_ids) if user_ids else None,
+            start_day=since.date() if since else None,
+            end_day=until.date() if until else None,
+        )
+        if not mismatches:
+            click.echo("✓ Daily time rollup matches time entries")
+            return
+        for m in mismatches[:50]:
+            click.echo(
+                f"  {m['day']} user={m['user_id']} project={m['project_id']} task={m['task_id']} "
+                f"client={m['client_id']} billable={m['billable']}: "
+                f"expected {m['expected'][0]}s/{m['expected'][1]} entries, stored {m['stored'][0]}s/{m['stored'][1]}"
+            )
+        click.echo(f"✗ {len(mismatches)} mismatching rollup row(s); run 'flask rebuild-time-rollup' to fix")
+        raise SystemExit(1)
+
     @app.cli.command()
     @with_appcontext
     def seed_permissions_cmd():
@@ -6,7 +6,7 @@ from flask_babel import get_locale
 from flask_babel import gettext as _
 from flask_login import current_user
 
-from app.models import Settings
+from app.utils.settings_cache import get_settings_snapshot
 from app.utils.license_utils import is_license_activated
 from app.utils.timezone import (
     get_resolved_date_format_key,
@@ -32,7 +32,7 @@ def register_context_processors(app):
 
             # Check if we have an active database session
             if db.session.is_active:
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 resolved_date = get_resolved_date_format_key()
                 resolved_time = get_resolved_time_format_key()
                 resolved_week_start = get_resolved_week_start_day()
@@ -91,7 +91,7 @@ def register_context_processors(app):
 
             # Check if we have an active database session
             if db.session.is_active:
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 timezone_name = settings.timezone if settings else "Europe/Rome"
             else:
                 timezone_name = "Europe/Rome"
@@ -203,7 +203,7 @@ def register_context_processors(app):
                 from app.services.usage_stats_service import UsageStatsService
                 from app.utils.license_utils import is_license_activated
 
-                settings_obj = Settings.get_settings()
+                settings_obj = get_settings_snapshot()
                 is_supporter_instance = bool(settings_obj and is_license_activated(settings_obj))
                 ui_show_donate = bool(getattr(current_user, "ui_show_donate", True))
 
@@ -214,7 +214,7 @@ def register_context_processors(app):
                     support_banner_suppressed=support_banner_suppressed,
                 )
 
-                usage_stats = UsageStatsService.get_for_user(current_user.id)
+                usage_stats = UsageStatsService.get_for_user(current_user.id, engagement=user_stats or None)
                 support_usage_stats_modal = usage_stats
                 checkout_urls = build_support_checkout_urls(current_app.config)
                 social_line = get_social_proof_text(current_app.config)
@@ -297,8 +297,7 @@ def _export_time_entries(user):
 def _export_user_projects(user):
     """Export projects user has worked on"""
     time_entry_repo = TimeEntryRepository()
-    project_ids = time_entry_repo.get_distinct_project_ids_for_user(user.id)
-    projects = Project.query.filter(Project.id.in_(project_ids)).all()
+    projects = Project.query.filter(Project.id.in_(time_entry_repo.get_project_ids_select_for_user(user.id))).all()
     return [_project_to_dict(p) for p in projects]
 
 
@@ -13,6 +13,7 @@ from flask import current_app
 
 from app import db
 from app.models import Client, Contact, Expense, ExpenseCategory, Project, Task, TimeEntry, User
+from app.utils.bulk_import import add_isolated, count_csv_rows, iter_csv_chunks
 from app.utils.db import safe_commit
 
 logger = logging.getLogger(__name__)
@@ -24,17 +25,24 @@ class ImportError(Exception):
     pass
 
 
-def import_csv_time_entries(user_id, csv_content, import_record):
+def import_csv_time_entries(user_id, csv_content, import_record, on_progress=None):
     """
     Import time entries from CSV file
 
     Expected CSV format:
     project_name, task_name, start_time, end_time, duration_hours, notes, tags, billable
 
+    Rows are processed in chunks of ``IMPORT_CHUNK_SIZE``: the clients,
+    projects and tasks named in a chunk are looked up (and created) with a few
+    batched queries, the chunk's entries are inserted in one flush and
+    committed together, and rows that fail are isolated in savepoints so they
+    never take good rows down with them.
+
     Args:
         user_id: ID of the user importing data
         csv_content: String content of CSV file
         import_record: DataImport model instance to track progress
+        on_progress: Optional callback(total, successful, failed) run after each committed batch
 
     Returns:
         Dictionary with import statistics
@@ -45,106 +53,57 @@ def import_csv_time_entries(user_id, csv_content, import_record):
 
     import_record.start_processing()
 
-    # Parse CSV
+    # Parse CSV (counting rows up front validates it and gives progress a total)
     try:
-        csv_reader = csv.DictReader(StringIO(csv_content))
-        rows = list(csv_reader)
+        total = count_csv_rows(csv_content)
     except Exception as e:
         import_record.fail(f"Failed to parse CSV: {str(e)}")
         raise ImportError(f"Failed to parse CSV: {str(e)}")
 
-    total = len(rows)
     successful = 0
     failed = 0
     errors = []
+    names = _ImportNameCache(user_id)
 
     import_record.update_progress(total, 0, 0)
 
-    for idx, row in enumerate(rows):
-        try:
-            # Get or create project
-            project_name = row.get("project_name", "").strip()
-            if not project_name:
-                raise ValueError("Project name is required")
-
-            # Get or create client
-            client_name = row.get("client_name", project_name).strip()
-            client = Client.query.filter_by(name=client_name).first()
-            if not client:
-                client = Client(name=client_name)
-                db.session.add(client)
-                db.session.flush()
-
-            # Get or create project
-            project = Project.query.filter_by(name=project_name, client_id=client.id).first()
-            if not project:
-                project = Project(
-                    name=project_name, client_id=client.id, billable=row.get("billable", "true").lower() == "true"
-                )
-                db.session.add(project)
-                db.session.flush()
-
-            # Get or create task (if provided)
-            task = None
-            task_name = row.get("task_name", "").strip()
-            if task_name:
-                task = Task.query.filter_by(name=task_name, project_id=project.id).first()
-                if not task:
-                    task = Task(name=task_name, project_id=project.id, status="in_progress", created_by=user_id)
-                    db.session.add(task)
-                    db.session.flush()
-
-            # Parse times
-            start_time = _parse_datetime(row.get("start_time", row.get("start", "")))
-            end_time = _parse_datetime(row.get("end_time", row.get("end", "")))
-
-            if not start_time:
-                raise ValueError("Start time is required")
-
-            # Create time entry
-            time_entry = TimeEntry(
-                user_id=user_id,
-                project_id=project.id,
-                task_id=task.id if task else None,
-                start_time=start_time,
-                end_time=end_time,
-                notes=row.get("notes", row.get("description", "")).strip(),
-                tags=row.get("tags", "").strip(),
-                billable=row.get("billable", "true").lower() == "true",
-                source="import",
-            )
-
-            # Handle duration
-            if end_time:
-                time_entry.calculate_duration()
-            elif "duration_hours" in row:
-                duration_hours = float(row["duration_hours"])
-                time_entry.duration_seconds = int(duration_hours * 3600)
-                if not end_time and start_time:
-                    time_entry.end_time = start_time + timedelta(seconds=time_entry.duration_seconds)
-
-            db.session.add(time_entry)
-            successful += 1
-
-            # Commit every 100 records
-            if (idx + 1) % 100 == 0:
-                db.session.commit()
-                import_record.update_progress(total, successful, failed)
+    for chunk in iter_csv_chunks(csv_content):
+        rows = dict(chunk)
+        row_errors = {}
+        parsed = {}
+        for idx, row in chunk:
+            try:
+                parsed[idx] = _parse_csv_entry_row(row)
+            except Exception as e:
+                row_errors[idx] = e
+
+        names.resolve(parsed.values())
+        entries = []
+        for idx, fields in parsed.items():
+            try:
+                entries.append((idx, names.entry_kwargs(fields, user_id)))
+            except Exception as e:
+                row_errors[idx] = e
+
+        added, entry_errors = add_isolated(TimeEntry, entries)
+        row_errors.update(entry_errors)
 
+        try:
+            db.session.commit()
         except Exception as e:
-            failed += 1
-            error_msg = f"Row {idx + 1}: {str(e)}"
-            errors.append(error_msg)
-            import_record.add_error(error_msg, row)
             db.session.rollback()
-
-    # Final commit
-    try:
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        import_record.fail(f"Failed to commit final changes: {str(e)}")
-        raise ImportError(f"Failed to commit changes: {str(e)}")
+            import_record.fail(f"Failed to commit final changes: {str(e)}")
+            raise ImportError(f"Failed to commit changes: {str(e)}")
+
+        successful += len(added)
+        failed += len(row_errors)
+        chunk_errors = [(f"Row {idx + 1}: {str(row_errors[idx])}", rows[idx]) for idx in sorted(row_errors)]
+        errors.extend(message for message, _ in chunk_errors)
+        if chunk_errors:
+            import_record.add_errors(chunk_errors)
+        import_record.update_progress(total, successful, failed)
+        if on_progress:
+            on_progress(total, successful, failed)
 
     # Update import record
     import_record.update_progress(total, successful, failed)
@@ -162,7 +121,147 @@ def import_csv_time_entries(user_id, csv_content, import_record):
     return summary
 
 
-def import_from_toggl(user_id, api_token, workspace_id, start_date, end_date, import_record):
+def _parse_csv_entry_row(row):
+    """Validate one CSV row and return the fields needed to create its time entry"""
+    project_name = (row.get("project_name") or "").strip()
+    if not project_name:
+        raise ValueError("Project name is required")
+
+    start_time = _parse_datetime(row.get("start_time", row.get("start", "")))
+    end_time = _parse_datetime(row.get("end_time", row.get("end", "")))
+    if not start_time:
+        raise ValueError("Start time is required")
+
+    duration_seconds = None
+    if not end_time and "duration_hours" in row:
+        duration_seconds = int(float(row["duration_hours"]) * 3600)
+        end_time = start_time + timedelta(seconds=duration_seconds)
+
+    billable = (row.get("billable", "true") or "").strip().lower() == "true"
+    return {
+        "client_name": (row.get("client_name") or "").strip() or project_name,
+        "project_name": project_name,
+        "task_name": (row.get("task_name") or "").strip(),
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration_seconds": duration_seconds,
+        "notes": (row.get("notes", row.get("description", "")) or "").strip(),
+        "tags": (row.get("tags") or "").strip(),
+        "billable": billable,
+    }
+
+
+class _ImportNameCache:
+    """Client/project/task ids by name, resolved a chunk at a time with batched queries.
+
+    Missing records are created (first matching row decides a new project's
+    ``billable``); names whose record could not be created fail their rows.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.clients = {}
+        self.projects = {}
+        self.tasks = {}
+        self.errors = {}
+
+    def resolve(self, rows):
+        rows = list(rows)
+        self._resolve_clients({r["client_name"] for r in rows})
+
+        wanted_projects = {}
+        for r in rows:
+            client_id = self.clients.get(r["client_name"])
+            if client_id is not None:
+                wanted_projects.setdefault((client_id, r["project_name"]), r["billable"])
+        self._resolve_projects(wanted_projects)
+
+        wanted_tasks = set()
+        for r in rows:
+            project_id = self.projects.get((self.clients.get(r["client_name"]), r["project_name"]))
+            if project_id is not None and r["task_name"]:
+                wanted_tasks.add((project_id, r["task_name"]))
+        self._resolve_tasks(wanted_tasks)
+
+    def _resolve_clients(self, names):
+        missing = [n for n in names if n not in self.clients and ("client", n) not in self.errors]
+        if not missing:
+            return
+        for client_id, name in (
+            db.session.query(Client.id, Client.name).filter(Client.name.in_(missing)).order_by(Client.id)
+        ):
+            self.clients.setdefault(name, client_id)
+        added, failed = add_isolated(Client, [(n, {"name": n}) for n in missing if n not in self.clients])
+        self.clients.update({name: obj.id for name, obj in added.items()})
+        self.errors.update({("client", name): e for name, e in failed.items()})
+
+    def _resolve_projects(self, wanted):
+        missing = [k for k in wanted if k not in self.projects and ("project", k) not in self.errors]
+        if not missing:
+            return
+        for project_id, client_id, name in (
+            db.session.query(Project.id, Project.client_id, Project.name)
+            .filter(
+                Project.client_id.in_({k[0] for k in missing}),
+                Project.name.in_({k[1] for k in missing}),
+            )
+            .order_by(Project.id)
+        ):
+            self.projects.setdefault((client_id, name), project_id)
+        added, failed = add_isolated(
+            Project,
+            [(k, {"name": k[1], "client_id": k[0], "billable": wanted[k]}) for k in missing if k not in self.projects],
+        )
+        self.projects.update({k: obj.id for k, obj in added.items()})
+        self.errors.update({("project", k): e for k, e in failed.items()})
+
+    def _resolve_tasks(self, wanted):
+        missing = [k for k in wanted if k not in self.tasks and ("task", k) not in self.errors]
+        if not missing:
+            return
+        for task_id, project_id, name in (
+            db.session.query(Task.id, Task.project_id, Task.name)
+            .filter(Task.project_id.in_({k[0] for k in missing}), Task.name.in_({k[1] for k in missing}))
+            .order_by(Task.id)
+        ):
+            self.tasks.setdefault((project_id, name), task_id)
+        added, failed = add_isolated(
+            Task,
+            [
+                (k, {"name": k[1], "project_id": k[0], "status": "in_progress", "created_by": self.user_id})
+                for k in missing
+                if k not in self.tasks
+            ],
+        )
+        self.tasks.update({k: obj.id for k, obj in added.items()})
+        self.errors.update({("task", k): e for k, e in failed.items()})
+
+    def _lookup(self, kind, cache, key):
+        if key in cache:
+            return cache[key]
+        raise self.errors.get((kind, key)) or ValueError(f"Could not resolve {kind} {key!r}")
+
+    def entry_kwargs(self, fields, user_id):
+        client_id = self._lookup("client", self.clients, fields["client_name"])
+        project_id = self._lookup("project", self.projects, (client_id, fields["project_name"]))
+        task_id = None
+        if fields["task_name"]:
+            task_id = self._lookup("task", self.tasks, (project_id, fields["task_name"]))
+        return {
+            "user_id": user_id,
+            "project_id": project_id,
+            "task_id": task_id,
+            "start_time": fields["start_time"],
+            "end_time": fields["end_time"],
+            "duration_seconds": fields["duration_seconds"],
+            "notes": fields["notes"],
+            "tags": fields["tags"],
+            "billable": fields["billable"],
+            "source": "import",
+        }
+
+
+def import_from_toggl(user_id, api_token, workspace_id, start_date, end_date, import_record, on_progress=None):
     """
     Import time entries from Toggl Track
 
@@ -173,6 +272,7 @@ def import_from_toggl(user_id, api_token, workspace_id, start_date, end_date, im
         start_date: Start date for import (datetime)
         end_date: End date for import (datetime)
         import_record: DataImport model instance to track progress
+        on_progress: Optional callback(total, successful, failed) run after each committed batch
 
     Returns:
         Dictionary with import statistics
@@ -283,6 +383,9 @@ def import_from_toggl(user_id, api_token, workspace_id, start_date, end_date, im
             import_record.add_error(error_msg, entry)
             db.session.rollback()
 
+        if on_progress and (idx + 1) % 50 == 0:
+            on_progress(total, successful, failed)
+
     # Final commit
     try:
         db.session.commit()
@@ -307,7 +410,7 @@ def import_from_toggl(user_id, api_token, workspace_id, start_date, end_date, im
     return summary
 
 
-def import_from_harvest(user_id, account_id, api_token, start_date, end_date, import_record):
+def import_from_harvest(user_id, account_id, api_token, start_date, end_date, import_record, on_progress=None):
     """
     Import time entries from Harvest
 
@@ -318,6 +421,7 @@ def import_from_harvest(user_id, account_id, api_token, start_date, end_date, im
         start_date: Start date for import (datetime)
         end_date: End date for import (datetime)
         import_record: DataImport model instance to track progress
+        on_progress: Optional callback(total, successful, failed) run after each committed batch
 
     Returns:
         Dictionary with import statistics
@@ -463,6 +567,9 @@ def import_from_harvest(user_id, account_id, api_token, start_date, end_date, im
             import_record.add_error(error_msg, entry)
             db.session.rollback()
 
+        if on_progress and (idx + 1) % 50 == 0:
+            on_progress(total, successful, failed)
+
     # Final commit
     try:
         db.session.commit()
@@ -2,7 +2,6 @@
 
 import os
 from datetime import datetime, timedelta
-from threading import Thread
 
 from flask import current_app, render_template, url_for
 from flask_mail import Mail, Message
@@ -88,15 +87,6 @@ def reload_mail_config(app):
         return False
 
 
-def send_async_email(app, msg):
-    """Send email asynchronously in background thread"""
-    with app.app_context():
-        try:
-            mail.send(msg)
-        except Exception as e:
-            current_app.logger.error(f"Failed to send email: {e}")
-
-
 def send_client_portal_password_setup_email(client, token):
     """Send password setup email to client
 
@@ -208,7 +198,7 @@ def send_template_email(to, subject, template, **context):
 
 
 def send_email(subject, recipients, text_body, html_body=None, sender=None, attachments=None):
-    """Send an email
+    """Queue an email in the outbox; the outbox worker sends it in the background
 
     Args:
         subject: Email subject line
@@ -255,8 +245,10 @@ def send_email(subject, recipients, text_body, html_body=None, sender=None, atta
         for filename, content_type, data in attachments:
             msg.attach(filename, content_type, data)
 
-    # Send asynchronously
-    Thread(target=send_async_email, args=(current_app._get_current_object(), msg)).start()
+    # Queue in the outbox; the outbox worker sends it (see app.utils.email_outbox)
+    from app.utils.email_outbox import queue_email
+
+    queue_email(msg)
 
 
 def send_overdue_invoice_notification(invoice, user):
@@ -698,14 +690,16 @@ def _build_invoice_email_payload(invoice, email_template_id=None, custom_message
     current_app.logger.info(f"[INVOICE EMAIL] Building payload for invoice {invoice.invoice_number}")
 
     pdf_bytes = None
+    # (embed_err, pdfa_err) once the PDF went through Factur-X/PDF-A post-processing
+    postprocess_errors = None
     try:
-        from app.utils.pdf_generator import InvoicePDFGenerator
+        from app.utils.pdf_cache import render_invoice_pdf
 
         settings = Settings.get_settings()
-        pdf_generator = InvoicePDFGenerator(invoice, settings=settings, page_size="A4")
-        pdf_bytes = pdf_generator.generate_pdf()
+        pdf_bytes, embed_err, pdfa_err = render_invoice_pdf(invoice, settings, page_size="A4")
         if not pdf_bytes:
             raise ValueError("PDF generator returned None")
+        postprocess_errors = (embed_err, pdfa_err)
         current_app.logger.info(f"[INVOICE EMAIL] PDF generated successfully - size: {len(pdf_bytes)} bytes")
     except Exception as pdf_error:
         current_app.logger.warning(f"[INVOICE EMAIL] PDF generation failed, trying fallback: {pdf_error}")
@@ -728,9 +722,12 @@ def _build_invoice_email_payload(invoice, email_template_id=None, custom_message
         raise ValueError("PDF generation returned empty result")
 
     settings = Settings.get_settings()
-    from app.utils.invoice_pdf_postprocess import postprocess_invoice_pdf_bytes
+    if postprocess_errors is None:
+        from app.utils.invoice_pdf_postprocess import postprocess_invoice_pdf_bytes
 
-    pdf_bytes, embed_err, pdfa_err = postprocess_invoice_pdf_bytes(pdf_bytes, invoice, settings)
+        pdf_bytes, embed_err, pdfa_err = postprocess_invoice_pdf_bytes(pdf_bytes, invoice, settings)
+    else:
+        embed_err, pdfa_err = postprocess_errors
     if embed_err:
         current_app.logger.error(f"[INVOICE EMAIL] Factur-X embed failed: {embed_err}")
         raise ValueError(
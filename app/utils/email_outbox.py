@@ -0,0 +1,470 @@
+"""Email outbox worker - sends queued notification emails in batches over one SMTP connection
+
+``send_email`` used to start a thread per message, and every thread opened
+its own SMTP connection (a scheduled run for 500 users meant 500 threads and
+500 TLS handshakes at once). It now calls ``queue_email``, which writes an
+``email_outbox`` row on its own connection, so the email is stored even if the
+caller's transaction rolls back or the process stops before it is sent.
+
+The worker drains the outbox:
+
+- a batch of due rows is claimed with one conditional ``UPDATE`` that sets a
+  lease (``locked_by`` / ``locked_until``), so worker threads, ``flask
+  email-worker`` processes and replicas can share the table; rows whose lease
+  expired (worker died mid-batch) are claimed again;
+- each batch is sent over a single ``mail.connect()`` connection;
+- sends are paced per SMTP provider (``MAIL_SERVER``) with
+  ``MAIL_RATE_LIMIT_PER_MINUTE`` or a per-host override in ``MAIL_RATE_LIMITS``;
+- failed messages are retried with exponential backoff up to
+  ``EMAIL_OUTBOX_MAX_ATTEMPTS``; sent rows are purged after
+  ``EMAIL_OUTBOX_RETENTION_DAYS``.
+
+The worker thread is started by ``create_app`` (outside tests) and can also
+be run as a dedicated process with ``flask email-worker``. Emails that report
+success to the user right away (test emails, invoice and quote emails) are
+still sent synchronously.
+"""
+
+import base64
+import logging
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.utils import formataddr
+from typing import Dict, List, Optional
+
+from flask_mail import Message
+from prometheus_client import Gauge
+from sqlalchemy import and_, or_
+
+from app import db
+from app.utils.job_queue import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_DEPTH = Gauge("tt_email_outbox_depth", "Emails waiting in the outbox")
+
+# Errors after which the SMTP connection cannot be used for the rest of the batch
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+_worker: Optional["EmailOutboxWorker"] = None
+_worker_lock = threading.Lock()
+
+
+def _config(key, default):
+    from flask import current_app
+
+    try:
+        return current_app.config.get(key, default)
+    except RuntimeError:
+        return default
+
+
+def _table():
+    from app.models import EmailOutboxMessage
+
+    return EmailOutboxMessage.__table__
+
+
+def _due_clause(t, now: datetime):
+    from app.models import EmailOutboxMessage
+
+    return or_(
+        and_(t.c.status == EmailOutboxMessage.STATUS_PENDING, t.c.next_attempt_at <= now),
+        and_(t.c.status == EmailOutboxMessage.STATUS_SENDING, t.c.locked_until < now),
+    )
+
+
+def queue_email(msg: Message, max_attempts: Optional[int] = None) -> int:
+    """Store ``msg`` in the outbox on its own connection and wake the worker; returns the row id"""
+    from app.models import EmailOutboxMessage
+
+    attachments = [
+        {
+            "filename": a.filename,
+            "content_type": a.content_type,
+            "data": base64.b64encode(a.data if isinstance(a.data, bytes) else str(a.data).encode("utf-8")).decode(
+                "ascii"
+            ),
+        }
+        for a in msg.attachments or []
+    ]
+    now = datetime.utcnow()
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            _table()
+            .insert()
+            .values(
+                subject=msg.subject or "",
+                sender=formataddr(msg.sender) if isinstance(msg.sender, tuple) else msg.sender,
+                recipients=list(msg.recipients or []),
+                body=msg.body,
+                html=msg.html,
+                attachments=attachments or None,
+                status=EmailOutboxMessage.STATUS_PENDING,
+                attempts=0,
+                max_attempts=max_attempts or int(_config("EMAIL_OUTBOX_MAX_ATTEMPTS", 5)),
+                next_attempt_at=now,
+                created_at=now,
+            )
+        )
+        message_id = result.inserted_primary_key[0]
+    if _worker is not None:
+        _worker.notify()
+    return message_id
+
+
+def count_pending() -> int:
+    """Number of outbox rows not yet sent or given up on"""
+    from app.models import EmailOutboxMessage
+
+    t = _table()
+    return (
+        db.session.execute(
+            db.select(db.func.count(t.c.id)).where(
+                t.c.status.in_((EmailOutboxMessage.STATUS_PENDING, EmailOutboxMessage.STATUS_SENDING))
+            )
+        ).scalar()
+        or 0
+    )
+
+
+def claim_batch(limit: int, worker_id: str = WORKER_ID, now: Optional[datetime] = None) -> List[int]:
+    """Lease up to ``limit`` due rows with one conditional UPDATE; returns the ids this caller got"""
+    from app.models import EmailOutboxMessage
+
+    now = now or datetime.utcnow()
+    t = _table()
+    with db.engine.connect() as conn:
+        candidates = [
+            row[0]
+            for row in conn.execute(
+                db.select(t.c.id).where(_due_clause(t, now)).order_by(t.c.next_attempt_at, t.c.id).limit(limit)
+            )
+        ]
+    if not candidates:
+        return []
+    # Unique per batch, so the rows won by this UPDATE can be read back
+    lease = f"{worker_id}:{uuid.uuid4().hex[:8]}"[:128]
+    lease_seconds = int(_config("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+    with db.engine.begin() as conn:
+        conn.execute(
+            t.update()
+            .where(t.c.id.in_(candidates), _due_clause(t, now))
+            .values(
+                status=EmailOutboxMessage.STATUS_SENDING,
+                locked_by=lease,
+                locked_until=now + timedelta(seconds=lease_seconds),
+                attempts=t.c.attempts + 1,
+            )
+        )
+        rows = conn.execute(
+            db.select(t.c.id).where(t.c.locked_by == lease, t.c.status == EmailOutboxMessage.STATUS_SENDING)
+        )
+        return sorted(row[0] for row in rows)
+
+
+def _renew_lease(conn, row, now: datetime) -> bool:
+    """Heartbeat before a send: extend the batch's lease; False when this row was re-claimed by another worker"""
+    from app.models import EmailOutboxMessage
+
+    t = _table()
+    lease_seconds = int(_config("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+    conn.execute(
+        t.update()
+        .where(t.c.locked_by == row.locked_by, t.c.status == EmailOutboxMessage.STATUS_SENDING)
+        .values(locked_until=now + timedelta(seconds=lease_seconds))
+    )
+    still_ours = conn.execute(db.select(t.c.id).where(t.c.id == row.id, t.c.locked_by == row.locked_by)).first()
+    return still_ours is not None
+
+
+def _to_message(row) -> Message:
+    msg = Message(
+        subject=row.subject,
+        recipients=list(row.recipients or []),
+        body=row.body,
+        html=row.html,
+        sender=row.sender or _config("MAIL_DEFAULT_SENDER", "noreply@timetracker.local"),
+    )
+    for attachment in row.attachments or []:
+        msg.attach(attachment["filename"], attachment["content_type"], base64.b64decode(attachment["data"]))
+    return msg
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    base = int(_config("EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS", 60))
+    return timedelta(seconds=min(base * (2 ** max(0, attempts - 1)), 6 * 3600))
+
+
+def _mark_sent(conn, row, now: datetime) -> None:
+    from app.models import EmailOutboxMessage
+
+    t = _table()
+    conn.execute(
+        t.update()
+        .where(t.c.id == row.id, t.c.locked_by == row.locked_by)
+        .values(status=EmailOutboxMessage.STATUS_SENT, sent_at=now, locked_by=None, locked_until=None, last_error=None)
+    )
+
+
+def _mark_failed(conn, row, error: str, now: datetime) -> None:
+    from app.models import EmailOutboxMessage
+
+    t = _table()
+    give_up = row.attempts >= row.max_attempts
+    conn.execute(
+        t.update()
+        .where(t.c.id == row.id, t.c.locked_by == row.locked_by)
+        .values(
+            status=EmailOutboxMessage.STATUS_FAILED if give_up else EmailOutboxMessage.STATUS_PENDING,
+            next_attempt_at=now if give_up else now + _retry_delay(row.attempts),
+            locked_by=None,
+            locked_until=None,
+            last_error=error[:2000],
+        )
+    )
+    if give_up:
+        logger.error(f"Email {row.id} to {row.recipients} failed after {row.attempts} attempts: {error}")
+
+
+def _release(conn, rows) -> None:
+    """Hand claimed but unsent rows back without counting the attempt"""
+    from app.models import EmailOutboxMessage
+
+    t = _table()
+    for row in rows:
+        conn.execute(
+            t.update()
+            .where(t.c.id == row.id, t.c.locked_by == row.locked_by)
+            .values(
+                status=EmailOutboxMessage.STATUS_PENDING,
+                attempts=t.c.attempts - 1,
+                locked_by=None,
+                locked_until=None,
+            )
+        )
+
+
+class RateLimiter:
+    """Per-provider pacing of SMTP sends (messages per minute)
+
+    ``MAIL_RATE_LIMITS`` holds ``host=N`` pairs separated by commas (e.g.
+    ``smtp.gmail.com=20,smtp.office365.com=30``); other hosts use
+    ``MAIL_RATE_LIMIT_PER_MINUTE`` (0 = unlimited).
+    """
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._next_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def limit_for(provider: str) -> float:
+        for pair in str(_config("MAIL_RATE_LIMITS", "") or "").split(","):
+            host, _, value = pair.partition("=")
+            if host.strip().lower() == provider and value.strip():
+                try:
+                    return float(value)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid MAIL_RATE_LIMITS entry: {pair.strip()}")
+        return float(_config("MAIL_RATE_LIMIT_PER_MINUTE", 0) or 0)
+
+    def acquire(self, provider: str, stop: Optional[threading.Event] = None) -> bool:
+        """Wait for the provider's next send slot; False if ``stop`` was set while waiting"""
+        per_minute = self.limit_for(provider)
+        if per_minute <= 0:
+            return True
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_at.get(provider, now))
+            self._next_at[provider] = slot + 60.0 / per_minute
+        wait = slot - now
+        if wait > 0:
+            if stop is not None:
+                return not stop.wait(wait)
+            self._sleep(wait)
+        return True
+
+
+def send_due_emails(
+    limit: Optional[int] = None,
+    worker_id: str = WORKER_ID,
+    rate_limiter: Optional[RateLimiter] = None,
+    stop: Optional[threading.Event] = None,
+) -> Dict[str, int]:
+    """Claim one batch of due emails and send it over one SMTP connection
+
+    Returns:
+        dict: ``claimed``, ``sent``, ``failed`` (rescheduled or given up) and ``released`` counts
+    """
+    from app.utils.email import mail
+
+    counts = {"claimed": 0, "sent": 0, "failed": 0, "released": 0}
+    provider = str(_config("MAIL_SERVER", "") or "").lower()
+    limit = limit or int(_config("EMAIL_OUTBOX_BATCH_SIZE", 50))
+    per_minute = RateLimiter.limit_for(provider)
+    if per_minute > 0:
+        # Claim no more than the rate limit lets us send within one lease
+        lease_seconds = int(_config("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+        limit = min(limit, max(1, int(per_minute * lease_seconds / 60)))
+    ids = claim_batch(limit, worker_id)
+    if not ids:
+        return counts
+    counts["claimed"] = len(ids)
+    t = _table()
+    with db.engine.connect() as conn:
+        rows = list(conn.execute(db.select(t).where(t.c.id.in_(ids)).order_by(t.c.id)))
+
+    rate_limiter = rate_limiter or RateLimiter()
+    remaining = list(rows)
+    try:
+        with mail.connect() as smtp:
+            while remaining:
+                row = remaining[0]
+                if (stop is not None and stop.is_set()) or not rate_limiter.acquire(provider, stop):
+                    break
+                remaining.pop(0)
+                with db.engine.begin() as conn:
+                    if not _renew_lease(conn, row, datetime.utcnow()):
+                        logger.warning(f"Email {row.id} was re-claimed by another worker; not sending it here")
+                        continue
+                try:
+                    smtp.send(_to_message(row))
+                except _CONNECTION_ERRORS as e:
+                    with db.engine.begin() as conn:
+                        _mark_failed(conn, row, str(e), datetime.utcnow())
+                    counts["failed"] += 1
+                    break
+                except Exception as e:
+                    with db.engine.begin() as conn:
+                        _mark_failed(conn, row, str(e), datetime.utcnow())
+                    counts["failed"] += 1
+                    continue
+                with db.engine.begin() as conn:
+                    _mark_sent(conn, row, datetime.utcnow())
+                counts["sent"] += 1
+    except Exception as e:
+        # Connecting failed (or the server dropped the connection on quit)
+        logger.warning(f"SMTP connection for email outbox failed: {e}")
+        with db.engine.begin() as conn:
+            for row in remaining:
+                _mark_failed(conn, row, str(e), datetime.utcnow())
+        counts["failed"] += len(remaining)
+        remaining = []
+    if remaining:
+        with db.engine.begin() as conn:
+            _release(conn, remaining)
+        counts["released"] = len(remaining)
+    return counts
+
+
+def purge_sent(days: Optional[int] = None) -> int:
+    """Delete sent rows older than ``days`` (default ``EMAIL_OUTBOX_RETENTION_DAYS``); returns rows deleted"""
+    from app.models import EmailOutboxMessage
+
+    days = int(_config("EMAIL_OUTBOX_RETENTION_DAYS", 30) if days is None else days)
+    t = _table()
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            t.delete().where(
+                t.c.status == EmailOutboxMessage.STATUS_SENT,
+                t.c.sent_at < datetime.utcnow() - timedelta(days=days),
+            )
+        )
+        return result.rowcount or 0
+
+
+class EmailOutboxWorker:
+    """Background thread that drains the email outbox one SMTP batch at a time"""
+
+    def __init__(self, app, poll_interval: float = 5.0, worker_id: str = WORKER_ID):
+        self.app = app
+        self.poll_interval = float(poll_interval)
+        self.worker_id = worker_id
+        self.rate_limiter = RateLimiter()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_purge = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+        logger.info("Email outbox worker started")
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join(timeout=self.poll_interval + 30)
+
+    def notify(self) -> None:
+        """Wake the worker (an email was queued)"""
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Send due emails until none are left (or the worker stops); returns the number sent"""
+        sent = 0
+        with self.app.app_context():
+            try:
+                EMAIL_OUTBOX_DEPTH.set(count_pending())
+                while not self._stop.is_set():
+                    counts = send_due_emails(worker_id=self.worker_id, rate_limiter=self.rate_limiter, stop=self._stop)
+                    sent += counts["sent"]
+                    # Stop on an empty batch, or when the SMTP server is failing
+                    if not counts["claimed"] or not counts["sent"]:
+                        break
+                if time.monotonic() - self._last_purge > 3600:
+                    self._last_purge = time.monotonic()
+                    purge_sent()
+                EMAIL_OUTBOX_DEPTH.set(count_pending())
+            except Exception as e:
+                logger.error(f"Email outbox poll failed: {e}", exc_info=True)
+                try:
+                    db.session.rollback()
+                except Exception:
+                    pass
+            finally:
+                db.session.remove()
+        return sent
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.run_once()
+
+
+def get_worker() -> Optional[EmailOutboxWorker]:
+    """Return the process-wide outbox worker, if one was started"""
+    return _worker
+
+
+def start_worker(app) -> Optional[EmailOutboxWorker]:
+    """Start the process-wide outbox worker from app config (idempotent)
+
+    Returns None when ``EMAIL_OUTBOX_WORKER`` is off; run ``flask
+    email-worker`` processes to send queued emails in that case.
+    """
+    global _worker
+    if not app.config.get("EMAIL_OUTBOX_WORKER", True):
+        return None
+    with _worker_lock:
+        if _worker is None or not _worker.running:
+            _worker = EmailOutboxWorker(app, poll_interval=app.config.get("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", 5.0))
+            _worker.start()
+    return _worker
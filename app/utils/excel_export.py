@@ -2,9 +2,11 @@
 
 import io
 import logging
+import tempfile
 from datetime import datetime
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 
@@ -74,22 +76,47 @@ ALLOWED_TIME_ENTRY_EXPORT_COLUMNS = {
 }
 
 
+# Column widths for write-only exports (widths must be set before rows are streamed)
+_TIME_ENTRY_COLUMN_WIDTHS = {
+    "id": 8,
+    "date": 12,
+    "user": 22,
+    "project": 30,
+    "client": 26,
+    "billed": 8,
+    "task": 26,
+    "start_time": 27,
+    "end_time": 27,
+    "duration": 18,
+    "duration_hours": 18,
+    "duration_formatted": 20,
+    "notes": 50,
+    "tags": 20,
+    "source": 10,
+    "billable": 10,
+    "created_at": 27,
+}
+
+
 def create_time_entries_excel(entries, filename_prefix="timetracker_export", columns=None):
     """Create Excel file from time entries
 
+    Written with openpyxl's write-only mode: ``entries`` may be any iterable
+    (e.g. ``iter_time_entry_export_rows``) and is consumed once, so rows are
+    never all held in memory. The workbook is built in a spooled temporary
+    file that only moves to disk once it grows large.
+
     Args:
-        entries: List of TimeEntry objects
+        entries: Iterable of TimeEntry objects (or ``TimeEntryExportRow``)
         filename_prefix: Prefix for the filename
         columns: Optional list of column keys to export (see ALLOWED_TIME_ENTRY_EXPORT_COLUMNS).
                  If omitted/None, uses the legacy fixed export format.
 
     Returns:
-        tuple: (BytesIO object with Excel file, filename)
+        tuple: (binary file object positioned at 0 with the Excel file, filename)
     """
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Time Entries"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Time Entries")
 
     # Define styles
     header_font = Font(bold=True, color="FFFFFF")
@@ -125,70 +152,66 @@ def create_time_entries_excel(entries, filename_prefix="timetracker_export", col
             column_keys = ["date", "user", "project", "task", "duration_hours", "notes"]
 
     headers = [ALLOWED_TIME_ENTRY_EXPORT_COLUMNS[k][0] for k in column_keys]
+    for col_num, key in enumerate(column_keys, 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = _TIME_ENTRY_COLUMN_WIDTHS.get(key, 15)
 
     # Write headers with styling
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num, value=header)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
         cell.font = header_font
         cell.fill = header_fill
         cell.alignment = header_alignment
         cell.border = border
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     # Write data
-    for row_num, entry in enumerate(entries, 2):
-        data = []
+    row_count = 0
+    total_hours = 0
+    billable_hours = 0
+    for entry in entries:
+        row_count += 1
+        if columns is None and getattr(entry, "end_time", None):
+            total_hours += entry.duration_hours
+            if getattr(entry, "billable", False):
+                billable_hours += entry.duration_hours
+
+        row = []
         for key in column_keys:
             try:
                 extractor = ALLOWED_TIME_ENTRY_EXPORT_COLUMNS[key][1]
-                data.append(extractor(entry))
+                value = extractor(entry)
             except Exception as e:
                 logger.debug(f"Error exporting column {key}: {e}")
-                data.append("")
-
-        for col_num, value in enumerate(data, 1):
-            cell = ws.cell(row=row_num, column=col_num, value=value)
+                value = ""
+            cell = WriteOnlyCell(ws, value=value)
             cell.border = border
-
             # Format duration columns as numbers
-            if column_keys[col_num - 1] in {"duration", "duration_hours"} and isinstance(value, (int, float)):
+            if key in {"duration", "duration_hours"} and isinstance(value, (int, float)):
                 cell.number_format = "0.00"
-
-    # Auto-adjust column widths
-    for col_idx, col in enumerate(ws.columns, 1):
-        max_length = 0
-        # Get column letter - use column index (1-based) to avoid MergedCell issues
-        column = get_column_letter(col_idx)
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except (AttributeError, TypeError) as e:
-                # Cell value may be None or not have expected attributes
-                logger.debug(f"Error reading cell value: {e}")
-                pass
-        adjusted_width = min(max_length + 2, 50)  # Cap at 50
-        ws.column_dimensions[column].width = adjusted_width
+            row.append(cell)
+        ws.append(row)
 
     # Add summary at the bottom only for legacy exports
     if columns is None:
-        last_row = len(entries) + 2
-        ws.cell(row=last_row + 1, column=1, value="Summary")
-        ws.cell(row=last_row + 1, column=1).font = Font(bold=True)
-
-        total_hours = sum(e.duration_hours for e in entries if getattr(e, "end_time", None))
-        billable_hours = sum(
-            e.duration_hours for e in entries if getattr(e, "end_time", None) and getattr(e, "billable", False)
-        )
-
-        ws.cell(row=last_row + 2, column=1, value="Total Hours:")
-        ws.cell(row=last_row + 2, column=2, value=total_hours).number_format = "0.00"
-        ws.cell(row=last_row + 3, column=1, value="Billable Hours:")
-        ws.cell(row=last_row + 3, column=2, value=billable_hours).number_format = "0.00"
-        ws.cell(row=last_row + 4, column=1, value="Total Entries:")
-        ws.cell(row=last_row + 4, column=2, value=len(entries))
-
-    # Save to BytesIO
-    output = io.BytesIO()
+        bold = Font(bold=True)
+        summary = WriteOnlyCell(ws, value="Summary")
+        summary.font = bold
+
+        def number_cell(value, fmt="0.00"):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.number_format = fmt
+            return cell
+
+        ws.append([])
+        ws.append([summary])
+        ws.append(["Total Hours:", number_cell(total_hours)])
+        ws.append(["Billable Hours:", number_cell(billable_hours)])
+        ws.append(["Total Entries:", number_cell(row_count, "General")])
+
+    # Save to a spooled temp file (in memory until it gets large)
+    output = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
     wb.save(output)
     output.seek(0)
 
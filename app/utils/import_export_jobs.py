@@ -0,0 +1,159 @@
+"""Background job handlers for the import/export module
+
+Each handler receives the ``BackgroundJob`` and a ``JobContext`` and reports
+into the ``DataImport``/``DataExport`` record the route created. Imports and
+restores commit as they go, so they are registered with a single attempt;
+exports only write a new file and are retried.
+
+Uploaded files are written under ``UPLOAD_FOLDER/jobs`` and listed in the
+payload's ``files``; the queue removes them once the job is final. API tokens
+are stored encrypted when ``SETTINGS_ENCRYPTION_KEY`` is set and are dropped
+from the payload when the job finishes.
+"""
+
+import os
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.models import DataExport, DataImport
+from app.utils.job_queue import job_handler
+from app.utils.secret_crypto import decrypt_if_needed, encrypt_if_possible
+
+EXPORT_MAX_ATTEMPTS = 3
+
+
+def job_upload_path(filename: str) -> str:
+    """A unique path under ``UPLOAD_FOLDER/jobs`` for a file a job will read"""
+    job_dir = os.path.join(current_app.config.get("UPLOAD_FOLDER", "/data/uploads"), "jobs")
+    os.makedirs(job_dir, exist_ok=True)
+    return os.path.join(job_dir, f"{uuid.uuid4().hex}_{secure_filename(filename)}")
+
+
+def protect_secret(value: str) -> str:
+    """Encrypt a credential for the job payload (stored as-is when no encryption key is configured)"""
+    try:
+        return encrypt_if_possible(value)
+    except RuntimeError:
+        return value
+
+
+def _import_record(job):
+    record = db.session.get(DataImport, job.target_id)
+    if record is None:
+        raise RuntimeError(f"Import record {job.target_id} no longer exists")
+    return record
+
+
+def _export_record(job):
+    record = db.session.get(DataExport, job.target_id)
+    if record is None:
+        raise RuntimeError(f"Export record {job.target_id} no longer exists")
+    return record
+
+
+def _date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+@job_handler("import_csv")
+def run_csv_import(job, ctx):
+    from app.utils.data_import import import_csv_time_entries
+
+    with open(job.payload["path"], "r", encoding="utf-8") as f:
+        csv_content = f.read()
+    return import_csv_time_entries(
+        user_id=job.user_id, csv_content=csv_content, import_record=_import_record(job), on_progress=ctx.checkpoint
+    )
+
+
+@job_handler("import_toggl")
+def run_toggl_import(job, ctx):
+    from app.utils.data_import import import_from_toggl
+
+    payload = job.payload
+    return import_from_toggl(
+        user_id=job.user_id,
+        api_token=decrypt_if_needed(payload["api_token"]),
+        workspace_id=payload["workspace_id"],
+        start_date=_date(payload["start_date"]),
+        end_date=_date(payload["end_date"]),
+        import_record=_import_record(job),
+        on_progress=ctx.checkpoint,
+    )
+
+
+@job_handler("import_harvest")
+def run_harvest_import(job, ctx):
+    from app.utils.data_import import import_from_harvest
+
+    payload = job.payload
+    return import_from_harvest(
+        user_id=job.user_id,
+        account_id=payload["account_id"],
+        api_token=decrypt_if_needed(payload["api_token"]),
+        start_date=_date(payload["start_date"]),
+        end_date=_date(payload["end_date"]),
+        import_record=_import_record(job),
+        on_progress=ctx.checkpoint,
+    )
+
+
+def _run_export(job, ctx, produce):
+    export_record = _export_record(job)
+    export_record.start_processing()
+    result = produce()
+    ctx.checkpoint()
+    export_record.complete(
+        file_path=result["filepath"], file_size=result["file_size"], record_count=result["record_count"]
+    )
+    return {
+        "filename": result["filename"],
+        "record_count": result["record_count"],
+        "download_url": f"/api/export/download/{export_record.id}",
+    }
+
+
+@job_handler("export_gdpr", max_attempts=EXPORT_MAX_ATTEMPTS)
+def run_gdpr_export(job, ctx):
+    from app.utils.data_export import export_user_data_gdpr
+
+    return _run_export(
+        job, ctx, lambda: export_user_data_gdpr(user_id=job.user_id, export_format=job.payload.get("format", "json"))
+    )
+
+
+@job_handler("export_backup", max_attempts=EXPORT_MAX_ATTEMPTS)
+def run_backup_export(job, ctx):
+    from app.utils.data_export import create_backup
+
+    return _run_export(job, ctx, lambda: create_backup(user_id=job.user_id))
+
+
+@job_handler("restore_backup")
+def run_backup_restore(job, ctx):
+    from app.utils.backup import restore_backup as restore_backup_archive
+    from app.utils.data_import import restore_from_backup
+
+    import_record = _import_record(job)
+    import_record.start_processing()
+    path = job.payload["path"]
+    if job.payload.get("archive"):
+        # Full system backup (same as Admin restore)
+        success, message = restore_backup_archive(current_app._get_current_object(), path)
+        if not success:
+            raise RuntimeError(message)
+        statistics = {"message": message}
+        # The restored database may not contain this import record
+        db.session.expire_all()
+        import_record = db.session.get(DataImport, job.target_id)
+        if import_record is None:
+            return statistics
+    else:
+        statistics = restore_from_backup(user_id=job.user_id, backup_file_path=path)
+    import_record.set_summary(statistics)
+    import_record.complete()
+    return statistics
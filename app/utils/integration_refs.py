@@ -0,0 +1,168 @@
+"""
+Indexed lookup of projects and tasks by integration reference.
+
+Connectors mark imported records with ``custom_fields["integration"] =
+{"source": ..., "ref": ...}`` (see ``app.utils.integration_sync_context``).
+``receive_after_flush`` mirrors that marker into ``integration_external_refs``
+on the flush's own connection whenever a project or task is inserted, has its
+``custom_fields`` replaced, or is deleted, so the mapping commits or rolls
+back with the record.
+
+``find_projects_by_refs`` and ``find_tasks_by_refs`` resolve a batch of
+external keys in one indexed query. In-place mutation of ``custom_fields``
+(without reassigning the attribute) is not seen by the flush and is not
+mirrored; the helpers in ``integration_sync_context`` always reassign.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import attributes
+
+
+def _models():
+    from app.models import IntegrationExternalRef, Project, Task
+
+    return {IntegrationExternalRef.ENTITY_PROJECT: Project, IntegrationExternalRef.ENTITY_TASK: Task}
+
+
+def _entity_type(obj) -> Optional[str]:
+    for entity_type, model in _models().items():
+        if isinstance(obj, model):
+            return entity_type
+    return None
+
+
+def integration_ref(custom_fields) -> Optional[Tuple[str, str]]:
+    """``(source, ref)`` from a ``custom_fields`` value, or ``None`` when it has no integration marker"""
+    block = custom_fields.get("integration") if isinstance(custom_fields, dict) else None
+    if not isinstance(block, dict):
+        return None
+    source, ref = block.get("source"), block.get("ref")
+    if not source or ref is None or ref == "":
+        return None
+    return str(source), str(ref)
+
+
+def _mapping_row(entity_type: str, obj) -> Optional[Dict[str, Any]]:
+    ref = integration_ref(obj.custom_fields)
+    if ref is None or obj.id is None:
+        return None
+    return {"entity_type": entity_type, "entity_id": obj.id, "source": ref[0], "external_ref": ref[1]}
+
+
+def receive_after_flush(session, flush_context):
+    """Keep ``integration_external_refs`` in line with the projects/tasks written in this flush."""
+    stale: Dict[str, List[int]] = {}
+    rows = []
+    for obj in session.new:
+        entity_type = _entity_type(obj)
+        row = _mapping_row(entity_type, obj) if entity_type else None
+        if row:
+            rows.append(row)
+
+    for obj in session.dirty:
+        entity_type = _entity_type(obj)
+        if not entity_type or obj in session.deleted:
+            continue
+        if not attributes.get_history(obj, "custom_fields", passive=attributes.PASSIVE_NO_INITIALIZE).has_changes():
+            continue
+        stale.setdefault(entity_type, []).append(obj.id)
+        row = _mapping_row(entity_type, obj)
+        if row:
+            rows.append(row)
+
+    for obj in session.deleted:
+        entity_type = _entity_type(obj)
+        if entity_type and obj.id is not None:
+            stale.setdefault(entity_type, []).append(obj.id)
+
+    if not stale and not rows:
+        return
+    from app.models import IntegrationExternalRef
+
+    table = IntegrationExternalRef.__table__
+    conn = session.connection()
+    for entity_type, ids in stale.items():
+        conn.execute(table.delete().where(table.c.entity_type == entity_type, table.c.entity_id.in_(ids)))
+    if rows:
+        conn.execute(table.insert(), rows)
+
+
+def _clean_refs(refs: Iterable[Any]) -> List[str]:
+    return sorted({str(r) for r in refs if r is not None and r != ""})
+
+
+def find_projects_by_refs(client_id: int, source: str, refs: Iterable[Any]) -> Dict[str, Any]:
+    """``{ref: Project}`` for the projects of ``client_id`` linked to ``source`` refs (lowest id wins)."""
+    from app import db
+    from app.models import IntegrationExternalRef, Project
+
+    refs = _clean_refs(refs)
+    if not refs:
+        return {}
+    rows = (
+        db.session.query(IntegrationExternalRef.external_ref, Project)
+        .join(
+            Project,
+            (IntegrationExternalRef.entity_id == Project.id)
+            & (IntegrationExternalRef.entity_type == IntegrationExternalRef.ENTITY_PROJECT),
+        )
+        .filter(
+            Project.client_id == client_id,
+            IntegrationExternalRef.source == source,
+            IntegrationExternalRef.external_ref.in_(refs),
+        )
+        .order_by(Project.id)
+        .all()
+    )
+    found: Dict[str, Any] = {}
+    for ref, project in rows:
+        found.setdefault(ref, project)
+    return found
+
+
+def find_tasks_by_refs(project_id: int, refs: Iterable[Any], source: Optional[str] = None) -> Dict[str, Any]:
+    """``{ref: Task}`` for the tasks of ``project_id`` with those refs, optionally of one ``source`` (lowest id wins)."""
+    from app import db
+    from app.models import IntegrationExternalRef, Task
+
+    refs = _clean_refs(refs)
+    if not refs:
+        return {}
+    query = (
+        db.session.query(IntegrationExternalRef.external_ref, Task)
+        .join(
+            Task,
+            (IntegrationExternalRef.entity_id == Task.id)
+            & (IntegrationExternalRef.entity_type == IntegrationExternalRef.ENTITY_TASK),
+        )
+        .filter(Task.project_id == project_id, IntegrationExternalRef.external_ref.in_(refs))
+    )
+    if source is not None:
+        query = query.filter(IntegrationExternalRef.source == source)
+    found: Dict[str, Any] = {}
+    for ref, task in query.order_by(Task.id).all():
+        found.setdefault(ref, task)
+    return found
+
+
+def rebuild_integration_refs() -> int:
+    """Rebuild the whole mapping from ``custom_fields`` (repair after bulk updates); returns rows written."""
+    from app import db
+    from app.models import IntegrationExternalRef
+
+    db.session.query(IntegrationExternalRef).delete(synchronize_session=False)
+    rows = []
+    for entity_type, model in _models().items():
+        for entity_id, custom_fields in db.session.query(model.id, model.custom_fields).filter(
+            model.custom_fields.isnot(None)
+        ):
+            ref = integration_ref(custom_fields)
+            if ref:
+                rows.append(
+                    {"entity_type": entity_type, "entity_id": entity_id, "source": ref[0], "external_ref": ref[1]}
+                )
+    if rows:
+        db.session.execute(IntegrationExternalRef.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
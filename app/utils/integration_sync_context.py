@@ -10,7 +10,8 @@ Projects are created under a dedicated client (default name "Integration imports
 overridable via INTEGRATION_IMPORT_CLIENT_NAME.
 
 External system linkage is stored in Project.custom_fields / Task.custom_fields under
-the key "integration": {"source": "<provider>", "ref": "<stable id>"}.
+the key "integration": {"source": "<provider>", "ref": "<stable id>"}, and mirrored into the
+indexed integration_external_refs table used by the find_* lookups (see app.utils.integration_refs).
 """
 
 from __future__ import annotations
@@ -87,14 +88,16 @@ def require_sync_context(integration) -> Tuple[int, int]:
 
 
 def find_project_by_integration_ref(client_id: int, source: str, ref: str):
-    from app.models import Project
+    from app.utils.integration_refs import find_projects_by_refs
 
-    for p in Project.query.filter_by(client_id=client_id).all():
-        cf = p.custom_fields if p.custom_fields is not None else {}
-        block = cf.get("integration") if isinstance(cf, dict) else {}
-        if isinstance(block, dict) and block.get("source") == source and block.get("ref") == ref:
-            return p
-    return None
+    return find_projects_by_refs(client_id, source, [ref]).get(str(ref))
+
+
+def find_projects_by_integration_refs(client_id: int, source: str, refs) -> Dict[str, Any]:
+    """Bulk ``find_project_by_integration_ref``: ``{ref: Project}`` for the refs that exist."""
+    from app.utils.integration_refs import find_projects_by_refs
+
+    return find_projects_by_refs(client_id, source, refs)
 
 
 def ensure_project_integration_fields(
@@ -117,17 +120,16 @@ def ensure_project_integration_fields(
 
 def find_task_by_integration_ref(project_id: int, ref: str, source: Optional[str] = None):
     """Match task by integration ref. If ``source`` is set, require the same integration source."""
-    from app.models import Task
-
-    for t in Task.query.filter_by(project_id=project_id).all():
-        cf = t.custom_fields if t.custom_fields is not None else {}
-        block = cf.get("integration") if isinstance(cf, dict) else {}
-        if not isinstance(block, dict) or block.get("ref") != ref:
-            continue
-        if source is not None and block.get("source") != source:
-            continue
-        return t
-    return None
+    from app.utils.integration_refs import find_tasks_by_refs
+
+    return find_tasks_by_refs(project_id, [ref], source=source).get(str(ref))
+
+
+def find_tasks_by_integration_refs(project_id: int, refs, source: Optional[str] = None) -> Dict[str, Any]:
+    """Bulk ``find_task_by_integration_ref``: ``{ref: Task}`` for the refs that exist (one query per page)."""
+    from app.utils.integration_refs import find_tasks_by_refs
+
+    return find_tasks_by_refs(project_id, refs, source=source)
 
 
 def set_task_integration_ref(task, *, source: str, ref: str, extra: Optional[Dict[str, Any]] = None) -> None:
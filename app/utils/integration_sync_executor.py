@@ -0,0 +1,351 @@
+"""
+Concurrent executor for scheduled integration syncs.
+
+``sync_integrations`` and ``sync_google_calendar_for_all_users`` used to call
+each connector in turn, so one slow Jira or CalDAV server delayed every other
+tenant and the run grew linearly with the number of integrations.
+``IntegrationSyncExecutor.run`` runs one ``SyncTask`` per integration in a
+bounded thread pool (``INTEGRATION_SYNC_WORKERS``):
+
+- every task pushes its own app context and uses its own (thread-scoped)
+  DB session, which is removed when the task ends;
+- at most ``INTEGRATION_SYNC_PER_PROVIDER`` tasks of a provider (overridable
+  per provider with ``INTEGRATION_SYNC_PROVIDER_LIMITS``, e.g. ``jira=1``)
+  and ``INTEGRATION_SYNC_PER_HOST`` tasks against one server run at once; a
+  task that cannot get a slot within the timeout is skipped;
+- each task waits a random delay of up to ``INTEGRATION_SYNC_JITTER_SECONDS``
+  before it starts, so syncs do not all hit their servers at the same second;
+- a task still running ``INTEGRATION_SYNC_TIMEOUT_SECONDS`` after it started
+  is reported as timed out and no longer waited for. The thread finishes in
+  the background and completes the timeout's event with its real outcome;
+  until then the integration stays in a process-wide registry and later runs
+  skip it instead of starting a second sync next to it.
+
+Every finished task records an ``IntegrationEvent`` through
+``IntegrationService._log_event`` with its duration and item count.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Integration id -> sync in progress, across runs (a timed-out sync stays here until it returns)
+_in_flight: Dict[int, "_Running"] = {}
+_in_flight_lock = threading.Lock()
+
+
+@dataclass
+class SyncTask:
+    """One integration to sync; ``func(integration)`` runs in the task's app context and returns the result dict"""
+
+    integration_id: int
+    provider: str
+    host: str
+    func: Callable[[Any], Dict[str, Any]]
+
+
+@dataclass
+class SyncOutcome:
+    integration_id: int
+    provider: str
+    success: bool
+    message: Optional[str] = None
+    items: int = 0
+    duration: float = 0.0
+    timed_out: bool = False
+    result: Dict[str, Any] = field(default_factory=dict)
+
+
+def integration_host(integration) -> str:
+    """Server a sync talks to: the first URL in the integration config, else the connector's API host"""
+    for key, value in sorted((integration.config or {}).items()):
+        if key.endswith("url") and isinstance(value, str) and "://" in value:
+            netloc = urlparse(value).netloc.lower()
+            if netloc:
+                return netloc
+    from app.services.integration_service import IntegrationService
+
+    connector_class = IntegrationService._connector_registry.get(integration.provider)
+    for attr in ("BASE_URL", "API_BASE_URL", "GRAPH_BASE_URL"):
+        value = getattr(connector_class, attr, None)
+        if isinstance(value, str) and "://" in value:
+            return urlparse(value).netloc.lower()
+    return integration.provider
+
+
+def _parse_limits(raw: str) -> Dict[str, int]:
+    limits = {}
+    for pair in str(raw or "").split(","):
+        name, _, value = pair.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip().lower()] = int(value)
+    return limits
+
+
+class _Slots:
+    """Named semaphores created on first use"""
+
+    def __init__(self, default: int, overrides: Optional[Dict[str, int]] = None):
+        self.default = max(1, int(default))
+        self.overrides = overrides or {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(name)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(max(1, self.overrides.get(name, self.default)))
+                self._semaphores[name] = semaphore
+            return semaphore
+
+
+class _Running:
+    def __init__(self, task: SyncTask):
+        self.task = task
+        self.started_at: Optional[float] = None
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        # Guards the hand-over between the run loop declaring a timeout and the sync completing
+        self.lock = threading.Lock()
+        self.completed = False
+        self.timed_out = False
+        self.timeout_event_id: Optional[int] = None
+
+
+def _register(running: _Running) -> bool:
+    """Claim the integration for this sync; False while an earlier sync of it is still running"""
+    with _in_flight_lock:
+        if running.task.integration_id in _in_flight:
+            return False
+        _in_flight[running.task.integration_id] = running
+        return True
+
+
+def _unregister(running: _Running) -> None:
+    with _in_flight_lock:
+        if _in_flight.get(running.task.integration_id) is running:
+            del _in_flight[running.task.integration_id]
+
+
+class IntegrationSyncExecutor:
+    """Runs integration syncs in a bounded thread pool with per-provider and per-host caps"""
+
+    def __init__(
+        self,
+        app,
+        max_workers: int = 4,
+        per_provider: int = 2,
+        per_host: int = 2,
+        timeout: float = 900.0,
+        jitter: float = 10.0,
+        provider_limits: Optional[Dict[str, int]] = None,
+        trigger: str = "scheduler",
+    ):
+        self.app = app
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = float(timeout)
+        self.jitter = max(0.0, float(jitter))
+        self.trigger = trigger
+        self._providers = _Slots(per_provider, provider_limits)
+        self._hosts = _Slots(per_host)
+
+    @classmethod
+    def from_config(cls, app, **kwargs) -> "IntegrationSyncExecutor":
+        cfg = app.config
+        options = dict(
+            max_workers=cfg.get("INTEGRATION_SYNC_WORKERS", 4),
+            per_provider=cfg.get("INTEGRATION_SYNC_PER_PROVIDER", 2),
+            per_host=cfg.get("INTEGRATION_SYNC_PER_HOST", 2),
+            timeout=cfg.get("INTEGRATION_SYNC_TIMEOUT_SECONDS", 900),
+            jitter=cfg.get("INTEGRATION_SYNC_JITTER_SECONDS", 10),
+            provider_limits=_parse_limits(cfg.get("INTEGRATION_SYNC_PROVIDER_LIMITS", "")),
+        )
+        options.update(kwargs)
+        return cls(app, **options)
+
+    def run(self, tasks: Iterable[SyncTask]) -> List[SyncOutcome]:
+        """Run ``tasks`` and return their outcomes (timed-out tasks included) in completion order"""
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        outcomes: List[SyncOutcome] = []
+        workers = min(self.max_workers, len(tasks))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="integration-sync")
+        abandoned: List[_Running] = []
+        try:
+            pending = {}
+            for task in tasks:
+                running = _Running(task)
+                if not _register(running):
+                    message = "Skipped: the previous sync of this integration is still running"
+                    logger.warning(f"Integration {task.integration_id} ({task.provider}): {message}")
+                    outcomes.append(SyncOutcome(task.integration_id, task.provider, False, message))
+                    continue
+                pending[executor.submit(self._execute, running)] = running
+            while pending:
+                done, _ = wait(list(pending), timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    outcomes.append(future.result())
+                now = time.monotonic()
+                for future, running in list(pending.items()):
+                    if running.started_at is not None and now - running.started_at > self.timeout:
+                        outcome = self._timed_out(running, now - running.started_at)
+                        if outcome is None:
+                            continue  # finished just now; collected on the next pass
+                        pending.pop(future)
+                        abandoned.append(running)
+                        outcomes.append(outcome)
+                # Every thread is held by a timed-out sync: the rest would never start
+                if pending and sum(1 for r in abandoned if not r.finished.is_set()) >= workers:
+                    for future, running in list(pending.items()):
+                        if running.started_at is None:
+                            running.cancelled.set()
+                            if future.cancel():
+                                _unregister(running)
+                            pending.pop(future)
+                            outcomes.append(
+                                SyncOutcome(
+                                    running.task.integration_id,
+                                    running.task.provider,
+                                    False,
+                                    "Not started: all sync workers are busy with timed-out syncs",
+                                )
+                            )
+        finally:
+            # Timed-out syncs keep their thread until the connector returns
+            executor.shutdown(wait=False)
+        return outcomes
+
+    def _execute(self, running: _Running) -> SyncOutcome:
+        try:
+            return self._acquire_and_sync(running)
+        finally:
+            running.finished.set()
+            _unregister(running)
+
+    def _acquire_and_sync(self, running: _Running) -> SyncOutcome:
+        from app import db
+        from app.models import Integration
+
+        task = running.task
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        if running.cancelled.is_set():
+            return SyncOutcome(task.integration_id, task.provider, False, "Cancelled")
+        provider_slot = self._providers.get(task.provider.lower())
+        host_slot = self._hosts.get(task.host)
+        if not provider_slot.acquire(timeout=self.timeout):
+            return SyncOutcome(task.integration_id, task.provider, False, f"No free {task.provider} sync slot")
+        try:
+            if not host_slot.acquire(timeout=self.timeout):
+                return SyncOutcome(task.integration_id, task.provider, False, f"No free sync slot for {task.host}")
+            try:
+                running.started_at = time.monotonic()
+                with self.app.app_context():
+                    try:
+                        integration = db.session.get(Integration, task.integration_id)
+                        if integration is None:
+                            return SyncOutcome(task.integration_id, task.provider, False, "Integration not found")
+                        return self._sync(running, integration)
+                    finally:
+                        db.session.remove()
+            finally:
+                host_slot.release()
+        finally:
+            provider_slot.release()
+
+    def _sync(self, running: _Running, integration) -> SyncOutcome:
+        from app import db
+        from app.utils.integration_sync_context import sync_result_item_count
+
+        task = running.task
+        try:
+            result = task.func(integration) or {}
+            success = bool(result.get("success", result.get("ok")))
+            message = result.get("message") or result.get("error")
+            items = sync_result_item_count(result)
+        except Exception as e:
+            logger.error(f"Error syncing integration {task.integration_id} ({task.provider}): {e}", exc_info=True)
+            db.session.rollback()
+            result, success, message, items = {}, False, str(e), 0
+        outcome = SyncOutcome(
+            task.integration_id,
+            task.provider,
+            success,
+            message,
+            items,
+            time.monotonic() - running.started_at,
+            result=result,
+        )
+        with running.lock:
+            running.completed = True
+            late = running.timed_out
+        if late:
+            outcome.timed_out = True
+            self._log_late(running.timeout_event_id, outcome)
+        else:
+            self._log(outcome)
+        return outcome
+
+    def _timed_out(self, running: _Running, elapsed: float) -> Optional[SyncOutcome]:
+        """Report a sync that overran the timeout; None when it completed in the meantime"""
+        task = running.task
+        message = f"Sync still running after {int(elapsed)}s (timeout {int(self.timeout)}s)"
+        outcome = SyncOutcome(task.integration_id, task.provider, False, message, duration=elapsed, timed_out=True)
+        with running.lock:
+            if running.completed:
+                return None
+            running.timed_out = True
+            logger.warning(f"Integration {task.integration_id} ({task.provider}): {message}")
+            running.timeout_event_id = self._log(outcome)
+        return outcome
+
+    def _metadata(self, outcome: SyncOutcome) -> Dict[str, Any]:
+        metadata = {
+            "trigger": self.trigger,
+            "duration_ms": int(outcome.duration * 1000),
+            "synced_count": outcome.items,
+            "synced_items": outcome.items,
+        }
+        if outcome.timed_out:
+            metadata["timed_out"] = True
+        return metadata
+
+    def _log(self, outcome: SyncOutcome) -> Optional[int]:
+        from app.services.integration_service import IntegrationService
+
+        try:
+            event = IntegrationService()._log_event(
+                outcome.integration_id, "sync", outcome.success, outcome.message, self._metadata(outcome)
+            )
+            return event.id if event is not None else None
+        except Exception as e:
+            logger.warning("Could not log integration sync outcome: %s", e)
+            return None
+
+    def _log_late(self, event_id: Optional[int], outcome: SyncOutcome) -> None:
+        """A timed-out sync returned: complete its timeout event instead of logging a second one"""
+        from app import db
+        from app.models import IntegrationEvent
+
+        try:
+            event = db.session.get(IntegrationEvent, event_id) if event_id else None
+            if event is None:
+                self._log(outcome)
+                return
+            event.status = "success" if outcome.success else "error"
+            event.message = f"{outcome.message or 'Sync finished'} (after the {int(self.timeout)}s timeout)"
+            event.event_metadata = dict(event.event_metadata or {}, **self._metadata(outcome), finished_late=True)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Could not record the late outcome of integration sync %s: %s", outcome.integration_id, e)
@@ -0,0 +1,136 @@
+"""
+Indexed links between invoice lines and the time entries they bill.
+
+``InvoiceItem.time_entry_ids`` (comma-separated) stays the field that the
+invoice forms, services and API write. ``receive_after_flush`` mirrors it into
+``invoice_item_time_entries`` for every invoice line created, deleted or whose
+``time_entry_ids`` changed, on the flush's own connection, so the links commit
+or roll back with the line. IDs of time entries that do not exist are skipped.
+
+Readers test "billed" with ``billed_clause``, a correlated ``EXISTS`` on the
+link table's ``time_entry_id`` index joined to the line's invoice, so finding
+unbilled time is a single anti-join (``~billed_clause(TimeEntry.id, ...)``)
+instead of splitting the ``time_entry_ids`` of every invoice line in Python.
+``flask rebuild-invoice-time-entry-links`` recomputes the table from the
+string column.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+import sqlalchemy as sa
+from sqlalchemy.orm import attributes
+
+logger = logging.getLogger(__name__)
+
+
+def parse_time_entry_ids(value) -> List[int]:
+    """Time entry IDs of a comma-separated ``time_entry_ids`` value, in order and without duplicates"""
+    if not value:
+        return []
+    ids: List[int] = []
+    for part in str(value).split(","):
+        part = part.strip()
+        if part.isdigit() and int(part) not in ids:
+            ids.append(int(part))
+    return ids
+
+
+def _tables():
+    from app.models import Invoice, InvoiceItem, InvoiceItemTimeEntry, TimeEntry
+
+    return InvoiceItemTimeEntry.__table__, InvoiceItem.__table__, Invoice.__table__, TimeEntry.__table__
+
+
+def _sync(connection, lines: Dict[int, List[int]], removed: Set[int], replace: bool = True) -> int:
+    """Write the links of ``lines`` (item id -> entry ids), replacing theirs and those of ``removed`` items"""
+    links, _, _, entries = _tables()
+    item_ids = set(lines) | removed
+    if replace and item_ids:
+        connection.execute(links.delete().where(links.c.invoice_item_id.in_(sorted(item_ids))))
+    inserted = 0
+    for item_id, entry_ids in lines.items():
+        if not entry_ids:
+            continue
+        existing = sa.select(sa.literal(item_id), entries.c.id).where(entries.c.id.in_(entry_ids))
+        result = connection.execute(
+            links.insert().from_select([links.c.invoice_item_id, links.c.time_entry_id], existing)
+        )
+        inserted += max(result.rowcount or 0, 0)
+    return inserted
+
+
+def receive_after_flush(session, flush_context):
+    """Mirror ``time_entry_ids`` of the invoice lines written in this flush into the link table."""
+    from app.models import InvoiceItem
+
+    lines: Dict[int, List[int]] = {}
+    removed: Set[int] = set()
+    for obj in session.new:
+        if isinstance(obj, InvoiceItem) and obj.time_entry_ids:
+            lines[obj.id] = parse_time_entry_ids(obj.time_entry_ids)
+    for obj in session.dirty:
+        if not isinstance(obj, InvoiceItem):
+            continue
+        hist = attributes.get_history(obj, "time_entry_ids", passive=attributes.PASSIVE_NO_INITIALIZE)
+        if hist.added or hist.deleted:
+            lines[obj.id] = parse_time_entry_ids(obj.time_entry_ids)
+    for obj in session.deleted:
+        if isinstance(obj, InvoiceItem) and sa.inspect(obj).identity is not None:
+            removed.add(sa.inspect(obj).identity[0])
+    if lines or removed:
+        _sync(session.connection(), lines, removed)
+
+
+def billed_clause(time_entry_id, *invoice_criteria):
+    """``EXISTS`` clause: the time entry is on an invoice line
+
+    Args:
+        time_entry_id: Column (usually ``TimeEntry.id``) the clause correlates with
+        invoice_criteria: Conditions on ``Invoice`` columns the line's invoice must match,
+            e.g. ``Invoice.client_id == client_id``
+    """
+    links, items, invoices, _ = _tables()
+    # Joining the line keeps links left behind by bulk deletes from counting
+    query = (
+        sa.select(sa.literal(1))
+        .select_from(links.join(items, items.c.id == links.c.invoice_item_id))
+        .where(links.c.time_entry_id == time_entry_id)
+    )
+    if invoice_criteria:
+        query = query.join(invoices, invoices.c.id == items.c.invoice_id).where(*invoice_criteria)
+    return sa.exists(query)
+
+
+def billed_time_entry_ids_select(*invoice_criteria):
+    """``SELECT time_entry_id`` of the lines of invoices matching ``invoice_criteria``"""
+    links, items, invoices, _ = _tables()
+    return (
+        sa.select(links.c.time_entry_id)
+        .join(items, items.c.id == links.c.invoice_item_id)
+        .join(invoices, invoices.c.id == items.c.invoice_id)
+        .where(*invoice_criteria)
+    )
+
+
+def rebuild_invoice_time_entry_links(item_ids: Optional[Iterable[int]] = None, connection=None) -> int:
+    """Recompute links from ``invoice_items.time_entry_ids``; returns the number of links written
+
+    Args:
+        item_ids: Invoice lines to rebuild (default: all)
+        connection: Connection to use (default: the current session's)
+    """
+    from app import db
+
+    links, items, _, _ = _tables()
+    connection = connection if connection is not None else db.session.connection()
+    query = sa.select(items.c.id, items.c.time_entry_ids)
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        if not item_ids:
+            return 0
+        query = query.where(items.c.id.in_(item_ids))
+    else:
+        connection.execute(links.delete())
+    lines = {row.id: parse_time_entry_ids(row.time_entry_ids) for row in connection.execute(query)}
+    return _sync(connection, lines, set(), replace=item_ids is not None)
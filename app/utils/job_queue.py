@@ -0,0 +1,584 @@
+"""Persistent background job queue - runs imports, exports and restores off the request path
+
+Routes ``enqueue`` a ``BackgroundJob`` row and return its status URL at once.
+Workers pick due rows up:
+
+- a job is claimed with one conditional ``UPDATE`` that sets a lease
+  (``locked_by`` / ``locked_until``), so any number of threads, ``flask
+  job-worker`` processes and replicas can poll the same table;
+- while a job runs, its lease is extended by heartbeats - from the worker
+  pool's dispatcher thread and from every ``JobContext.checkpoint`` the
+  handler calls when it reports progress;
+- a job whose lease expired (the worker died) is claimed again while
+  ``attempts < max_attempts``, otherwise it is failed by the reaper;
+- a failed attempt is retried with exponential backoff up to
+  ``max_attempts``; handlers that are not safe to repeat register with
+  ``max_attempts=1``;
+- cancellation sets ``cancel_requested``; a queued job is cancelled at once
+  and a running one raises ``JobCancelled`` at its next checkpoint.
+
+Job state writes use their own connection (``db.engine.begin()``) so they
+never share a transaction with the handler's work. Handlers are registered
+with ``@job_handler("type")``; the import/export handlers live in
+``app.utils.import_export_jobs``, the invoice PDF renderer in
+``app.utils.pdf_jobs``.
+
+The pool is started by ``create_app`` (outside tests) with
+``JOB_QUEUE_WORKERS`` threads and can also be run as a dedicated process
+with ``flask job-worker``.
+"""
+
+import importlib
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# Modules that register handlers; imported before a job is executed
+HANDLER_MODULES = ("app.utils.import_export_jobs", "app.utils.pdf_jobs")
+# Payload keys removed once a job reaches a final state
+SECRET_PAYLOAD_KEYS = ("api_token",)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_handlers: Dict[str, "_Handler"] = {}
+_pool: Optional["JobWorkerPool"] = None
+_pool_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled or its lease was lost"""
+
+
+class _Handler:
+    def __init__(self, func: Callable, max_attempts: int):
+        self.func = func
+        self.max_attempts = max_attempts
+
+
+def job_handler(job_type: str, max_attempts: int = 1):
+    """Register ``func(job, ctx)`` as the handler for ``job_type``
+
+    ``max_attempts`` is the default for jobs enqueued with this type; keep it
+    at 1 for work that commits partial results and cannot be repeated safely.
+    """
+
+    def decorator(func):
+        _handlers[job_type] = _Handler(func, max_attempts)
+        return func
+
+    return decorator
+
+
+def _load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def _config(key, default):
+    from flask import current_app
+
+    try:
+        return current_app.config.get(key, default)
+    except RuntimeError:
+        return default
+
+
+def _lease_seconds() -> int:
+    return int(_config("JOB_QUEUE_LEASE_SECONDS", 300))
+
+
+def _table():
+    from app.models import BackgroundJob
+
+    return BackgroundJob.__table__
+
+
+def enqueue(
+    job_type: str,
+    payload: Optional[dict] = None,
+    user_id: Optional[int] = None,
+    target=None,
+    max_attempts: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+):
+    """Queue a job and commit; ``target`` is the ``DataImport``/``DataExport`` it reports into"""
+    from app.models import BackgroundJob, DataExport, DataImport
+
+    _load_handlers()
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+    job = BackgroundJob(
+        job_type=job_type,
+        payload=payload or {},
+        user_id=user_id,
+        max_attempts=max_attempts or _handlers[job_type].max_attempts,
+        run_after=run_after or datetime.utcnow(),
+    )
+    if isinstance(target, DataImport):
+        job.target_type, job.target_id = "data_import", target.id
+    elif isinstance(target, DataExport):
+        job.target_type, job.target_id = "data_export", target.id
+    db.session.add(job)
+    db.session.commit()
+    if _pool is not None:
+        _pool.notify()
+    return job
+
+
+def enqueue_detached(
+    job_type: str, payload: Optional[dict] = None, user_id: Optional[int] = None, max_attempts: Optional[int] = None
+) -> int:
+    """Queue a job on its own connection; for session hooks (e.g. ``after_commit``) where ``enqueue`` cannot commit"""
+    from app.models import BackgroundJob
+
+    _load_handlers()
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+    now = datetime.utcnow()
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            _table()
+            .insert()
+            .values(
+                job_type=job_type,
+                payload=payload or {},
+                user_id=user_id,
+                status=BackgroundJob.STATUS_QUEUED,
+                attempts=0,
+                max_attempts=max_attempts or _handlers[job_type].max_attempts,
+                run_after=now,
+                cancel_requested=False,
+                created_at=now,
+            )
+        )
+        job_id = result.inserted_primary_key[0]
+    if _pool is not None:
+        _pool.notify()
+    return job_id
+
+
+def find_job_for_target(target_type: str, target_id: int):
+    """Most recent job reporting into the given import/export record, if any"""
+    from app.models import BackgroundJob
+
+    return (
+        BackgroundJob.query.filter_by(target_type=target_type, target_id=target_id)
+        .order_by(BackgroundJob.id.desc())
+        .first()
+    )
+
+
+def find_due_jobs(limit: int = 10, now: Optional[datetime] = None) -> List[int]:
+    """Ids of queued jobs that are due and of running jobs whose lease expired with attempts left"""
+    from app.models import BackgroundJob
+
+    now = now or datetime.utcnow()
+    t = _table()
+    rows = db.session.execute(
+        db.select(t.c.id)
+        .where(
+            t.c.cancel_requested.is_(False),
+            or_(
+                and_(t.c.status == BackgroundJob.STATUS_QUEUED, t.c.run_after <= now),
+                and_(
+                    t.c.status == BackgroundJob.STATUS_RUNNING,
+                    t.c.locked_until < now,
+                    t.c.attempts < t.c.max_attempts,
+                ),
+            ),
+        )
+        .order_by(t.c.run_after, t.c.id)
+        .limit(limit)
+    )
+    return [row[0] for row in rows]
+
+
+def claim_job(job_id: int, worker_id: str = WORKER_ID, now: Optional[datetime] = None) -> bool:
+    """Take the lease on a due job; False when another worker got it first"""
+    from app.models import BackgroundJob
+
+    now = now or datetime.utcnow()
+    t = _table()
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            t.update()
+            .where(
+                t.c.id == job_id,
+                t.c.cancel_requested.is_(False),
+                or_(
+                    and_(t.c.status == BackgroundJob.STATUS_QUEUED, t.c.run_after <= now),
+                    and_(
+                        t.c.status == BackgroundJob.STATUS_RUNNING,
+                        t.c.locked_until < now,
+                        t.c.attempts < t.c.max_attempts,
+                    ),
+                ),
+            )
+            .values(
+                status=BackgroundJob.STATUS_RUNNING,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=_lease_seconds()),
+                heartbeat_at=now,
+                attempts=t.c.attempts + 1,
+                started_at=db.func.coalesce(t.c.started_at, now),
+            )
+        )
+        return result.rowcount == 1
+
+
+class JobContext:
+    """Handed to a handler: heartbeats, cancellation checks and progress reporting"""
+
+    def __init__(self, job_id: int, worker_id: str = WORKER_ID, lease_seconds: Optional[int] = None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds or _lease_seconds()
+        self.cancelled = threading.Event()
+        self.last_heartbeat = datetime.utcnow()
+
+    def heartbeat(self, now: Optional[datetime] = None) -> bool:
+        """Extend the lease; returns False (and flags cancellation) when the job was cancelled or the lease lost"""
+        now = now or datetime.utcnow()
+        t = _table()
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                t.update()
+                .where(t.c.id == self.job_id, t.c.locked_by == self.worker_id)
+                .values(locked_until=now + timedelta(seconds=self.lease_seconds), heartbeat_at=now)
+            )
+            cancel_requested = conn.execute(
+                db.select(t.c.cancel_requested).where(t.c.id == self.job_id)
+            ).scalar_one_or_none()
+        self.last_heartbeat = now
+        if result.rowcount != 1 or cancel_requested:
+            self.cancelled.set()
+            return False
+        return True
+
+    def checkpoint(self, *progress) -> None:
+        """Call between units of work (e.g. as an import's ``on_progress``); raises ``JobCancelled`` when cancelled"""
+        if self.cancelled.is_set() or not self.heartbeat():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+
+def _finish(job_id: int, worker_id: str, values: dict, payload: Optional[dict]) -> bool:
+    if payload is not None:
+        values["payload"] = {k: v for k, v in payload.items() if k not in SECRET_PAYLOAD_KEYS}
+    t = _table()
+    with db.engine.begin() as conn:
+        result = conn.execute(t.update().where(t.c.id == job_id, t.c.locked_by == worker_id).values(**values))
+        return result.rowcount == 1
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    base = float(_config("JOB_QUEUE_RETRY_BACKOFF_SECONDS", 30))
+    return timedelta(seconds=base * (2 ** max(0, attempts - 1)))
+
+
+def _remove_payload_files(payload: Optional[dict]) -> None:
+    for path in (payload or {}).get("files") or []:
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove job file {path}: {e}")
+
+
+def _update_target(job, status: str, message: Optional[str]) -> None:
+    """Mirror a final failure or cancellation into the job's import/export record"""
+    from app.models import DataExport, DataImport
+
+    model = {"data_import": DataImport, "data_export": DataExport}.get(job.target_type)
+    record = db.session.get(model, job.target_id) if model and job.target_id else None
+    if record is None or record.status in ("completed", "partial", "failed"):
+        return
+    record.fail(message or status)
+
+
+def execute_job(job_id: int, worker_id: str = WORKER_ID, ctx: Optional[JobContext] = None) -> Optional[str]:
+    """Run a job this worker has claimed; returns its resulting status"""
+    from app.models import BackgroundJob
+
+    _load_handlers()
+    ctx = ctx or JobContext(job_id, worker_id)
+    job = db.session.get(BackgroundJob, job_id, populate_existing=True)
+    if job is None or job.locked_by != worker_id:
+        return None
+    payload = dict(job.payload or {})
+    handler = _handlers.get(job.job_type)
+    try:
+        if handler is None:
+            raise RuntimeError(f"No handler registered for job type {job.job_type}")
+        ctx.checkpoint()
+        result = handler.func(job, ctx)
+    except JobCancelled as e:
+        db.session.rollback()
+        if _finish(
+            job_id,
+            worker_id,
+            {
+                "status": BackgroundJob.STATUS_CANCELLED,
+                "finished_at": datetime.utcnow(),
+                "locked_until": None,
+                "last_error": str(e),
+            },
+            payload,
+        ):
+            _update_target(job, BackgroundJob.STATUS_CANCELLED, "Cancelled")
+            _remove_payload_files(payload)
+        return BackgroundJob.STATUS_CANCELLED
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Background job {job_id} ({job.job_type}) failed: {e}", exc_info=True)
+        if job.attempts < job.max_attempts:
+            _finish(
+                job_id,
+                worker_id,
+                {
+                    "status": BackgroundJob.STATUS_QUEUED,
+                    "run_after": datetime.utcnow() + _retry_delay(job.attempts),
+                    "locked_by": None,
+                    "locked_until": None,
+                    "last_error": str(e),
+                },
+                None,
+            )
+            return BackgroundJob.STATUS_QUEUED
+        if _finish(
+            job_id,
+            worker_id,
+            {
+                "status": BackgroundJob.STATUS_FAILED,
+                "finished_at": datetime.utcnow(),
+                "locked_until": None,
+                "last_error": str(e),
+            },
+            payload,
+        ):
+            _update_target(job, BackgroundJob.STATUS_FAILED, str(e))
+            _remove_payload_files(payload)
+        return BackgroundJob.STATUS_FAILED
+
+    db.session.commit()
+    _finish(
+        job_id,
+        worker_id,
+        {
+            "status": BackgroundJob.STATUS_SUCCEEDED,
+            "finished_at": datetime.utcnow(),
+            "locked_until": None,
+            "last_error": None,
+            "result": result if isinstance(result, dict) else None,
+        },
+        payload,
+    )
+    _remove_payload_files(payload)
+    return BackgroundJob.STATUS_SUCCEEDED
+
+
+def run_next_job(worker_id: str = WORKER_ID) -> Optional[int]:
+    """Claim and run one due job in the calling thread; returns its id, or None when nothing was due"""
+    for job_id in find_due_jobs(limit=5):
+        if claim_job(job_id, worker_id):
+            execute_job(job_id, worker_id)
+            return job_id
+    return None
+
+
+def reap_expired_jobs(now: Optional[datetime] = None) -> int:
+    """Fail running jobs whose lease expired with no attempts left (their worker died)"""
+    from app.models import BackgroundJob
+
+    now = now or datetime.utcnow()
+    t = _table()
+    expired = (
+        BackgroundJob.query.filter(
+            BackgroundJob.status == BackgroundJob.STATUS_RUNNING,
+            BackgroundJob.locked_until < now,
+            BackgroundJob.attempts >= BackgroundJob.max_attempts,
+        )
+        .limit(50)
+        .all()
+    )
+    reaped = 0
+    for job in expired:
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                t.update()
+                .where(t.c.id == job.id, t.c.status == BackgroundJob.STATUS_RUNNING, t.c.locked_until < now)
+                .values(
+                    status=BackgroundJob.STATUS_FAILED,
+                    finished_at=now,
+                    locked_until=None,
+                    last_error="Worker stopped before the job finished",
+                    payload={k: v for k, v in (job.payload or {}).items() if k not in SECRET_PAYLOAD_KEYS},
+                )
+            )
+        if result.rowcount == 1:
+            reaped += 1
+            _update_target(job, BackgroundJob.STATUS_FAILED, "Worker stopped before the job finished")
+            _remove_payload_files(job.payload)
+    return reaped
+
+
+def cancel_job(job) -> bool:
+    """Cancel a queued job now, or ask a running one to stop at its next checkpoint"""
+    from app.models import BackgroundJob
+
+    if job.is_final:
+        return False
+    t = _table()
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            t.update()
+            .where(t.c.id == job.id, t.c.status == BackgroundJob.STATUS_QUEUED)
+            .values(status=BackgroundJob.STATUS_CANCELLED, cancel_requested=True, finished_at=datetime.utcnow())
+        )
+        if result.rowcount != 1:
+            conn.execute(
+                t.update()
+                .where(t.c.id == job.id, t.c.status == BackgroundJob.STATUS_RUNNING)
+                .values(cancel_requested=True)
+            )
+    db.session.refresh(job)
+    if job.status == BackgroundJob.STATUS_CANCELLED:
+        _update_target(job, job.status, "Cancelled")
+        _remove_payload_files(job.payload)
+    return True
+
+
+class JobWorkerPool:
+    """Background threads that run queued jobs"""
+
+    def __init__(self, app, workers: int = 1, poll_interval: float = 2.0, worker_id: str = WORKER_ID):
+        self.app = app
+        self.workers = max(1, int(workers))
+        self.poll_interval = float(poll_interval)
+        self.worker_id = worker_id
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._active: Dict[int, JobContext] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="background-job")
+        self._thread = threading.Thread(target=self._run, name="job-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Background job pool started ({self.workers} workers)")
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join(timeout=self.poll_interval + 5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def notify(self) -> None:
+        """Wake the dispatcher thread (a job was enqueued)"""
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Heartbeat running jobs, reap dead ones and submit due jobs to free threads; returns jobs submitted"""
+        submitted = 0
+        with self.app.app_context():
+            try:
+                self._heartbeat_active()
+                reap_expired_jobs()
+                with self._lock:
+                    free = self.workers - len(self._active)
+                if free > 0:
+                    for job_id in find_due_jobs(limit=free):
+                        if not claim_job(job_id, self.worker_id):
+                            continue
+                        ctx = JobContext(job_id, self.worker_id)
+                        with self._lock:
+                            self._active[job_id] = ctx
+                        self._executor.submit(self._execute, job_id, ctx)
+                        submitted += 1
+            except Exception as e:
+                logger.error(f"Background job dispatcher poll failed: {e}", exc_info=True)
+                try:
+                    db.session.rollback()
+                except Exception:
+                    pass
+            finally:
+                db.session.remove()
+        return submitted
+
+    def _heartbeat_active(self) -> None:
+        with self._lock:
+            contexts = list(self._active.values())
+        due = datetime.utcnow() - timedelta(seconds=max(1, _lease_seconds() // 3))
+        for ctx in contexts:
+            if ctx.last_heartbeat <= due and not ctx.cancelled.is_set():
+                ctx.heartbeat()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.run_once()
+
+    def _execute(self, job_id: int, ctx: JobContext) -> None:
+        try:
+            with self.app.app_context():
+                try:
+                    execute_job(job_id, self.worker_id, ctx)
+                except Exception as e:
+                    logger.error(f"Background job {job_id} crashed: {e}", exc_info=True)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+            # A thread is free again; pick up the next due job
+            self._wake.set()
+
+
+def get_worker_pool() -> Optional[JobWorkerPool]:
+    """Return the process-wide job pool, if one was started"""
+    return _pool
+
+
+def start_worker_pool(app) -> Optional[JobWorkerPool]:
+    """Start the process-wide job pool from app config (idempotent)
+
+    Returns None when ``JOB_QUEUE_WORKERS`` is 0; run ``flask job-worker``
+    processes to execute queued jobs in that case.
+    """
+    global _pool
+    workers = int(app.config.get("JOB_QUEUE_WORKERS", 1) or 0)
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or not _pool.running:
+            _pool = JobWorkerPool(
+                app, workers=workers, poll_interval=app.config.get("JOB_QUEUE_POLL_INTERVAL_SECONDS", 2.0)
+            )
+            _pool.start()
+    return _pool
@@ -6,7 +6,7 @@ Centralized registry for managing module metadata, dependencies, and visibility.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 
 class ModulePreset(str, Enum):
@@ -108,6 +108,9 @@ class ModuleRegistry:
         """
         Check if a module is enabled for a user.
 
+        For an authenticated user this is a lookup in the user's compiled set of
+        enabled modules (see ``app.utils.access_cache``).
+
         Args:
             module_id: The module ID to check
             settings: Settings instance (deprecated, kept for backwards compatibility)
@@ -129,6 +132,32 @@ class ModuleRegistry:
             except Exception:
                 user = None
 
+        from app.utils.access_cache import enabled_modules_for
+
+        enabled = enabled_modules_for(user, settings)
+        if enabled is not None:
+            return module_id in enabled
+        return cls._evaluate(module_id, settings, user, {})
+
+    @classmethod
+    def compile_enabled_modules(cls, settings=None, user=None) -> FrozenSet[str]:
+        """Evaluate every module for ``user`` once (dependencies shared); return the enabled IDs"""
+        memo: Dict[str, bool] = {}
+        return frozenset(module_id for module_id in cls._modules if cls._evaluate(module_id, settings, user, memo))
+
+    @classmethod
+    def _evaluate(cls, module_id: str, settings, user, memo: Dict[str, bool]) -> bool:
+        if module_id not in memo:
+            memo[module_id] = False  # guards against dependency cycles
+            memo[module_id] = cls._evaluate_uncached(module_id, settings, user, memo)
+        return memo[module_id]
+
+    @classmethod
+    def _evaluate_uncached(cls, module_id: str, settings, user, memo: Dict[str, bool]) -> bool:
+        module = cls.get(module_id)
+        if not module:
+            return False
+
         # Core modules are always enabled
         if module.category == ModuleCategory.CORE:
             return True
@@ -160,7 +189,7 @@ class ModuleRegistry:
 
         # Check dependencies recursively
         for dep_id in module.dependencies:
-            if not cls.is_enabled(dep_id, settings, user):
+            if not cls._evaluate(dep_id, settings, user, memo):
                 return False
 
         # Admin-disabled modules (settings.disabled_module_ids)
@@ -169,10 +198,6 @@ class ModuleRegistry:
             if isinstance(disabled, list) and module_id in disabled:
                 # Some modules can be disabled for non-admin users only.
                 if module.admin_only_when_disabled:
-                    if user is None:
-                        from flask_login import current_user
-
-                        user = current_user
                     if user and getattr(user, "is_authenticated", False) and getattr(user, "is_admin", False):
                         return True
                 return False
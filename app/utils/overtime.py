@@ -211,27 +211,38 @@ def get_daily_breakdown(user, start_date: date, end_date: date, include_weekends
 
     from app.models import TimeEntry
 
-    start_datetime = dt.combine(start_date, dt.min.time())
-    end_datetime = dt.combine(end_date, dt.max.time())
+    from app.utils.time_daily_rollup import seconds_by_day, time_rollup_enabled
 
-    entries = (
-        TimeEntry.query.filter(
-            TimeEntry.user_id == user.id,
-            TimeEntry.end_time.isnot(None),
-            TimeEntry.start_time >= start_datetime,
-            TimeEntry.start_time <= end_datetime,
+    daily_data = {}
+    if time_rollup_enabled():
+        for entry_date, totals in seconds_by_day(start_date, end_date, user_id=user.id).items():
+            if totals["entries"]:
+                daily_data[entry_date] = {
+                    "date": entry_date,
+                    "total_hours": totals["seconds"] / 3600,
+                    "entries_count": totals["entries"],
+                }
+    else:
+        start_datetime = dt.combine(start_date, dt.min.time())
+        end_datetime = dt.combine(end_date, dt.max.time())
+
+        entries = (
+            TimeEntry.query.filter(
+                TimeEntry.user_id == user.id,
+                TimeEntry.end_time.isnot(None),
+                TimeEntry.start_time >= start_datetime,
+                TimeEntry.start_time <= end_datetime,
+            )
+            .order_by(TimeEntry.start_time)
+            .all()
         )
-        .order_by(TimeEntry.start_time)
-        .all()
-    )
 
-    daily_data = {}
-    for entry in entries:
-        entry_date = entry.start_time.date()
-        if entry_date not in daily_data:
-            daily_data[entry_date] = {"date": entry_date, "total_hours": 0.0, "entries": []}
-        daily_data[entry_date]["total_hours"] += entry.duration_hours
-        daily_data[entry_date]["entries"].append(entry)
+        for entry in entries:
+            entry_date = entry.start_time.date()
+            if entry_date not in daily_data:
+                daily_data[entry_date] = {"date": entry_date, "total_hours": 0.0, "entries_count": 0}
+            daily_data[entry_date]["total_hours"] += entry.duration_hours
+            daily_data[entry_date]["entries_count"] += 1
 
     if mode == "weekly":
         # In weekly mode no per-day split; just total_hours per day
@@ -250,7 +261,7 @@ def get_daily_breakdown(user, start_date: date, end_date: date, include_weekends
                     "undertime_hours": 0.0,
                     "is_overtime": False,
                     "is_undertime": False,
-                    "entries_count": len(day_info["entries"]),
+                    "entries_count": day_info["entries_count"],
                 }
             )
         return breakdown
@@ -280,7 +291,7 @@ def get_daily_breakdown(user, start_date: date, end_date: date, include_weekends
                 "undertime_hours": round(undertime_hours, 2),
                 "is_overtime": overtime_hours > 0,
                 "is_undertime": is_undertime,
-                "entries_count": len(day_info["entries"]),
+                "entries_count": day_info["entries_count"],
             }
         )
     return breakdown
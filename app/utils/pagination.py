@@ -1,17 +1,44 @@
 """
 Pagination utilities for consistent pagination across the application.
+
+Two modes are supported:
+
+* Offset mode (``page`` / ``per_page``), the default, backed by
+  Flask-SQLAlchemy ``paginate()``.
+* Keyset mode (``cursor``), opt-in for endpoints that declare their sort key.
+  The client passes ``cursor=`` (empty) for the first page and then the
+  ``next_cursor`` from each response. Cursors are opaque, signed tokens
+  holding the sort-key values of the last row returned, so each page is a
+  range scan instead of an ``OFFSET`` over everything before it.
+
+Both modes accept ``include_total=false`` to skip the ``COUNT(*)`` query.
 """
 
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from flask import request
+from flask import abort, current_app, request
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Query
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
 
 from app.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
+CURSOR_SALT = "timetracker:pagination-cursor:v1"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed, tampered with or issued for another sort key"""
+
 
 def paginate_query(
-    query: Query, page: Optional[int] = None, per_page: Optional[int] = None, max_per_page: int = MAX_PAGE_SIZE
+    query: Query,
+    page: Optional[int] = None,
+    per_page: Optional[int] = None,
+    max_per_page: int = MAX_PAGE_SIZE,
+    keyset: Optional[Sequence[Any]] = None,
 ) -> Dict[str, Any]:
     """
     Paginate a SQLAlchemy query.
@@ -21,6 +48,9 @@ def paginate_query(
         page: Page number (defaults to request arg or 1)
         per_page: Items per page (defaults to request arg or DEFAULT_PAGE_SIZE)
         max_per_page: Maximum items per page
+        keyset: Optional ordering, e.g. ``(TimeEntry.start_time.desc(), TimeEntry.id.desc())``.
+            When given and the request carries a ``cursor`` argument, the query is paginated
+            by keyset instead of offset. The last column must be unique.
 
     Returns:
         dict with 'items' and 'pagination' keys
@@ -31,6 +61,18 @@ def paginate_query(
 
     # Enforce maximum
     per_page = min(per_page, max_per_page)
+    include_total = wants_total()
+
+    if keyset is not None and request and "cursor" in request.args:
+        try:
+            return keyset_paginate(
+                query, keyset, cursor=request.args.get("cursor"), per_page=per_page, include_total=include_total
+            )
+        except InvalidCursorError as e:
+            abort(400, description=str(e))
+
+    if not include_total:
+        return _paginate_without_count(query, page, per_page)
 
     # Paginate
     paginated = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -50,6 +92,173 @@ def paginate_query(
     }
 
 
+def wants_total() -> bool:
+    """Whether the request wants the total row count (``include_total=false`` skips the COUNT query)."""
+    if not request:
+        return True
+    return request.args.get("include_total", "true").lower() != "false"
+
+
+def _paginate_without_count(query: Query, page: int, per_page: int) -> Dict[str, Any]:
+    """Offset pagination without COUNT(*): fetch one extra row to know whether a next page exists."""
+    page = max(page, 1)
+    rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(rows) > per_page
+    return {
+        "items": rows[:per_page],
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "total": None,
+            "pages": None,
+            "has_next": has_next,
+            "has_prev": page > 1,
+            "next_page": page + 1 if has_next else None,
+            "prev_page": page - 1 if page > 1 else None,
+        },
+    }
+
+
+def _keyset_columns(keyset: Sequence[Any]) -> List[Tuple[Any, bool]]:
+    """Split an ordering into ``(column, descending)`` pairs."""
+    columns = []
+    for clause in keyset:
+        descending = False
+        if isinstance(clause, UnaryExpression):
+            descending = clause.modifier is operators.desc_op
+            clause = clause.element
+        columns.append((clause, descending))
+    return columns
+
+
+def _keyset_signature(columns: List[Tuple[Any, bool]]) -> str:
+    return ",".join(f"{column}:{'desc' if descending else 'asc'}" for column, descending in columns)
+
+
+def _cursor_serializer():
+    from itsdangerous import URLSafeSerializer
+
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt=CURSOR_SALT)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(keyset: Sequence[Any], values: Sequence[Any]) -> str:
+    """Encode the sort-key values of a row as an opaque, signed cursor for ``keyset``."""
+    columns = _keyset_columns(keyset)
+    return _cursor_serializer().dumps({"k": _keyset_signature(columns), "v": [_dump_value(v) for v in values]})
+
+
+def decode_cursor(keyset: Sequence[Any], cursor: str) -> List[Any]:
+    """
+    Decode a cursor issued by ``encode_cursor`` for the same ``keyset``.
+
+    Raises:
+        InvalidCursorError: if the cursor is malformed, has a bad signature or was issued for another ordering
+    """
+    from itsdangerous import BadSignature
+
+    columns = _keyset_columns(keyset)
+    try:
+        payload = _cursor_serializer().loads(cursor)
+    except BadSignature:
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(payload, dict) or payload.get("k") != _keyset_signature(columns):
+        raise InvalidCursorError("Pagination cursor does not match this listing")
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursorError("Invalid pagination cursor")
+    try:
+        return [_load_value(v) for v in values]
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+def _keyset_filter(columns: List[Tuple[Any, bool]], values: List[Any]):
+    """
+    Rows strictly after ``values`` in the given ordering.
+
+    Expands the row comparison into ``c1 < v1 OR (c1 = v1 AND c2 < v2) ...`` so mixed
+    directions work, and adds a redundant bound on the leading column so the database can
+    use its index as a range scan rather than filtering every row before the cursor.
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(columns):
+        equal = [c == v for (c, _), v in zip(columns[:i], values[:i])]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, after) if equal else after)
+    lead, lead_desc = columns[0]
+    lead_bound = lead <= values[0] if lead_desc else lead >= values[0]
+    return and_(lead_bound, or_(*clauses))
+
+
+def keyset_paginate(
+    query: Query,
+    keyset: Sequence[Any],
+    cursor: Optional[str] = None,
+    per_page: int = DEFAULT_PAGE_SIZE,
+    include_total: bool = True,
+) -> Dict[str, Any]:
+    """
+    Paginate a query by keyset (seek) instead of offset.
+
+    Args:
+        query: SQLAlchemy query object (its own ORDER BY is replaced by ``keyset``)
+        keyset: Ordering clauses; the last one must be unique (usually the primary key).
+            Sort-key columns must be non-nullable.
+        cursor: ``next_cursor`` from the previous page, or empty/None for the first page
+        per_page: Items per page
+        include_total: Whether to run COUNT(*) for ``total``
+
+    Returns:
+        dict with 'items' and 'pagination' keys; ``pagination.next_cursor`` is None on the last page
+
+    Raises:
+        InvalidCursorError: if ``cursor`` cannot be decoded for this keyset
+    """
+    columns = _keyset_columns(keyset)
+    total = query.order_by(None).count() if include_total else None
+    if cursor:
+        query = query.filter(_keyset_filter(columns, decode_cursor(keyset, cursor)))
+
+    rows = query.order_by(None).order_by(*keyset).limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor(keyset, [getattr(last, column.key) for column, _ in columns])
+
+    return {
+        "items": items,
+        "pagination": {
+            "per_page": per_page,
+            "total": total,
+            "has_next": has_next,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
 def get_pagination_params(
     default_page: int = 1, default_per_page: int = DEFAULT_PAGE_SIZE, max_per_page: int = MAX_PAGE_SIZE
 ) -> tuple[int, int]:
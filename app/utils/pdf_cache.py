@@ -0,0 +1,289 @@
+"""
+On-disk cache of rendered invoice PDFs.
+
+Rendering an invoice (ReportLab layout, then the optional Factur-X embed and
+PDF/A-3 normalization) was repeated on every download and email.
+``render_invoice_pdf`` returns the finished bytes from a cache keyed by a
+fingerprint of everything the output depends on:
+
+- the invoice row, its items, extra goods, expenses and payments, its project
+  and client;
+- the PDF template for the page size (``template_json`` and ``updated_at``);
+- the settings row (except ``updated_at``) and the company logo file;
+- the page size, the locale, ``APP_VERSION`` and ``RENDER_VERSION``.
+
+Any edit produces a new key, so entries are never invalidated explicitly:
+stale files age out of the directory (``PDF_CACHE_DIR``, default
+``<UPLOAD_FOLDER>/pdf_cache``), which is trimmed to ``PDF_CACHE_MAX_MB``
+least recently used first (a hit touches the file's mtime). Only PDFs whose
+post-processing succeeded are stored; generator exceptions propagate so
+callers keep their fallback.
+
+Finalized invoices are rendered ahead of the first download:
+``receive_after_flush`` notes non-draft invoices (and invoices whose lines
+changed) written in a transaction and ``receive_after_commit`` queues a
+``render_invoice_pdfs`` background job for them (``app.utils.pdf_jobs``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm.util import identity_key
+
+logger = logging.getLogger(__name__)
+
+# Bump when the generator's output changes for the same inputs
+RENDER_VERSION = 1
+# Invoice statuses rendered ahead of time
+PRERENDER_STATUSES = ("sent", "paid", "overdue")
+
+_SESSION_INFO_KEY = "pdf_prerender_invoice_ids"
+_LINE_MODELS = ("InvoiceItem", "ExtraGood", "Expense", "Payment")
+
+
+def _config(key, default):
+    from flask import current_app
+
+    try:
+        return current_app.config.get(key, default)
+    except RuntimeError:
+        return default
+
+
+def cache_dir() -> Optional[str]:
+    """Cache directory (created on demand), or None when the cache is disabled or not writable"""
+    if not _config("PDF_CACHE_ENABLED", True):
+        return None
+    path = _config("PDF_CACHE_DIR", None) or os.path.join(_config("UPLOAD_FOLDER", "/data/uploads"), "pdf_cache")
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        logger.debug(f"PDF cache directory {path} unavailable: {e}")
+        return None
+    return path
+
+
+def _column_values(model, obj, exclude=()) -> dict:
+    return {
+        attr.key: getattr(obj, attr.key, None) for attr in sa.inspect(model).column_attrs if attr.key not in exclude
+    }
+
+
+def _rows(relation) -> list:
+    if relation is None:
+        return []
+    rows = relation.all() if hasattr(relation, "all") else list(relation)
+    return sorted((_column_values(type(row), row) for row in rows), key=lambda values: values.get("id") or 0)
+
+
+def _logo_stat(settings):
+    try:
+        path = settings.get_logo_path() if settings.company_logo_filename else None
+        if path and os.path.exists(path):
+            stat = os.stat(path)
+            return [settings.company_logo_filename, stat.st_size, stat.st_mtime_ns]
+    except Exception:
+        pass
+    return None
+
+
+def _locale() -> Optional[str]:
+    try:
+        from flask_babel import get_locale
+
+        return str(get_locale() or "")
+    except Exception:
+        return None
+
+
+def invoice_fingerprint(invoice, settings, page_size: str = "A4") -> str:
+    """SHA-256 over every input of the rendered invoice PDF"""
+    from app import db
+    from app.models import Client, InvoicePDFTemplate, Project, Settings
+
+    templates = InvoicePDFTemplate.__table__
+    template = db.session.execute(
+        sa.select(templates.c.id, templates.c.template_json, templates.c.updated_at).where(
+            templates.c.page_size == page_size
+        )
+    ).first()
+
+    project = invoice.project
+    client = invoice.client
+    parts = {
+        "render_version": RENDER_VERSION,
+        "app_version": _config("APP_VERSION", None),
+        "page_size": page_size,
+        "locale": _locale(),
+        "invoice": _column_values(type(invoice), invoice),
+        "items": _rows(invoice.items),
+        "extra_goods": _rows(getattr(invoice, "extra_goods", None)),
+        "expenses": _rows(getattr(invoice, "expenses", None)),
+        "payments": _rows(getattr(invoice, "payments", None)),
+        "project": _column_values(Project, project) if project is not None else None,
+        "client": _column_values(Client, client) if client is not None else None,
+        "template": list(template) if template is not None else None,
+        "settings": _column_values(Settings, settings, exclude=("updated_at",)),
+        "logo": _logo_stat(settings),
+    }
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _entry_path(directory: str, key: str) -> str:
+    return os.path.join(directory, f"{key}.pdf")
+
+
+def read_cached(directory: str, key: str) -> Optional[bytes]:
+    """Cached bytes for ``key`` (marking the entry as recently used), or None"""
+    path = _entry_path(directory, key)
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+        os.utime(path)
+        return data or None
+    except OSError:
+        return None
+
+
+def store(directory: str, key: str, data: bytes) -> None:
+    """Write an entry atomically, then trim the directory to ``PDF_CACHE_MAX_MB``"""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, _entry_path(directory, key))
+    except OSError as e:
+        logger.warning(f"Could not store cached PDF {key}: {e}")
+        return
+    evict(directory)
+
+
+def evict(directory: str, max_bytes: Optional[int] = None) -> int:
+    """Remove least recently used entries until the directory fits ``max_bytes``; returns the number removed"""
+    if max_bytes is None:
+        max_bytes = int(float(_config("PDF_CACHE_MAX_MB", 256)) * 1024 * 1024)
+    entries = []
+    total = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pdf"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+    except OSError:
+        return 0
+    if total <= max_bytes:
+        return 0
+    removed = 0
+    # Leave headroom so not every following write evicts again
+    target = max_bytes * 0.9
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _cache_key(directory: Optional[str], invoice, settings, page_size: str) -> Optional[str]:
+    if not directory:
+        return None
+    try:
+        return invoice_fingerprint(invoice, settings, page_size)
+    except Exception as e:
+        logger.debug(f"PDF cache key for invoice {getattr(invoice, 'id', None)} unavailable: {e}")
+        return None
+
+
+def is_cached(invoice, settings, page_size: str = "A4") -> bool:
+    directory = cache_dir()
+    key = _cache_key(directory, invoice, settings, page_size)
+    return bool(key) and os.path.exists(_entry_path(directory, key))
+
+
+def render_invoice_pdf(invoice, settings=None, page_size: str = "A4") -> Tuple[bytes, Optional[str], Optional[str]]:
+    """Rendered and post-processed invoice PDF, from the cache when its inputs are unchanged
+
+    Returns:
+        ``(pdf_bytes, embed_error, pdfa_error)`` as ``postprocess_invoice_pdf_bytes``
+    """
+    from app.models import Settings
+    from app.utils.invoice_pdf_postprocess import postprocess_invoice_pdf_bytes
+    from app.utils.pdf_generator import InvoicePDFGenerator
+
+    settings = settings or Settings.get_settings()
+    directory = cache_dir()
+    key = _cache_key(directory, invoice, settings, page_size)
+    if key:
+        cached = read_cached(directory, key)
+        if cached:
+            return cached, None, None
+
+    pdf_bytes = InvoicePDFGenerator(invoice, settings=settings, page_size=page_size).generate_pdf()
+    pdf_bytes, embed_err, pdfa_err = postprocess_invoice_pdf_bytes(pdf_bytes, invoice, settings)
+    if key and pdf_bytes and not (embed_err or pdfa_err):
+        store(directory, key, pdf_bytes)
+    return pdf_bytes, embed_err, pdfa_err
+
+
+def _changed_invoice_ids(session) -> set:
+    from app.models import Invoice
+
+    invoice_ids = set()
+    line_invoice_ids = set()
+    for obj in list(session.new) + list(session.dirty):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, Invoice):
+            if obj.status in PRERENDER_STATUSES and obj.id is not None:
+                invoice_ids.add(obj.id)
+        elif type(obj).__name__ in _LINE_MODELS and getattr(obj, "invoice_id", None) is not None:
+            line_invoice_ids.add(obj.invoice_id)
+    for obj in session.deleted:
+        if type(obj).__name__ in _LINE_MODELS and getattr(obj, "invoice_id", None) is not None:
+            line_invoice_ids.add(obj.invoice_id)
+    for invoice_id in line_invoice_ids - invoice_ids:
+        # Skip drafts that are loaded; the job checks the status of the others
+        loaded = session.identity_map.get(identity_key(Invoice, invoice_id))
+        if loaded is None or loaded.__dict__.get("status", PRERENDER_STATUSES[0]) in PRERENDER_STATUSES:
+            invoice_ids.add(invoice_id)
+    return invoice_ids
+
+
+def receive_after_flush(session, flush_context):
+    """Note finalized invoices whose rendered PDF changes with this flush."""
+    if not (_config("PDF_CACHE_ENABLED", True) and _config("PDF_PRERENDER", True)):
+        return
+    invoice_ids = _changed_invoice_ids(session)
+    if invoice_ids:
+        session.info.setdefault(_SESSION_INFO_KEY, set()).update(invoice_ids)
+
+
+def receive_after_commit(session):
+    """Queue a background render of the invoices changed in the committed transaction."""
+    invoice_ids = session.info.pop(_SESSION_INFO_KEY, None)
+    if not invoice_ids:
+        return
+    try:
+        from app.utils.job_queue import enqueue_detached
+
+        enqueue_detached("render_invoice_pdfs", {"invoice_ids": sorted(invoice_ids), "finalized_only": True})
+    except Exception as e:
+        logger.debug(f"PDF pre-render not queued: {e}")
+
+
+def receive_after_transaction_end(session, transaction):
+    """Drop invoices noted in a transaction that rolled back."""
+    if transaction.parent is None:
+        session.info.pop(_SESSION_INFO_KEY, None)
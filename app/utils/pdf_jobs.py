@@ -0,0 +1,50 @@
+"""Background job handler that renders invoice PDFs into the PDF cache
+
+Queued by ``app.utils.pdf_cache`` when finalized invoices change and by the
+bulk render API (``POST /api/v1/invoices/pdf/render``). Workers of the job
+queue - the in-app pool and ``flask job-worker`` processes - render the
+invoices one by one; invoices whose PDF is already cached are skipped, so
+repeated or overlapping jobs cost one fingerprint each. Rendering only writes
+cache files and is retried.
+"""
+
+import logging
+
+from app import db
+from app.models import Invoice, Settings
+from app.utils.job_queue import job_handler
+from app.utils.pdf_cache import PRERENDER_STATUSES, is_cached, render_invoice_pdf
+
+logger = logging.getLogger(__name__)
+
+RENDER_MAX_ATTEMPTS = 2
+
+
+@job_handler("render_invoice_pdfs", max_attempts=RENDER_MAX_ATTEMPTS)
+def run_invoice_pdf_render(job, ctx):
+    payload = job.payload or {}
+    page_size = payload.get("page_size") or "A4"
+    finalized_only = bool(payload.get("finalized_only"))
+    settings = Settings.get_settings()
+    result = {"rendered": 0, "cached": 0, "skipped": [], "failed": []}
+
+    for invoice_id in payload.get("invoice_ids") or []:
+        ctx.checkpoint()
+        invoice = db.session.get(Invoice, invoice_id)
+        if invoice is None or (finalized_only and invoice.status not in PRERENDER_STATUSES):
+            result["skipped"].append(invoice_id)
+            continue
+        if is_cached(invoice, settings, page_size):
+            result["cached"] += 1
+            continue
+        try:
+            _, embed_err, pdfa_err = render_invoice_pdf(invoice, settings, page_size)
+        except Exception as e:
+            logger.warning(f"Rendering PDF of invoice {invoice_id} failed: {e}")
+            embed_err = str(e)
+            pdfa_err = None
+        if embed_err or pdfa_err:
+            result["failed"].append(invoice_id)
+        else:
+            result["rendered"] += 1
+    return result
@@ -0,0 +1,76 @@
+"""
+Socket.IO rooms and message-queue selection.
+
+Every real-time event is emitted to a room instead of to all connections, so
+the cost of an emit grows with the sockets interested in it:
+
+- ``user_room(user_id)``: a user's own sockets (timers, mentions, own activity);
+  joined automatically on connect.
+- ``project_board_room(project_id)``: sockets showing a Kanban board; ``None``
+  is the board of the global (non project-specific) columns.
+- ``client_portal_room(client_id)``: client portal sessions of one client.
+- ``ACTIVITY_FEED_ROOM``: sockets showing the team activity feed.
+
+With ``SOCKETIO_MESSAGE_QUEUE`` set (or Redis reachable in ``auto`` mode)
+emits are published on the queue, so they reach clients connected to any app
+process and can be sent from processes without sockets (job workers, the
+scheduler). Without a queue everything stays in-process.
+"""
+
+import logging
+from typing import Any, Mapping, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_FEED_ROOM = "activity_feed"
+
+
+def user_room(user_id: int) -> str:
+    return f"user_{user_id}"
+
+
+def project_board_room(project_id: Optional[int]) -> str:
+    return f"project_board_{project_id}" if project_id else "project_board_global"
+
+
+def client_portal_room(client_id: int) -> str:
+    return f"client_portal_{client_id}"
+
+
+def _with_password(url: str, password: Optional[str]) -> str:
+    """Add ``password`` to a Redis URL that carries no credentials"""
+    if not password:
+        return url
+    parts = urlsplit(url)
+    if "@" in parts.netloc:
+        return url
+    return urlunsplit(parts._replace(netloc=f":{password}@{parts.netloc}"))
+
+
+def resolve_message_queue(config: Mapping[str, Any]) -> Optional[str]:
+    """
+    Return the message-queue URL for ``SocketIO.init_app``, or None for in-process.
+
+    ``SOCKETIO_MESSAGE_QUEUE`` may be ``auto`` (Redis from ``REDIS_URL`` if it
+    answers a ping, not used while testing), ``none``/empty, or any URL
+    python-socketio supports (``redis://``, ``amqp://``, ``kafka://``...).
+    """
+    setting = (config.get("SOCKETIO_MESSAGE_QUEUE") or "").strip()
+    if setting.lower() in ("", "none", "false", "0"):
+        return None
+    if setting.lower() != "auto":
+        return setting
+    if config.get("TESTING"):
+        return None
+
+    from app.utils.redis_pool import RedisPoolManager
+
+    manager = RedisPoolManager.from_config(config)
+    try:
+        if manager.client() is None:
+            logger.info("Socket.IO: Redis unavailable, events are delivered in-process only")
+            return None
+    finally:
+        manager.close()
+    return _with_password(config.get("REDIS_URL", "redis://localhost:6379/0"), config.get("REDIS_PASSWORD"))
@@ -0,0 +1,236 @@
+"""
+Shared Redis connection pool for TimeTracker.
+
+``app.utils.cache``, ``app.utils.cache_redis`` and ``app.utils.api_rate_limit``
+all borrow connections from one ``RedisPoolManager`` per application instead of
+opening (and pinging) a new connection for every operation.
+
+- Connections are kept alive in a bounded ``redis.ConnectionPool``; redis-py
+  re-checks idle connections every ``REDIS_HEALTH_CHECK_INTERVAL`` seconds.
+- A circuit breaker stops talking to an unreachable Redis for
+  ``REDIS_CIRCUIT_BREAKER_SECONDS``; during that window ``client()`` returns
+  None and callers use their in-memory fallbacks.
+- ``pipeline()``, ``mget()`` and ``mset()`` batch multi-key work into a single
+  round-trip.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis  # type: ignore[import-not-found]
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None  # type: ignore[assignment]
+    REDIS_AVAILABLE = False
+
+_EXTENSION_KEY = "redis_pool"
+_default_manager: Optional["RedisPoolManager"] = None
+_default_lock = threading.Lock()
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """Whether ``exc`` means Redis is unreachable (as opposed to a bad command)"""
+    if redis is None:
+        return False
+    return isinstance(exc, (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError))
+
+
+class RedisPoolManager:
+    """Pooled Redis clients with health checking and a circuit breaker"""
+
+    def __init__(
+        self,
+        url: str,
+        enabled: bool = True,
+        password: Optional[str] = None,
+        max_connections: int = 50,
+        socket_timeout: float = 1.0,
+        health_check_interval: int = 30,
+        breaker_seconds: int = 30,
+    ):
+        self.url = url
+        self.enabled = bool(enabled) and REDIS_AVAILABLE
+        self.password = password or None
+        self.max_connections = max(1, int(max_connections))
+        self.socket_timeout = float(socket_timeout)
+        self.health_check_interval = int(health_check_interval)
+        self.breaker_seconds = max(0, int(breaker_seconds))
+
+        self._lock = threading.Lock()
+        self._clients: Dict[bool, Any] = {}
+        self._open_until = 0.0
+        self._verified = False
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "RedisPoolManager":
+        return cls(
+            url=config.get("REDIS_URL", "redis://localhost:6379/0"),
+            enabled=config.get("REDIS_ENABLED", True),
+            password=config.get("REDIS_PASSWORD") or None,
+            max_connections=config.get("REDIS_MAX_CONNECTIONS", 50),
+            socket_timeout=config.get("REDIS_SOCKET_TIMEOUT", 1.0),
+            health_check_interval=config.get("REDIS_HEALTH_CHECK_INTERVAL", 30),
+            breaker_seconds=config.get("REDIS_CIRCUIT_BREAKER_SECONDS", 30),
+        )
+
+    @property
+    def circuit_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def client(self, decode_responses: bool = True):
+        """
+        Return a pooled client, or None if Redis is disabled or the circuit is open.
+
+        The first call after start-up (and after the breaker closes again) pings
+        Redis once; later calls do no network I/O until a command is issued.
+        """
+        if not self.enabled or self.circuit_open:
+            return None
+
+        client = self._client_for(decode_responses)
+        if not self._verified:
+            try:
+                client.ping()
+            except Exception as e:
+                self.record_failure(e)
+                return None
+            self._verified = True
+        return client
+
+    def record_failure(self, exc: BaseException) -> None:
+        """Open the circuit if ``exc`` is a connection-level failure"""
+        if not is_connection_error(exc):
+            return
+        with self._lock:
+            was_open = self.circuit_open
+            self._open_until = time.monotonic() + self.breaker_seconds
+            self._verified = False
+            for client in self._clients.values():
+                try:
+                    client.connection_pool.disconnect()
+                except Exception:
+                    pass
+        if not was_open:
+            logger.warning(f"Redis unavailable, using in-memory fallbacks for {self.breaker_seconds}s: {exc}")
+
+    def pipeline(self, transaction: bool = False, decode_responses: bool = True):
+        """Return a pipeline on a pooled connection, or None if Redis is unavailable"""
+        client = self.client(decode_responses=decode_responses)
+        if client is None:
+            return None
+        return client.pipeline(transaction=transaction)
+
+    def mget(self, keys: Iterable[str], decode_responses: bool = True) -> Optional[List[Any]]:
+        """
+        Fetch several keys in one round-trip.
+
+        Returns:
+            Values in key order (None for missing keys), or None if Redis is unavailable
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        client = self.client(decode_responses=decode_responses)
+        if client is None:
+            return None
+        try:
+            return client.mget(keys)
+        except Exception as e:
+            self.record_failure(e)
+            logger.warning(f"Redis mget failed: {e}")
+            return None
+
+    def mset(self, mapping: Mapping[str, Any], ttl: Optional[int] = None, decode_responses: bool = True) -> bool:
+        """Store several keys in one round-trip (each with ``ttl`` seconds if given)"""
+        if not mapping:
+            return True
+        pipe = self.pipeline(decode_responses=decode_responses)
+        if pipe is None:
+            return False
+        try:
+            if ttl:
+                for key, value in mapping.items():
+                    pipe.setex(key, ttl, value)
+            else:
+                pipe.mset(dict(mapping))
+            pipe.execute()
+            return True
+        except Exception as e:
+            self.record_failure(e)
+            logger.warning(f"Redis mset failed: {e}")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                try:
+                    client.connection_pool.disconnect()
+                except Exception:
+                    pass
+            self._clients.clear()
+            self._verified = False
+
+    def _client_for(self, decode_responses: bool):
+        client = self._clients.get(decode_responses)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(decode_responses)
+            if client is None:
+                pool = redis.ConnectionPool.from_url(
+                    self.url,
+                    password=self.password,
+                    decode_responses=decode_responses,
+                    max_connections=self.max_connections,
+                    socket_connect_timeout=self.socket_timeout,
+                    socket_timeout=self.socket_timeout,
+                    health_check_interval=self.health_check_interval,
+                    retry_on_timeout=False,
+                )
+                client = redis.Redis(connection_pool=pool)
+                self._clients[decode_responses] = client
+            return client
+
+
+def get_redis_manager(app=None) -> RedisPoolManager:
+    """
+    Return the shared pool manager for ``app`` (or the current app).
+
+    Outside an application context a process-wide manager configured from the
+    ``REDIS_*`` environment variables is returned.
+    """
+    if app is None:
+        from flask import current_app, has_app_context
+
+        if has_app_context():
+            app = current_app._get_current_object()
+
+    if app is not None:
+        manager = app.extensions.get(_EXTENSION_KEY)
+        if manager is None:
+            manager = app.extensions.setdefault(_EXTENSION_KEY, RedisPoolManager.from_config(app.config))
+        return manager
+
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = RedisPoolManager.from_config(
+                {
+                    "REDIS_URL": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    "REDIS_ENABLED": os.getenv("REDIS_ENABLED", "true").lower() == "true",
+                    "REDIS_PASSWORD": os.getenv("REDIS_PASSWORD", ""),
+                }
+            )
+        return _default_manager
+
+
+def get_redis_client(decode_responses: bool = True):
+    """Shortcut for ``get_redis_manager().client(...)``"""
+    return get_redis_manager().client(decode_responses=decode_responses)
@@ -405,6 +405,8 @@ def register_scheduled_tasks(scheduler, app=None):
         scheduler: APScheduler instance
         app: Flask app instance (optional, will use current_app if not provided)
     """
+    # Jobs added below run only in the scheduler leader process (see install_leader_election)
+    existing_job_ids = {job.id for job in scheduler.get_jobs()}
     try:
         # Check overdue invoices daily at 9 AM
         scheduler.add_job(
@@ -519,7 +521,8 @@ def register_scheduled_tasks(scheduler, app=None):
         )
         logger.info("Registered monthly unpaid hours reports task")
 
-        # Retry failed webhook deliveries every 5 minutes
+        # Drain the webhook outbox every 5 minutes (new deliveries and scheduled retries).
+        # The delivery worker pool normally sends them within seconds; this is the fallback.
         # Create a closure that captures the app instance
         if app is None:
             try:
@@ -715,6 +718,56 @@ def register_scheduled_tasks(scheduler, app=None):
         )
         logger.info("Registered working time limits check task")
 
+        # Trim the /api/v1/sync change log daily
+        def prune_sync_changes_with_app():
+            app_instance = app
+            if app_instance is None:
+                try:
+                    app_instance = current_app._get_current_object()
+                except RuntimeError:
+                    logger.error("No app instance available for sync change log pruning")
+                    return
+            with app_instance.app_context():
+                from app.utils.sync_changes import prune_sync_changes
+
+                prune_sync_changes()
+
+        scheduler.add_job(
+            func=prune_sync_changes_with_app,
+            trigger="cron",
+            hour=3,
+            minute=30,
+            id="prune_sync_changes",
+            name="Prune sync change log",
+            replace_existing=True,
+        )
+        logger.info("Registered sync change log pruning task")
+
+        # Prune scheduled job run history daily at 3:45 AM
+        def prune_scheduled_job_runs_with_app():
+            app_instance = app
+            if app_instance is None:
+                try:
+                    app_instance = current_app._get_current_object()
+                except RuntimeError:
+                    logger.error("No app instance available for scheduled job history pruning")
+                    return
+            with app_instance.app_context():
+                from app.utils.scheduler_leader import prune_scheduled_job_runs
+
+                prune_scheduled_job_runs()
+
+        scheduler.add_job(
+            func=prune_scheduled_job_runs_with_app,
+            trigger="cron",
+            hour=3,
+            minute=45,
+            id="prune_scheduled_job_runs",
+            name="Prune scheduled job run history",
+            replace_existing=True,
+        )
+        logger.info("Registered scheduled job history pruning task")
+
         # Base telemetry heartbeat (daily) – always-on minimal install footprint
         def send_base_telemetry_heartbeat_with_app():
             app_instance = app
@@ -810,6 +863,15 @@ def register_scheduled_tasks(scheduler, app=None):
     except Exception as e:
         logger.error(f"Error registering scheduled tasks: {e}")
 
+    try:
+        from app.utils.scheduler_leader import install_leader_election
+
+        app_instance = app if app is not None else current_app._get_current_object()
+        job_ids = [job.id for job in scheduler.get_jobs() if job.id not in existing_job_ids]
+        install_leader_election(scheduler, app_instance, job_ids)
+    except Exception as e:
+        logger.error(f"Error installing scheduler leader election: {e}")
+
 
 def send_smart_reminder_push_notifications():
     """Send browser push notifications for actionable smart reminders.
@@ -1162,8 +1224,8 @@ def process_scheduled_reports():
 def retry_failed_webhooks():
     """Retry failed webhook deliveries
 
-    This task should be run periodically to retry webhook deliveries
-    that have failed and are scheduled for retry.
+    This task should be run periodically to send queued webhook deliveries
+    and retry those that have failed and are scheduled for retry.
 
     Note: This function should be called within an app context.
     Use retry_failed_webhooks_with_app() wrapper for scheduled tasks.
@@ -1250,6 +1312,43 @@ def check_expiring_quotes():
         return 0
 
 
+def _scheduled_connector_sync(integration):
+    """Incremental sync of one integration for ``sync_integrations``; runs on an executor thread"""
+    service = IntegrationService()
+    connector = service.get_connector(integration)
+    if not connector:
+        logger.warning(f"Could not get connector for integration {integration.id} ({integration.provider})")
+        return {"success": False, "message": f"No connector for provider {integration.provider}"}
+
+    logger.info(f"Syncing integration {integration.id} ({integration.provider})...")
+    try:
+        result = connector.sync_data(sync_type="incremental")
+    except Exception as e:
+        db.session.rollback()
+        integration.last_sync_status = "error"
+        integration.last_error = str(e)
+        db.session.commit()
+        raise
+
+    if result.get("success"):
+        # Update last sync time
+        integration.last_sync_at = datetime.utcnow()
+        integration.last_sync_status = "success"
+        integration.last_error = None
+        cfg = dict(integration.config or {})
+        cfg["last_scheduled_sync_at"] = datetime.utcnow().isoformat()
+        integration.config = cfg
+        logger.info(
+            f"Successfully synced integration {integration.id} ({integration.provider}): {result.get('synced_items', 0)} items"
+        )
+    else:
+        integration.last_sync_status = "error"
+        integration.last_error = result.get("message", "Unknown error")
+        logger.error(f"Failed to sync integration {integration.id} ({integration.provider}): {result.get('message')}")
+    db.session.commit()
+    return result
+
+
 def sync_integrations():
     """Sync all active integrations
 
@@ -1264,99 +1363,49 @@ def sync_integrations():
 
         logger.info(f"Found {len(active_integrations)} active integrations")
 
-        service = IntegrationService()
-        synced_count = 0
-        errors = []
+        from app.utils.integration_sync_executor import IntegrationSyncExecutor, SyncTask, integration_host
 
+        tasks = []
         for integration in active_integrations:
-            try:
-                # Check if auto_sync is enabled (default to True if not set)
-                config = integration.config or {}
-                auto_sync = config.get("auto_sync", False)
-
-                if not auto_sync:
-                    logger.debug(f"Skipping integration {integration.id} ({integration.provider}): auto_sync disabled")
-                    continue
+            # Check if auto_sync is enabled (default to True if not set)
+            config = integration.config or {}
+            auto_sync = config.get("auto_sync", False)
 
-                sync_interval = config.get("sync_interval", 60)
-                if sync_interval == "manual":
-                    logger.debug(f"Skipping integration {integration.id}: manual sync_interval")
-                    continue
-                if isinstance(sync_interval, str) and sync_interval.isdigit():
-                    sync_interval = int(sync_interval)
-                if isinstance(sync_interval, (int, float)):
-                    last_run = config.get("last_scheduled_sync_at")
-                    interval_minutes = int(sync_interval)
-                    if last_run:
-                        try:
-                            last_dt = datetime.fromisoformat(last_run.replace("Z", "+00:00"))
-                            if (
-                                datetime.utcnow() - last_dt.replace(tzinfo=None)
-                            ).total_seconds() < interval_minutes * 60:
-                                logger.debug(f"Skipping integration {integration.id}: sync interval not elapsed")
-                                continue
-                        except (ValueError, TypeError):
-                            pass
-                elif sync_interval == "daily" and datetime.utcnow().hour != 2:
-                    logger.debug(f"Skipping integration {integration.id}: daily sync not due")
-                    continue
-
-                # Get connector
-                connector = service.get_connector(integration)
-                if not connector:
-                    logger.warning(f"Could not get connector for integration {integration.id} ({integration.provider})")
-                    continue
+            if not auto_sync:
+                logger.debug(f"Skipping integration {integration.id} ({integration.provider}): auto_sync disabled")
+                continue
 
-                # Perform sync
-                logger.info(f"Syncing integration {integration.id} ({integration.provider})...")
-                result = connector.sync_data(sync_type="incremental")
-
-                if result.get("success"):
-                    synced_count += 1
-                    # Update last sync time
-                    integration.last_sync_at = datetime.utcnow()
-                    integration.last_sync_status = "success"
-                    integration.last_error = None
-                    cfg = dict(integration.config or {})
-                    cfg["last_scheduled_sync_at"] = datetime.utcnow().isoformat()
-                    integration.config = cfg
-                    logger.info(
-                        f"Successfully synced integration {integration.id} ({integration.provider}): {result.get('synced_items', 0)} items"
-                    )
-                else:
-                    errors.append(f"{integration.provider}: {result.get('message', 'Unknown error')}")
-                    integration.last_sync_status = "error"
-                    integration.last_error = result.get("message", "Unknown error")
-                    logger.error(
-                        f"Failed to sync integration {integration.id} ({integration.provider}): {result.get('message')}"
-                    )
+            sync_interval = config.get("sync_interval", 60)
+            if sync_interval == "manual":
+                logger.debug(f"Skipping integration {integration.id}: manual sync_interval")
+                continue
+            if isinstance(sync_interval, str) and sync_interval.isdigit():
+                sync_interval = int(sync_interval)
+            if isinstance(sync_interval, (int, float)):
+                last_run = config.get("last_scheduled_sync_at")
+                interval_minutes = int(sync_interval)
+                if last_run:
+                    try:
+                        last_dt = datetime.fromisoformat(last_run.replace("Z", "+00:00"))
+                        if (datetime.utcnow() - last_dt.replace(tzinfo=None)).total_seconds() < interval_minutes * 60:
+                            logger.debug(f"Skipping integration {integration.id}: sync interval not elapsed")
+                            continue
+                    except (ValueError, TypeError):
+                        pass
+            elif sync_interval == "daily" and datetime.utcnow().hour != 2:
+                logger.debug(f"Skipping integration {integration.id}: daily sync not due")
+                continue
 
-                from app.utils.integration_sync_context import sync_result_item_count
-
-                _n = sync_result_item_count(result)
-                service._log_event(
-                    integration.id,
-                    "sync",
-                    bool(result.get("success")),
-                    result.get("message"),
-                    (
-                        {"synced_count": _n, "synced_items": _n, "trigger": "scheduler"}
-                        if _n or result.get("success")
-                        else {"trigger": "scheduler"}
-                    ),
-                )
+            tasks.append(
+                SyncTask(integration.id, integration.provider, integration_host(integration), _scheduled_connector_sync)
+            )
 
-            except Exception as e:
-                error_msg = f"Error syncing integration {integration.id} ({integration.provider}): {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg, exc_info=True)
-                integration.last_sync_status = "error"
-                integration.last_error = str(e)
-                try:
-                    service._log_event(integration.id, "sync", False, str(e), {"trigger": "scheduler"})
-                except Exception as log_err:
-                    logger.warning("Could not log integration sync failure: %s", log_err)
-                    db.session.commit()
+        # Connectors run concurrently, each in its own app context and DB session
+        outcomes = IntegrationSyncExecutor.from_config(current_app._get_current_object()).run(tasks)
+        synced_count = sum(1 for outcome in outcomes if outcome.success)
+        errors = [
+            f"{outcome.provider}: {outcome.message or 'Unknown error'}" for outcome in outcomes if not outcome.success
+        ]
 
         logger.info(f"Integration sync completed. Synced {synced_count}/{len(active_integrations)} integrations")
         if errors:
@@ -1378,8 +1427,8 @@ def sync_google_calendar_for_all_users():
     """Sync every active Google Calendar integration created with the new
     :class:`app.integrations.google_calendar_connector.GoogleCalendarConnector`.
 
-    Each user is wrapped in try/except so one failing account does not block
-    the rest. Never raises.
+    Integrations are synced concurrently by the integration sync executor, so
+    one slow or failing account does not hold up the rest. Never raises.
     """
     try:
         from app.integrations.google_calendar_connector import GoogleCalendarConnector
@@ -1387,21 +1436,33 @@ def sync_google_calendar_for_all_users():
         logger.debug("GoogleCalendarConnector not importable; skipping job: %s", exc)
         return {"ok": False, "synced": 0, "errors": [str(exc)]}
 
+    from app.utils.integration_sync_executor import IntegrationSyncExecutor, SyncTask, integration_host
+
+    def sync_one(integration):
+        result = GoogleCalendarConnector(integration=integration, credentials=None).sync()
+        if not result.get("ok"):
+            result["error"] = result.get("error") or "; ".join(result.get("errors", []) or [])
+        result["synced_items"] = result.get("imported", 0) + result.get("exported", 0)
+        return result
+
+    tasks = [
+        SyncTask(
+            connector.integration.id, connector.integration.provider, integration_host(connector.integration), sync_one
+        )
+        for connector in GoogleCalendarConnector.for_any_active()
+    ]
+    # Users are synced concurrently; one failing account does not block the rest
+    outcomes = IntegrationSyncExecutor.from_config(current_app._get_current_object()).run(tasks)
     synced = 0
     errors = []
-    for connector in GoogleCalendarConnector.for_any_active():
-        integration = connector.integration
-        try:
-            result = connector.sync()
-            if result.get("ok"):
-                synced += 1
-            else:
-                err = result.get("error") or "; ".join(result.get("errors", []) or [])
-                errors.append(f"integration {integration.id}: {err}")
-                logger.warning("Google Calendar sync skipped for integration %s: %s", integration.id, err)
-        except Exception as exc:
-            errors.append(f"integration {integration.id}: {exc}")
-            logger.warning("Google Calendar sync failed for integration %s: %s", integration.id, exc)
+    for outcome in outcomes:
+        if outcome.success:
+            synced += 1
+        else:
+            errors.append(f"integration {outcome.integration_id}: {outcome.message}")
+            logger.warning(
+                "Google Calendar sync failed for integration %s: %s", outcome.integration_id, outcome.message
+            )
     logger.info("Google Calendar connector sync: %d ok, %d errors", synced, len(errors))
     return {"ok": True, "synced": synced, "errors": errors}
 
@@ -0,0 +1,303 @@
+"""
+Leader election for the background scheduler.
+
+Every process that creates the app starts the APScheduler instance, so with
+more than one gunicorn worker (or replica) each job would fire once per
+process. The jobs registered by ``register_scheduled_tasks`` are therefore
+wrapped so they only execute in the process holding the ``scheduler`` lease
+row (``SchedulerLease``):
+
+* A heartbeat job runs in every process every ``SCHEDULER_LEASE_SECONDS / 4``
+  seconds. It renews the lease if this process holds it, or takes it over
+  once the holder has stopped renewing and the lease has expired.
+* Before a job runs, the wrapper renews the lease again in a single
+  conditional ``UPDATE``; followers skip the run. Lease writes use their own
+  connection so they never share a transaction with the job.
+* Each run the leader executes is recorded in ``ScheduledJobRun`` (start,
+  finish, duration, outcome).
+* When a process becomes leader, cron jobs whose next fire time after their
+  last recorded run has already passed (runs missed while no process held
+  the lease) are run once immediately, depending on ``SCHEDULER_CATCHUP``
+  (``once`` or ``skip``) and ``SCHEDULER_CATCHUP_MAX_AGE_HOURS``.
+"""
+
+import atexit
+import functools
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, or_
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "scheduler"
+HEARTBEAT_JOB_ID = "scheduler_leader_heartbeat"
+
+# Identifies this process in the lease row and run history
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_state = {"leader": False}
+_leader_job_ids = set()
+_pending_catch_up = set()
+
+
+def try_acquire_lease(name, owner, ttl_seconds, now=None):
+    """Take or renew lease ``name`` for ``owner``; True when ``owner`` holds it afterwards.
+
+    Renewal and takeover of an expired lease are one conditional ``UPDATE``, so two
+    processes can never both succeed; a missing row is created, and losing that
+    insert race counts as not acquiring.
+    """
+    from app.models import SchedulerLease
+
+    now = now or datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    table = SchedulerLease.__table__
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            table.update()
+            .where(table.c.name == name, or_(table.c.owner == owner, table.c.expires_at < now))
+            .values(
+                owner=owner,
+                expires_at=expires_at,
+                acquired_at=case((table.c.owner == owner, table.c.acquired_at), else_=now),
+            )
+        )
+        if result.rowcount:
+            return True
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(table.insert().values(name=name, owner=owner, acquired_at=now, expires_at=expires_at))
+        return True
+    except IntegrityError:
+        return False
+
+
+def release_lease(name, owner):
+    """Give up lease ``name`` if ``owner`` holds it (so a successor does not wait for expiry)."""
+    from app.models import SchedulerLease
+
+    table = SchedulerLease.__table__
+    with db.engine.begin() as conn:
+        conn.execute(table.delete().where(table.c.name == name, table.c.owner == owner))
+
+
+def is_leader():
+    """Whether this process held the scheduler lease at its last renewal"""
+    return _state["leader"]
+
+
+def _election_enabled(app):
+    return bool(app.config.get("SCHEDULER_LEADER_ELECTION", True))
+
+
+def _lease_seconds(app):
+    return max(int(app.config.get("SCHEDULER_LEASE_SECONDS", 60)), 4)
+
+
+def _renew(app):
+    """Renew or take the lease; updates and returns the leader flag."""
+    try:
+        leader = try_acquire_lease(LEASE_NAME, PROCESS_OWNER, _lease_seconds(app))
+    except Exception as e:
+        # Database unreachable: behave as a follower until the next heartbeat
+        logger.warning("Scheduler lease renewal failed: %s", e)
+        leader = False
+    was_leader = _state["leader"]
+    _state["leader"] = leader
+    if leader and not was_leader:
+        logger.info("Process %s is now the scheduler leader", PROCESS_OWNER)
+    elif was_leader and not leader:
+        logger.warning("Process %s lost the scheduler lease", PROCESS_OWNER)
+    return leader, leader and not was_leader
+
+
+def _record_start(job_id, catch_up):
+    from app.models import ScheduledJobRun
+
+    table = ScheduledJobRun.__table__
+    try:
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                table.insert().values(
+                    job_id=job_id,
+                    owner=PROCESS_OWNER,
+                    catch_up=catch_up,
+                    status=ScheduledJobRun.STATUS_RUNNING,
+                    started_at=datetime.utcnow(),
+                )
+            )
+            return result.inserted_primary_key[0]
+    except Exception as e:
+        logger.warning("Could not record start of scheduled job %s: %s", job_id, e)
+        return None
+
+
+def _record_finish(run_id, status, duration_ms, error=None):
+    from app.models import ScheduledJobRun
+
+    if run_id is None:
+        return
+    table = ScheduledJobRun.__table__
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(
+                table.update()
+                .where(table.c.id == run_id)
+                .values(status=status, finished_at=datetime.utcnow(), duration_ms=duration_ms, error=error)
+            )
+    except Exception as e:
+        logger.warning("Could not record result of scheduled job run %s: %s", run_id, e)
+
+
+def run_recorded(job_id, func, catch_up=False):
+    """Run ``func`` and record the run in ``ScheduledJobRun``; exceptions are re-raised."""
+    from app.models import ScheduledJobRun
+
+    run_id = _record_start(job_id, catch_up)
+    started = time.monotonic()
+    try:
+        result = func()
+    except Exception as e:
+        db.session.rollback()
+        _record_finish(
+            run_id, ScheduledJobRun.STATUS_ERROR, int((time.monotonic() - started) * 1000), f"{type(e).__name__}: {e}"
+        )
+        raise
+    _record_finish(run_id, ScheduledJobRun.STATUS_SUCCESS, int((time.monotonic() - started) * 1000))
+    return result
+
+
+def leader_only(job_id, func, app, scheduler=None):
+    """Wrap scheduled job ``func`` so it only runs (and is recorded) in the lease holder."""
+
+    @functools.wraps(func)
+    def run_if_leader(*args, **kwargs):
+        with app.app_context():
+            if _election_enabled(app):
+                leader, became_leader = _renew(app)
+                if not leader:
+                    logger.debug("Skipping scheduled job %s: not the scheduler leader", job_id)
+                    return None
+                if became_leader and scheduler is not None:
+                    # This job is running now, so it needs no catch-up of its own
+                    catch_up_missed_runs(scheduler, app, exclude=job_id)
+            catch_up = job_id in _pending_catch_up
+            _pending_catch_up.discard(job_id)
+            return run_recorded(job_id, functools.partial(func, *args, **kwargs), catch_up=catch_up)
+
+    return run_if_leader
+
+
+def missed_job_ids(scheduler, job_ids, now=None, max_age=None):
+    """Cron jobs whose first fire time after their last recorded run is already due.
+
+    Interval jobs are not caught up: they fire again within their interval anyway.
+    Jobs without any recorded run have no baseline and are skipped.
+    """
+    from apscheduler.triggers.cron import CronTrigger
+
+    from app.models import ScheduledJobRun
+
+    now = now or datetime.now(timezone.utc)
+    last_runs = dict(
+        db.session.query(ScheduledJobRun.job_id, db.func.max(ScheduledJobRun.started_at))
+        .filter(ScheduledJobRun.job_id.in_(list(job_ids)))
+        .group_by(ScheduledJobRun.job_id)
+        .all()
+    )
+    missed = []
+    for job_id in sorted(job_ids):
+        job = scheduler.get_job(job_id)
+        last = last_runs.get(job_id)
+        if job is None or last is None or not isinstance(job.trigger, CronTrigger):
+            continue
+        due = job.trigger.get_next_fire_time(None, last.replace(tzinfo=timezone.utc) + timedelta(microseconds=1))
+        if due is None or due > now:
+            continue
+        if max_age is not None and now - due > max_age:
+            continue
+        missed.append(job_id)
+    return missed
+
+
+def catch_up_missed_runs(scheduler, app, exclude=None):
+    """On becoming leader, run each missed cron job once now (``SCHEDULER_CATCHUP=once``)."""
+    if (app.config.get("SCHEDULER_CATCHUP") or "once").lower() != "once":
+        return []
+    max_age = timedelta(hours=float(app.config.get("SCHEDULER_CATCHUP_MAX_AGE_HOURS", 24)))
+    try:
+        missed = missed_job_ids(scheduler, _leader_job_ids - {exclude}, max_age=max_age)
+    except Exception as e:
+        logger.warning("Could not determine missed scheduled runs: %s", e)
+        return []
+    now = datetime.now(timezone.utc)
+    for job_id in missed:
+        logger.info("Catching up missed run of scheduled job %s", job_id)
+        _pending_catch_up.add(job_id)
+        # The trigger computes the regular next fire time after this run
+        scheduler.modify_job(job_id, next_run_time=now)
+    return missed
+
+
+def install_leader_election(scheduler, app, job_ids):
+    """Make ``job_ids`` leader-only and register the lease heartbeat in this process."""
+    for job_id in job_ids:
+        job = scheduler.get_job(job_id)
+        if job is None or job_id in _leader_job_ids:
+            continue
+        job.modify(func=leader_only(job_id, job.func, app, scheduler))
+        _leader_job_ids.add(job_id)
+
+    if not _election_enabled(app):
+        return
+
+    def scheduler_leader_heartbeat():
+        with app.app_context():
+            _, became_leader = _renew(app)
+            if became_leader:
+                catch_up_missed_runs(scheduler, app)
+
+    scheduler.add_job(
+        func=scheduler_leader_heartbeat,
+        trigger="interval",
+        seconds=max(_lease_seconds(app) // 4, 1),
+        id=HEARTBEAT_JOB_ID,
+        name="Renew or take over the scheduler lease",
+        replace_existing=True,
+        max_instances=1,
+        next_run_time=datetime.now(timezone.utc),
+    )
+
+    def _release_on_exit():
+        if not _state["leader"]:
+            return
+        try:
+            with app.app_context():
+                release_lease(LEASE_NAME, PROCESS_OWNER)
+        except Exception:
+            pass
+
+    atexit.register(_release_on_exit)
+    logger.info("Scheduler leader election enabled for %d jobs (owner %s)", len(_leader_job_ids), PROCESS_OWNER)
+
+
+def prune_scheduled_job_runs(retention_days=None):
+    """Delete job run history older than ``SCHEDULER_RUN_HISTORY_DAYS``; returns rows removed."""
+    from flask import current_app
+
+    from app.models import ScheduledJobRun
+
+    if retention_days is None:
+        retention_days = current_app.config.get("SCHEDULER_RUN_HISTORY_DAYS", 30)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = ScheduledJobRun.query.filter(ScheduledJobRun.started_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
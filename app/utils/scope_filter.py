@@ -2,6 +2,7 @@
 
 from typing import Set, Tuple
 
+import sqlalchemy as sa
 from flask_login import current_user
 
 
@@ -38,53 +39,78 @@ def apply_project_scope(Project, query, user=None):
 
 
 def apply_client_scope_to_model(Client, user=None):
-    """Return filter expression for Client query (Client.id.in_(...) or None for no filter)."""
+    """Return filter expression for Client query (None for no filter).
+
+    Mirrors ``User.get_allowed_client_ids`` as SQL so the allowed IDs are never loaded into Python.
+    """
     u = user or (current_user if current_user.is_authenticated else None)
     if not u or u.is_admin:
         return None
-    allowed = u.get_allowed_client_ids()
-    if allowed is None:
-        return None
-    if not allowed:
-        return Client.id.in_([])  # never match
-    return Client.id.in_(allowed)
+    return _client_scope(u, Client.id)
 
 
 def apply_project_scope_to_model(Project, user=None):
-    """Return filter expression for Project query (Project.id.in_(...) or None for no filter)."""
+    """Return filter expression for Project query (None for no filter).
+
+    Mirrors ``User.get_allowed_project_ids`` as SQL; subcontractors read the projects of their
+    assigned clients from ``user_project_access``.
+    """
     u = user or (current_user if current_user.is_authenticated else None)
     if not u or u.is_admin:
         return None
-    allowed_projects = u.get_allowed_project_ids()
-    if allowed_projects is None:
+    from app.utils.permissions import user_has_view_all_projects, user_has_view_own_projects_only
+
+    if u.is_client_portal_user:
+        return Project.client_id == u.client_id
+    if u.is_scope_restricted:
+        return Project.id.in_(assigned_project_ids_select(u.id))
+    if user_has_view_all_projects(u):
+        return _client_scope(u, Project.client_id)
+    if user_has_view_own_projects_only(u):
+        return Project.created_by == u.id
+    return Project.id.in_([])  # never match
+
+
+def _client_scope(u, client_id_column):
+    """Filter on ``client_id_column`` for a non-admin user (None when every client is allowed)"""
+    from app.models import Client
+    from app.utils.permissions import user_has_view_all_clients, user_has_view_own_clients_only
+
+    if u.is_client_portal_user:
+        return client_id_column == u.client_id
+    if u.is_scope_restricted:
+        return client_id_column.in_(assigned_client_ids_select(u.id))
+    if user_has_view_all_clients(u):
         return None
-    if not allowed_projects:
-        return Project.id.in_([])  # never match
-    return Project.id.in_(allowed_projects)
+    if user_has_view_own_clients_only(u):
+        return client_id_column.in_(sa.select(Client.id).where(Client.created_by == u.id))
+    return client_id_column.in_([])  # never match
 
 
 def user_can_access_client(user, client_id):
     """Return True if user may access this client (for direct ID checks / 403)."""
     if not user:
         return False
-    if user.is_admin:
-        return True
-    allowed = user.get_allowed_client_ids()
-    if allowed is None:
+    from app import db
+    from app.models import Client
+
+    scope = apply_client_scope_to_model(Client, user)
+    if scope is None:
         return True
-    return client_id in allowed
+    return db.session.query(Client.id).filter(Client.id == client_id, scope).first() is not None
 
 
 def user_can_access_project(user, project_id):
     """Return True if user may access this project (for direct ID checks / 403)."""
     if not user:
         return False
-    if user.is_admin:
-        return True
-    allowed = user.get_allowed_project_ids()
-    if allowed is None:
+    from app import db
+    from app.models import Project
+
+    scope = apply_project_scope_to_model(Project, user)
+    if scope is None:
         return True
-    return project_id in allowed
+    return db.session.query(Project.id).filter(Project.id == project_id, scope).first() is not None
 
 
 def get_active_clients_for_user(user, *, status="active"):
@@ -109,33 +135,48 @@ def get_active_projects_for_user(user, *, status="active"):
     return query.all()
 
 
+def accessible_project_ids_select(user_id: int):
+    """
+    SELECT of project IDs for issue-style access (projects the user has time entries for
+    or is assigned to tasks on), for use in ``Column.in_()`` filters.
+    Reads the materialized ``user_project_access`` table.
+    """
+    from app.utils.user_project_access import project_ids_select
+
+    return project_ids_select(user_id, entries=True, tasks=True)
+
+
+def accessible_client_ids_select(user_id: int):
+    """SELECT of the client IDs of the projects from ``accessible_project_ids_select``."""
+    from app.utils.user_project_access import client_ids_select
+
+    return client_ids_select(user_id, entries=True, tasks=True)
+
+
+def assigned_project_ids_select(user_id: int):
+    """SELECT of the project IDs of the user's assigned clients (``user_clients``), from ``user_project_access``."""
+    from app.utils.user_project_access import project_ids_select
+
+    return project_ids_select(user_id, entries=False, clients=True)
+
+
+def assigned_client_ids_select(user_id: int):
+    """SELECT of the user's assigned client IDs (``user_clients``)."""
+    from app.models import UserClient
+
+    return sa.select(UserClient.client_id).where(UserClient.user_id == user_id)
+
+
 def get_accessible_project_and_client_ids_for_user(user_id: int) -> Tuple[Set[int], Set[int]]:
     """
     Return (accessible_project_ids, accessible_client_ids) for issue-style access:
     projects the user has time entries for or is assigned to tasks on, and clients of those projects.
-    Used to filter issues for non-admin users without view_all_issues permission.
+    Used to check a single issue; list queries filter with the ``*_select`` helpers above instead.
     """
-    from app.models import Project, Task
-    from app.repositories import TimeEntryRepository
-
-    time_entry_repo = TimeEntryRepository()
-    user_project_ids = set(time_entry_repo.get_distinct_project_ids_for_user(user_id))
-    task_project_rows = (
-        Task.query.with_entities(Task.project_id)
-        .filter_by(assigned_to=user_id)
-        .filter(Task.project_id.isnot(None))
-        .distinct()
-        .all()
-    )
-    task_project_ids = {r[0] for r in task_project_rows}
-    all_accessible_project_ids = user_project_ids | task_project_ids
-    if not all_accessible_project_ids:
+    from app import db
+
+    project_ids = set(db.session.execute(accessible_project_ids_select(user_id)).scalars())
+    if not project_ids:
         return set(), set()
-    client_rows = (
-        Project.query.with_entities(Project.client_id)
-        .filter(Project.id.in_(all_accessible_project_ids), Project.client_id.isnot(None))
-        .distinct()
-        .all()
-    )
-    accessible_client_ids = {r[0] for r in client_rows}
-    return all_accessible_project_ids, accessible_client_ids
+    client_ids = set(db.session.execute(accessible_client_ids_select(user_id)).scalars())
+    return project_ids, client_ids
@@ -0,0 +1,186 @@
+"""
+Process-wide, versioned cache of the singleton Settings row.
+
+``Settings.get_settings()`` returns a live ORM instance (callers mutate and
+commit it), so every call costs a ``SELECT``. Read-only hot paths (timezone
+resolution, date-format filters, context processors, column defaults) use
+``get_settings_snapshot()`` instead, which returns an immutable
+``SettingsSnapshot``:
+
+- one snapshot is held per application in ``app.extensions``;
+- a module-level version counter is bumped whenever a ``Settings`` row is
+  flushed, committed or deleted, which invalidates every cached snapshot;
+- snapshots also expire after ``SETTINGS_CACHE_TTL`` seconds so that other
+  worker processes pick up changes saved elsewhere;
+- within a request the snapshot is memoized on ``flask.g`` so all reads see
+  one consistent view.
+"""
+
+import logging
+import threading
+import time
+import types
+from typing import Any, Dict, Optional
+
+from flask import current_app, g, has_app_context, has_request_context
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "settings_snapshot_cache"
+_DEFAULT_TTL_SECONDS = 60
+_SESSION_INFO_KEY = "settings_cache_dirty"
+
+_version_lock = threading.Lock()
+_version = 0
+
+
+def get_settings_version() -> int:
+    """Return the current in-process settings version."""
+    return _version
+
+
+def bump_settings_version() -> int:
+    """Invalidate all cached settings snapshots in this process."""
+    global _version
+    with _version_lock:
+        _version += 1
+        return _version
+
+
+class SettingsSnapshot:
+    """Immutable, detached copy of a Settings row.
+
+    Column values are copied at build time. Methods and properties defined on
+    the ``Settings`` model (``get_logo_url``, ``get_ai_config``, ``to_dict``,
+    ...) are bound to the snapshot on access, so read-only callers can use it
+    as a drop-in replacement for the ORM instance. Assignment raises
+    ``AttributeError``.
+    """
+
+    __slots__ = ("_values", "_model", "version")
+
+    def __init__(self, values: Dict[str, Any], model: type, version: int):
+        object.__setattr__(self, "_values", dict(values))
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "version", version)
+
+    @classmethod
+    def from_instance(cls, instance, version: int) -> "SettingsSnapshot":
+        from sqlalchemy import inspect as sa_inspect
+
+        mapper = sa_inspect(type(instance))
+        values = {attr.key: getattr(instance, attr.key, None) for attr in mapper.column_attrs}
+        return cls(values, type(instance), version)
+
+    def __getattr__(self, name: str) -> Any:
+        values = object.__getattribute__(self, "_values")
+        if name in values:
+            return values[name]
+        model = object.__getattribute__(self, "_model")
+        attr = getattr(model, name)  # AttributeError propagates for unknown names
+        if isinstance(attr, property):
+            return attr.fget(self) if attr.fget else None
+        if isinstance(attr, types.FunctionType):
+            return types.MethodType(attr, self)
+        return attr
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SettingsSnapshot is read-only; use Settings.get_settings() to modify settings")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("SettingsSnapshot is read-only")
+
+    def __repr__(self) -> str:
+        return f"<SettingsSnapshot v{self.version}>"
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(current_app.config.get("SETTINGS_CACHE_TTL", _DEFAULT_TTL_SECONDS))
+    except (TypeError, ValueError, RuntimeError):
+        return _DEFAULT_TTL_SECONDS
+
+
+def _load_snapshot(version: int):
+    from app.models import Settings
+
+    settings = Settings.get_settings()
+    if not isinstance(settings, Settings):
+        # None, or a stand-in object (e.g. patched in tests): pass through uncached
+        return settings
+    return SettingsSnapshot.from_instance(settings, version)
+
+
+def get_settings_snapshot() -> Optional[SettingsSnapshot]:
+    """Return the current settings as an immutable snapshot.
+
+    Returns None outside an application context. Transient fallback settings
+    (table missing during migrations) are returned but never cached.
+    """
+    if not has_app_context():
+        return None
+
+    version = _version
+    if has_request_context():
+        memo = g.get("_settings_snapshot")
+        if memo is not None and getattr(memo, "version", None) == version:
+            return memo
+
+    cache = current_app.extensions.setdefault(_EXTENSION_KEY, {})
+    entry = cache.get("entry")
+    now = time.monotonic()
+    if entry is not None and entry[0] == version and now - entry[1] < _ttl_seconds():
+        snapshot = entry[2]
+    else:
+        snapshot = _load_snapshot(version)
+        if snapshot is None:
+            return None
+        if isinstance(snapshot, SettingsSnapshot) and snapshot.id is not None:
+            cache["entry"] = (version, now, snapshot)
+
+    if has_request_context() and isinstance(snapshot, SettingsSnapshot):
+        g._settings_snapshot = snapshot
+    return snapshot
+
+
+def clear_settings_cache(app=None) -> None:
+    """Drop the cached snapshot for ``app`` (or the current app) and bump the version."""
+    bump_settings_version()
+    target = app
+    if target is None and has_app_context():
+        target = current_app._get_current_object()
+    if target is not None:
+        target.extensions.pop(_EXTENSION_KEY, None)
+
+
+def _touches_settings(session) -> bool:
+    from app.models import Settings
+
+    for collection in (session.new, session.dirty, session.deleted):
+        for obj in collection:
+            if isinstance(obj, Settings):
+                return True
+    return False
+
+
+def receive_after_flush(session, flush_context):
+    """Invalidate snapshots when a Settings row was written in this flush."""
+    try:
+        if _touches_settings(session):
+            session.info[_SESSION_INFO_KEY] = True
+            bump_settings_version()
+    except Exception as e:
+        logger.debug(f"Settings cache flush hook failed: {e}")
+
+
+def receive_after_transaction_end(session, transaction):
+    """Bump again once the transaction that wrote Settings commits or rolls back.
+
+    A snapshot built between flush and commit may contain values that are
+    later rolled back (or not yet visible to other sessions), so it must not
+    outlive the transaction.
+    """
+    if transaction.parent is not None:
+        return
+    if session.info.pop(_SESSION_INFO_KEY, False):
+        bump_settings_version()
@@ -0,0 +1,249 @@
+"""
+Streaming export helpers for time-entry CSV/Excel downloads.
+
+Exports used to load every matching ``TimeEntry`` with its relationships,
+render the whole file into a text buffer and copy it into bytes, so a large
+export held the result set three times over. The helpers here keep memory
+flat instead:
+
+* ``iter_time_entry_export_rows`` turns a filtered ``TimeEntry`` query into a
+  column-only select (entry columns plus user/project/client/task names via
+  outer joins) fetched in batches with ``yield_per``, which uses a server-side
+  cursor where the driver supports it. Rows come back as
+  ``TimeEntryExportRow`` objects that expose the attributes export code reads
+  from ``TimeEntry`` (``entry.user.display_name``, ``entry.project.client``,
+  ``entry.duration_hours``...), so row-building code works with either.
+* ``stream_csv`` renders rows into CSV text chunks and ``csv_response`` sends
+  them as a chunked download.
+* Excel files are written with openpyxl's write-only mode
+  (see ``app.utils.excel_export``).
+"""
+
+import csv
+import io
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from flask import Response, stream_with_context
+from sqlalchemy.orm import aliased
+
+EXPORT_BATCH_SIZE = 1000
+CSV_CHUNK_SIZE = 64 * 1024
+
+
+class _Related:
+    """Read-only stand-in for a related object (user, project, client, task) in an export row"""
+
+    __slots__ = ("name", "username", "full_name", "client", "custom_fields")
+
+    def __init__(self, name=None, username=None, full_name=None, client=None, custom_fields=None):
+        self.name = name
+        self.username = username
+        self.full_name = full_name
+        self.client = client
+        self.custom_fields = custom_fields
+
+    @property
+    def display_name(self):
+        if self.full_name and self.full_name.strip():
+            return self.full_name.strip()
+        return self.username
+
+
+class TimeEntryExportRow:
+    """One time entry as fetched by ``iter_time_entry_export_rows``.
+
+    Mirrors the ``TimeEntry`` attributes and properties used by the export
+    routes; related objects are ``None`` when the entry has none, like the
+    ORM relationships.
+    """
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "project_id",
+        "task_id",
+        "start_time",
+        "end_time",
+        "duration_seconds",
+        "break_seconds",
+        "paused_at",
+        "notes",
+        "tags",
+        "source",
+        "billable",
+        "paid",
+        "created_at",
+        "updated_at",
+        "user",
+        "project",
+        "client",
+        "task",
+    )
+
+    def __init__(self, row):
+        for key in _ENTRY_COLUMNS:
+            setattr(self, key, getattr(row, key))
+        self.user = _Related(username=row.user_username, full_name=row.user_full_name) if row.user_id else None
+        self.project = (
+            _Related(name=row.project_name, client=row.project_client_name or "Unknown Client")
+            if row.project_name is not None
+            else None
+        )
+        self.client = (
+            _Related(name=row.client_name, custom_fields=row.client_custom_fields)
+            if row.client_name is not None
+            else None
+        )
+        self.task = _Related(name=row.task_name) if row.task_name is not None else None
+
+    @property
+    def duration_hours(self):
+        if not self.duration_seconds:
+            return 0
+        return round(self.duration_seconds / 3600, 2)
+
+    @property
+    def current_duration_seconds(self):
+        if self.end_time:
+            return self.duration_seconds or 0
+        from app.models.time_entry import local_now
+
+        end_ref = self.paused_at or local_now()
+        if self.start_time is None:
+            return 0
+        return max(0, int((end_ref - self.start_time).total_seconds()) - (self.break_seconds or 0))
+
+    @property
+    def duration_formatted(self):
+        if not self.end_time:
+            total_seconds = int(self.current_duration_seconds)
+        elif not self.duration_seconds:
+            return "00:00:00"
+        else:
+            total_seconds = int(self.duration_seconds)
+        return f"{total_seconds // 3600:02d}:{(total_seconds % 3600) // 60:02d}:{total_seconds % 60:02d}"
+
+
+_ENTRY_COLUMNS = (
+    "id",
+    "user_id",
+    "project_id",
+    "task_id",
+    "start_time",
+    "end_time",
+    "duration_seconds",
+    "break_seconds",
+    "paused_at",
+    "notes",
+    "tags",
+    "source",
+    "billable",
+    "paid",
+    "created_at",
+    "updated_at",
+)
+
+
+def iter_time_entry_export_rows(query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[TimeEntryExportRow]:
+    """Iterate a filtered/ordered ``TimeEntry`` query as ``TimeEntryExportRow`` objects.
+
+    The query must select ``TimeEntry`` without loader options (``joinedload``);
+    related names are fetched through aliased outer joins so queries that already
+    join ``Client`` or ``Project`` for filtering are not affected.
+    """
+    from app.models import Client, Project, Task, TimeEntry, User
+
+    ExportUser = aliased(User)
+    ExportProject = aliased(Project)
+    ProjectClient = aliased(Client)
+    EntryClient = aliased(Client)
+    ExportTask = aliased(Task)
+
+    rows = (
+        query.outerjoin(ExportUser, TimeEntry.user_id == ExportUser.id)
+        .outerjoin(ExportProject, TimeEntry.project_id == ExportProject.id)
+        .outerjoin(ProjectClient, ExportProject.client_id == ProjectClient.id)
+        .outerjoin(EntryClient, TimeEntry.client_id == EntryClient.id)
+        .outerjoin(ExportTask, TimeEntry.task_id == ExportTask.id)
+        .with_entities(
+            *[getattr(TimeEntry, key) for key in _ENTRY_COLUMNS],
+            ExportUser.username.label("user_username"),
+            ExportUser.full_name.label("user_full_name"),
+            ExportProject.name.label("project_name"),
+            ProjectClient.name.label("project_client_name"),
+            EntryClient.name.label("client_name"),
+            EntryClient.custom_fields.label("client_custom_fields"),
+            ExportTask.name.label("task_name"),
+        )
+        .execution_options(yield_per=batch_size)
+    )
+    for row in rows:
+        yield TimeEntryExportRow(row)
+
+
+class CountingRows:
+    """Wrap an iterable and count the items consumed (for export tracking after a streamed write)."""
+
+    def __init__(self, rows: Iterable[Any]):
+        self._rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self._rows:
+            self.count += 1
+            yield row
+
+
+def stream_csv(
+    header: Sequence[Any],
+    rows: Iterable[Sequence[Any]],
+    delimiter: str = ",",
+    on_complete: Optional[Callable[[int, int], None]] = None,
+    chunk_size: int = CSV_CHUNK_SIZE,
+) -> Iterator[str]:
+    """Render ``header`` and ``rows`` as CSV, yielding text chunks of about ``chunk_size`` characters.
+
+    ``on_complete(row_count, byte_count)`` is called once the last chunk has been produced
+    (for export tracking, which used to need the finished buffer).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter or ",")
+    writer.writerow(header)
+    row_count = 0
+    byte_count = 0
+    for row in rows:
+        writer.writerow(row)
+        row_count += 1
+        if buffer.tell() >= chunk_size:
+            chunk = buffer.getvalue()
+            byte_count += len(chunk.encode("utf-8"))
+            yield chunk
+            buffer.seek(0)
+            buffer.truncate(0)
+    chunk = buffer.getvalue()
+    byte_count += len(chunk.encode("utf-8"))
+    yield chunk
+    if on_complete is not None:
+        on_complete(row_count, byte_count)
+
+
+def csv_response(chunks: Iterable[str], filename: str) -> Response:
+    """Chunked CSV download of ``chunks`` (keeps the request context alive while streaming)."""
+    return Response(
+        stream_with_context(chunks),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def write_csv_bytes(header: Sequence[Any], rows: Iterable[Sequence[Any]], delimiter: str = ",") -> io.BytesIO:
+    """Write CSV straight into a ``BytesIO`` (for callers that need a file object rather than a response)."""
+    output = io.BytesIO()
+    text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    writer = csv.writer(text, delimiter=delimiter or ",")
+    writer.writerow(header)
+    writer.writerows(rows)
+    text.flush()
+    text.detach()
+    output.seek(0)
+    return output
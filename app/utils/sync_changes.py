@@ -0,0 +1,334 @@
+"""
+Change log and delta feed for ``/api/v1/sync``.
+
+``receive_after_flush`` appends one ``sync_changes`` row for every time
+entry, project and task inserted, updated or deleted by a flush, on the
+flush's own connection so the log commits or rolls back with the change.
+When an update moves a record out of a scope (a time entry reassigned to
+another user or project, a task moved to another project) a tombstone is
+also written under the old scope, so clients that can no longer see the
+record drop it.
+
+Ids are assigned at flush time but rows become visible at commit time, so a
+transaction that flushed first can commit last. The feed is therefore ordered
+by ``commit_seq``: ``receive_before_commit`` draws the next number from the
+``sync_change_sequence`` row and stamps the transaction's rows with it. The
+counter row stays locked until the commit finishes, so numbers are handed out
+in commit order and no commit can land behind a watermark a client already
+holds.
+
+``read_changes`` pages through the log after a watermark (a
+``(commit_seq, id)`` position) for a set of scoped entity types.
+``prune_sync_changes`` (scheduled daily)
+drops rows older than ``SYNC_CHANGE_RETENTION_DAYS``; clients holding an
+older watermark are told to do a full refetch.
+
+Bulk ``Query.update()``/``Query.delete()`` and raw SQL bypass the ORM flush
+and are not logged.
+"""
+
+import itertools
+import logging
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import attributes
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_SALT = "timetracker:sync-watermark:v1"
+
+# API name -> (entity_type stored in the log, required token scope)
+SyncEntity = namedtuple("SyncEntity", ["entity_type", "scope"])
+SYNC_ENTITIES: Dict[str, SyncEntity] = {
+    "time_entries": SyncEntity("time_entry", "read:time_entries"),
+    "projects": SyncEntity("project", "read:projects"),
+    "tasks": SyncEntity("task", "read:tasks"),
+}
+
+_NO_VALUE = object()
+_SESSION_INFO_KEY = "sync_changes_uncommitted"
+_STAMP_BATCH_SIZE = 500
+
+
+def _models():
+    from app.models import Project, Task, TimeEntry
+
+    return {"time_entry": TimeEntry, "project": Project, "task": Task}
+
+
+def _entity_type(obj) -> Optional[str]:
+    for entity_type, model in _models().items():
+        if isinstance(obj, model):
+            return entity_type
+    return None
+
+
+def _old_value(obj, key):
+    hist = attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    return obj.__dict__.get(key, _NO_VALUE)
+
+
+def _scope(entity_type: str, obj, value) -> Tuple[Optional[int], Optional[int]]:
+    """``(user_id, project_id)`` of a record, reading attributes through ``value(obj, key)``"""
+
+    def known(key):
+        v = value(obj, key)
+        return None if v is _NO_VALUE else v
+
+    if entity_type == "time_entry":
+        return known("user_id"), known("project_id")
+    if entity_type == "project":
+        return None, obj.id
+    return None, known("project_id")
+
+
+def _old_scope(session, entity_type: str, obj) -> Tuple[Optional[int], Optional[int]]:
+    if entity_type == "time_entry":
+        from app.utils.time_entry_changes import old_state
+
+        state = old_state(session, obj)
+        if state is not None:
+            return state["user_id"], state["project_id"]
+    return _scope(entity_type, obj, _old_value)
+
+
+def _row(entity_type: str, entity_id: int, op: str, scope, now: datetime) -> Dict[str, Any]:
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "op": op,
+        "user_id": scope[0],
+        "project_id": scope[1],
+        "changed_at": now,
+    }
+
+
+def _collect_rows(session) -> List[Dict[str, Any]]:
+    from app.models import SyncChange
+
+    now = datetime.utcnow()
+    rows = []
+    for obj in session.new:
+        entity_type = _entity_type(obj)
+        if entity_type and obj.id is not None:
+            rows.append(_row(entity_type, obj.id, SyncChange.OP_UPSERT, _scope(entity_type, obj, getattr), now))
+
+    for obj in session.dirty:
+        entity_type = _entity_type(obj)
+        if not entity_type or obj in session.deleted or not session.is_modified(obj, include_collections=False):
+            continue
+        scope = _scope(entity_type, obj, getattr)
+        old_scope = _old_scope(session, entity_type, obj)
+        if old_scope != scope:
+            rows.append(_row(entity_type, obj.id, SyncChange.OP_DELETE, old_scope, now))
+        rows.append(_row(entity_type, obj.id, SyncChange.OP_UPSERT, scope, now))
+
+    for obj in session.deleted:
+        entity_type = _entity_type(obj)
+        if entity_type and obj.id is not None:
+            rows.append(_row(entity_type, obj.id, SyncChange.OP_DELETE, _old_scope(session, entity_type, obj), now))
+    return rows
+
+
+def receive_after_flush(session, flush_context):
+    """Append change-log rows for the synced records written in this flush."""
+    rows = _collect_rows(session)
+    if not rows:
+        return
+    from app.models import SyncChange
+
+    table = SyncChange.__table__
+    inserted = session.connection().execute(table.insert().returning(table.c.id), rows)
+    session.info.setdefault(_SESSION_INFO_KEY, []).extend(inserted.scalars())
+
+
+def _next_commit_seq(connection) -> int:
+    """Increment the sequence row; its lock is held until the caller's transaction ends"""
+    from app.models import SyncChangeSequence
+
+    table = SyncChangeSequence.__table__
+    increment = table.update().where(table.c.id == 1).values(value=table.c.value + 1)
+    if not connection.execute(increment).rowcount:
+        # Database created without migrations: no sequence row yet
+        try:
+            with connection.begin_nested():
+                connection.execute(table.insert().values(id=1, value=0))
+        except IntegrityError:
+            pass
+        connection.execute(increment)
+    return connection.execute(sa.select(table.c.value).where(table.c.id == 1)).scalar_one()
+
+
+def receive_before_commit(session):
+    """Stamp the change-log rows of the committing transaction with the next commit sequence number."""
+    from app.models import SyncChange
+
+    # before_commit runs ahead of the commit's own flush
+    if any(_entity_type(obj) for obj in itertools.chain(session.new, session.dirty, session.deleted)):
+        session.flush()
+    ids = session.info.pop(_SESSION_INFO_KEY, None)
+    if not ids:
+        return
+    connection = session.connection()
+    commit_seq = _next_commit_seq(connection)
+    table = SyncChange.__table__
+    for start in range(0, len(ids), _STAMP_BATCH_SIZE):
+        batch = ids[start : start + _STAMP_BATCH_SIZE]
+        connection.execute(table.update().where(table.c.id.in_(batch)).values(commit_seq=commit_seq))
+
+
+def receive_after_transaction_end(session, transaction):
+    """Forget the rows of a transaction that rolled back."""
+    if transaction.parent is None:
+        session.info.pop(_SESSION_INFO_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Watermarks
+# ---------------------------------------------------------------------------
+
+
+class InvalidWatermarkError(ValueError):
+    """Raised when a sync watermark is malformed or has a bad signature"""
+
+
+def _serializer():
+    from itsdangerous import URLSafeSerializer
+
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt=WATERMARK_SALT)
+
+
+def encode_watermark(position: Tuple[int, int], as_of: datetime) -> str:
+    """Opaque, signed watermark: every change up to ``position`` (``(commit_seq, id)``) is applied, read at ``as_of``"""
+    commit_seq, change_id = position
+    return _serializer().dumps({"seq": int(commit_seq), "id": int(change_id), "ts": as_of.isoformat()})
+
+
+def decode_watermark(token: str) -> Tuple[Tuple[int, int], datetime]:
+    """Return ``((commit_seq, id), as_of)`` of a watermark issued by ``encode_watermark``"""
+    from itsdangerous import BadSignature
+
+    try:
+        payload = _serializer().loads(token)
+        change_id = int(payload["id"])
+        # Watermarks issued before commit sequences: migrated rows have commit_seq == id
+        commit_seq = int(payload.get("seq", change_id))
+        return (commit_seq, change_id), datetime.fromisoformat(payload["ts"])
+    except (BadSignature, KeyError, TypeError, ValueError, AttributeError):
+        raise InvalidWatermarkError("Invalid sync watermark")
+
+
+def _retention_cutoff(now: datetime) -> datetime:
+    return now - timedelta(days=int(current_app.config.get("SYNC_CHANGE_RETENTION_DAYS", 30)))
+
+
+def watermark_expired(as_of: datetime, now: Optional[datetime] = None) -> bool:
+    """Whether changes after a watermark may already have been pruned (client must refetch everything)"""
+    now = now or datetime.utcnow()
+    return as_of < _retention_cutoff(now)
+
+
+def current_watermark(now: Optional[datetime] = None) -> str:
+    """Watermark for the current end of the log (hand out before a client's full fetch)"""
+    from app import db
+    from app.models import SyncChange
+
+    now = now or datetime.utcnow()
+    last = (
+        db.session.query(SyncChange.commit_seq, SyncChange.id)
+        .filter(SyncChange.commit_seq.isnot(None))
+        .order_by(SyncChange.commit_seq.desc(), SyncChange.id.desc())
+        .first()
+    )
+    return encode_watermark((last.commit_seq, last.id) if last else (0, 0), now)
+
+
+# ---------------------------------------------------------------------------
+# Reading the feed
+# ---------------------------------------------------------------------------
+
+
+def _scope_filter(SyncChange, entity_type: str, user_id: Optional[int], project_ids):
+    clauses = [SyncChange.entity_type == entity_type]
+    if user_id is not None:
+        clauses.append(SyncChange.user_id == user_id)
+    if project_ids is not None:
+        # Tombstones whose scope could not be determined only reveal an id; keep them visible
+        clauses.append(sa.or_(SyncChange.project_id.in_(list(project_ids)), SyncChange.project_id.is_(None)))
+    return sa.and_(*clauses)
+
+
+def read_changes(
+    since: Tuple[int, int],
+    scopes: Dict[str, Tuple[Optional[int], Optional[List[int]]]],
+    limit: int,
+    now: Optional[datetime] = None,
+):
+    """Committed changes after the ``since`` position visible under ``scopes``.
+
+    Args:
+        since: ``(commit_seq, id)`` of the last change the client has applied
+        scopes: entity_type -> ``(user_id, project_ids)``; ``user_id`` restricts to one owner and
+            ``project_ids`` to a set of projects, ``None`` meaning unrestricted
+        limit: Maximum number of log rows to return
+
+    Returns:
+        ``(rows, has_more, watermark)`` with rows in commit order and the watermark to resume from
+    """
+    from app.models import SyncChange
+
+    now = now or datetime.utcnow()
+    if not scopes:
+        return [], False, encode_watermark(since, now)
+    since_seq, since_id = since
+    rows = (
+        SyncChange.query.filter(
+            # Uncommitted rows have no commit_seq yet and never match
+            sa.or_(
+                SyncChange.commit_seq > since_seq,
+                sa.and_(SyncChange.commit_seq == since_seq, SyncChange.id > since_id),
+            ),
+            sa.or_(*[_scope_filter(SyncChange, t, uid, pids) for t, (uid, pids) in scopes.items()]),
+        )
+        .order_by(SyncChange.commit_seq, SyncChange.id)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return rows, False, encode_watermark(since, now)
+    # Later commits get higher sequence numbers, so the last row read is a safe place to resume
+    as_of = rows[-1].changed_at if has_more else now
+    return rows, has_more, encode_watermark((rows[-1].commit_seq, rows[-1].id), as_of)
+
+
+def collapse_changes(rows) -> List[Any]:
+    """Keep only the latest change per record, in log order"""
+    latest = {}
+    for row in rows:
+        latest.pop((row.entity_type, row.entity_id), None)
+        latest[(row.entity_type, row.entity_id)] = row
+    return list(latest.values())
+
+
+def prune_sync_changes(now: Optional[datetime] = None) -> int:
+    """Delete change-log rows older than ``SYNC_CHANGE_RETENTION_DAYS``; returns the number removed"""
+    from app import db
+    from app.models import SyncChange
+
+    now = now or datetime.utcnow()
+    removed = SyncChange.query.filter(SyncChange.changed_at < _retention_cutoff(now)).delete(synchronize_session=False)
+    db.session.commit()
+    if removed:
+        logger.info(f"Pruned {removed} sync change log rows")
+    return removed
@@ -373,9 +373,9 @@ def register_template_filters(app):
             return str(value)
         if currency_code is None:
             try:
-                from app.models import Settings
+                from app.utils.settings_cache import get_settings_snapshot
 
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 currency_code = settings.currency if settings else "EUR"
             except Exception:
                 currency_code = "EUR"
@@ -471,9 +471,9 @@ def register_template_filters(app):
         """Convert currency code to symbol"""
         if not currency_code:
             try:
-                from app.models import Settings
+                from app.utils.settings_cache import get_settings_snapshot
 
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 currency_code = settings.currency if settings else "EUR"
             except Exception:
                 currency_code = "EUR"
@@ -513,9 +513,9 @@ def register_template_filters(app):
         """Convert currency code to FontAwesome icon class"""
         if not currency_code:
             try:
-                from app.models import Settings
+                from app.utils.settings_cache import get_settings_snapshot
 
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 currency_code = settings.currency if settings else "EUR"
             except Exception:
                 currency_code = "EUR"
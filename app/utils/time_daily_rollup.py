@@ -0,0 +1,350 @@
+"""
+Incremental maintenance and read helpers for the ``time_daily_rollup`` table.
+
+``receive_after_flush`` turns the ``TimeEntry`` rows written by a flush into
+per-key deltas (a key is day, user, project, task, client and billable) and
+applies them on the flush's own connection, so the rollup commits or rolls
+back together with the entries. Only completed entries (``end_time`` set) are
+counted, matching the report and dashboard queries the rollup replaces; a
+timer is added when it is stopped and moved when an entry is edited.
+
+Reports and dashboards read the rollup through ``seconds_by_day``,
+``total_seconds`` and ``seconds_by_project`` when ``TIME_ROLLUP_ENABLED`` is
+on. Bulk ``Query.update()``/``Query.delete()`` and raw SQL bypass the ORM
+flush; run ``flask rebuild-time-rollup`` after such maintenance and
+``flask verify-time-rollup`` to compare the table against ``time_entries``.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import sqlalchemy as sa
+from flask import current_app, has_app_context
+from sqlalchemy.exc import IntegrityError
+
+from app.utils.time_entry_changes import collect_time_entry_changes, deleted_user_ids
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[date, int, int, int, int, bool]
+_KEY_COLUMNS = ("day", "user_id", "project_id", "task_id", "client_id", "billable")
+
+
+def time_rollup_enabled() -> bool:
+    """Whether reports and dashboards should read from the rollup table"""
+    if not has_app_context():
+        return False
+    return bool(current_app.config.get("TIME_ROLLUP_ENABLED", True))
+
+
+def _tables():
+    from app.models import TimeDailyRollup, TimeEntry
+
+    return TimeDailyRollup.__table__, TimeEntry.__table__
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _key(state) -> Optional[Key]:
+    if state is None or state["end_time"] is None or state["start_time"] is None or state["user_id"] is None:
+        return None
+    return (
+        state["start_time"].date(),
+        state["user_id"],
+        state["project_id"] or 0,
+        state["task_id"] or 0,
+        state["client_id"] or 0,
+        bool(state["billable"]),
+    )
+
+
+def _key_clause(rollup, key: Key):
+    return sa.and_(*[rollup.c[name] == value for name, value in zip(_KEY_COLUMNS, key)])
+
+
+def _collect_deltas(session, flush_context) -> Tuple[Dict[Key, List[int]], set]:
+    changes = collect_time_entry_changes(session, flush_context)
+    deltas: Dict[Key, List[int]] = defaultdict(lambda: [0, 0])
+    for old, new in changes.changes:
+        old_key, new_key = _key(old), _key(new)
+        old_sec = int(old["duration_seconds"] or 0) if old_key else 0
+        new_sec = int(new["duration_seconds"] or 0) if new_key else 0
+        if old_key == new_key and old_sec == new_sec:
+            continue
+        if old_key is not None:
+            deltas[old_key][0] -= old_sec
+            deltas[old_key][1] -= 1
+        if new_key is not None:
+            deltas[new_key][0] += new_sec
+            deltas[new_key][1] += 1
+
+    skip_users = deleted_user_ids(session) | changes.rebuild_user_ids
+    deltas = {key: d for key, d in deltas.items() if key[1] not in skip_users and (d[0] or d[1])}
+    return deltas, changes.rebuild_user_ids - deleted_user_ids(session)
+
+
+def _apply_delta(connection, key: Key, seconds: int, count: int, now: datetime) -> None:
+    rollup, _ = _tables()
+    update = (
+        rollup.update()
+        .where(_key_clause(rollup, key))
+        .values(
+            total_seconds=rollup.c.total_seconds + seconds,
+            entry_count=rollup.c.entry_count + count,
+            updated_at=now,
+        )
+    )
+    if connection.execute(update).rowcount == 0:
+        if count <= 0:
+            # Nothing stored for this key (rollup out of date); never store negative totals
+            return
+        try:
+            with connection.begin_nested():
+                connection.execute(
+                    rollup.insert().values(
+                        **dict(zip(_KEY_COLUMNS, key)), total_seconds=seconds, entry_count=count, updated_at=now
+                    )
+                )
+            return
+        except IntegrityError:
+            # Another transaction created the row first
+            connection.execute(update)
+    if count < 0:
+        connection.execute(rollup.delete().where(_key_clause(rollup, key), rollup.c.entry_count <= 0))
+
+
+def receive_after_flush(session, flush_context):
+    """Apply daily rollup deltas for the TimeEntry rows written in this flush."""
+    deltas, rebuild_user_ids = _collect_deltas(session, flush_context)
+    if not deltas and not rebuild_user_ids:
+        return
+    connection = session.connection()
+    now = datetime.utcnow()
+    for key, (seconds, count) in deltas.items():
+        _apply_delta(connection, key, seconds, count, now)
+    if rebuild_user_ids:
+        rebuild_time_daily_rollup(user_ids=rebuild_user_ids, connection=connection)
+
+
+def _raw_aggregate(user_ids=None, start_day: Optional[date] = None, end_day: Optional[date] = None):
+    """SELECT of per-key totals computed from ``time_entries``"""
+    _, entries = _tables()
+    day = sa.func.date(entries.c.start_time)
+    key_columns = [
+        day,
+        entries.c.user_id,
+        sa.func.coalesce(entries.c.project_id, 0),
+        sa.func.coalesce(entries.c.task_id, 0),
+        sa.func.coalesce(entries.c.client_id, 0),
+        entries.c.billable,
+    ]
+    query = (
+        sa.select(
+            *key_columns,
+            sa.func.coalesce(sa.func.sum(entries.c.duration_seconds), 0),
+            sa.func.count(entries.c.id),
+        )
+        .where(entries.c.end_time.isnot(None))
+        .group_by(*key_columns)
+    )
+    if user_ids is not None:
+        query = query.where(entries.c.user_id.in_(list(user_ids)))
+    if start_day is not None:
+        query = query.where(entries.c.start_time >= datetime.combine(start_day, datetime.min.time()))
+    if end_day is not None:
+        query = query.where(entries.c.start_time < datetime.combine(end_day + timedelta(days=1), datetime.min.time()))
+    return query
+
+
+def _rollup_filter(query, rollup, user_ids=None, start_day=None, end_day=None):
+    if user_ids is not None:
+        query = query.where(rollup.c.user_id.in_(list(user_ids)))
+    if start_day is not None:
+        query = query.where(rollup.c.day >= start_day)
+    if end_day is not None:
+        query = query.where(rollup.c.day <= end_day)
+    return query
+
+
+def rebuild_time_daily_rollup(
+    user_ids: Optional[Iterable[int]] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    connection=None,
+) -> int:
+    """Recompute rollup rows from ``time_entries`` for the given users/days (default: everything).
+
+    Returns:
+        Number of rollup rows written
+    """
+    from app import db
+
+    rollup, _ = _tables()
+    connection = connection if connection is not None else db.session.connection()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+
+    connection.execute(_rollup_filter(rollup.delete(), rollup, user_ids, start_day, end_day))
+    rows = connection.execute(_raw_aggregate(user_ids, start_day, end_day)).all()
+    now = datetime.utcnow()
+    values = [
+        {
+            "day": _as_date(row[0]),
+            "user_id": row[1],
+            "project_id": row[2],
+            "task_id": row[3],
+            "client_id": row[4],
+            "billable": bool(row[5]),
+            "total_seconds": int(row[6] or 0),
+            "entry_count": int(row[7] or 0),
+            "updated_at": now,
+        }
+        for row in rows
+    ]
+    if values:
+        connection.execute(rollup.insert(), values)
+    return len(values)
+
+
+def verify_time_daily_rollup(
+    user_ids: Optional[Iterable[int]] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """Compare the rollup against ``time_entries``.
+
+    Returns:
+        One dict per mismatching key with the expected and stored totals
+    """
+    from app import db
+
+    rollup, _ = _tables()
+    connection = db.session.connection()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+
+    expected: Dict[tuple, Tuple[int, int]] = {}
+    for row in connection.execute(_raw_aggregate(user_ids, start_day, end_day)):
+        key = (_as_date(row[0]), row[1], row[2], row[3], row[4], bool(row[5]))
+        expected[key] = (int(row[6] or 0), int(row[7] or 0))
+
+    stored: Dict[tuple, Tuple[int, int]] = {}
+    query = sa.select(*[rollup.c[name] for name in _KEY_COLUMNS], rollup.c.total_seconds, rollup.c.entry_count)
+    for row in connection.execute(_rollup_filter(query, rollup, user_ids, start_day, end_day)):
+        key = (_as_date(row[0]), row[1], row[2], row[3], row[4], bool(row[5]))
+        stored[key] = (int(row[6] or 0), int(row[7] or 0))
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], k[1:])):
+        if expected.get(key) != stored.get(key):
+            mismatches.append(
+                {
+                    **dict(zip(_KEY_COLUMNS, key)),
+                    "expected": expected.get(key, (0, 0)),
+                    "stored": stored.get(key, (0, 0)),
+                }
+            )
+    return mismatches
+
+
+# ---------------------------------------------------------------------- reads
+
+
+def _filtered(query, user_id=None, start_day=None, end_day=None, project_id=None, client_id=None, billable_only=False):
+    from app.models import TimeDailyRollup
+
+    if user_id:
+        query = query.filter(TimeDailyRollup.user_id == user_id)
+    if start_day is not None:
+        query = query.filter(TimeDailyRollup.day >= start_day)
+    if end_day is not None:
+        query = query.filter(TimeDailyRollup.day <= end_day)
+    if project_id:
+        query = query.filter(TimeDailyRollup.project_id == project_id)
+    if client_id:
+        query = query.filter(TimeDailyRollup.client_id == client_id)
+    if billable_only:
+        query = query.filter(TimeDailyRollup.billable.is_(True))
+    return query
+
+
+def seconds_by_day(
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+) -> Dict[date, Dict[str, int]]:
+    """Per-day ``{"seconds", "billable_seconds", "entries"}`` for completed entries"""
+    from app import db
+    from app.models import TimeDailyRollup
+
+    query = db.session.query(
+        TimeDailyRollup.day,
+        sa.func.coalesce(sa.func.sum(TimeDailyRollup.total_seconds), 0),
+        sa.func.coalesce(
+            sa.func.sum(sa.case((TimeDailyRollup.billable.is_(True), TimeDailyRollup.total_seconds), else_=0)),
+            0,
+        ),
+        sa.func.coalesce(sa.func.sum(TimeDailyRollup.entry_count), 0),
+    )
+    query = _filtered(query, user_id=user_id, start_day=start_day, end_day=end_day, project_id=project_id)
+    out: Dict[date, Dict[str, int]] = {}
+    for day, seconds, billable_seconds, entries in query.group_by(TimeDailyRollup.day):
+        out[_as_date(day)] = {
+            "seconds": int(seconds or 0),
+            "billable_seconds": int(billable_seconds or 0),
+            "entries": int(entries or 0),
+        }
+    return out
+
+
+def total_seconds(
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    billable_only: bool = False,
+) -> int:
+    """Tracked seconds of completed entries matching the filters"""
+    from app import db
+    from app.models import TimeDailyRollup
+
+    query = db.session.query(sa.func.coalesce(sa.func.sum(TimeDailyRollup.total_seconds), 0))
+    query = _filtered(
+        query,
+        user_id=user_id,
+        start_day=start_day,
+        end_day=end_day,
+        project_id=project_id,
+        client_id=client_id,
+        billable_only=billable_only,
+    )
+    return int(query.scalar() or 0)
+
+
+def seconds_by_project(
+    start_day: Optional[date] = None, end_day: Optional[date] = None, user_id: Optional[int] = None
+) -> Dict[int, int]:
+    """Tracked seconds per project id (entries without a project are omitted)"""
+    from app import db
+    from app.models import TimeDailyRollup
+
+    query = db.session.query(TimeDailyRollup.project_id, sa.func.sum(TimeDailyRollup.total_seconds)).filter(
+        TimeDailyRollup.project_id != 0
+    )
+    query = _filtered(query, user_id=user_id, start_day=start_day, end_day=end_day)
+    return {int(pid): int(sec or 0) for pid, sec in query.group_by(TimeDailyRollup.project_id)}
@@ -0,0 +1,166 @@
+"""
+Before/after state of the ``TimeEntry`` rows written by a flush.
+
+Rollups maintained from flush events (``user_time_stats``,
+``time_daily_rollup``, ``timer_state``) need the values an entry had before the flush as well
+as after it. Attribute history normally provides the old values; for
+entries modified or deleted while their attributes were expired (so no old
+value was ever loaded) ``receive_before_flush`` reads the stored row while
+the database still holds it.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import attributes
+
+logger = logging.getLogger(__name__)
+
+TRACKED_ATTRS = (
+    "user_id",
+    "project_id",
+    "client_id",
+    "task_id",
+    "billable",
+    "start_time",
+    "end_time",
+    "duration_seconds",
+    "paused_at",
+    "break_seconds",
+)
+
+_SESSION_INFO_KEY = "time_entry_old_state"
+_NO_VALUE = object()
+
+State = Dict[str, Any]
+
+
+def _history_value(obj, key):
+    hist = attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    if hist.added:
+        return _NO_VALUE
+    return obj.__dict__.get(key, _NO_VALUE)
+
+
+def _history_state(obj) -> Optional[State]:
+    state = {key: _history_value(obj, key) for key in TRACKED_ATTRS}
+    if any(value is _NO_VALUE for value in state.values()):
+        return None
+    return state
+
+
+def current_state(obj) -> State:
+    return {key: getattr(obj, key) for key in TRACKED_ATTRS}
+
+
+def receive_before_flush(session, flush_context, instances):
+    """Load stored values for dirty/deleted entries whose history lacks them."""
+    from app.models import TimeEntry
+
+    missing = [
+        obj
+        for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, TimeEntry) and obj.id is not None and _history_state(obj) is None
+    ]
+    if not missing:
+        return
+    try:
+        table = TimeEntry.__table__
+        rows = session.connection().execute(
+            sa.select(table.c.id, *[table.c[key] for key in TRACKED_ATTRS]).where(
+                table.c.id.in_([obj.id for obj in missing])
+            )
+        )
+        stored = session.info.setdefault(_SESSION_INFO_KEY, {})
+        for row in rows:
+            stored[row.id] = {key: getattr(row, key) for key in TRACKED_ATTRS}
+    except Exception as e:
+        logger.debug(f"Could not load stored time entry state: {e}")
+
+
+def old_state(session, obj) -> Optional[State]:
+    """Tracked values of ``obj`` before the current flush, or None if unknown"""
+    state = _history_state(obj)
+    if state is None:
+        state = session.info.get(_SESSION_INFO_KEY, {}).get(obj.id)
+    return state
+
+
+class TimeEntryChanges:
+    """Tracked-attribute changes of the TimeEntry rows written by one flush.
+
+    ``changes`` holds ``(old, new)`` state pairs; ``old`` is None for inserts
+    and ``new`` is None for deletes. Entries whose previous state could not be
+    determined are not listed; their users are in ``rebuild_user_ids`` so the
+    rollups can recompute those users from ``time_entries`` instead.
+    """
+
+    __slots__ = ("changes", "rebuild_user_ids")
+
+    def __init__(self):
+        self.changes: List[Tuple[Optional[State], Optional[State]]] = []
+        self.rebuild_user_ids: Set[int] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.changes or self.rebuild_user_ids)
+
+    def _unknown(self, obj, new: Optional[State]) -> None:
+        logger.warning(f"Previous state of time entry {obj.id} is unknown; rebuilding its user's rollups")
+        for user_id in (obj.__dict__.get("user_id"), new["user_id"] if new else None):
+            if user_id is not None:
+                self.rebuild_user_ids.add(user_id)
+
+
+def collect_time_entry_changes(session, flush_context) -> TimeEntryChanges:
+    """Changes written by the current flush (call from ``after_flush``; memoized per flush)"""
+    memo = flush_context.attributes.get(_SESSION_INFO_KEY)
+    if memo is None:
+        memo = flush_context.attributes[_SESSION_INFO_KEY] = _collect(session)
+    return memo
+
+
+def _collect(session) -> TimeEntryChanges:
+    from app.models import TimeEntry
+
+    result = TimeEntryChanges()
+    for obj in session.new:
+        if isinstance(obj, TimeEntry):
+            result.changes.append((None, current_state(obj)))
+
+    for obj in session.deleted:
+        if isinstance(obj, TimeEntry):
+            old = old_state(session, obj)
+            if old is None:
+                result._unknown(obj, None)
+            else:
+                result.changes.append((old, None))
+
+    for obj in session.dirty:
+        if not isinstance(obj, TimeEntry) or obj in session.deleted:
+            continue
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        new = current_state(obj)
+        old = old_state(session, obj)
+        if old is None:
+            result._unknown(obj, new)
+        elif old != new:
+            result.changes.append((old, new))
+    return result
+
+
+def deleted_user_ids(session) -> set:
+    """IDs of users deleted in the current flush (their rollup rows cascade away)"""
+    from app.models import User
+
+    return {obj.id for obj in session.deleted if isinstance(obj, User)}
+
+
+def receive_after_flush_postexec(session, flush_context):
+    """Drop the stored states loaded by ``receive_before_flush``."""
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -0,0 +1,185 @@
+"""
+Push updates and ETags for the running-timer state.
+
+``receive_after_flush`` compares the ``TimeEntry`` rows written by a flush
+with their previous state (``app.utils.time_entry_changes``). For every user
+whose active timer was started, stopped, paused, resumed or edited it increments
+``user_timer_states.version`` on the flush's own connection. Once the
+transaction commits, ``receive_after_commit`` emits ``timer_state``
+(``{"event", "version", "timer_id"}``) to the user's Socket.IO room. Every code
+path that changes a timer is covered, including API v1, kiosk and scheduled
+stops.
+
+``timer_status_response`` serves the status endpoints: the version is the
+ETag, and a request whose ``If-None-Match`` matches gets ``304`` without the
+active entry being loaded. Clients poll this way only while the socket is
+down.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import sqlalchemy as sa
+from flask import jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+
+from app.utils.time_entry_changes import State, current_state, deleted_user_ids, old_state
+
+logger = logging.getLogger(__name__)
+
+TIMER_STATE_EVENT = "timer_state"
+
+_SESSION_INFO_KEY = "timer_state_events"
+
+Event = Tuple[str, Optional[int]]
+
+
+def _table():
+    from app.models import UserTimerState
+
+    return UserTimerState.__table__
+
+
+def _is_active(state: Optional[State]) -> bool:
+    return state is not None and state["end_time"] is None
+
+
+def timer_event(old: Optional[State], new: Optional[State]) -> Optional[str]:
+    """Classify one entry change as seen by its (new) owner; None if no timer was involved"""
+    if not _is_active(old) and not _is_active(new):
+        return None
+    if not _is_active(old):
+        return "started"
+    if not _is_active(new):
+        return "stopped"
+    if old["paused_at"] is None and new["paused_at"] is not None:
+        return "paused"
+    if old["paused_at"] is not None and new["paused_at"] is None:
+        return "resumed"
+    return "updated"
+
+
+def _collect_events(session) -> Dict[int, Event]:
+    from app.models import TimeEntry
+
+    events: Dict[int, Event] = {}
+
+    def record(obj, old: Optional[State], new: Optional[State]) -> None:
+        event = timer_event(old, new)
+        if event is not None and new is not None:
+            events[new["user_id"]] = (event, obj.id)
+        if _is_active(old) and (new is None or old["user_id"] != new["user_id"]):
+            events[old["user_id"]] = ("stopped", obj.id)
+
+    for obj in session.new:
+        if isinstance(obj, TimeEntry):
+            record(obj, None, current_state(obj))
+    for obj in session.deleted:
+        if isinstance(obj, TimeEntry):
+            old = old_state(session, obj)
+            if old is None:
+                events.setdefault(obj.__dict__.get("user_id"), ("updated", obj.id))
+            else:
+                record(obj, old, None)
+    for obj in session.dirty:
+        if not isinstance(obj, TimeEntry) or obj in session.deleted:
+            continue
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        new = current_state(obj)
+        old = old_state(session, obj)
+        if old is None:
+            events.setdefault(new["user_id"], ("updated", obj.id))
+        elif old != new:
+            record(obj, old, new)
+
+    for user_id in deleted_user_ids(session) | {None}:
+        events.pop(user_id, None)
+    return events
+
+
+def _bump_versions(connection, user_ids: Iterable[int]) -> Dict[int, int]:
+    """Increment the version of each user (creating missing rows); return the new versions"""
+    table = _table()
+    user_ids = sorted(set(user_ids))
+    now = datetime.utcnow()
+    connection.execute(
+        table.update().where(table.c.user_id.in_(user_ids)).values(version=table.c.version + 1, updated_at=now)
+    )
+    existing = {
+        row.user_id for row in connection.execute(sa.select(table.c.user_id).where(table.c.user_id.in_(user_ids)))
+    }
+    for user_id in user_ids:
+        if user_id in existing:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(table.insert().values(user_id=user_id, version=1, updated_at=now))
+        except IntegrityError:
+            # Created by a concurrent transaction since our UPDATE
+            connection.execute(
+                table.update().where(table.c.user_id == user_id).values(version=table.c.version + 1, updated_at=now)
+            )
+    rows = connection.execute(sa.select(table.c.user_id, table.c.version).where(table.c.user_id.in_(user_ids)))
+    return {row.user_id: row.version for row in rows}
+
+
+def receive_after_flush(session, flush_context):
+    """Bump timer-state versions for the active timers changed in this flush."""
+    events = _collect_events(session)
+    if not events:
+        return
+    versions = _bump_versions(session.connection(), events.keys())
+    pending = session.info.setdefault(_SESSION_INFO_KEY, {})
+    for user_id, (event, timer_id) in events.items():
+        pending[user_id] = {"event": event, "version": versions.get(user_id, 0), "timer_id": timer_id}
+
+
+def receive_after_commit(session):
+    """Push ``timer_state`` to each affected user's room once their change is committed."""
+    pending = session.info.pop(_SESSION_INFO_KEY, None)
+    if not pending:
+        return
+    try:
+        from app import socketio
+        from app.utils.realtime import user_room
+
+        for user_id, payload in pending.items():
+            socketio.emit(TIMER_STATE_EVENT, payload, room=user_room(user_id))
+    except Exception as e:
+        logger.debug(f"Timer state emit skipped: {e}")
+
+
+def receive_after_transaction_end(session, transaction):
+    """Drop events of a transaction that rolled back."""
+    if transaction.parent is None:
+        session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def get_timer_state_version(user_id: int) -> int:
+    from app import db
+
+    table = _table()
+    version = db.session.execute(sa.select(table.c.version).where(table.c.user_id == user_id)).scalar()
+    return int(version or 0)
+
+
+def timer_status_response(user_id: int, build: Callable[[], Dict[str, Any]]):
+    """JSON timer status with the user's timer-state version as ETag.
+
+    ``build`` is only called when the client's ``If-None-Match`` is stale. The
+    version is read first, so a change racing with ``build`` at worst makes the
+    next poll return 200 again.
+    """
+    version = get_timer_state_version(user_id)
+    etag = f"timer-{user_id}-{version}"
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        payload = build()
+        payload["version"] = version
+        response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -32,11 +32,11 @@ def _get_system_date_format_key():
         if not has_app_context():
             return _DEFAULT_DATE_FORMAT_KEY
         from app import db
-        from app.models import Settings
+        from app.utils.settings_cache import get_settings_snapshot
 
         try:
             if db.session.is_active and not getattr(db.session, "_flushing", False):
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 if settings:
                     val = getattr(settings, "date_format", None)
                     if val and val in USER_DATE_FORMATS:
@@ -56,11 +56,11 @@ def _get_system_time_format_key():
         if not has_app_context():
             return _DEFAULT_TIME_FORMAT_KEY
         from app import db
-        from app.models import Settings
+        from app.utils.settings_cache import get_settings_snapshot
 
         try:
             if db.session.is_active and not getattr(db.session, "_flushing", False):
-                settings = Settings.get_settings()
+                settings = get_settings_snapshot()
                 if settings:
                     val = getattr(settings, "time_format", None)
                     if val and val in USER_TIME_FORMATS:
@@ -170,13 +170,13 @@ def get_app_timezone():
 
         # Try to get timezone from database settings first
         from app import db
-        from app.models import Settings
+        from app.utils.settings_cache import get_settings_snapshot
 
         # Check if we have a database connection
         try:
             if db.session.is_active and not getattr(db.session, "_flushing", False):
                 try:
-                    settings = Settings.get_settings()
+                    settings = get_settings_snapshot()
                     if settings and settings.timezone:
                         return settings.timezone
                 except Exception as e:
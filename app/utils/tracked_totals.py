@@ -0,0 +1,298 @@
+"""
+Stored tracked-time and cost totals on ``Task`` and ``Project``.
+
+``Task.total_hours``, ``Project.total_hours``, ``Project.total_costs`` and the
+properties built on them read stored columns instead of aggregating on every
+access (a kanban board renders one progress bar per card):
+
+- ``tasks.tracked_seconds`` / ``billable_seconds`` and the same columns on
+  ``projects`` hold the duration of completed time entries;
+- ``projects.costs_total`` / ``billable_costs_total`` hold ``ProjectCost``
+  amounts.
+
+``receive_after_flush`` applies the difference made by the flushed
+``TimeEntry`` rows with one ``UPDATE`` per task and project on the flush's own
+connection, so the totals commit or roll back with the entries. Changed
+``ProjectCost`` rows recompute their projects' cost totals. Entries whose
+previous state is unknown recompute the totals of their current task and
+project. ``receive_after_flush_postexec`` expires the counters on loaded
+instances so code running before the commit reads the new values.
+
+Bulk ``Query.update()``/``Query.delete()`` bypass the ORM flush; run
+``flask rebuild-tracked-totals`` after such maintenance and
+``flask verify-tracked-totals`` to check the stored values.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import attributes
+from sqlalchemy.orm.util import identity_key
+
+from app.utils.time_entry_changes import collect_time_entry_changes, old_state
+
+logger = logging.getLogger(__name__)
+
+_SESSION_INFO_KEY = "tracked_totals"
+_OLD_COST_KEY = "tracked_totals_old_cost_projects"
+_SECONDS_ATTRS = ("tracked_seconds", "billable_seconds")
+_COST_ATTRS = ("costs_total", "billable_costs_total")
+
+
+def _tables():
+    from app.models import Project, ProjectCost, Task, TimeEntry
+
+    return Task.__table__, Project.__table__, TimeEntry.__table__, ProjectCost.__table__
+
+
+def _add(deltas: Dict[int, List[int]], key, state, sign: int) -> None:
+    if key is None:
+        return
+    seconds = sign * int(state["duration_seconds"] or 0)
+    delta = deltas.setdefault(key, [0, 0])
+    delta[0] += seconds
+    if state["billable"]:
+        delta[1] += seconds
+
+
+def _entry_deltas(session, flush_context):
+    """Per-task and per-project ``[seconds, billable_seconds]`` changes, plus IDs to recompute"""
+    changes = collect_time_entry_changes(session, flush_context)
+    tasks: Dict[int, List[int]] = {}
+    projects: Dict[int, List[int]] = {}
+    for old, new in changes.changes:
+        for state, sign in ((old, -1), (new, +1)):
+            if state is None or state["end_time"] is None:
+                continue
+            _add(tasks, state["task_id"], state, sign)
+            _add(projects, state["project_id"], state, sign)
+
+    recompute_tasks: Set[int] = set()
+    recompute_projects: Set[int] = set()
+    if changes.rebuild_user_ids:
+        from app.models import TimeEntry
+
+        # Entries whose previous state is unknown: recompute where they are now
+        for obj in list(session.dirty) + list(session.deleted):
+            if isinstance(obj, TimeEntry) and old_state(session, obj) is None:
+                if obj.__dict__.get("task_id") is not None:
+                    recompute_tasks.add(obj.__dict__["task_id"])
+                if obj.__dict__.get("project_id") is not None:
+                    recompute_projects.add(obj.__dict__["project_id"])
+
+    tasks = {key: d for key, d in tasks.items() if any(d) and key not in recompute_tasks}
+    projects = {key: d for key, d in projects.items() if any(d) and key not in recompute_projects}
+    return tasks, projects, recompute_tasks, recompute_projects
+
+
+def receive_before_flush(session, flush_context, instances):
+    """Remember the stored project of dirty/deleted costs whose history lacks it."""
+    from app.models import ProjectCost
+
+    session.info.pop(_OLD_COST_KEY, None)
+    missing = []
+    for obj in list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, ProjectCost) or sa.inspect(obj).identity is None:
+            continue
+        hist = attributes.get_history(obj, "project_id", passive=attributes.PASSIVE_NO_INITIALIZE)
+        if not (hist.deleted or hist.unchanged):
+            missing.append(sa.inspect(obj).identity[0])
+    if not missing:
+        return
+    try:
+        costs = _tables()[3]
+        rows = session.connection().execute(sa.select(costs.c.project_id).where(costs.c.id.in_(missing)))
+        session.info[_OLD_COST_KEY] = {row.project_id for row in rows}
+    except Exception as e:
+        logger.debug(f"Could not load stored project cost state: {e}")
+
+
+def _cost_projects(session) -> Set[int]:
+    """Projects whose cost totals are affected by the flushed ``ProjectCost`` rows"""
+    from app.models import ProjectCost
+
+    project_ids: Set[int] = set(session.info.pop(_OLD_COST_KEY, ()))
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, ProjectCost):
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        hist = attributes.get_history(obj, "project_id", passive=attributes.PASSIVE_NO_INITIALIZE)
+        for values in (hist.added, hist.unchanged, hist.deleted):
+            project_ids.update(values or ())
+        if obj.__dict__.get("project_id") is not None:
+            project_ids.add(obj.__dict__["project_id"])
+    project_ids.discard(None)
+    return project_ids
+
+
+def _seconds_subqueries(entries, key_column, target_column):
+    completed = sa.and_(key_column == target_column, entries.c.end_time.isnot(None))
+    total = sa.select(sa.func.coalesce(sa.func.sum(entries.c.duration_seconds), 0)).where(completed)
+    billable = total.where(entries.c.billable.is_(sa.true()))
+    return total.scalar_subquery(), billable.scalar_subquery()
+
+
+def _cost_subqueries(costs, target_column):
+    total = sa.select(sa.func.coalesce(sa.func.sum(costs.c.amount), 0)).where(costs.c.project_id == target_column)
+    billable = total.where(costs.c.billable.is_(sa.true()))
+    return total.scalar_subquery(), billable.scalar_subquery()
+
+
+def _recompute_seconds(connection, table, ids: Optional[Iterable[int]]) -> int:
+    entries = _tables()[2]
+    key_column = entries.c.task_id if table.name == "tasks" else entries.c.project_id
+    total, billable = _seconds_subqueries(entries, key_column, table.c.id)
+    update = table.update().values(tracked_seconds=total, billable_seconds=billable, updated_at=table.c.updated_at)
+    if ids is not None:
+        update = update.where(table.c.id.in_(sorted(ids)))
+    return max(connection.execute(update).rowcount or 0, 0)
+
+
+def _recompute_costs(connection, ids: Optional[Iterable[int]]) -> int:
+    _, projects, _, costs = _tables()
+    total, billable = _cost_subqueries(costs, projects.c.id)
+    update = projects.update().values(
+        costs_total=total, billable_costs_total=billable, updated_at=projects.c.updated_at
+    )
+    if ids is not None:
+        update = update.where(projects.c.id.in_(sorted(ids)))
+    return max(connection.execute(update).rowcount or 0, 0)
+
+
+def _apply_deltas(connection, table, deltas: Dict[int, List[int]]) -> None:
+    for key, (seconds, billable) in deltas.items():
+        connection.execute(
+            table.update()
+            .where(table.c.id == key)
+            .values(
+                tracked_seconds=table.c.tracked_seconds + seconds,
+                billable_seconds=table.c.billable_seconds + billable,
+                # Keep updated_at: tracked time is not an edit of the task/project itself
+                updated_at=table.c.updated_at,
+            )
+        )
+
+
+def receive_after_flush(session, flush_context):
+    """Apply tracked-time and cost deltas for the rows written in this flush."""
+    task_deltas, project_deltas, recompute_tasks, recompute_projects = _entry_deltas(session, flush_context)
+    cost_projects = _cost_projects(session)
+    if not (task_deltas or project_deltas or recompute_tasks or recompute_projects or cost_projects):
+        return
+
+    tasks, projects, _, _ = _tables()
+    connection = session.connection()
+    _apply_deltas(connection, tasks, task_deltas)
+    _apply_deltas(connection, projects, project_deltas)
+    if recompute_tasks:
+        _recompute_seconds(connection, tasks, recompute_tasks)
+    if recompute_projects:
+        _recompute_seconds(connection, projects, recompute_projects)
+    if cost_projects:
+        _recompute_costs(connection, cost_projects)
+
+    touched = session.info.setdefault(_SESSION_INFO_KEY, {})
+    for key in set(task_deltas) | recompute_tasks:
+        touched.setdefault(("tasks", key), set()).update(_SECONDS_ATTRS)
+    for key in set(project_deltas) | recompute_projects:
+        touched.setdefault(("projects", key), set()).update(_SECONDS_ATTRS)
+    for key in cost_projects:
+        touched.setdefault(("projects", key), set()).update(_COST_ATTRS)
+
+
+def receive_after_flush_postexec(session, flush_context):
+    """Expire the updated counters on loaded Task/Project instances."""
+    touched = session.info.pop(_SESSION_INFO_KEY, None)
+    if not touched:
+        return
+    from app.models import Project, Task
+
+    models = {"tasks": Task, "projects": Project}
+    for (table_name, key), attrs in touched.items():
+        obj = session.identity_map.get(identity_key(models[table_name], key))
+        if obj is not None and obj not in session.deleted:
+            session.expire(obj, sorted(attrs))
+
+
+def rebuild_tracked_totals(
+    task_ids: Optional[Iterable[int]] = None, project_ids: Optional[Iterable[int]] = None, connection=None
+) -> Tuple[int, int]:
+    """Recompute the stored totals from ``time_entries`` and ``project_costs``.
+
+    Args:
+        task_ids: Tasks to rebuild (default: all, unless only ``project_ids`` is given)
+        project_ids: Projects to rebuild (default: all, unless only ``task_ids`` is given)
+        connection: Connection to use (default: the current session's)
+
+    Returns:
+        ``(tasks_updated, projects_updated)``
+    """
+    from app import db
+
+    tasks, projects, _, _ = _tables()
+    connection = connection if connection is not None else db.session.connection()
+    if task_ids is None and project_ids is None:
+        task_count = _recompute_seconds(connection, tasks, None)
+        project_count = _recompute_seconds(connection, projects, None)
+        _recompute_costs(connection, None)
+        return task_count, project_count
+
+    task_count = _recompute_seconds(connection, tasks, task_ids) if task_ids else 0
+    project_count = 0
+    if project_ids:
+        project_count = _recompute_seconds(connection, projects, project_ids)
+        _recompute_costs(connection, project_ids)
+    return task_count, project_count
+
+
+def _normalize(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+
+def verify_tracked_totals(task_ids: Optional[Iterable[int]] = None, project_ids: Optional[Iterable[int]] = None):
+    """Compare the stored totals with ``time_entries`` and ``project_costs``.
+
+    Returns:
+        List of mismatches, each a dict with ``kind`` ("task"/"project"), ``id``,
+        ``column``, ``expected`` and ``stored``
+    """
+    from app import db
+
+    tasks, projects, entries, costs = _tables()
+    connection = db.session.connection()
+    mismatches = []
+
+    checks = [
+        (
+            "task",
+            tasks,
+            task_ids,
+            list(zip(_SECONDS_ATTRS, _seconds_subqueries(entries, entries.c.task_id, tasks.c.id))),
+        ),
+        (
+            "project",
+            projects,
+            project_ids,
+            list(zip(_SECONDS_ATTRS, _seconds_subqueries(entries, entries.c.project_id, projects.c.id)))
+            + list(zip(_COST_ATTRS, _cost_subqueries(costs, projects.c.id))),
+        ),
+    ]
+    for kind, table, ids, columns in checks:
+        query = sa.select(table.c.id, *[table.c[name] for name, _ in columns], *[expr for _, expr in columns])
+        if ids is not None:
+            ids = list(ids)
+            if not ids:
+                continue
+            query = query.where(table.c.id.in_(ids))
+        for row in connection.execute(query.order_by(table.c.id)):
+            stored_values = row[1 : 1 + len(columns)]
+            expected_values = row[1 + len(columns) :]
+            for (name, _), stored, expected in zip(columns, stored_values, expected_values):
+                if _normalize(stored) != _normalize(expected):
+                    mismatches.append(
+                        {"kind": kind, "id": row[0], "column": name, "expected": expected, "stored": stored}
+                    )
+    return mismatches
@@ -0,0 +1,437 @@
+"""
+Incremental maintenance of the ``user_project_access`` table.
+
+A user reaches a project through their time entries on it, through tasks of
+the project assigned to them, or through ``user_clients`` (the project's
+client is assigned to them). ``receive_after_flush`` looks at the rows a flush
+wrote and updates the affected ``(user, project)`` pairs on the flush's own
+connection, so the table commits or rolls back together with the data:
+
+- time entries apply a ``+1``/``-1`` delta to ``entry_count`` per pair;
+- tasks (new, deleted, reassigned, moved) recompute ``task_count`` of the old
+  and new pairs;
+- ``UserClient`` rows and projects changing client recompute ``via_client``
+  of the pairs of that client's projects;
+- a pair without a row gets one built from the source tables (which already
+  contain the flushed changes); rows with nothing left are deleted.
+
+Bulk ``Query.update()``/``Query.delete()`` bypass the ORM flush; call
+``rebuild_user_project_access`` for the users involved (the admin user form
+does so for its ``user_clients`` sync) or run
+``flask rebuild-user-project-access`` after such maintenance.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import attributes
+
+from app.utils.time_entry_changes import collect_time_entry_changes, deleted_user_ids
+
+logger = logging.getLogger(__name__)
+
+_SESSION_INFO_KEY = "user_project_access_old"
+_NO_VALUE = object()
+_TASK_ATTRS = ("assigned_to", "project_id")
+
+Pair = Tuple[int, int]
+
+
+def _tables():
+    from app.models import Project, Task, TimeEntry, UserClient, UserProjectAccess
+
+    return (
+        UserProjectAccess.__table__,
+        TimeEntry.__table__,
+        Task.__table__,
+        UserClient.__table__,
+        Project.__table__,
+    )
+
+
+def _history_value(obj, key):
+    hist = attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    if hist.added:
+        return _NO_VALUE
+    return obj.__dict__.get(key, _NO_VALUE)
+
+
+def _watched(session):
+    """Dirty/deleted tasks and projects whose previous values matter"""
+    from app.models import Project, Task
+
+    for obj in list(session.dirty) + list(session.deleted):
+        if sa.inspect(obj).identity is None:
+            continue
+        if isinstance(obj, Task):
+            yield obj, _TASK_ATTRS
+        elif isinstance(obj, Project):
+            yield obj, ("client_id",)
+
+
+def receive_before_flush(session, flush_context, instances):
+    """Load stored values for dirty/deleted tasks and projects whose history lacks them."""
+    session.info.pop(_SESSION_INFO_KEY, None)
+    missing = [
+        (obj, keys) for obj, keys in _watched(session) if any(_history_value(obj, key) is _NO_VALUE for key in keys)
+    ]
+    if not missing:
+        return
+    try:
+        stored = session.info.setdefault(_SESSION_INFO_KEY, {})
+        by_table: Dict[sa.Table, Tuple[tuple, list]] = {}
+        for obj, keys in missing:
+            by_table.setdefault(obj.__table__, (keys, []))[1].append(sa.inspect(obj).identity[0])
+        connection = session.connection()
+        for table, (keys, ids) in by_table.items():
+            rows = connection.execute(sa.select(table.c.id, *[table.c[key] for key in keys]).where(table.c.id.in_(ids)))
+            for row in rows:
+                stored[(table.name, row.id)] = tuple(getattr(row, key) for key in keys)
+    except Exception as e:
+        logger.debug(f"Could not load stored task/project state: {e}")
+
+
+def _old_values(session, obj, keys) -> Optional[tuple]:
+    values = tuple(_history_value(obj, key) for key in keys)
+    if any(value is _NO_VALUE for value in values):
+        return session.info.get(_SESSION_INFO_KEY, {}).get((obj.__table__.name, sa.inspect(obj).identity[0]))
+    return values
+
+
+class _Changes:
+    __slots__ = ("entry_deltas", "task_pairs", "client_links", "project_clients", "rebuild_user_ids")
+
+    def __init__(self):
+        self.entry_deltas: Dict[Pair, int] = {}
+        self.task_pairs: Set[Pair] = set()
+        # (user_id, client_id) from UserClient rows; (project_id, client_id) from projects
+        self.client_links: Set[Tuple[int, int]] = set()
+        self.project_clients: Set[Tuple[int, int]] = set()
+        self.rebuild_user_ids: Set[int] = set()
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.entry_deltas or self.task_pairs or self.client_links or self.project_clients or self.rebuild_user_ids
+        )
+
+    def entry(self, state, sign: int) -> None:
+        if state is None or state["user_id"] is None or state["project_id"] is None:
+            return
+        pair = (state["user_id"], state["project_id"])
+        self.entry_deltas[pair] = self.entry_deltas.get(pair, 0) + sign
+
+    def unknown_task(self, obj) -> None:
+        logger.warning(f"Previous state of task {obj.id} is unknown; rebuilding its assignee's project access")
+        if obj.__dict__.get("assigned_to") is not None:
+            self.rebuild_user_ids.add(obj.__dict__["assigned_to"])
+
+    def task(self, values) -> None:
+        if values is not None and values[0] is not None and values[1] is not None:
+            self.task_pairs.add((values[0], values[1]))
+
+
+def _collect(session, flush_context) -> Tuple[_Changes, Set[int]]:
+    from app.models import Project, Task, UserClient
+
+    changes = _Changes()
+
+    entry_changes = collect_time_entry_changes(session, flush_context)
+    for old, new in entry_changes.changes:
+        changes.entry(old, -1)
+        changes.entry(new, +1)
+    changes.rebuild_user_ids |= entry_changes.rebuild_user_ids
+
+    deleted_project_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.task((obj.assigned_to, obj.project_id))
+        elif isinstance(obj, UserClient):
+            changes.client_links.add((obj.user_id, obj.client_id))
+        elif isinstance(obj, Project) and obj.client_id is not None:
+            changes.project_clients.add((obj.id, obj.client_id))
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            old = _old_values(session, obj, _TASK_ATTRS)
+            if old is None:
+                changes.unknown_task(obj)
+            changes.task(old)
+        elif isinstance(obj, UserClient):
+            changes.client_links.add((obj.user_id, obj.client_id))
+        elif isinstance(obj, Project):
+            deleted_project_ids.add(obj.id)
+
+    for obj in session.dirty:
+        if obj in session.deleted or not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, Task):
+            new = (obj.assigned_to, obj.project_id)
+            old = _old_values(session, obj, _TASK_ATTRS)
+            if old is None:
+                changes.unknown_task(obj)
+            elif old != new:
+                changes.task(old)
+                changes.task(new)
+        elif isinstance(obj, Project):
+            old = _old_values(session, obj, ("client_id",))
+            old_client_id = old[0] if old is not None else None
+            if old is None or old_client_id != obj.client_id:
+                for client_id in (old_client_id, obj.client_id):
+                    if client_id is not None:
+                        changes.project_clients.add((obj.id, client_id))
+
+    return changes, deleted_project_ids
+
+
+def _client_pairs(connection, changes: _Changes) -> Set[Pair]:
+    """(user, project) pairs whose ``via_client`` may have changed"""
+    _, _, _, user_clients, projects = _tables()
+    pairs: Set[Pair] = set()
+    if changes.client_links:
+        client_ids = {client_id for _, client_id in changes.client_links}
+        rows = connection.execute(
+            sa.select(projects.c.client_id, projects.c.id).where(projects.c.client_id.in_(client_ids))
+        )
+        by_client: Dict[int, Set[int]] = {}
+        for client_id, project_id in rows:
+            by_client.setdefault(client_id, set()).add(project_id)
+        for user_id, client_id in changes.client_links:
+            pairs.update((user_id, project_id) for project_id in by_client.get(client_id, ()))
+    if changes.project_clients:
+        client_ids = {client_id for _, client_id in changes.project_clients}
+        rows = connection.execute(
+            sa.select(user_clients.c.client_id, user_clients.c.user_id).where(user_clients.c.client_id.in_(client_ids))
+        )
+        by_client = {}
+        for client_id, user_id in rows:
+            by_client.setdefault(client_id, set()).add(user_id)
+        for project_id, client_id in changes.project_clients:
+            pairs.update((user_id, project_id) for user_id in by_client.get(client_id, ()))
+    return pairs
+
+
+def _source_select(user_ids: Optional[Iterable[int]] = None, pairs: Optional[Iterable[Pair]] = None):
+    """``(user_id, project_id, entry_count, task_count, via_client)`` aggregated from the source tables"""
+    _, entries, tasks, user_clients, projects = _tables()
+    zero = sa.literal(0, sa.Integer)
+
+    parts = [
+        (
+            sa.select(
+                entries.c.user_id.label("user_id"),
+                entries.c.project_id.label("project_id"),
+                sa.func.count().label("entries"),
+                zero.label("tasks"),
+                zero.label("clients"),
+            )
+            .where(entries.c.project_id.isnot(None))
+            .group_by(entries.c.user_id, entries.c.project_id),
+            entries.c.user_id,
+            entries.c.project_id,
+        ),
+        (
+            sa.select(tasks.c.assigned_to, tasks.c.project_id, zero, sa.func.count(), zero)
+            .where(tasks.c.assigned_to.isnot(None))
+            .group_by(tasks.c.assigned_to, tasks.c.project_id),
+            tasks.c.assigned_to,
+            tasks.c.project_id,
+        ),
+        (
+            sa.select(user_clients.c.user_id, projects.c.id, zero, zero, sa.literal(1, sa.Integer)).select_from(
+                user_clients.join(projects, projects.c.client_id == user_clients.c.client_id)
+            ),
+            user_clients.c.user_id,
+            projects.c.id,
+        ),
+    ]
+    selects = []
+    for select, user_col, project_col in parts:
+        if user_ids is not None:
+            select = select.where(user_col.in_(user_ids))
+        if pairs is not None:
+            select = select.where(sa.tuple_(user_col, project_col).in_(pairs))
+        selects.append(select)
+
+    src = sa.union_all(*selects).subquery()
+    return sa.select(
+        src.c.user_id,
+        src.c.project_id,
+        sa.func.sum(src.c.entries),
+        sa.func.sum(src.c.tasks),
+        sa.func.max(src.c.clients) > 0,
+        sa.literal(datetime.utcnow(), sa.DateTime),
+    ).group_by(src.c.user_id, src.c.project_id)
+
+
+_COLUMNS = ["user_id", "project_id", "entry_count", "task_count", "via_client", "updated_at"]
+
+
+def _insert_missing(connection, pairs: Set[Pair]) -> Set[Pair]:
+    """Create rows for ``pairs`` from the source tables; returns the pairs another transaction created first"""
+    access = _tables()[0]
+    try:
+        with connection.begin_nested():
+            connection.execute(access.insert().from_select(_COLUMNS, _source_select(pairs=sorted(pairs))))
+        return set()
+    except IntegrityError:
+        pass
+    lost = set()
+    for pair in sorted(pairs):
+        try:
+            with connection.begin_nested():
+                connection.execute(access.insert().from_select(_COLUMNS, _source_select(pairs=[pair])))
+        except IntegrityError:
+            lost.add(pair)
+    return lost
+
+
+def _apply(connection, changes: _Changes, recompute: Set[Pair]) -> None:
+    access, entries, tasks, user_clients, projects = _tables()
+    now = datetime.utcnow()
+    pairs = set(changes.entry_deltas) | recompute
+    pair_key = sa.tuple_(access.c.user_id, access.c.project_id)
+
+    existing = {
+        (row.user_id, row.project_id)
+        for row in connection.execute(
+            sa.select(access.c.user_id, access.c.project_id).where(pair_key.in_(sorted(pairs)))
+        )
+    }
+    missing = pairs - existing
+    if missing:
+        # Built from the source tables, which already include this flush
+        existing |= _insert_missing(connection, missing)
+
+    for pair, delta in changes.entry_deltas.items():
+        if delta and pair in existing:
+            connection.execute(
+                access.update()
+                .where(access.c.user_id == pair[0], access.c.project_id == pair[1])
+                .values(entry_count=access.c.entry_count + delta, updated_at=now)
+            )
+
+    recompute &= existing
+    if recompute:
+        connection.execute(
+            access.update()
+            .where(pair_key.in_(sorted(recompute)))
+            .values(
+                task_count=sa.select(sa.func.count())
+                .where(tasks.c.assigned_to == access.c.user_id, tasks.c.project_id == access.c.project_id)
+                .scalar_subquery(),
+                via_client=sa.exists().where(
+                    user_clients.c.user_id == access.c.user_id,
+                    user_clients.c.client_id == projects.c.client_id,
+                    projects.c.id == access.c.project_id,
+                ),
+                updated_at=now,
+            )
+        )
+
+    if existing:
+        connection.execute(
+            access.delete().where(
+                pair_key.in_(sorted(existing & pairs)),
+                access.c.entry_count <= 0,
+                access.c.task_count <= 0,
+                sa.not_(access.c.via_client),
+            )
+        )
+
+
+def receive_after_flush(session, flush_context):
+    """Update the (user, project) access rows affected by this flush."""
+    changes, deleted_project_ids = _collect(session, flush_context)
+    session.info.pop(_SESSION_INFO_KEY, None)
+    if not changes and not deleted_project_ids:
+        return
+
+    connection = session.connection()
+    recompute = changes.task_pairs | _client_pairs(connection, changes)
+
+    # Rows of users and projects deleted in this flush cascade away
+    gone_users = deleted_user_ids(session)
+    changes.rebuild_user_ids -= gone_users
+    if changes.rebuild_user_ids:
+        rebuild_user_project_access(changes.rebuild_user_ids, connection=connection)
+
+    def keep(pair: Pair) -> bool:
+        return (
+            pair[0] not in gone_users and pair[0] not in changes.rebuild_user_ids and pair[1] not in deleted_project_ids
+        )
+
+    changes.entry_deltas = {pair: d for pair, d in changes.entry_deltas.items() if d and keep(pair)}
+    recompute = {pair for pair in recompute if keep(pair)}
+    if deleted_project_ids:
+        access = _tables()[0]
+        connection.execute(access.delete().where(access.c.project_id.in_(deleted_project_ids)))
+    if changes.entry_deltas or recompute:
+        _apply(connection, changes, recompute)
+
+
+def rebuild_user_project_access(user_ids: Optional[Iterable[int]] = None, connection=None) -> int:
+    """Recompute access rows from time entries, task assignments and ``user_clients``.
+
+    Args:
+        user_ids: Users to rebuild (default: all)
+        connection: Connection to use (default: the current session's)
+
+    Returns:
+        Number of rows written
+    """
+    from app import db
+
+    access = _tables()[0]
+    connection = connection if connection is not None else db.session.connection()
+
+    delete = access.delete()
+    if user_ids is not None:
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return 0
+        delete = delete.where(access.c.user_id.in_(user_ids))
+
+    connection.execute(delete)
+    result = connection.execute(access.insert().from_select(_COLUMNS, _source_select(user_ids=user_ids)))
+    return max(result.rowcount or 0, 0)
+
+
+def project_ids_select(user_id: int, *, entries: bool = True, tasks: bool = False, clients: bool = False):
+    """SELECT of the project IDs ``user_id`` reaches, for ``Column.in_()`` filters.
+
+    Args:
+        user_id: User ID
+        entries: Include projects the user has time entries for
+        tasks: Include projects with tasks assigned to the user
+        clients: Include projects of the user's assigned clients (``user_clients``)
+    """
+    from app.models import UserProjectAccess
+
+    conditions = []
+    if entries:
+        conditions.append(UserProjectAccess.entry_count > 0)
+    if tasks:
+        conditions.append(UserProjectAccess.task_count > 0)
+    if clients:
+        conditions.append(UserProjectAccess.via_client)
+    return sa.select(UserProjectAccess.project_id).where(
+        UserProjectAccess.user_id == user_id, sa.or_(*conditions) if conditions else sa.false()
+    )
+
+
+def client_ids_select(user_id: int, **sources):
+    """SELECT of the client IDs of the projects from ``project_ids_select(user_id, **sources)``"""
+    from app.models import Project
+
+    return (
+        sa.select(Project.client_id)
+        .where(Project.id.in_(project_ids_select(user_id, **sources)), Project.client_id.isnot(None))
+        .distinct()
+    )
@@ -0,0 +1,203 @@
+"""
+Incremental maintenance of the ``user_time_stats`` rollup.
+
+``receive_after_flush`` looks at the ``TimeEntry`` rows inserted, updated or
+deleted by a flush and applies the per-user difference (entry count, seconds
+of completed entries, latest start time) with a single ``UPDATE`` per user on
+the flush's own connection, so the rollup commits or rolls back together with
+the entries themselves.
+
+- A user without a rollup row gets one built from ``time_entries`` (which
+  already contains the flushed changes).
+- Removing or moving an entry recomputes only ``last_entry_at`` for the user.
+- Bulk ``Query.update()``/``Query.delete()`` bypass the ORM flush; run
+  ``flask rebuild-user-time-stats`` after such maintenance.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+
+from app.utils.time_entry_changes import collect_time_entry_changes, deleted_user_ids
+
+logger = logging.getLogger(__name__)
+
+
+class _UserDelta:
+    __slots__ = ("count", "seconds", "last", "recompute_last", "rebuild")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0
+        self.last: Optional[datetime] = None
+        self.recompute_last = False
+        self.rebuild = False
+
+    def add(self, state, sign: int) -> None:
+        self.count += sign
+        if state["end_time"] is not None:
+            self.seconds += sign * int(state["duration_seconds"] or 0)
+        if sign > 0:
+            start_time = state["start_time"]
+            if start_time is not None and (self.last is None or start_time > self.last):
+                self.last = start_time
+        else:
+            self.recompute_last = True
+
+    @property
+    def empty(self) -> bool:
+        return not (self.count or self.seconds or self.last or self.recompute_last or self.rebuild)
+
+
+def _tables():
+    from app.models import TimeEntry, UserTimeStats
+
+    return UserTimeStats.__table__, TimeEntry.__table__
+
+
+def _collect_deltas(session, flush_context) -> Dict[int, _UserDelta]:
+    changes = collect_time_entry_changes(session, flush_context)
+    deltas: Dict[int, _UserDelta] = {}
+
+    def delta(user_id) -> _UserDelta:
+        return deltas.setdefault(user_id, _UserDelta())
+
+    for old, new in changes.changes:
+        if (
+            old is not None
+            and new is not None
+            and all(old[key] == new[key] for key in ("user_id", "start_time", "end_time", "duration_seconds"))
+        ):
+            continue
+        if old is not None and old["user_id"] is not None:
+            delta(old["user_id"]).add(old, -1)
+        if new is not None and new["user_id"] is not None:
+            delta(new["user_id"]).add(new, +1)
+    for user_id in changes.rebuild_user_ids:
+        delta(user_id).rebuild = True
+
+    # Users deleted in this flush take their rollup row with them (ON DELETE CASCADE)
+    for user_id in deleted_user_ids(session):
+        deltas.pop(user_id, None)
+
+    return {user_id: d for user_id, d in deltas.items() if not d.empty}
+
+
+def aggregate_user_time_stats(connection, user_id: int) -> Tuple[int, int, Optional[datetime]]:
+    """Compute ``(entry_count, total_seconds, last_entry_at)`` for a user from ``time_entries``"""
+    _, entries = _tables()
+    row = connection.execute(
+        sa.select(
+            sa.func.count(entries.c.id),
+            sa.func.coalesce(
+                sa.func.sum(sa.case((entries.c.end_time.isnot(None), entries.c.duration_seconds), else_=0)), 0
+            ),
+            sa.func.max(entries.c.start_time),
+        ).where(entries.c.user_id == user_id)
+    ).one()
+    return int(row[0] or 0), int(row[1] or 0), row[2]
+
+
+def _insert_from_aggregate(connection, user_id: int) -> bool:
+    """Create the rollup row for ``user_id``; False if another transaction created it first"""
+    stats, _ = _tables()
+    count, seconds, last = aggregate_user_time_stats(connection, user_id)
+    try:
+        with connection.begin_nested():
+            connection.execute(
+                stats.insert().values(
+                    user_id=user_id,
+                    entry_count=count,
+                    total_seconds=seconds,
+                    last_entry_at=last,
+                    updated_at=datetime.utcnow(),
+                )
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def _apply_delta(connection, user_id: int, d: _UserDelta) -> None:
+    stats, entries = _tables()
+    now = datetime.utcnow()
+
+    if d.rebuild:
+        connection.execute(stats.delete().where(stats.c.user_id == user_id))
+        if _insert_from_aggregate(connection, user_id):
+            return
+
+    values = {
+        "entry_count": stats.c.entry_count + d.count,
+        "total_seconds": stats.c.total_seconds + d.seconds,
+        "updated_at": now,
+    }
+    if d.recompute_last:
+        values["last_entry_at"] = (
+            sa.select(sa.func.max(entries.c.start_time)).where(entries.c.user_id == user_id).scalar_subquery()
+        )
+    elif d.last is not None:
+        values["last_entry_at"] = sa.case(
+            (sa.or_(stats.c.last_entry_at.is_(None), stats.c.last_entry_at < d.last), d.last),
+            else_=stats.c.last_entry_at,
+        )
+
+    result = connection.execute(stats.update().where(stats.c.user_id == user_id).values(**values))
+    if result.rowcount == 0 and not _insert_from_aggregate(connection, user_id):
+        # Lost the race to create the row; the other transaction could not see our entries
+        connection.execute(stats.update().where(stats.c.user_id == user_id).values(**values))
+
+
+def receive_after_flush(session, flush_context):
+    """Apply per-user rollup deltas for the TimeEntry rows written in this flush."""
+    deltas = _collect_deltas(session, flush_context)
+    if not deltas:
+        return
+    connection = session.connection()
+    for user_id, d in deltas.items():
+        _apply_delta(connection, user_id, d)
+
+
+def rebuild_user_time_stats(user_ids: Optional[Iterable[int]] = None, connection=None) -> int:
+    """Recompute rollup rows from ``time_entries``.
+
+    Args:
+        user_ids: Users to rebuild (default: every user with time entries)
+        connection: Connection to use (default: the current session's)
+
+    Returns:
+        Number of rows written
+    """
+    from app import db
+
+    stats, entries = _tables()
+    connection = connection if connection is not None else db.session.connection()
+    now = datetime.utcnow()
+
+    delete = stats.delete()
+    aggregate = sa.select(
+        entries.c.user_id,
+        sa.func.count(entries.c.id),
+        sa.func.coalesce(
+            sa.func.sum(sa.case((entries.c.end_time.isnot(None), entries.c.duration_seconds), else_=0)), 0
+        ),
+        sa.func.max(entries.c.start_time),
+        sa.literal(now, sa.DateTime),
+    ).group_by(entries.c.user_id)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+        delete = delete.where(stats.c.user_id.in_(user_ids))
+        aggregate = aggregate.where(entries.c.user_id.in_(user_ids))
+
+    connection.execute(delete)
+    result = connection.execute(
+        stats.insert().from_select(
+            ["user_id", "entry_count", "total_seconds", "last_entry_at", "updated_at"], aggregate
+        )
+    )
+    return max(result.rowcount or 0, 0)
@@ -3,8 +3,6 @@
 import logging
 from typing import Any, Dict, Optional
 
-from flask import current_app
-
 from app import db
 from app.models.webhook import Webhook
 from app.utils.webhook_service import WebhookService
@@ -17,36 +15,46 @@ class WebhookDispatcher:
 
     @staticmethod
     def dispatch_event(
-        event_type: str, payload: Dict[str, Any], event_id: Optional[str] = None, user_id: Optional[int] = None
+        event_type: str,
+        payload: Dict[str, Any],
+        event_id: Optional[str] = None,
+        user_id: Optional[int] = None,
+        commit: bool = True,
     ):
-        """Dispatch a webhook event to all active webhooks that subscribe to it
+        """Queue a webhook event for every active webhook that subscribes to it
+
+        Deliveries are written to the outbox (``webhook_deliveries`` rows with
+        status ``pending``) and sent by the delivery workers, so no HTTP request
+        happens in the caller's request cycle.
 
         Args:
             event_type: Event type (e.g., 'project.created')
             payload: Event payload dictionary
             event_id: Optional unique event ID for deduplication
             user_id: Optional user ID who triggered the event
+            commit: Commit the outbox rows now. Pass False to have them committed
+                atomically with the caller's own pending transaction.
         """
         try:
             # Find all active webhooks that subscribe to this event
             webhooks = Webhook.query.filter(Webhook.is_active == True).all()
+            subscribers = [webhook for webhook in webhooks if webhook.subscribes_to(event_type)]
+            if not subscribers:
+                return
+
+            for webhook in subscribers:
+                WebhookService.enqueue_delivery(
+                    webhook=webhook, event_type=event_type, payload=payload, event_id=event_id
+                )
 
-            triggered_count = 0
+            # Wake the delivery workers once the outbox rows are visible
+            from app.utils.webhook_worker import notify_after_commit
 
-            for webhook in webhooks:
-                if webhook.subscribes_to(event_type):
-                    try:
-                        WebhookService.deliver_webhook(
-                            webhook=webhook, event_type=event_type, payload=payload, event_id=event_id
-                        )
-                        triggered_count += 1
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to deliver webhook {webhook.id} for event {event_type}: {e}", exc_info=True
-                        )
+            notify_after_commit(db.session())
+            if commit:
+                db.session.commit()
 
-            if triggered_count > 0:
-                logger.debug(f"Dispatched {event_type} to {triggered_count} webhook(s)")
+            logger.debug(f"Queued {event_type} for {len(subscribers)} webhook(s)")
 
         except Exception as e:
             logger.error(f"Error dispatching webhook event {event_type}: {e}", exc_info=True)
@@ -141,13 +149,15 @@ class WebhookDispatcher:
         return payload
 
     @staticmethod
-    def on_activity_logged(activity):
+    def on_activity_logged(activity, commit: bool = True):
         """Callback to be called when an activity is logged
 
-        This method should be called after Activity.log() to trigger webhooks
+        Activity.log() calls this after flushing the activity and before its
+        commit, with ``commit=False``, so the outbox rows share its transaction.
 
         Args:
             activity: Activity model instance that was just logged
+            commit: Whether to commit the queued deliveries immediately
         """
         try:
             # Map activity to webhook event type
@@ -162,7 +172,11 @@ class WebhookDispatcher:
 
             # Dispatch webhook
             WebhookDispatcher.dispatch_event(
-                event_type=event_type, payload=payload, event_id=f"activity_{activity.id}", user_id=activity.user_id
+                event_type=event_type,
+                payload=payload,
+                event_id=f"activity_{activity.id}",
+                user_id=activity.user_id,
+                commit=commit,
             )
 
         except Exception as e:
@@ -5,10 +5,12 @@ import logging
 import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from flask import current_app
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import and_, false, func, or_
 
 from app import db
 from app.models.webhook import Webhook, WebhookDelivery
@@ -16,6 +18,11 @@ from app.utils.timezone import now_in_app_timezone
 
 logger = logging.getLogger(__name__)
 
+WEBHOOK_OUTBOX_DEPTH = Gauge("tt_webhook_outbox_depth", "Webhook deliveries waiting in the outbox")
+WEBHOOK_DELIVERY_LATENCY = Histogram(
+    "tt_webhook_delivery_latency_seconds", "Webhook delivery HTTP latency seconds", ["outcome"]
+)
+
 
 class WebhookDeliveryError(Exception):
     """Base exception for webhook delivery errors"""
@@ -69,13 +76,14 @@ class WebhookService:
 
         # Create delivery record
         delivery = WebhookDelivery(
-            webhook_id=webhook.id,
+            webhook=webhook,
             event_type=event_type,
             event_id=event_id,
             payload=payload_json,
             payload_hash=payload_hash,
             status="pending",
             attempt_number=1,
+            retry_count=0,
         )
         db.session.add(delivery)
 
@@ -176,13 +184,14 @@ class WebhookService:
         return delivery
 
     @staticmethod
-    def _send_request(webhook: Webhook, payload_json: str, event_type: str) -> requests.Response:
+    def _send_request(webhook: Webhook, payload_json: str, event_type: str, http_session=None) -> requests.Response:
         """Send HTTP request to webhook URL
 
         Args:
             webhook: Webhook configuration
             payload_json: JSON-encoded payload
             event_type: Event type
+            http_session: Optional pooled ``requests.Session`` (keep-alive per host)
 
         Returns:
             requests.Response: HTTP response
@@ -213,6 +222,12 @@ class WebhookService:
             "allow_redirects": True,
         }
 
+        method = webhook.http_method.upper()
+        if http_session is not None:
+            if method not in ("POST", "PUT", "PATCH"):
+                raise ValueError(f"Unsupported HTTP method: {webhook.http_method}")
+            return http_session.request(method, **request_kwargs)
+
         # Send request based on HTTP method
         if webhook.http_method.upper() == "POST":
             response = requests.post(**request_kwargs)
@@ -245,101 +260,243 @@ class WebhookService:
         logger.info(f"Scheduled retry for webhook {webhook.id} delivery {delivery.id} at {next_retry_at}")
 
     @staticmethod
-    def retry_failed_deliveries(max_deliveries: int = 100) -> int:
-        """Retry failed webhook deliveries that are scheduled for retry
+    def enqueue_delivery(
+        webhook: Webhook, event_type: str, payload: Dict[str, Any], event_id: Optional[str] = None
+    ) -> WebhookDelivery:
+        """Write a pending delivery to the outbox without sending it
+
+        The row is only added to the current session, so it is committed (or
+        rolled back) together with the caller's transaction. Delivery workers
+        pick it up via ``claim_delivery`` once it is due.
 
         Args:
-            max_deliveries: Maximum number of deliveries to process in this run
+            webhook: Webhook configuration
+            event_type: Event type (e.g., 'project.created')
+            payload: Event payload dictionary
+            event_id: Optional unique event ID for deduplication
 
         Returns:
-            int: Number of deliveries retried
+            WebhookDelivery: Pending delivery record
         """
+        if not event_id:
+            event_id = str(uuid.uuid4())
+
+        payload_json = json.dumps(payload, default=str)
         now = now_in_app_timezone()
+        delivery = WebhookDelivery(
+            webhook=webhook,
+            event_type=event_type,
+            event_id=event_id,
+            payload=payload_json,
+            payload_hash=WebhookDelivery.hash_payload(payload_json),
+            status="pending",
+            attempt_number=1,
+            retry_count=0,
+            started_at=now,
+            next_retry_at=now,
+        )
+        db.session.add(delivery)
+        return delivery
 
-        # Find deliveries ready for retry
-        deliveries = (
-            WebhookDelivery.query.filter(WebhookDelivery.status == "retrying", WebhookDelivery.next_retry_at <= now)
-            .limit(max_deliveries)
+    @staticmethod
+    def _due_filter(now: datetime, lease_seconds: Optional[int] = None, status: Optional[str] = None):
+        """SQL condition matching due deliveries, optionally only those in ``status``"""
+        if lease_seconds is None:
+            lease_seconds = WebhookService._lease_seconds()
+        stale_before = now - timedelta(seconds=lease_seconds)
+        conditions = []
+        waiting = [s for s in ("pending", "retrying") if status in (None, s)]
+        if waiting:
+            conditions.append(and_(WebhookDelivery.status.in_(waiting), WebhookDelivery.next_retry_at <= now))
+        if status in (None, "delivering"):
+            conditions.append(and_(WebhookDelivery.status == "delivering", WebhookDelivery.started_at <= stale_before))
+        return or_(*conditions) if conditions else false()
+
+    @staticmethod
+    def find_due_deliveries(limit: int = 100, lease_seconds: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Return ``(delivery_id, status, webhook_url)`` for outbox rows that are due
+
+        Due rows are pending or retrying deliveries whose ``next_retry_at`` has
+        passed, plus ``delivering`` rows whose lease expired (worker crashed
+        mid-send).
+
+        Args:
+            limit: Maximum number of rows to return
+            lease_seconds: Age after which an in-flight delivery is considered abandoned
+        """
+        rows = (
+            db.session.query(WebhookDelivery.id, WebhookDelivery.status, Webhook.url)
+            .join(Webhook, Webhook.id == WebhookDelivery.webhook_id)
+            .filter(WebhookService._due_filter(now_in_app_timezone(), lease_seconds))
+            .order_by(WebhookDelivery.next_retry_at.asc(), WebhookDelivery.id.asc())
+            .limit(limit)
             .all()
         )
+        return [(row[0], row[1], row[2]) for row in rows]
 
-        retried_count = 0
+    @staticmethod
+    def count_pending_deliveries() -> int:
+        """Return the number of outbox rows waiting to be sent (pending or retrying)"""
+        return (
+            db.session.query(func.count(WebhookDelivery.id))
+            .filter(WebhookDelivery.status.in_(("pending", "retrying")))
+            .scalar()
+            or 0
+        )
+
+    @staticmethod
+    def claim_delivery(delivery_id: int, previous_status: str, lease_seconds: Optional[int] = None) -> bool:
+        """Atomically move a due delivery to ``delivering``
 
-        for delivery in deliveries:
-            webhook = delivery.webhook
+        Uses a conditional UPDATE that repeats the due condition of
+        ``find_due_deliveries``, so that when several workers or processes
+        race for the same row exactly one of them wins, and a stale candidate
+        cannot claim a row that was rescheduled or re-leased in the meantime.
 
-            if not webhook or not webhook.is_active:
-                # Mark as failed if webhook is deleted or inactive
-                delivery.mark_failed(error_message="Webhook is inactive or deleted", error_type="webhook_inactive")
-                db.session.commit()
-                continue
+        Args:
+            delivery_id: Delivery ID returned by ``find_due_deliveries``
+            previous_status: Status the row had when it was found
+            lease_seconds: Age after which an in-flight delivery is considered abandoned
 
-            try:
-                # Retry delivery
-                start_time = time.time()
-                delivery.started_at = now_in_app_timezone()
+        Returns:
+            bool: True if this caller now owns the delivery
+        """
+        now = now_in_app_timezone()
+        claimed = WebhookDelivery.query.filter(
+            WebhookDelivery.id == delivery_id,
+            WebhookService._due_filter(now, lease_seconds, status=previous_status),
+        ).update({"status": "delivering", "started_at": now}, synchronize_session=False)
+        db.session.commit()
+        return claimed == 1
+
+    @staticmethod
+    def process_delivery(delivery_id: int, previous_status: str, http_session=None) -> bool:
+        """Send a claimed delivery and record the outcome
+
+        Retries keep the semantics of ``retry_failed_deliveries``: failures are
+        marked failed and rescheduled with exponential backoff until the
+        webhook's ``max_retries`` is reached.
+
+        Args:
+            delivery_id: Claimed delivery ID
+            previous_status: Status the row had before it was claimed
+            http_session: Optional pooled ``requests.Session`` to send with
+
+        Returns:
+            bool: True if an HTTP attempt was made
+        """
+        delivery = db.session.get(WebhookDelivery, delivery_id)
+        if delivery is None:
+            return False
+
+        webhook = delivery.webhook
+        if not webhook or not webhook.is_active:
+            # Mark as failed if webhook is deleted or inactive
+            delivery.mark_failed(error_message="Webhook is inactive or deleted", error_type="webhook_inactive")
+            db.session.commit()
+            return False
+
+        start_time = time.time()
+        success = False
+        try:
+            delivery.started_at = now_in_app_timezone()
+            if previous_status != "pending":
                 delivery.attempt_number += 1
 
-                response = WebhookService._send_request(webhook, delivery.payload, delivery.event_type)
-
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                if 200 <= response.status_code < 300:
-                    delivery.mark_success(
-                        status_code=response.status_code,
-                        response_body=response.text[:10000],
-                        response_headers=dict(response.headers),
-                        duration_ms=duration_ms,
-                    )
-                    logger.info(f"Webhook {webhook.id} retry successful: {delivery.event_type}")
-                else:
-                    delivery.mark_failed(
-                        error_message=f"HTTP {response.status_code}: {response.text[:500]}",
-                        error_type="http_error",
-                        response_status_code=response.status_code,
-                        response_body=response.text[:10000],
-                        duration_ms=duration_ms,
-                    )
-                    WebhookService._schedule_retry(delivery, webhook)
+            response = WebhookService._send_request(
+                webhook, delivery.payload, delivery.event_type, http_session=http_session
+            )
 
-                retried_count += 1
+            duration_ms = int((time.time() - start_time) * 1000)
 
-            except requests.exceptions.Timeout as e:
-                duration_ms = int((time.time() - start_time) * 1000)
-                delivery.mark_failed(
-                    error_message=f"Request timeout after {webhook.timeout_seconds}s",
-                    error_type="timeout",
+            if 200 <= response.status_code < 300:
+                delivery.mark_success(
+                    status_code=response.status_code,
+                    response_body=response.text[:10000],
+                    response_headers=dict(response.headers),
                     duration_ms=duration_ms,
                 )
-                WebhookService._schedule_retry(delivery, webhook)
-                retried_count += 1
-
-            except requests.exceptions.ConnectionError as e:
-                duration_ms = int((time.time() - start_time) * 1000)
+                success = True
+                logger.info(f"Webhook {webhook.id} delivered: {delivery.event_type}")
+            else:
                 delivery.mark_failed(
-                    error_message=f"Connection error: {str(e)[:500]}",
-                    error_type="connection_error",
+                    error_message=f"HTTP {response.status_code}: {response.text[:500]}",
+                    error_type="http_error",
+                    response_status_code=response.status_code,
+                    response_body=response.text[:10000],
                     duration_ms=duration_ms,
                 )
                 WebhookService._schedule_retry(delivery, webhook)
-                retried_count += 1
 
-            except Exception as e:
-                duration_ms = int((time.time() - start_time) * 1000)
-                delivery.mark_failed(
-                    error_message=f"Unexpected error: {str(e)[:500]}",
-                    error_type="unknown_error",
-                    duration_ms=duration_ms,
-                )
-                WebhookService._schedule_retry(delivery, webhook)
-                retried_count += 1
-                logger.error(f"Error retrying webhook {webhook.id} delivery {delivery.id}", exc_info=True)
+        except requests.exceptions.Timeout:
+            duration_ms = int((time.time() - start_time) * 1000)
+            delivery.mark_failed(
+                error_message=f"Request timeout after {webhook.timeout_seconds}s",
+                error_type="timeout",
+                duration_ms=duration_ms,
+            )
+            WebhookService._schedule_retry(delivery, webhook)
+
+        except requests.exceptions.ConnectionError as e:
+            duration_ms = int((time.time() - start_time) * 1000)
+            delivery.mark_failed(
+                error_message=f"Connection error: {str(e)[:500]}",
+                error_type="connection_error",
+                duration_ms=duration_ms,
+            )
+            WebhookService._schedule_retry(delivery, webhook)
+
+        except Exception as e:
+            duration_ms = int((time.time() - start_time) * 1000)
+            delivery.mark_failed(
+                error_message=f"Unexpected error: {str(e)[:500]}",
+                error_type="unknown_error",
+                duration_ms=duration_ms,
+            )
+            WebhookService._schedule_retry(delivery, webhook)
+            logger.error(f"Error delivering webhook {webhook.id} delivery {delivery.id}", exc_info=True)
+
+        finally:
+            db.session.commit()
+
+        WEBHOOK_DELIVERY_LATENCY.labels(outcome="success" if success else "failure").observe(time.time() - start_time)
+        try:
+            from app.telemetry.otel_setup import record_webhook_delivery
+
+            record_webhook_delivery(delivery.event_type, success)
+        except Exception:
+            pass
+        return True
 
-            finally:
-                db.session.commit()
+    @staticmethod
+    def retry_failed_deliveries(max_deliveries: int = 100) -> int:
+        """Send due outbox deliveries (new and scheduled retries) synchronously
+
+        This is the scheduler fallback for the delivery worker pool; it drains
+        the same outbox with the same claim semantics, so both can run at once.
+
+        Args:
+            max_deliveries: Maximum number of deliveries to process in this run
+
+        Returns:
+            int: Number of deliveries attempted
+        """
+        retried_count = 0
+        for delivery_id, status, _url in WebhookService.find_due_deliveries(limit=max_deliveries):
+            if not WebhookService.claim_delivery(delivery_id, status):
+                continue
+            if WebhookService.process_delivery(delivery_id, status):
+                retried_count += 1
 
         return retried_count
 
+    @staticmethod
+    def _lease_seconds() -> int:
+        try:
+            return int(current_app.config.get("WEBHOOK_DELIVERY_LEASE_SECONDS", 300))
+        except (RuntimeError, TypeError, ValueError):
+            return 300
+
     @staticmethod
     def get_available_events() -> List[str]:
         """Get list of available webhook event types
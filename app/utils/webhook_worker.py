@@ -0,0 +1,215 @@
+"""Webhook delivery worker pool - drains the webhook outbox off the request path
+
+``WebhookDispatcher.dispatch_event`` only writes ``pending`` rows to
+``webhook_deliveries``. A ``WebhookDeliveryWorkerPool`` claims due rows with a
+conditional UPDATE (safe across threads, workers and replicas) and sends them
+from a bounded thread pool:
+
+- one pooled, keep-alive ``requests.Session`` per target host;
+- at most ``WEBHOOK_MAX_CONCURRENCY_PER_HOST`` in-flight requests per host, so
+  a slow subscriber cannot occupy every worker;
+- retries and backoff are handled by ``WebhookService.process_delivery`` exactly
+  as ``retry_failed_deliveries`` does.
+
+The pool is started by ``create_app`` (outside tests) and can also be run as a
+dedicated process with ``flask webhook-worker``.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional["WebhookDeliveryWorkerPool"] = None
+_pool_lock = threading.Lock()
+_NOTIFY_KEY = "webhook_outbox_notify"
+
+
+class WebhookDeliveryWorkerPool:
+    """Background threads that send queued webhook deliveries"""
+
+    def __init__(
+        self,
+        app,
+        workers: int = 2,
+        per_host_limit: int = 2,
+        poll_interval: float = 2.0,
+        batch_size: int = 50,
+    ):
+        self.app = app
+        self.workers = max(1, int(workers))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.poll_interval = float(poll_interval)
+        self.batch_size = max(1, int(batch_size))
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="webhook-delivery")
+        self._thread = threading.Thread(target=self._run, name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Webhook delivery pool started ({self.workers} workers, {self.per_host_limit} per host)")
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join(timeout=self.poll_interval + 5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def notify(self) -> None:
+        """Wake the dispatcher thread (new deliveries were committed)"""
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Claim and submit one batch of due deliveries; returns the number submitted"""
+        from app.utils.webhook_service import WEBHOOK_OUTBOX_DEPTH, WebhookService
+
+        submitted = 0
+        with self.app.app_context():
+            try:
+                WEBHOOK_OUTBOX_DEPTH.set(WebhookService.count_pending_deliveries())
+                candidates = WebhookService.find_due_deliveries(limit=self.batch_size)
+                for delivery_id, status, url in candidates:
+                    host = self._host_key(url)
+                    with self._lock:
+                        if sum(self._in_flight.values()) >= self.workers:
+                            break
+                        if self._in_flight.get(host, 0) >= self.per_host_limit:
+                            continue
+                        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+                    try:
+                        claimed = WebhookService.claim_delivery(delivery_id, status)
+                    except Exception:
+                        self._release(host)
+                        raise
+                    if not claimed:
+                        self._release(host)
+                        continue
+                    self._executor.submit(self._deliver, delivery_id, status, host)
+                    submitted += 1
+            except Exception as e:
+                logger.error(f"Webhook dispatcher poll failed: {e}", exc_info=True)
+                try:
+                    from app import db
+
+                    db.session.rollback()
+                except Exception:
+                    pass
+            finally:
+                from app import db
+
+                db.session.remove()
+        return submitted
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.run_once()
+
+    def _deliver(self, delivery_id: int, status: str, host: str) -> None:
+        from app import db
+        from app.utils.webhook_service import WebhookService
+
+        try:
+            with self.app.app_context():
+                try:
+                    WebhookService.process_delivery(delivery_id, status, http_session=self._session_for(host))
+                except Exception as e:
+                    logger.error(f"Webhook delivery {delivery_id} failed: {e}", exc_info=True)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+        finally:
+            self._release(host)
+            # A host slot freed up; rows skipped for this host can be claimed now
+            self._wake.set()
+
+    def _release(self, host: str) -> None:
+        with self._lock:
+            remaining = self._in_flight.get(host, 1) - 1
+            if remaining > 0:
+                self._in_flight[host] = remaining
+            else:
+                self._in_flight.pop(host, None)
+
+    def _session_for(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_limit)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parsed = urlparse(url or "")
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def get_worker_pool() -> Optional[WebhookDeliveryWorkerPool]:
+    """Return the process-wide worker pool, if one was started"""
+    return _pool
+
+
+def start_worker_pool(app) -> Optional[WebhookDeliveryWorkerPool]:
+    """Start the process-wide worker pool from app config (idempotent)
+
+    Returns None when ``WEBHOOK_DELIVERY_WORKERS`` is 0; the scheduled
+    ``retry_failed_webhooks`` job still drains the outbox in that case.
+    """
+    global _pool
+    workers = int(app.config.get("WEBHOOK_DELIVERY_WORKERS", 2) or 0)
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or not _pool.running:
+            _pool = WebhookDeliveryWorkerPool(
+                app,
+                workers=workers,
+                per_host_limit=app.config.get("WEBHOOK_MAX_CONCURRENCY_PER_HOST", 2),
+                poll_interval=app.config.get("WEBHOOK_POLL_INTERVAL_SECONDS", 2.0),
+            )
+            _pool.start()
+    return _pool
+
+
+def notify_after_commit(session) -> None:
+    """Wake the worker pool once ``session`` commits its pending outbox rows"""
+    session.info[_NOTIFY_KEY] = True
+
+
+def receive_after_commit(session) -> None:
+    """Session ``after_commit`` hook registered by ``create_app``"""
+    if session.info.pop(_NOTIFY_KEY, False) and _pool is not None:
+        _pool.notify()
@@ -0,0 +1,61 @@
+"""Add user_time_stats rollup table and backfill it from time_entries.
+
+Holds per-user entry count, tracked seconds of completed entries and the latest
+entry start, maintained incrementally on time-entry writes.
+
+Revision ID: 172_add_user_time_stats
+Revises: 171_merge_kanban_feature_heads
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "172_add_user_time_stats"
+down_revision = "171_merge_kanban_feature_heads"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "user_time_stats"):
+        return
+    op.create_table(
+        "user_time_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_seconds", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_entry_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO user_time_stats (user_id, entry_count, total_seconds, last_entry_at, updated_at)
+        SELECT user_id,
+               COUNT(id),
+               COALESCE(SUM(CASE WHEN end_time IS NOT NULL THEN duration_seconds ELSE 0 END), 0),
+               MAX(start_time),
+               CURRENT_TIMESTAMP
+        FROM time_entries
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "user_time_stats"):
+        return
+    op.drop_table("user_time_stats")
@@ -0,0 +1,76 @@
+"""Add time_daily_rollup table and backfill it from time_entries.
+
+Per-day totals of completed time entries keyed by (day, user, project, task,
+client, billable); missing project/task/client are stored as 0.
+
+Revision ID: 173_add_time_daily_rollup
+Revises: 172_add_user_time_stats
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "173_add_time_daily_rollup"
+down_revision = "172_add_user_time_stats"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "time_daily_rollup"):
+        return
+    op.create_table(
+        "time_daily_rollup",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("billable", sa.Boolean(), nullable=False),
+        sa.Column("total_seconds", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("day", "user_id", "project_id", "task_id", "client_id", "billable"),
+    )
+    op.create_index("ix_time_daily_rollup_user_day", "time_daily_rollup", ["user_id", "day"])
+    op.create_index("ix_time_daily_rollup_project_day", "time_daily_rollup", ["project_id", "day"])
+    op.execute(
+        """
+        INSERT INTO time_daily_rollup
+            (day, user_id, project_id, task_id, client_id, billable, total_seconds, entry_count, updated_at)
+        SELECT DATE(start_time),
+               user_id,
+               COALESCE(project_id, 0),
+               COALESCE(task_id, 0),
+               COALESCE(client_id, 0),
+               billable,
+               COALESCE(SUM(duration_seconds), 0),
+               COUNT(id),
+               CURRENT_TIMESTAMP
+        FROM time_entries
+        WHERE end_time IS NOT NULL
+        GROUP BY DATE(start_time), user_id, COALESCE(project_id, 0), COALESCE(task_id, 0),
+                 COALESCE(client_id, 0), billable
+        """
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "time_daily_rollup"):
+        return
+    op.drop_index("ix_time_daily_rollup_project_day", table_name="time_daily_rollup")
+    op.drop_index("ix_time_daily_rollup_user_day", table_name="time_daily_rollup")
+    op.drop_table("time_daily_rollup")
@@ -0,0 +1,57 @@
+"""Add sync_changes table (change log behind /api/v1/sync).
+
+Starts empty: clients take their first watermark before a full fetch, so no
+backfill of existing records is needed.
+
+Revision ID: 174_add_sync_changes
+Revises: 173_add_time_daily_rollup
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "174_add_sync_changes"
+down_revision = "173_add_time_daily_rollup"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "sync_changes"):
+        return
+    op.create_table(
+        "sync_changes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity_type", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("project_id", sa.Integer(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_sync_changes_changed_at", "sync_changes", ["changed_at"])
+    op.create_index("ix_sync_changes_type_id", "sync_changes", ["entity_type", "id"])
+    op.create_index("ix_sync_changes_user_id", "sync_changes", ["user_id", "id"])
+    op.create_index("ix_sync_changes_project_id", "sync_changes", ["project_id", "id"])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "sync_changes"):
+        return
+    op.drop_index("ix_sync_changes_project_id", table_name="sync_changes")
+    op.drop_index("ix_sync_changes_user_id", table_name="sync_changes")
+    op.drop_index("ix_sync_changes_type_id", table_name="sync_changes")
+    op.drop_index("ix_sync_changes_changed_at", table_name="sync_changes")
+    op.drop_table("sync_changes")
@@ -0,0 +1,60 @@
+"""Add scheduler_leases and scheduled_job_runs (leader-elected background scheduler).
+
+Revision ID: 175_add_scheduler_leases
+Revises: 174_add_sync_changes
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "175_add_scheduler_leases"
+down_revision = "174_add_sync_changes"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "scheduler_leases"):
+        op.create_table(
+            "scheduler_leases",
+            sa.Column("name", sa.String(length=64), primary_key=True),
+            sa.Column("owner", sa.String(length=128), nullable=False),
+            sa.Column("acquired_at", sa.DateTime(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+        )
+    if not _has_table(inspector, "scheduled_job_runs"):
+        op.create_table(
+            "scheduled_job_runs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("job_id", sa.String(length=100), nullable=False),
+            sa.Column("owner", sa.String(length=128), nullable=False),
+            sa.Column("catch_up", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=False),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.Column("duration_ms", sa.Integer(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+        )
+        op.create_index("ix_scheduled_job_runs_started_at", "scheduled_job_runs", ["started_at"])
+        op.create_index("ix_scheduled_job_runs_job_started", "scheduled_job_runs", ["job_id", "started_at"])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "scheduled_job_runs"):
+        op.drop_index("ix_scheduled_job_runs_job_started", table_name="scheduled_job_runs")
+        op.drop_index("ix_scheduled_job_runs_started_at", table_name="scheduled_job_runs")
+        op.drop_table("scheduled_job_runs")
+    if _has_table(inspector, "scheduler_leases"):
+        op.drop_table("scheduler_leases")
@@ -0,0 +1,83 @@
+"""Add integration_external_refs (indexed lookup of integration-linked projects and tasks).
+
+Backfilled from the "integration" block of projects.custom_fields and
+tasks.custom_fields; afterwards the mapping is maintained on every flush.
+
+Revision ID: 176_add_integration_external_refs
+Revises: 175_add_scheduler_leases
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "176_add_integration_external_refs"
+down_revision = "175_add_scheduler_leases"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def _integration_ref(custom_fields):
+    if isinstance(custom_fields, str):
+        try:
+            custom_fields = json.loads(custom_fields)
+        except ValueError:
+            return None
+    block = custom_fields.get("integration") if isinstance(custom_fields, dict) else None
+    if not isinstance(block, dict):
+        return None
+    source, ref = block.get("source"), block.get("ref")
+    if not source or ref is None or ref == "":
+        return None
+    return str(source)[:50], str(ref)[:255]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "integration_external_refs"):
+        return
+    refs = op.create_table(
+        "integration_external_refs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity_type", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(length=50), nullable=False),
+        sa.Column("external_ref", sa.String(length=255), nullable=False),
+        sa.UniqueConstraint("entity_type", "entity_id", name="uq_integration_external_refs_entity"),
+    )
+    op.create_index(
+        "ix_integration_external_refs_lookup", "integration_external_refs", ["entity_type", "external_ref", "source"]
+    )
+
+    rows = []
+    for entity_type, table_name in (("project", "projects"), ("task", "tasks")):
+        if not _has_table(inspector, table_name):
+            continue
+        result = bind.execute(sa.text(f"SELECT id, custom_fields FROM {table_name} WHERE custom_fields IS NOT NULL"))
+        for entity_id, custom_fields in result:
+            ref = _integration_ref(custom_fields)
+            if ref:
+                rows.append(
+                    {"entity_type": entity_type, "entity_id": entity_id, "source": ref[0], "external_ref": ref[1]}
+                )
+    if rows:
+        op.bulk_insert(refs, rows)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "integration_external_refs"):
+        return
+    op.drop_index("ix_integration_external_refs_lookup", table_name="integration_external_refs")
+    op.drop_table("integration_external_refs")
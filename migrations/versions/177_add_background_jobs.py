@@ -0,0 +1,64 @@
+"""Add background_jobs (persistent queue for imports, exports and restores).
+
+Revision ID: 177_add_background_jobs
+Revises: 176_add_integration_external_refs
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "177_add_background_jobs"
+down_revision = "176_add_integration_external_refs"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "background_jobs"):
+        return
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_type", sa.String(length=50), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("target_type", sa.String(length=30), nullable=True),
+        sa.Column("target_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("run_after", sa.DateTime(), nullable=False),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("locked_by", sa.String(length=128), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_background_jobs_user_id", "background_jobs", ["user_id"])
+    op.create_index("ix_background_jobs_status_run_after", "background_jobs", ["status", "run_after"])
+    op.create_index("ix_background_jobs_target", "background_jobs", ["target_type", "target_id"])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "background_jobs"):
+        return
+    op.drop_index("ix_background_jobs_target", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_status_run_after", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_user_id", table_name="background_jobs")
+    op.drop_table("background_jobs")
@@ -0,0 +1,63 @@
+"""Add audit_snapshots and per-entity change maps to audit_logs.
+
+Revision ID: 178_add_audit_snapshots
+Revises: 177_add_background_jobs
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "178_add_audit_snapshots"
+down_revision = "177_add_background_jobs"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def _table_has_column(inspector, table_name, column_name):
+    if not _has_table(inspector, table_name):
+        return False
+    return column_name in {c["name"] for c in inspector.get_columns(table_name)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "audit_snapshots"):
+        op.create_table(
+            "audit_snapshots",
+            sa.Column("digest", sa.String(length=64), primary_key=True),
+            sa.Column("entity_type", sa.String(length=50), nullable=False),
+            sa.Column("state", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+
+    if not _has_table(inspector, "audit_logs"):
+        return
+    if not _table_has_column(inspector, "audit_logs", "changes"):
+        op.add_column("audit_logs", sa.Column("changes", sa.JSON(), nullable=True))
+    for column in ("old_state_digest", "new_state_digest"):
+        if not _table_has_column(inspector, "audit_logs", column):
+            op.add_column(
+                "audit_logs",
+                sa.Column(column, sa.String(length=64), sa.ForeignKey("audit_snapshots.digest"), nullable=True),
+            )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "audit_logs"):
+        with op.batch_alter_table("audit_logs") as batch_op:
+            for column in ("new_state_digest", "old_state_digest", "changes"):
+                if _table_has_column(inspector, "audit_logs", column):
+                    batch_op.drop_column(column)
+    if _has_table(inspector, "audit_snapshots"):
+        op.drop_table("audit_snapshots")
@@ -0,0 +1,42 @@
+"""Add user_timer_states (per-user timer-state version for push updates and ETags).
+
+Revision ID: 179_add_user_timer_states
+Revises: 178_add_audit_snapshots
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "179_add_user_timer_states"
+down_revision = "178_add_audit_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "user_timer_states"):
+        return
+    # Rows are created on a user's first timer change; a missing row reads as version 0
+    op.create_table(
+        "user_timer_states",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "user_timer_states"):
+        op.drop_table("user_timer_states")
@@ -0,0 +1,74 @@
+"""Replace per-message chat read receipts with a read watermark per channel member.
+
+Revision ID: 180_add_chat_read_watermark
+Revises: 179_add_user_timer_states
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "180_add_chat_read_watermark"
+down_revision = "179_add_user_timer_states"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def _has_column(inspector, table_name: str, column_name: str) -> bool:
+    try:
+        return column_name in {c["name"] for c in inspector.get_columns(table_name)}
+    except Exception:
+        return False
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    try:
+        return any((idx.get("name") or "") == index_name for idx in inspector.get_indexes(table_name))
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "chat_channel_members"):
+        return
+    if not _has_column(inspector, "chat_channel_members", "last_read_message_id"):
+        op.add_column("chat_channel_members", sa.Column("last_read_message_id", sa.Integer(), nullable=True))
+    # Unread counts are range counts over (channel_id, id)
+    if not _has_index(inspector, "chat_messages", "ix_chat_messages_channel_id_id"):
+        op.create_index("ix_chat_messages_channel_id_id", "chat_messages", ["channel_id", "id"])
+
+    if _has_table(inspector, "chat_read_receipts"):
+        # Messages were marked read in fetched pages, so the newest receipted message is the watermark
+        op.execute(
+            """
+            UPDATE chat_channel_members
+            SET last_read_message_id = (
+                SELECT MAX(r.message_id)
+                FROM chat_read_receipts r
+                JOIN chat_messages m ON m.id = r.message_id
+                WHERE m.channel_id = chat_channel_members.channel_id
+                  AND r.user_id = chat_channel_members.user_id
+            )
+            WHERE last_read_message_id IS NULL
+            """
+        )
+        op.execute("DELETE FROM chat_read_receipts")
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    # Collapsed receipts are not recreated; messages up to the watermark read as unread again
+    if _has_index(inspector, "chat_messages", "ix_chat_messages_channel_id_id"):
+        op.drop_index("ix_chat_messages_channel_id_id", table_name="chat_messages")
+    if _has_column(inspector, "chat_channel_members", "last_read_message_id"):
+        op.drop_column("chat_channel_members", "last_read_message_id")
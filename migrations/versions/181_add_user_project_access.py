@@ -0,0 +1,73 @@
+"""Add user_project_access (materialized user -> project access) and backfill it.
+
+One row per (user, project) with the user's time-entry count, assigned-task
+count and whether the project's client is one of the user's user_clients.
+
+Revision ID: 181_add_user_project_access
+Revises: 180_add_chat_read_watermark
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "181_add_user_project_access"
+down_revision = "180_add_chat_read_watermark"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "user_project_access"):
+        return
+    op.create_table(
+        "user_project_access",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("task_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("via_client", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "project_id"),
+    )
+    op.create_index("ix_user_project_access_project_id", "user_project_access", ["project_id"])
+    if not all(_has_table(inspector, t) for t in ("time_entries", "tasks", "user_clients", "projects", "users")):
+        return
+    op.execute("""
+        INSERT INTO user_project_access (user_id, project_id, entry_count, task_count, via_client, updated_at)
+        SELECT src.user_id, src.project_id, SUM(src.entries), SUM(src.tasks), MAX(src.via_client) > 0,
+               CURRENT_TIMESTAMP
+        FROM (
+            SELECT user_id, project_id, COUNT(*) AS entries, 0 AS tasks, 0 AS via_client
+            FROM time_entries WHERE project_id IS NOT NULL GROUP BY user_id, project_id
+            UNION ALL
+            SELECT assigned_to, project_id, 0, COUNT(*), 0
+            FROM tasks WHERE assigned_to IS NOT NULL GROUP BY assigned_to, project_id
+            UNION ALL
+            SELECT uc.user_id, p.id, 0, 0, 1
+            FROM user_clients uc JOIN projects p ON p.client_id = uc.client_id
+        ) src
+        JOIN users u ON u.id = src.user_id
+        JOIN projects p ON p.id = src.project_id
+        GROUP BY src.user_id, src.project_id
+        """)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "user_project_access"):
+        return
+    op.drop_index("ix_user_project_access_project_id", table_name="user_project_access")
+    op.drop_table("user_project_access")
@@ -0,0 +1,102 @@
+"""Add stored tracked-time and cost totals to tasks and projects and backfill them.
+
+tasks/projects.tracked_seconds and billable_seconds hold the duration of
+completed time entries; projects.costs_total and billable_costs_total hold
+project cost amounts.
+
+Revision ID: 182_add_tracked_totals
+Revises: 181_add_user_project_access
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "182_add_tracked_totals"
+down_revision = "181_add_user_project_access"
+branch_labels = None
+depends_on = None
+
+_SECONDS_COLUMNS = ("tracked_seconds", "billable_seconds")
+_COST_COLUMNS = ("costs_total", "billable_costs_total")
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def _has_column(inspector, table_name: str, column_name: str) -> bool:
+    try:
+        return column_name in {c["name"] for c in inspector.get_columns(table_name)}
+    except Exception:
+        return False
+
+
+def _add_columns(inspector, table_name, names, type_):
+    added = False
+    for name in names:
+        if not _has_column(inspector, table_name, name):
+            op.add_column(table_name, sa.Column(name, type_, nullable=False, server_default="0"))
+            added = True
+    return added
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "tasks") or not _has_table(inspector, "projects"):
+        return
+
+    if _add_columns(inspector, "tasks", _SECONDS_COLUMNS, sa.BigInteger()):
+        op.execute(
+            """
+            UPDATE tasks SET
+                tracked_seconds = (
+                    SELECT COALESCE(SUM(e.duration_seconds), 0) FROM time_entries e
+                    WHERE e.task_id = tasks.id AND e.end_time IS NOT NULL
+                ),
+                billable_seconds = (
+                    SELECT COALESCE(SUM(e.duration_seconds), 0) FROM time_entries e
+                    WHERE e.task_id = tasks.id AND e.end_time IS NOT NULL AND e.billable = TRUE
+                )
+            """
+        )
+    if _add_columns(inspector, "projects", _SECONDS_COLUMNS, sa.BigInteger()):
+        op.execute(
+            """
+            UPDATE projects SET
+                tracked_seconds = (
+                    SELECT COALESCE(SUM(e.duration_seconds), 0) FROM time_entries e
+                    WHERE e.project_id = projects.id AND e.end_time IS NOT NULL
+                ),
+                billable_seconds = (
+                    SELECT COALESCE(SUM(e.duration_seconds), 0) FROM time_entries e
+                    WHERE e.project_id = projects.id AND e.end_time IS NOT NULL AND e.billable = TRUE
+                )
+            """
+        )
+    if _add_columns(inspector, "projects", _COST_COLUMNS, sa.Numeric(12, 2)) and _has_table(inspector, "project_costs"):
+        op.execute(
+            """
+            UPDATE projects SET
+                costs_total = (
+                    SELECT COALESCE(SUM(c.amount), 0) FROM project_costs c WHERE c.project_id = projects.id
+                ),
+                billable_costs_total = (
+                    SELECT COALESCE(SUM(c.amount), 0) FROM project_costs c
+                    WHERE c.project_id = projects.id AND c.billable = TRUE
+                )
+            """
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table_name, names in (("tasks", _SECONDS_COLUMNS), ("projects", _SECONDS_COLUMNS + _COST_COLUMNS)):
+        for name in names:
+            if _has_column(inspector, table_name, name):
+                op.drop_column(table_name, name)
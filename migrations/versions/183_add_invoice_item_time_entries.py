@@ -0,0 +1,107 @@
+"""Add invoice_item_time_entries (invoice line -> time entry links) and backfill it.
+
+Indexed mirror of the comma-separated invoice_items.time_entry_ids, plus a
+partial index on billable, finished time entries, so unbilled time is found
+with an anti-join instead of parsing every invoice line.
+
+Revision ID: 183_add_invoice_item_time_entries
+Revises: 182_add_tracked_totals
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "183_add_invoice_item_time_entries"
+down_revision = "182_add_tracked_totals"
+branch_labels = None
+depends_on = None
+
+_BATCH_SIZE = 1000
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    try:
+        return index_name in {ix["name"] for ix in inspector.get_indexes(table_name)}
+    except Exception:
+        return False
+
+
+def _parse_ids(value):
+    ids = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part.isdigit() and int(part) not in ids:
+            ids.append(int(part))
+    return ids
+
+
+def _backfill(bind):
+    links = sa.table("invoice_item_time_entries", sa.column("invoice_item_id"), sa.column("time_entry_id"))
+    pairs = []
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, time_entry_ids FROM invoice_items WHERE time_entry_ids IS NOT NULL AND time_entry_ids != ''"
+        )
+    )
+    for item_id, value in rows:
+        pairs.extend((item_id, entry_id) for entry_id in _parse_ids(value))
+    existing = set()
+    entry_ids = sorted({entry_id for _, entry_id in pairs})
+    for start in range(0, len(entry_ids), _BATCH_SIZE):
+        chunk = entry_ids[start : start + _BATCH_SIZE]
+        found = bind.execute(
+            sa.text("SELECT id FROM time_entries WHERE id IN :ids").bindparams(sa.bindparam("ids", expanding=True)),
+            {"ids": chunk},
+        )
+        existing.update(row[0] for row in found)
+    values = [
+        {"invoice_item_id": item_id, "time_entry_id": entry_id} for item_id, entry_id in pairs if entry_id in existing
+    ]
+    for start in range(0, len(values), _BATCH_SIZE):
+        op.bulk_insert(links, values[start : start + _BATCH_SIZE])
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "invoice_items") or not _has_table(inspector, "time_entries"):
+        return
+
+    if not _has_table(inspector, "invoice_item_time_entries"):
+        op.create_table(
+            "invoice_item_time_entries",
+            sa.Column("invoice_item_id", sa.Integer(), nullable=False),
+            sa.Column("time_entry_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["invoice_item_id"], ["invoice_items.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["time_entry_id"], ["time_entries.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("invoice_item_id", "time_entry_id"),
+        )
+        op.create_index("ix_invoice_item_time_entries_time_entry_id", "invoice_item_time_entries", ["time_entry_id"])
+        _backfill(bind)
+
+    if not _has_index(inspector, "time_entries", "ix_time_entries_billable_completed"):
+        op.create_index(
+            "ix_time_entries_billable_completed",
+            "time_entries",
+            ["project_id", "start_time"],
+            postgresql_where=sa.text("billable = true AND end_time IS NOT NULL"),
+            sqlite_where=sa.text("billable = 1 AND end_time IS NOT NULL"),
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_index(inspector, "time_entries", "ix_time_entries_billable_completed"):
+        op.drop_index("ix_time_entries_billable_completed", table_name="time_entries")
+    if _has_table(inspector, "invoice_item_time_entries"):
+        op.drop_index("ix_invoice_item_time_entries_time_entry_id", table_name="invoice_item_time_entries")
+        op.drop_table("invoice_item_time_entries")
@@ -0,0 +1,56 @@
+"""Add integration_sync_records (content hashes for incremental integration syncs).
+
+Revision ID: 185_add_integration_sync_records
+Revises: 184_add_email_outbox
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "185_add_integration_sync_records"
+down_revision = "184_add_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "integration_sync_records"):
+        return
+    op.create_table(
+        "integration_sync_records",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "integration_id",
+            sa.Integer(),
+            sa.ForeignKey("integrations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("resource", sa.String(length=255), nullable=False),
+        sa.Column("external_id", sa.String(length=255), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("source_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint(
+            "integration_id", "resource", "external_id", name="uq_integration_sync_records_integration_record"
+        ),
+    )
+    op.create_index("ix_integration_sync_records_integration_id", "integration_sync_records", ["integration_id"])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "integration_sync_records"):
+        return
+    op.drop_index("ix_integration_sync_records_integration_id", table_name="integration_sync_records")
+    op.drop_table("integration_sync_records")
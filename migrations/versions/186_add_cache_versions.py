@@ -0,0 +1,45 @@
+"""Add cache_versions (cross-process invalidation of the permission cache).
+
+Revision ID: 186_add_cache_versions
+Revises: 185_add_integration_sync_records
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "186_add_cache_versions"
+down_revision = "185_add_integration_sync_records"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "cache_versions"):
+        return
+    cache_versions = op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.bulk_insert(cache_versions, [{"name": "access", "version": 0, "updated_at": datetime.utcnow()}])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "cache_versions"):
+        return
+    op.drop_table("cache_versions")
@@ -0,0 +1,69 @@
+"""Order the sync change log by commit sequence instead of flush-time id.
+
+Existing rows are all committed; they keep their id as their sequence number
+and the counter continues after the highest id, so watermarks issued before
+this migration (which carry only an id) resume at the same position.
+
+Revision ID: 187_add_sync_change_commit_seq
+Revises: 186_add_cache_versions
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "187_add_sync_change_commit_seq"
+down_revision = "186_add_cache_versions"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    try:
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def _has_column(inspector, table_name: str, column_name: str) -> bool:
+    try:
+        return column_name in {c["name"] for c in inspector.get_columns(table_name)}
+    except Exception:
+        return False
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    try:
+        return any((idx.get("name") or "") == index_name for idx in inspector.get_indexes(table_name))
+    except Exception:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if not _has_table(inspector, "sync_changes"):
+        return
+    if not _has_column(inspector, "sync_changes", "commit_seq"):
+        op.add_column("sync_changes", sa.Column("commit_seq", sa.BigInteger(), nullable=True))
+        op.execute("UPDATE sync_changes SET commit_seq = id")
+    if not _has_index(inspector, "sync_changes", "ix_sync_changes_commit_seq"):
+        op.create_index("ix_sync_changes_commit_seq", "sync_changes", ["commit_seq", "id"])
+    if not _has_table(inspector, "sync_change_sequence"):
+        op.create_table(
+            "sync_change_sequence",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+        op.execute("INSERT INTO sync_change_sequence (id, value) SELECT 1, COALESCE(MAX(id), 0) FROM sync_changes")
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if _has_table(inspector, "sync_change_sequence"):
+        op.drop_table("sync_change_sequence")
+    if _has_index(inspector, "sync_changes", "ix_sync_changes_commit_seq"):
+        op.drop_index("ix_sync_changes_commit_seq", table_name="sync_changes")
+    if _has_column(inspector, "sync_changes", "commit_seq"):
+        op.drop_column("sync_changes", "commit_seq")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""Measure the audit-log overhead of typical time-entry flushes.
+
+Runs start / stop / edit / delete cycles on a throwaway SQLite database,
+alternating rounds with the audit listeners attached and detached, and
+reports the median time per flush of each, the audit rows written and the
+bytes they store.
+
+Usage: python scripts/benchmark_audit_flush.py [--cycles 100] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event, func  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.utils import audit  # noqa: E402
+
+FLUSHES_PER_CYCLE = 4
+
+
+def _audit_listeners():
+    return (("before_flush", audit.receive_before_flush), ("after_flush", audit.receive_after_flush))
+
+
+def _detach_audit():
+    """Remove the audit flush listeners from every session class they were attached to; return them"""
+    detached = []
+    for target in {Session, type(db.session())}:
+        for name, fn in _audit_listeners():
+            if event.contains(target, name, fn):
+                event.remove(target, name, fn)
+                detached.append((target, name, fn))
+    return detached
+
+
+def _attach(listeners):
+    for target, name, fn in listeners:
+        event.listen(target, name, fn)
+
+
+def _run_cycles(cycles, user_id, project_id):
+    from app.models import TimeEntry
+
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    began = time.perf_counter()
+    for i in range(cycles):
+        entry = TimeEntry(user_id=user_id, project_id=project_id, start_time=start + timedelta(hours=i), notes="timer")
+        db.session.add(entry)
+        db.session.commit()
+
+        # Each step reloads the entry, as a request handling it would
+        db.session.refresh(entry)
+        entry.stop_timer(end_time=entry.start_time + timedelta(minutes=45))
+
+        db.session.refresh(entry)
+        entry.notes = "reviewed"
+        entry.billable = not entry.billable
+        entry.tags = "benchmark"
+        db.session.commit()
+
+        db.session.refresh(entry)
+        db.session.delete(entry)
+        db.session.commit()
+    return time.perf_counter() - began
+
+
+def _audit_volume():
+    from app.models.audit_log import AuditLog
+
+    columns = [
+        AuditLog.old_value,
+        AuditLog.new_value,
+        AuditLog.full_old_state,
+        AuditLog.full_new_state,
+        AuditLog.change_description,
+    ]
+    rows = db.session.query(func.count(AuditLog.id)).scalar() or 0
+    size = sum(db.session.query(func.coalesce(func.sum(func.length(c)), 0)).scalar() or 0 for c in columns)
+    if hasattr(AuditLog, "changes"):
+        size += db.session.query(func.coalesce(func.sum(func.length(AuditLog.changes)), 0)).scalar() or 0
+    try:
+        from app.models.audit_log import AuditSnapshot
+
+        size += db.session.query(func.coalesce(func.sum(func.length(AuditSnapshot.state)), 0)).scalar() or 0
+    except ImportError:
+        pass
+    return rows, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=100, help="cycles per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), f"audit_bench_{os.getpid()}.sqlite")
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+            "WTF_CSRF_ENABLED": False,
+            "SECRET_KEY": "benchmark",
+        }
+    )
+    try:
+        with app.app_context():
+            from app.models import Client, Project, User
+
+            db.create_all()
+            audit.reset_audit_table_cache()
+            user = User(username="bench", role="user")
+            client = Client(name="Bench Client")
+            db.session.add_all([user, client])
+            db.session.commit()
+            project = Project(name="Bench Project", client_id=client.id)
+            db.session.add(project)
+            db.session.commit()
+            baseline_rows, baseline_size = _audit_volume()
+
+            with_audit, without_audit = [], []
+            for _ in range(args.rounds):
+                with_audit.append(_run_cycles(args.cycles, user.id, project.id))
+                listeners = _detach_audit()
+                without_audit.append(_run_cycles(args.cycles, user.id, project.id))
+                _attach(listeners)
+            rows, size = _audit_volume()
+            rows -= baseline_rows
+            size -= baseline_size
+
+        flushes = args.cycles * FLUSHES_PER_CYCLE
+        cycles = args.cycles * args.rounds
+        with_ms = statistics.median(with_audit) / flushes * 1000
+        without_ms = statistics.median(without_audit) / flushes * 1000
+        print(f"rounds: {args.rounds} x {args.cycles} cycles ({flushes} flushes per round)")
+        print(f"with audit:    {with_ms:.3f} ms/flush (median)")
+        print(f"without audit: {without_ms:.3f} ms/flush (median)")
+        print(f"audit overhead: {with_ms - without_ms:.3f} ms/flush")
+        print(f"audit rows: {rows} ({rows / cycles:.1f} per cycle)")
+        print(f"audit bytes: {size} ({size / cycles:.0f} per cycle)")
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Measure Socket.IO fan-out cost of room-scoped vs. broadcast events.
+
+Connects N authenticated in-process test sockets, subscribes a fixed number of
+them to one Kanban board room and times emits to that room against emits to
+every connection. Room emits should cost the same whatever N is; broadcasts
+grow with N.
+
+Usage: python scripts/benchmark_socketio_fanout.py [--connections 100 500 1000] [--subscribers 10] [--emits 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app, db, socketio  # noqa: E402
+from app.utils.realtime import project_board_room  # noqa: E402
+
+
+def _time_emits(sockets, emits, **target):
+    began = time.perf_counter()
+    for i in range(emits):
+        socketio.emit("kanban_columns_updated", {"action": "benchmark", "seq": i}, namespace="/", **target)
+    elapsed = time.perf_counter() - began
+    delivered = sum(len(sock.get_received()) for sock in sockets)
+    return elapsed / emits * 1_000_000, delivered / emits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--subscribers", type=int, default=10)
+    parser.add_argument("--emits", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), f"socketio_bench_{os.getpid()}.sqlite")
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+            "WTF_CSRF_ENABLED": False,
+            "RATELIMIT_ENABLED": False,
+            "SECRET_KEY": "benchmark",
+            "SOCKETIO_MESSAGE_QUEUE": "none",
+        }
+    )
+    room = project_board_room(None)
+    try:
+        with app.app_context():
+            from app.models import User
+
+            db.create_all()
+            user = User(username="bench", role="user")
+            user.set_password("benchmark")
+            db.session.add(user)
+            db.session.commit()
+
+        # Fresh app contexts per socket call, as in a server (Flask-Login caches the user on ``g``)
+        with app.app_context():
+            http = app.test_client()
+            http.post("/login", data={"username": "bench", "password": "benchmark"})
+
+        sockets = []
+        print(f"{'connections':>11} {'room us/emit':>13} {'delivered':>9} {'broadcast us/emit':>18} {'delivered':>9}")
+        for total in sorted(args.connections):
+            while len(sockets) < total:
+                with app.app_context():
+                    sock = socketio.test_client(app, flask_test_client=http)
+                    if len(sockets) < args.subscribers:
+                        sock.emit("join_project_board", {"project_id": None})
+                sockets.append(sock)
+            for sock in sockets:
+                sock.get_received()
+
+            room_us, broadcast_us = [], []
+            for _ in range(args.rounds):
+                us, room_delivered = _time_emits(sockets, args.emits, room=room)
+                room_us.append(us)
+                us, broadcast_delivered = _time_emits(sockets, args.emits)
+                broadcast_us.append(us)
+            print(
+                f"{total:>11} {statistics.median(room_us):>13.1f} {room_delivered:>9.0f} "
+                f"{statistics.median(broadcast_us):>18.1f} {broadcast_delivered:>9.0f}"
+            )
+
+        for sock in sockets:
+            sock.disconnect()
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
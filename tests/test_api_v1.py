@@ -549,6 +549,72 @@ class TestPagination:
         data = json.loads(response.data)
         assert data["pagination"]["page"] == 2
 
+    def test_time_entries_cursor_pagination(self, client, api_token, test_user, test_project):
+        """Cursor mode walks every entry exactly once, including ties on start_time"""
+        start = datetime(2024, 1, 15, 9, 0)
+        for i in range(7):
+            # Pairs of entries share a start_time so the id tiebreaker is exercised
+            entry_start = start + timedelta(hours=i // 2)
+            db.session.add(
+                TimeEntry(
+                    user_id=int(test_user),
+                    project_id=test_project.id,
+                    start_time=entry_start,
+                    end_time=entry_start + timedelta(minutes=30),
+                    source="api",
+                )
+            )
+        db.session.commit()
+        expected = [e.id for e in TimeEntry.query.order_by(TimeEntry.start_time.desc(), TimeEntry.id.desc()).all()]
+
+        headers = {"Authorization": f"Bearer {api_token}"}
+        seen, cursor, pages = [], "", 0
+        while cursor is not None:
+            response = client.get(
+                "/api/v1/time-entries", query_string={"cursor": cursor, "per_page": 3}, headers=headers
+            )
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            seen.extend(e["id"] for e in data["time_entries"])
+            assert data["pagination"]["total"] == 7
+            cursor = data["pagination"]["next_cursor"]
+            pages += 1
+        assert seen == expected
+        assert pages == 3
+
+        response = client.get("/api/v1/time-entries?cursor=&per_page=3&include_total=false", headers=headers)
+        data = json.loads(response.data)
+        assert data["pagination"]["total"] is None
+        assert data["pagination"]["has_next"] is True
+
+    def test_invalid_cursor_rejected(self, client, api_token):
+        """Tampered cursors return 400"""
+        headers = {"Authorization": f"Bearer {api_token}"}
+        response = client.get("/api/v1/time-entries?cursor=not-a-cursor", headers=headers)
+        assert response.status_code == 400
+
+    def test_offset_without_total(self, client, api_token, test_user, test_project):
+        """include_total=false keeps offset paging but skips the count"""
+        for i in range(4):
+            db.session.add(
+                TimeEntry(
+                    user_id=int(test_user),
+                    project_id=test_project.id,
+                    start_time=datetime(2024, 1, 15, 9 + i, 0),
+                    end_time=datetime(2024, 1, 15, 9 + i, 30),
+                    source="api",
+                )
+            )
+        db.session.commit()
+
+        headers = {"Authorization": f"Bearer {api_token}"}
+        response = client.get("/api/v1/time-entries?page=2&per_page=3&include_total=false", headers=headers)
+        data = json.loads(response.data)
+        assert len(data["time_entries"]) == 1
+        assert data["pagination"]["total"] is None
+        assert data["pagination"]["has_next"] is False
+        assert data["pagination"]["prev_page"] == 1
+
 
 class TestSystemEndpoints:
     """Test system endpoints"""
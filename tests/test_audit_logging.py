@@ -94,9 +94,7 @@ class TestAuditLoggingIntegration:
             merged.name = "Updated Project Name"
             db.session.flush()
 
-            audit_logs = AuditLog.query.filter_by(
-                entity_type="Project", entity_id=project_id, action="updated"
-            ).all()
+            audit_logs = AuditLog.query.filter_by(entity_type="Project", entity_id=project_id, action="updated").all()
             assert len(audit_logs) >= 1, "At least one audit log should be created for entity update"
             assert audit_logs[0].action == "updated"
             assert audit_logs[0].entity_type == "Project"
@@ -113,3 +111,47 @@ class TestAuditLoggingIntegration:
             assert len(audit_logs) >= 1, "At least one audit log should be created for entity delete"
             assert audit_logs[0].action == "deleted"
             assert audit_logs[0].entity_type == "Project"
+
+    def test_one_compact_record_per_entity_per_flush(self, app, test_user, test_project):
+        """A multi-field update writes one row with a diff map; TimeEntry states are shared snapshots"""
+        from datetime import timedelta
+
+        from app.models import AuditSnapshot, TimeEntry
+
+        with app.app_context():
+            start = datetime(2024, 1, 1, 9, 0, 0)
+            entry = TimeEntry(user_id=test_user.id, project_id=test_project.id, start_time=start, notes="timer")
+            db.session.add(entry)
+            db.session.commit()
+            entry_id = entry.id
+
+            entry = db.session.get(TimeEntry, entry_id)
+            entry.stop_timer(end_time=start + timedelta(minutes=45))
+
+            logs = AuditLog.query.filter_by(entity_type="TimeEntry", entity_id=entry_id).order_by(AuditLog.id).all()
+            assert [log.action for log in logs] == ["created", "updated"]
+            created, stopped = logs
+            changes = stopped.get_changes()
+            assert set(changes) == {"end_time", "duration_seconds"}
+            assert changes["end_time"]["new"] == "2024-01-01T09:45:00"
+            assert stopped.field_name is None and "end_time" in stopped.change_description
+
+            # The state before the stop is the state stored when the entry was created
+            assert stopped.old_state_digest == created.new_state_digest
+            assert stopped.get_full_old_state()["end_time"] is None
+            assert stopped.get_full_new_state()["duration_seconds"] == 2700
+            assert stopped.get_full_old_state()["project_name"] == test_project.name
+            assert AuditSnapshot.query.count() == 2
+            assert stopped.to_dict()["changes"] == changes
+
+    def test_single_field_update_keeps_field_name(self, app, test_user, test_project):
+        """Single-field rows stay filterable by field_name and expose old/new values"""
+        with app.app_context():
+            project = db.session.merge(test_project)
+            old_name = project.name
+            project.name = "Renamed Project"
+            db.session.flush()
+
+            log = AuditLog.query.filter_by(entity_type="Project", entity_id=project.id, action="updated").one()
+            assert log.field_name == "name"
+            assert (log.get_old_value(), log.get_new_value()) == (old_name, "Renamed Project")
@@ -88,9 +88,10 @@ class TestSendEmail:
     """Tests for sending emails"""
 
     @patch("app.utils.email.mail.send")
-    @patch("app.utils.email.Thread")
-    def test_send_email_success(self, mock_thread, mock_send, app):
+    def test_send_email_success(self, mock_send, app):
         """Test sending email successfully"""
+        from app.models import EmailOutboxMessage
+
         with app.app_context():
             app.config["MAIL_SERVER"] = "smtp.gmail.com"
 
@@ -101,8 +102,11 @@ class TestSendEmail:
                 html_body="<p>Test body</p>",
             )
 
-            # Verify thread was started for async sending
-            assert mock_thread.called
+            # Verify the email was queued in the outbox instead of sent inline
+            queued = EmailOutboxMessage.query.one()
+            assert queued.status == EmailOutboxMessage.STATUS_PENDING
+            assert queued.recipients == ["test@example.com"]
+            assert not mock_send.called
 
     def test_send_email_no_server(self, app):
         """Test sending email with no mail server configured"""
@@ -118,10 +118,10 @@ Test Project 2,Test Client 2,,2024-01-01 09:00:00,2024-01-01 10:00:00,1.0,CSV im
             "/api/import/csv", data=data, content_type="multipart/form-data", headers=auth_headers
         )
 
-        assert response.status_code == 200
+        assert response.status_code == 202
         result = json.loads(response.data)
         assert result["success"] is True
-        assert result["summary"]["successful"] >= 0
+        assert result["status_url"] == f"/api/import/status/{result['import_id']}"
 
     def test_csv_import_no_file(self, app, client_fixture, auth_headers):
         """Test CSV import with no file"""
@@ -151,17 +151,17 @@ class TestGDPRExport:
         """Test GDPR export in JSON format"""
         response = client_fixture.post("/api/export/gdpr", json={"format": "json"}, headers=auth_headers)
 
-        assert response.status_code == 200
+        assert response.status_code == 202
         result = json.loads(response.data)
         assert result["success"] is True
         assert "export_id" in result
-        assert "download_url" in result
+        assert "status_url" in result
 
     def test_gdpr_export_zip(self, app, client_fixture, auth_headers):
         """Test GDPR export in ZIP format"""
         response = client_fixture.post("/api/export/gdpr", json={"format": "zip"}, headers=auth_headers)
 
-        assert response.status_code == 200
+        assert response.status_code == 202
         result = json.loads(response.data)
         assert result["success"] is True
         assert "export_id" in result
@@ -219,11 +219,11 @@ class TestBackupRestore:
         """Test successful backup creation"""
         response = client_fixture.post("/api/export/backup", headers=admin_auth_headers)
 
-        assert response.status_code == 200
+        assert response.status_code == 202
         result = json.loads(response.data)
         assert result["success"] is True
         assert "export_id" in result
-        assert "download_url" in result
+        assert "status_url" in result
 
 
 class TestImportHistory:
@@ -13,6 +13,7 @@ pytestmark = [pytest.mark.integration]
 
 from app.integrations.jira import JiraConnector, JIRA_ISSUE_KEY_PATTERN
 from app.models import Integration, User
+from app.utils.integration_sync_state import content_hash
 
 
 @pytest.fixture
@@ -414,6 +415,153 @@ class TestJiraSyncIssue:
         mock_get.assert_not_called()
 
 
+def _jira_issue(issue_id, key, updated, summary="Issue", status="To Do"):
+    return {
+        "id": str(issue_id),
+        "key": key,
+        "fields": {
+            "summary": summary,
+            "description": None,
+            "status": {"name": status},
+            "project": {"key": "PROJ"},
+            "updated": updated,
+        },
+    }
+
+
+def _jira_page(issues, next_token=None):
+    body = {"issues": issues, "isLast": next_token is None}
+    if next_token:
+        body["nextPageToken"] = next_token
+    return Mock(status_code=200, json=Mock(return_value=body))
+
+
+class TestJiraIncrementalSync:
+    """sync_data pages through the search and resumes from the stored watermark."""
+
+    def test_full_sync_follows_page_tokens_and_stores_watermark(self, jira_integration):
+        from app.models import IntegrationSyncRecord, Task
+
+        connector = JiraConnector(jira_integration, None)
+        pages = [
+            _jira_page([_jira_issue(10001, "PROJ-1", "2026-01-05T10:30:00.000+0000")], next_token="t2"),
+            _jira_page([_jira_issue(10002, "PROJ-2", "2026-01-05T11:30:00.000+0100")]),
+        ]
+        with patch.object(connector, "get_access_token", return_value="mock-token"):
+            with patch.object(connector, "http_request", side_effect=pages) as mock_request:
+                result = connector.sync_data()
+
+        assert result["success"] is True and result["synced_items"] == 2
+        first, second = (c.kwargs["params"] for c in mock_request.call_args_list)
+        assert first["jql"] == "assignee = currentUser() AND status != Done ORDER BY updated ASC, key ASC"
+        assert "nextPageToken" not in first and second["nextPageToken"] == "t2"
+        assert {t.name for t in Task.query.all()} >= {"PROJ-1", "PROJ-2"}
+        assert IntegrationSyncRecord.query.filter_by(integration_id=jira_integration.id).count() == 2
+        # Both issues changed at 10:30 UTC (PROJ-2 reports +0100); the larger id breaks the tie
+        watermark = jira_integration.config["sync_watermarks"]["issues"]
+        assert watermark["updated_at"] == "2026-01-05T10:30:00" and watermark["id"] == "10002"
+        assert watermark["salt"] == content_hash(connector.sync_content_salt())
+
+    def test_incremental_sync_skips_seen_and_unchanged_issues(self, jira_integration):
+        from app.models import Task
+
+        connector = JiraConnector(jira_integration, None)
+        issue_1 = _jira_issue(10001, "PROJ-1", "2026-01-05T10:00:00.000+0000")
+        issue_2 = _jira_issue(10002, "PROJ-2", "2026-01-05T10:00:00.000+0000")
+        with patch.object(connector, "get_access_token", return_value="mock-token"):
+            with patch.object(connector, "http_request", return_value=_jira_page([issue_1, issue_2])):
+                connector.sync_data(sync_type="incremental")
+
+            # PROJ-1 is unchanged at the watermark, PROJ-2 only got a newer timestamp, PROJ-3 is new
+            touched = dict(issue_2, fields=dict(issue_2["fields"], updated="2026-01-05T12:00:00.000+0000"))
+            new = _jira_issue(10003, "PROJ-3", "2026-01-05T12:00:00.000+0000", status="In Progress")
+            page = _jira_page([issue_1, touched, new])
+            with patch.object(connector, "http_request", return_value=page) as mock_request:
+                upsert_spy = patch.object(connector, "_upsert_task_from_issue", wraps=connector._upsert_task_from_issue)
+                with upsert_spy as upsert:
+                    result = connector.sync_data(sync_type="incremental")
+
+        jql = mock_request.call_args.kwargs["params"]["jql"]
+        assert jql.startswith("(assignee = currentUser() AND status != Done) AND updated >= ")
+        assert jql.endswith(" ORDER BY updated ASC, key ASC")
+        assert [c.args[0]["key"] for c in upsert.call_args_list] == ["PROJ-3"]
+        assert result["synced_items"] == 1 and result["unchanged_items"] == 2
+        assert Task.query.filter_by(name="PROJ-3").one().status == "in_progress"
+        assert jira_integration.config["sync_watermarks"]["issues"]["id"] == "10003"
+
+    def test_failed_page_keeps_watermark(self, jira_integration):
+        connector = JiraConnector(jira_integration, None)
+        pages = [
+            _jira_page([_jira_issue(10001, "PROJ-1", "2026-01-05T10:00:00.000+0000")], next_token="t2"),
+            Mock(status_code=503),
+        ]
+        with patch.object(connector, "get_access_token", return_value="mock-token"):
+            with patch.object(connector, "http_request", side_effect=pages):
+                result = connector.sync_data(sync_type="incremental")
+
+        assert result["success"] is True and result["synced_items"] == 1
+        assert "503" in result["errors"][0]
+        assert "sync_watermarks" not in jira_integration.config
+
+    def test_page_cap_keeps_the_watermark_reached_so_far(self, jira_integration):
+        connector = JiraConnector(jira_integration, None)
+        connector.SYNC_MAX_PAGES = 1
+        pages = [
+            _jira_page([_jira_issue(10001, "PROJ-1", "2026-01-05T10:00:00.000+0000")], next_token="t2"),
+            _jira_page([_jira_issue(10002, "PROJ-2", "2026-01-05T11:00:00.000+0000")]),
+        ]
+        with patch.object(connector, "get_access_token", return_value="mock-token"):
+            with patch.object(connector, "http_request", side_effect=pages[:1]):
+                first = connector.sync_data()
+            assert "Stopped issues after 1 pages" in first["errors"][0]
+            assert jira_integration.config["sync_watermarks"]["issues"]["id"] == "10001"
+
+            # The next run resumes after PROJ-1 instead of starting over
+            with patch.object(connector, "http_request", side_effect=pages[1:]) as mock_request:
+                second = connector.sync_data(sync_type="incremental")
+
+        assert "updated >= " in mock_request.call_args.kwargs["params"]["jql"]
+        assert second["synced_items"] == 1 and not second.get("errors")
+        assert jira_integration.config["sync_watermarks"]["issues"]["id"] == "10002"
+
+    def test_overlap_window_picks_up_issue_missed_below_the_watermark(self, jira_integration):
+        from app.models import Task
+
+        connector = JiraConnector(jira_integration, None)
+        newer = _jira_issue(10002, "PROJ-2", "2026-01-05T12:00:00.000+0000")
+        with patch.object(connector, "get_access_token", return_value="mock-token"):
+            with patch.object(connector, "http_request", return_value=_jira_page([newer])):
+                connector.sync_data()
+
+            # PROJ-1 changed before the watermark but was not returned by the first run
+            missed = _jira_issue(10001, "PROJ-1", "2026-01-05T11:00:00.000+0000")
+            with patch.object(connector, "http_request", return_value=_jira_page([missed, newer])):
+                result = connector.sync_data(sync_type="incremental")
+
+        assert result["synced_items"] == 1 and result["unchanged_items"] == 1
+        assert Task.query.filter_by(name="PROJ-1").count() == 1
+        assert jira_integration.config["sync_watermarks"]["issues"]["id"] == "10002"
+
+    def test_changed_status_mapping_resets_the_watermark(self, jira_integration):
+        from app.models import Task
+
+        connector = JiraConnector(jira_integration, None)
+        page = _jira_page([_jira_issue(10001, "PROJ-1", "2026-01-05T10:00:00.000+0000", status="Waiting")])
+        with patch.object(connector, "get_access_token", return_value="mock-token"):
+            with patch.object(connector, "http_request", return_value=page):
+                connector.sync_data()
+            assert Task.query.filter_by(name="PROJ-1").one().status == "todo"
+
+            jira_integration.config = dict(jira_integration.config, status_mappings={"Waiting": "review"})
+            with patch.object(connector, "http_request", return_value=page) as mock_request:
+                result = connector.sync_data(sync_type="incremental")
+
+        # The mark was stored under the old mapping, so the issue is fetched and mapped again
+        assert "updated >= " not in mock_request.call_args.kwargs["params"]["jql"]
+        assert result["synced_items"] == 1
+        assert Task.query.filter_by(name="PROJ-1").one().status == "review"
+
+
 class TestJiraWebhookRoute:
     """HTTP-level tests for POST /integrations/<provider>/webhook."""
 
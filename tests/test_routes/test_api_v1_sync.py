@@ -0,0 +1,136 @@
+"""
+Tests for the /api/v1/sync delta feed and its change log.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.api, pytest.mark.integration]
+
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import ApiToken, SyncChange, TimeEntry, User
+from app.utils.sync_changes import _SESSION_INFO_KEY, encode_watermark, prune_sync_changes
+
+
+@pytest.fixture
+def sync_client(app, user):
+    token, plain_token = ApiToken.create_token(
+        user_id=user.id, name="Sync Token", scopes="read:time_entries,read:projects,read:tasks"
+    )
+    db.session.add(token)
+    db.session.commit()
+    test_client = app.test_client()
+    test_client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {plain_token}"
+    return test_client
+
+
+def _entry(user_id, project_id, hours=1):
+    start = datetime(2026, 3, 2, 9, 0)
+    return TimeEntry(user_id=user_id, project_id=project_id, start_time=start, end_time=start + timedelta(hours=hours))
+
+
+def _sync(client, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    response = client.get("/api/v1/sync", query_string=params)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+class TestSyncFeed:
+    def test_created_updated_deleted_since_watermark(self, app, sync_client, user, project, task):
+        watermark = _sync(sync_client)["watermark"]
+
+        kept = _entry(user.id, project.id)
+        dropped = _entry(user.id, project.id)
+        db.session.add_all([kept, dropped])
+        db.session.commit()
+        kept.notes = "edited"
+        db.session.delete(dropped)
+        task.name = "Renamed task"
+        db.session.commit()
+
+        data = _sync(sync_client, watermark)
+        changes = {(c["type"], c["id"]): c for c in data["changes"]}
+        assert data["has_more"] is False and data["reset"] is False
+        assert changes[("time_entries", kept.id)]["op"] == "upsert"
+        assert changes[("time_entries", kept.id)]["data"]["notes"] == "edited"
+        assert changes[("time_entries", dropped.id)] == {"type": "time_entries", "id": dropped.id, "op": "delete"}
+        assert changes[("tasks", task.id)]["data"]["name"] == "Renamed task"
+
+        # Nothing new after the returned watermark
+        assert _sync(sync_client, data["watermark"])["changes"] == []
+
+    def test_paginated_and_filtered_by_type(self, app, sync_client, user, project):
+        watermark = _sync(sync_client)["watermark"]
+        entries = [_entry(user.id, project.id, hours=h) for h in (1, 2, 3)]
+        db.session.add_all(entries)
+        db.session.commit()
+        project.description = "changed"
+        db.session.commit()
+
+        seen = []
+        while True:
+            data = _sync(sync_client, watermark, types="time_entries", limit=2)
+            seen.extend(c["id"] for c in data["changes"])
+            watermark = data["watermark"]
+            if not data["has_more"]:
+                break
+        assert seen == [e.id for e in entries]
+
+    def test_earlier_flush_committed_last_is_not_skipped(self, app, sync_client, user, project):
+        watermark = _sync(sync_client)["watermark"]
+
+        # A flushes first (lower id) but its commit is held back: the row stays unstamped
+        slow = _entry(user.id, project.id)
+        db.session.add(slow)
+        db.session.flush()
+        pending = db.session.info.pop(_SESSION_INFO_KEY)
+        db.session.commit()
+        fast = _entry(user.id, project.id)
+        db.session.add(fast)
+        db.session.commit()
+        assert slow.id < fast.id
+
+        data = _sync(sync_client, watermark, types="time_entries")
+        assert [c["id"] for c in data["changes"]] == [fast.id]
+
+        # A's commit lands now and is ordered after B
+        db.session.info[_SESSION_INFO_KEY] = pending
+        db.session.commit()
+        data = _sync(sync_client, data["watermark"], types="time_entries")
+        assert [c["id"] for c in data["changes"]] == [slow.id]
+        assert _sync(sync_client, data["watermark"])["changes"] == []
+
+    def test_scoped_to_own_entries_with_tombstone_on_reassign(self, app, sync_client, user, project):
+        other = User(username="sync_other", role="user")
+        db.session.add(other)
+        db.session.commit()
+        watermark = _sync(sync_client)["watermark"]
+
+        theirs = _entry(other.id, project.id)
+        mine = _entry(user.id, project.id)
+        db.session.add_all([theirs, mine])
+        db.session.commit()
+        data = _sync(sync_client, watermark, types="time_entries")
+        assert [c["id"] for c in data["changes"]] == [mine.id]
+
+        mine.user_id = other.id
+        db.session.commit()
+        data = _sync(sync_client, data["watermark"], types="time_entries")
+        assert data["changes"] == [{"type": "time_entries", "id": mine.id, "op": "delete"}]
+
+    def test_invalid_and_expired_watermarks(self, app, sync_client, user, project):
+        response = sync_client.get("/api/v1/sync?since=bogus")
+        assert response.status_code == 400
+
+        db.session.add(_entry(user.id, project.id))
+        db.session.commit()
+        old = encode_watermark((0, 0), datetime.utcnow() - timedelta(days=40))
+        assert _sync(sync_client, old)["reset"] is True
+
+        db.session.query(SyncChange).update({"changed_at": datetime.utcnow() - timedelta(days=40)})
+        db.session.commit()
+        assert prune_sync_changes() >= 1
+        assert SyncChange.query.count() == 0
@@ -0,0 +1,68 @@
+"""
+Tests for team chat read watermarks (ChatChannelMember.last_read_message_id).
+"""
+
+import pytest
+
+from app import db
+from app.models import User
+from app.models.team_chat import ChatChannel, ChatChannelMember, ChatMessage, ChatReadReceipt
+
+
+@pytest.fixture
+def chat(app, user):
+    other = User(username="chat_other", role="user")
+    other.set_password("password123")
+    db.session.add(other)
+    db.session.flush()
+    channel = ChatChannel(name="General", channel_type="public", created_by=user.id)
+    db.session.add(channel)
+    db.session.flush()
+    db.session.add_all(
+        [
+            ChatChannelMember(channel_id=channel.id, user_id=user.id, is_admin=True),
+            ChatChannelMember(channel_id=channel.id, user_id=other.id),
+        ]
+    )
+    messages = [ChatMessage(channel_id=channel.id, user_id=other.id, message=f"m{i}") for i in range(4)]
+    messages.append(ChatMessage(channel_id=channel.id, user_id=user.id, message="mine"))
+    messages.append(ChatMessage(channel_id=channel.id, user_id=other.id, message="gone", is_deleted=True))
+    db.session.add_all(messages)
+    db.session.commit()
+    return channel, messages
+
+
+@pytest.mark.models
+def test_unread_counts_follow_the_watermark(app, user, chat):
+    channel, messages = chat
+    # Own and deleted messages never count
+    assert ChatChannelMember.unread_counts(user.id) == {channel.id: 4}
+
+    assert ChatChannelMember.mark_read(channel.id, user.id, messages[1].id) is True
+    db.session.commit()
+    assert ChatChannelMember.unread_counts(user.id) == {channel.id: 2}
+
+    # The watermark never moves back
+    assert ChatChannelMember.mark_read(channel.id, user.id, messages[0].id) is False
+    assert ChatChannelMember.unread_counts(user.id, [channel.id]) == {channel.id: 2}
+
+
+@pytest.mark.api
+def test_fetching_messages_is_read_only(app, user, chat, authenticated_client):
+    channel, messages = chat
+
+    response = authenticated_client.get(f"/api/chat/channels/{channel.id}/messages")
+    assert response.status_code == 200
+    assert len(response.get_json()["messages"]) == 5
+    assert response.get_json()["last_read_message_id"] is None
+    assert ChatReadReceipt.query.count() == 0
+
+    listed = authenticated_client.get("/api/chat/channels").get_json()
+    assert [(c["id"], c["unread_count"], c["message_count"]) for c in listed["channels"]] == [(channel.id, 4, 6)]
+    assert listed["unread_total"] == 4
+
+    marked = authenticated_client.post(f"/api/chat/channels/{channel.id}/read", json={"message_id": messages[2].id})
+    assert marked.get_json()["unread_count"] == 1
+    marked = authenticated_client.post(f"/api/chat/channels/{channel.id}/read", json={})
+    assert marked.get_json() == {"success": True, "last_read_message_id": messages[-1].id, "unread_count": 0}
+    assert authenticated_client.get("/api/chat/channels").get_json()["unread_total"] == 0
@@ -0,0 +1,102 @@
+"""Tests for the batched OTLP analytics exporter."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.telemetry.exporter import EVENTS_DROPPED, OTLPLogBatchExporter
+
+RESOURCE = [{"key": "service.name", "value": {"stringValue": "timetracker"}}]
+HEADERS = {"Content-Type": "application/json", "Authorization": "Basic x"}
+
+
+def _record(name):
+    return {"body": {"stringValue": name}, "attributes": []}
+
+
+class _Sender:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.payloads = []
+
+    def __call__(self, endpoint, headers, payload, timeout):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("collector unavailable")
+        self.payloads.append((endpoint, payload))
+        return 200
+
+
+def _names(payload):
+    records = payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]
+    return [r["body"]["stringValue"] for r in records]
+
+
+def test_records_are_batched_per_endpoint():
+    sender = _Sender()
+    exporter = OTLPLogBatchExporter(batch_size=10, flush_interval=60, sender=sender)
+    with patch.object(exporter, "start"):
+        for name in ("a", "b", "c"):
+            assert exporter.submit("https://one/v1/logs", HEADERS, RESOURCE, _record(name))
+        exporter.submit("https://two/v1/logs", HEADERS, RESOURCE, _record("d"))
+
+    assert exporter.flush() == 4
+    assert [(endpoint, _names(payload)) for endpoint, payload in sender.payloads] == [
+        ("https://one/v1/logs", ["a", "b", "c"]),
+        ("https://two/v1/logs", ["d"]),
+    ]
+
+
+def test_full_queue_drops_without_blocking():
+    exporter = OTLPLogBatchExporter(max_queue_size=2, sender=_Sender())
+    dropped = EVENTS_DROPPED.labels(reason="queue_full")._value.get()
+    with patch.object(exporter, "start"):
+        results = [exporter.submit("https://one/v1/logs", HEADERS, RESOURCE, _record(str(i))) for i in range(3)]
+
+    assert results == [True, True, False]
+    assert EVENTS_DROPPED.labels(reason="queue_full")._value.get() == dropped + 1
+
+
+def test_failed_export_is_retried_then_dropped():
+    sender = _Sender(failures=1)
+    exporter = OTLPLogBatchExporter(max_retries=1, retry_backoff=0, sender=sender)
+    with patch.object(exporter, "start"):
+        exporter.submit("https://one/v1/logs", HEADERS, RESOURCE, _record("a"))
+    assert exporter.flush() == 1
+
+    sender.failures = 2
+    dropped = EVENTS_DROPPED.labels(reason="export_failed")._value.get()
+    with patch.object(exporter, "start"):
+        exporter.submit("https://one/v1/logs", HEADERS, RESOURCE, _record("b"))
+    assert exporter.flush() == 0
+    assert EVENTS_DROPPED.labels(reason="export_failed")._value.get() == dropped + 1
+
+
+def test_shutdown_flushes_background_queue():
+    sender = _Sender()
+    exporter = OTLPLogBatchExporter(batch_size=100, flush_interval=30, sender=sender)
+    exporter.submit("https://one/v1/logs", HEADERS, RESOURCE, _record("a"))
+    exporter.submit("https://one/v1/logs", HEADERS, RESOURCE, _record("b"))
+    assert exporter.running
+
+    exporter.shutdown(timeout=5)
+    assert not exporter.running
+    assert [_names(payload) for _, payload in sender.payloads] == [["a", "b"]]
+
+
+@patch("app.telemetry.service.is_detailed_analytics_enabled", return_value=True)
+def test_analytics_event_is_queued_not_posted(_mock_enabled, app):
+    from app.telemetry.service import send_analytics_event
+
+    env = {"OTEL_EXPORTER_OTLP_ENDPOINT": "https://otlp.example.com/otlp", "OTEL_EXPORTER_OTLP_TOKEN": "id:secret"}
+    with patch.dict(os.environ, env), patch("app.telemetry.service.get_exporter") as get_exporter, patch(
+        "app.telemetry.service.post_otlp_json"
+    ) as post:
+        send_analytics_event(7, "timer.started", {"email": "a@example.com", "source": "web"})
+
+    post.assert_not_called()
+    endpoint, _, _, record = get_exporter.return_value.submit.call_args[0]
+    assert endpoint == "https://otlp.example.com/otlp/v1/logs"
+    keys = {a["key"] for a in record["attributes"]}
+    assert "source" in keys and "email" not in keys
@@ -0,0 +1,122 @@
+"""
+Tests for compiled per-user permission and enabled-module sets.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from app import db
+from app.models import Permission, Role, Settings, User
+from app.utils import access_cache
+from app.utils.module_registry import ModuleRegistry
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    calls = []
+    compile_permissions = access_cache.compile_permissions
+    compile_enabled_modules = ModuleRegistry.compile_enabled_modules
+
+    def count_permissions(user):
+        calls.append("perms")
+        return compile_permissions(user)
+
+    def count_modules(settings=None, user=None):
+        calls.append("modules")
+        return compile_enabled_modules(settings, user)
+
+    monkeypatch.setattr(access_cache, "compile_permissions", count_permissions)
+    monkeypatch.setattr(ModuleRegistry, "compile_enabled_modules", count_modules)
+    return calls
+
+
+def test_permissions_compile_once_per_role_version(app, compiles):
+    perm = Permission(name="cache_perm", category="test")
+    role = Role(name="cache_role")
+    db.session.add_all([perm, role])
+    db.session.commit()
+    member = User(username="cache_member", role="user")
+    member.roles.append(role)
+    db.session.add(member)
+    db.session.commit()
+
+    assert not member.has_permission("cache_perm")
+    assert not member.has_any_permission("cache_perm", "other")
+    assert compiles.count("perms") == 1
+
+    # Granting the permission bumps the role version
+    role.add_permission(perm)
+    db.session.commit()
+    assert member.has_permission("cache_perm")
+    assert member.has_all_permissions("cache_perm")
+    assert compiles.count("perms") == 2
+
+    # Unflushed edits are seen immediately, without caching
+    member.roles.remove(role)
+    assert not member.has_permission("cache_perm")
+
+
+def test_legacy_admin_without_roles_has_every_permission(app):
+    legacy = User(username="legacy_admin", role="admin")
+    db.session.add(legacy)
+    db.session.commit()
+
+    assert legacy.has_permission("anything_at_all")
+    assert access_cache.permissions_for(legacy) is access_cache.ALL_PERMISSIONS
+
+
+def test_enabled_modules_follow_roles_and_settings(app, user, compiles):
+    ModuleRegistry.initialize_defaults()
+    settings = Settings.get_settings()
+    settings.disabled_module_ids = []
+    db.session.commit()
+
+    assert ModuleRegistry.is_enabled("calendar", settings, user)
+    assert ModuleRegistry.is_enabled("analytics", settings, user)
+    assert compiles.count("modules") == 1
+
+    settings.disabled_module_ids = ["calendar"]
+    db.session.commit()
+    assert not ModuleRegistry.is_enabled("calendar", settings, user)
+
+    for role in user.roles:
+        role.hidden_module_ids = ["analytics"]
+    db.session.commit()
+    assert not ModuleRegistry.is_enabled("analytics", settings, user)
+    assert compiles.count("modules") == 3
+
+
+def test_revocation_by_another_worker_applies_on_next_request(app, compiles):
+    from app.models import CacheVersion
+    from app.models.permission import role_permissions
+
+    perm = Permission(name="shared_perm", category="test")
+    role = Role(name="shared_role")
+    role.add_permission(perm)
+    db.session.add_all([perm, role])
+    member = User(username="shared_member", role="user")
+    member.roles.append(role)
+    db.session.add(member)
+    db.session.commit()
+    # The flush that wrote the role bumped the version every worker reads
+    assert db.session.get(CacheVersion, "access").version >= 1
+
+    with app.app_context(), app.test_request_context():
+        assert member.has_permission("shared_perm")
+    with app.app_context(), app.test_request_context():
+        assert member.has_permission("shared_perm")
+    assert compiles.count("perms") == 1
+
+    # Another process revokes the permission: this process's own version does not move
+    local_version = access_cache.get_role_version()
+    versions = CacheVersion.__table__
+    with db.engine.begin() as connection:
+        connection.execute(role_permissions.delete().where(role_permissions.c.role_id == role.id))
+        connection.execute(versions.update().values(version=versions.c.version + 1))
+    db.session.expire_all()
+
+    with app.app_context(), app.test_request_context():
+        assert not member.has_permission("shared_perm")
+    assert access_cache.get_role_version() == local_version
+    assert compiles.count("perms") == 2
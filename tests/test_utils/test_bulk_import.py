@@ -0,0 +1,100 @@
+"""
+Tests for the chunked CSV time-entry imports (bulk lookups, batched inserts, per-row isolation).
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import date
+
+from app import db
+from app.models import Client, DataImport, Project, Task, TimeEntry
+from app.models.timesheet_period import TimesheetPeriod, TimesheetPeriodStatus
+from app.services import time_entry_csv_import_service
+from app.services.time_entry_csv_import_service import import_time_entries_from_csv_text
+from app.utils import data_import
+from app.utils.bulk_import import add_isolated, count_csv_rows, iter_csv_chunks
+from app.utils.data_import import import_csv_time_entries
+
+HEADER = "project_name,client_name,task_name,start_time,end_time,duration_hours,notes,tags,billable\n"
+
+
+def test_chunks_and_isolated_flush_keep_good_rows(app):
+    text = "a,b\n1,2\n\n3,4\n5,6\n"
+    assert count_csv_rows(text) == 3
+    assert [[idx for idx, _ in chunk] for chunk in iter_csv_chunks(text, size=2)] == [[0, 1], [2]]
+
+    # The batch flush hits the unique client name; retried row by row only the duplicate fails
+    added, failed = add_isolated(
+        Client, [("a", {"name": "Dup Client"}), ("b", {"name": "Dup Client"}), ("c", {"name": "Other Client"})]
+    )
+    db.session.commit()
+    assert sorted(added) == ["a", "c"] and list(failed) == ["b"]
+    assert Client.query.filter(Client.name.in_(["Dup Client", "Other Client"])).count() == 2
+
+
+def test_csv_import_resolves_names_in_batches_and_isolates_bad_rows(app, user, monkeypatch):
+    monkeypatch.setattr(data_import, "iter_csv_chunks", lambda text: iter_csv_chunks(text, size=3))
+    rows = [
+        "Bulk Project,Bulk Client,Design,2024-01-01 09:00:00,2024-01-01 10:00:00,,one,,true",
+        ",Bulk Client,,2024-01-01 11:00:00,,1.0,missing project,,true",
+        "Bulk Project,Bulk Client,Design,2024-01-02 09:00:00,,1.5,two,,false",
+        "Bulk Project,Bulk Client,,2024-01-03 09:00:00,,not-a-number,bad duration,,true",
+        "Bulk Project,Bulk Client,Review,2024-01-04 09:00:00,2024-01-04 09:30:00,,three,,true",
+    ]
+    record = DataImport(user_id=user.id, import_type="csv")
+    db.session.add(record)
+    db.session.commit()
+
+    summary = import_csv_time_entries(user.id, HEADER + "\n".join(rows) + "\n", record)
+
+    assert (summary["total"], summary["successful"], summary["failed"]) == (5, 3, 2)
+    assert [e.split(":")[0] for e in summary["errors"]] == ["Row 2", "Row 4"]
+    assert record.status == "partial" and record.failed_records == 2
+    assert len(record.to_dict()["error_log"]) == 2
+
+    client = Client.query.filter_by(name="Bulk Client").one()
+    project = Project.query.filter_by(name="Bulk Project", client_id=client.id).one()
+    assert Task.query.filter_by(project_id=project.id).count() == 2
+    entries = TimeEntry.query.filter_by(project_id=project.id).order_by(TimeEntry.start_time).all()
+    assert [e.notes for e in entries] == ["one", "two", "three"]
+    assert entries[1].duration_seconds == 5400 and entries[1].billable is False
+
+
+def test_api_csv_import_checks_overlaps_periods_and_refs_per_chunk(app, user, project, monkeypatch):
+    monkeypatch.setattr(time_entry_csv_import_service, "IMPORT_CHUNK_SIZE", 2)
+    db.session.add(
+        TimesheetPeriod(
+            user_id=user.id,
+            period_start=date(2024, 2, 5),
+            period_end=date(2024, 2, 11),
+            status=TimesheetPeriodStatus.CLOSED,
+        )
+    )
+    db.session.commit()
+    csv_text = "\n".join(
+        [
+            "project_id,start_time,end_time,notes",
+            f"{project.id},2024-02-01T09:00:00,2024-02-01T10:00:00,first",
+            f"{project.id},2024-02-01T09:30:00,2024-02-01T11:00:00,overlaps row 2",
+            f"{project.id},2024-02-01T10:00:00,2024-02-01T11:00:00,second",
+            f"{project.id},2024-02-01T10:30:00,2024-02-01T10:45:00,overlaps committed chunk",
+            f"{project.id},2024-02-06T09:00:00,2024-02-06T10:00:00,closed period",
+            "999999,2024-02-02T09:00:00,2024-02-02T10:00:00,project outside scope",
+            f"{project.id},2024-02-02T10:00:00,2024-02-02T09:00:00,backwards",
+        ]
+    )
+
+    result, status = import_time_entries_from_csv_text(csv_text, user_id=user.id, is_admin=False)
+
+    assert status == 200 and result["created"] == 2
+    assert [(e["row"], e["error"].split(" ")[0]) for e in result["errors"]] == [
+        (3, "This"),
+        (5, "This"),
+        (6, "Timesheet"),
+        (7, "no"),
+        (8, "End"),
+    ]
+    notes = [e.notes for e in TimeEntry.query.filter_by(user_id=user.id).order_by(TimeEntry.start_time)]
+    assert notes == ["first", "second"]
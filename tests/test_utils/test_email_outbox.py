@@ -0,0 +1,180 @@
+"""
+Tests for the email outbox and its batched SMTP sender.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+import smtplib
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from flask_mail import Message
+
+from app import db
+from app.models import EmailOutboxMessage
+from app.utils import email_outbox
+from app.utils.email_outbox import RateLimiter, claim_batch, queue_email, send_due_emails
+
+
+class _SMTP:
+    """Stands in for ``mail.connect()``; counts connections and records sends"""
+
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+        self.connections = 0
+        self.sent = []
+
+    def __call__(self):
+        self.connections += 1
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, msg):
+        if msg.recipients[0] in self.fail_for:
+            raise smtplib.SMTPRecipientsRefused({msg.recipients[0]: (550, b"No such user")})
+        self.sent.append(msg)
+
+
+def _queue(*recipients, **kwargs):
+    return [
+        queue_email(Message(subject=f"Hi {r}", recipients=[r], body="Body", sender="tt@example.com"), **kwargs)
+        for r in recipients
+    ]
+
+
+def test_batch_is_sent_over_one_connection(app):
+    ids = _queue("a@example.com", "b@example.com", "c@example.com")
+    msg = Message(subject="Report", recipients=["d@example.com"], body="See attached", sender="tt@example.com")
+    msg.attach("report.csv", "text/csv", b"a,b\n1,2\n")
+    ids.append(queue_email(msg))
+
+    smtp = _SMTP()
+    with patch("app.utils.email.mail.connect", smtp):
+        counts = send_due_emails()
+
+    assert counts == {"claimed": 4, "sent": 4, "failed": 0, "released": 0}
+    assert smtp.connections == 1
+    assert smtp.sent[-1].attachments[0].data == b"a,b\n1,2\n"
+    assert {m.status for m in EmailOutboxMessage.query.filter(EmailOutboxMessage.id.in_(ids))} == {"sent"}
+
+
+def test_failed_message_is_retried_then_given_up(app):
+    retried, given_up, ok = _queue("retry@example.com", "bad@example.com", "ok@example.com")
+    db.session.get(EmailOutboxMessage, given_up).max_attempts = 1
+    db.session.commit()
+
+    smtp = _SMTP(fail_for={"retry@example.com", "bad@example.com"})
+    with patch("app.utils.email.mail.connect", smtp):
+        counts = send_due_emails()
+
+    assert counts["sent"] == 1 and counts["failed"] == 2
+    db.session.expire_all()
+    row = db.session.get(EmailOutboxMessage, retried)
+    assert row.status == "pending" and row.attempts == 1
+    assert row.next_attempt_at > datetime.utcnow()
+    assert "No such user" in row.last_error
+    assert db.session.get(EmailOutboxMessage, given_up).status == "failed"
+    assert db.session.get(EmailOutboxMessage, ok).status == "sent"
+
+
+def test_abandoned_batch_is_claimed_again(app):
+    (message_id,) = _queue("a@example.com")
+    now = datetime.utcnow()
+    assert claim_batch(10, worker_id="dead-worker", now=now) == [message_id]
+    # Leased rows are not handed out twice
+    assert claim_batch(10, worker_id="other", now=now) == []
+
+    later = now + timedelta(seconds=app.config.get("EMAIL_OUTBOX_LEASE_SECONDS", 300) + 1)
+    assert claim_batch(10, worker_id="other", now=later) == [message_id]
+    assert db.session.get(EmailOutboxMessage, message_id).attempts == 2
+
+
+def test_rate_limiter_paces_each_provider(app):
+    app.config["MAIL_RATE_LIMIT_PER_MINUTE"] = 0
+    app.config["MAIL_RATE_LIMITS"] = "smtp.slow.example=30"
+    clock = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        clock[0] += seconds
+
+    limiter = RateLimiter(clock=lambda: clock[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire("smtp.slow.example")
+        limiter.acquire("smtp.fast.example")
+
+    # 30 per minute: one send every 2 seconds; the other host is not limited
+    assert waits == [2.0, 2.0]
+    assert email_outbox.RateLimiter.limit_for("smtp.fast.example") == 0
+
+
+def test_claim_is_capped_at_what_the_rate_limit_sends_within_a_lease(app, monkeypatch):
+    monkeypatch.setitem(app.config, "MAIL_SERVER", "smtp.slow.example")
+    monkeypatch.setitem(app.config, "MAIL_RATE_LIMITS", "smtp.slow.example=30")
+    monkeypatch.setitem(app.config, "EMAIL_OUTBOX_LEASE_SECONDS", 4)
+    _queue("a@example.com", "b@example.com", "c@example.com")
+
+    clock = [0.0]
+    limiter = RateLimiter(clock=lambda: clock[0], sleep=lambda s: clock.__setitem__(0, clock[0] + s))
+    with patch("app.utils.email.mail.connect", _SMTP()):
+        counts = send_due_emails(rate_limiter=limiter)
+
+    # One send every 2 seconds fits two sends in a 4 second lease
+    assert counts["claimed"] == 2 and counts["sent"] == 2
+
+
+def test_lease_is_renewed_while_a_slow_batch_is_sending(app, monkeypatch):
+    """Sending the batch takes longer than the lease; no other worker may claim its rows meanwhile"""
+    monkeypatch.setitem(app.config, "EMAIL_OUTBOX_LEASE_SECONDS", 1)
+    ids = _queue("a@example.com", "b@example.com", "c@example.com")
+    stolen = []
+
+    class _SlowLimiter:
+        def acquire(self, provider, stop=None):
+            time.sleep(0.6)
+            stolen.extend(claim_batch(10, worker_id="other"))
+            return True
+
+    smtp = _SMTP()
+    with patch("app.utils.email.mail.connect", smtp):
+        counts = send_due_emails(rate_limiter=_SlowLimiter())
+
+    assert stolen == []
+    assert counts["sent"] == 3 and len(smtp.sent) == 3
+    db.session.expire_all()
+    assert {db.session.get(EmailOutboxMessage, i).attempts for i in ids} == {1}
+
+
+def test_row_reclaimed_by_another_worker_is_not_sent_twice(app):
+    ids = _queue("a@example.com", "b@example.com")
+
+    class _StallingLimiter:
+        """The first wait outlasts the lease and another worker takes over the batch"""
+
+        def __init__(self):
+            self.stolen = []
+
+        def acquire(self, provider, stop=None):
+            if not self.stolen:
+                later = datetime.utcnow() + timedelta(seconds=app.config.get("EMAIL_OUTBOX_LEASE_SECONDS", 300) + 1)
+                self.stolen = claim_batch(10, worker_id="other", now=later)
+            return True
+
+    limiter = _StallingLimiter()
+    smtp = _SMTP()
+    with patch("app.utils.email.mail.connect", smtp):
+        counts = send_due_emails(rate_limiter=limiter)
+
+    assert sorted(limiter.stolen) == sorted(ids)
+    assert smtp.sent == [] and counts["sent"] == 0
+    db.session.expire_all()
+    assert {db.session.get(EmailOutboxMessage, i).locked_by.split(":")[0] for i in ids} == {"other"}
@@ -1,7 +1,5 @@
 """Tests for integration sync helpers."""
 
-from unittest.mock import MagicMock, patch
-
 import pytest
 
 pytestmark = [pytest.mark.unit]
@@ -26,26 +24,62 @@ def test_sync_result_item_count_empty():
     assert sync_result_item_count(None) == 0
 
 
-@patch("app.models.Task")
-def test_find_task_by_integration_ref_filters_by_source(MockTask):
+def _imported_task(project, user, name, source, ref):
+    from app import db
+    from app.models import Task
+    from app.utils.integration_sync_context import set_task_integration_ref
+
+    task = Task(project_id=project.id, name=name, created_by=user.id)
+    db.session.add(task)
+    db.session.flush()
+    set_task_integration_ref(task, source=source, ref=ref)
+    db.session.commit()
+    return task
+
+
+def test_find_task_by_integration_ref_filters_by_source(app, user, project):
     from app.utils.integration_sync_context import find_task_by_integration_ref
 
-    t_git = MagicMock()
-    t_git.custom_fields = {"integration": {"source": "github", "ref": "same-ref"}}
-    t_jira = MagicMock()
-    t_jira.custom_fields = {"integration": {"source": "jira", "ref": "same-ref"}}
-    MockTask.query.filter_by.return_value.all.return_value = [t_git, t_jira]
+    t_git = _imported_task(project, user, "git", "github", "same-ref")
+    t_jira = _imported_task(project, user, "jira", "jira", "same-ref")
 
-    assert find_task_by_integration_ref(42, "same-ref", source="jira") is t_jira
-    assert find_task_by_integration_ref(42, "same-ref", source="github") is t_git
+    assert find_task_by_integration_ref(project.id, "same-ref", source="jira") is t_jira
+    assert find_task_by_integration_ref(project.id, "same-ref", source="github") is t_git
+    assert find_task_by_integration_ref(project.id, "same-ref", source="gitlab") is None
 
 
-@patch("app.models.Task")
-def test_find_task_by_integration_ref_without_source_matches_any(MockTask):
+def test_find_task_by_integration_ref_without_source_matches_any(app, user, project):
     from app.utils.integration_sync_context import find_task_by_integration_ref
 
-    first = MagicMock()
-    first.custom_fields = {"integration": {"source": "github", "ref": "r1"}}
-    MockTask.query.filter_by.return_value.all.return_value = [first]
+    first = _imported_task(project, user, "first", "github", "r1")
+
+    assert find_task_by_integration_ref(project.id, "r1") is first
+    assert find_task_by_integration_ref(project.id + 1, "r1") is None
+
+
+def test_bulk_lookup_follows_ref_changes_and_deletes(app, user, project, test_client):
+    from app import db
+    from app.models import IntegrationExternalRef
+    from app.utils.integration_refs import rebuild_integration_refs
+    from app.utils.integration_sync_context import (
+        ensure_project_integration_fields,
+        find_projects_by_integration_refs,
+        find_tasks_by_integration_refs,
+        set_task_integration_ref,
+    )
+
+    tasks = [_imported_task(project, user, f"issue {i}", "jira", f"PROJ-{i}") for i in range(3)]
+    ensure_project_integration_fields(project, source="jira", ref="PROJ", display_name=project.name)
+    db.session.commit()
+
+    assert find_projects_by_integration_refs(test_client.id, "jira", ["PROJ", "OTHER"]) == {"PROJ": project}
+    found = find_tasks_by_integration_refs(project.id, ["PROJ-0", "PROJ-1", "PROJ-2", "PROJ-9"], source="jira")
+    assert found == {"PROJ-0": tasks[0], "PROJ-1": tasks[1], "PROJ-2": tasks[2]}
+
+    set_task_integration_ref(tasks[0], source="jira", ref="PROJ-10")
+    db.session.delete(tasks[1])
+    db.session.commit()
+    found = find_tasks_by_integration_refs(project.id, ["PROJ-0", "PROJ-1", "PROJ-10"])
+    assert found == {"PROJ-10": tasks[0]}
 
-    assert find_task_by_integration_ref(1, "r1") is first
+    assert rebuild_integration_refs() == IntegrationExternalRef.query.count() == 3
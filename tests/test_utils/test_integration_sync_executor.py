@@ -0,0 +1,164 @@
+"""
+Tests for the concurrent integration sync executor.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+import threading
+import time
+from unittest.mock import patch
+
+from app import db
+from app.models import Integration, IntegrationEvent
+from app.utils.integration_sync_executor import IntegrationSyncExecutor, SyncTask, integration_host
+
+
+def _integration(provider, config=None):
+    integration = Integration(name=provider.title(), provider=provider, is_global=True, is_active=True, config=config)
+    db.session.add(integration)
+    db.session.commit()
+    return integration
+
+
+def _events(integration_id):
+    db.session.expire_all()
+    return IntegrationEvent.query.filter_by(integration_id=integration_id, event_type="sync").all()
+
+
+def test_syncs_run_concurrently_within_provider_caps(app):
+    jira = [_integration("jira", {"jira_url": f"https://tenant{i}.atlassian.net"}) for i in range(3)]
+    trello = [_integration("trello") for _ in range(2)]
+    lock = threading.Lock()
+    running = {"jira": 0, "trello": 0}
+    peak = {"jira": 0, "trello": 0, "total": 0}
+
+    def sync(integration):
+        with lock:
+            running[integration.provider] += 1
+            peak[integration.provider] = max(peak[integration.provider], running[integration.provider])
+            peak["total"] = max(peak["total"], sum(running.values()))
+        time.sleep(0.2)
+        with lock:
+            running[integration.provider] -= 1
+        return {"success": True, "synced_items": integration.id}
+
+    tasks = [SyncTask(i.id, i.provider, integration_host(i), sync) for i in jira + trello]
+    executor = IntegrationSyncExecutor(app, max_workers=4, per_provider=2, per_host=2, jitter=0, timeout=30)
+    outcomes = executor.run(tasks)
+
+    assert sorted(o.integration_id for o in outcomes if o.success) == sorted(i.id for i in jira + trello)
+    assert peak["jira"] == 2 and peak["total"] >= 3
+    event = _events(jira[0].id)[0]
+    assert event.status == "success"
+    assert event.event_metadata["synced_items"] == jira[0].id
+    assert event.event_metadata["duration_ms"] >= 200
+
+
+def test_same_host_is_capped(app):
+    shared = [_integration("jira", {"jira_url": "https://shared.example.com"}) for _ in range(3)]
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def sync(integration):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.1)
+        with lock:
+            state["running"] -= 1
+        return {"success": True}
+
+    tasks = [SyncTask(i.id, i.provider, integration_host(i), sync) for i in shared]
+    IntegrationSyncExecutor(app, max_workers=3, per_provider=3, per_host=1, jitter=0).run(tasks)
+    assert state["peak"] == 1
+
+
+def test_slow_sync_times_out_without_blocking_others(app):
+    slow, fast = _integration("caldav_calendar"), _integration("github")
+    release = threading.Event()
+
+    def sync(integration):
+        if integration.id == slow.id:
+            release.wait(10)
+        return {"success": True}
+
+    tasks = [SyncTask(i.id, i.provider, i.provider, sync) for i in (slow, fast)]
+    started = time.monotonic()
+    outcomes = {o.integration_id: o for o in IntegrationSyncExecutor(app, jitter=0, timeout=0.3).run(tasks)}
+    assert time.monotonic() - started < 5
+    assert outcomes[fast.id].success
+    assert outcomes[slow.id].timed_out and not outcomes[slow.id].success
+
+    # The abandoned sync completes the timeout's event when it returns instead of logging a second one
+    release.set()
+    for _ in range(50):
+        if _events(slow.id)[0].status == "success":
+            break
+        time.sleep(0.1)
+    (event,) = _events(slow.id)
+    assert event.status == "success" and "after the 0s timeout" in event.message
+    assert event.event_metadata["timed_out"] is True and event.event_metadata["finished_late"] is True
+
+
+def test_next_run_skips_integration_whose_timed_out_sync_is_still_running(app):
+    slow = _integration("caldav_calendar")
+    release = threading.Event()
+    calls = []
+
+    def sync(integration):
+        calls.append(integration.id)
+        release.wait(10)
+        return {"success": True}
+
+    task = SyncTask(slow.id, slow.provider, slow.provider, sync)
+    first = IntegrationSyncExecutor(app, jitter=0, timeout=0.3).run([task])
+    assert first[0].timed_out
+
+    (second,) = IntegrationSyncExecutor(app, jitter=0, timeout=0.3).run([task])
+    assert not second.success and "still running" in second.message
+    assert calls == [slow.id]
+
+    release.set()
+    for _ in range(50):
+        if _events(slow.id)[0].status == "success":
+            break
+        time.sleep(0.1)
+    for _ in range(50):
+        third = IntegrationSyncExecutor(app, jitter=0, timeout=5).run([task])
+        if third[0].success:
+            break
+        time.sleep(0.1)
+    assert third[0].success and calls == [slow.id, slow.id]
+
+
+def test_integration_host(app):
+    assert integration_host(Integration(provider="jira", config={"jira_url": "https://ACME.atlassian.net/"})) == (
+        "acme.atlassian.net"
+    )
+    assert integration_host(Integration(provider="asana", config={})) == "app.asana.com"
+    with patch.dict("app.services.integration_service.IntegrationService._connector_registry", {}, clear=True):
+        assert integration_host(Integration(provider="custom", config=None)) == "custom"
+
+
+def test_sync_integrations_uses_executor(app):
+    from app.utils.scheduled_tasks import sync_integrations
+
+    due = _integration("jira", {"auto_sync": True, "jira_url": "https://a.example.com"})
+    _integration("jira", {"auto_sync": False})
+    app.config["INTEGRATION_SYNC_JITTER_SECONDS"] = 0
+
+    class Connector:
+        def sync_data(self, sync_type):
+            assert sync_type == "incremental"
+            return {"success": True, "synced_items": 3}
+
+    with patch("app.services.integration_service.IntegrationService.get_connector", return_value=Connector()):
+        result = sync_integrations()
+
+    assert result["synced"] == 1 and result["errors"] == []
+    db.session.expire_all()
+    assert db.session.get(Integration, due.id).last_sync_status == "success"
+    assert "last_scheduled_sync_at" in db.session.get(Integration, due.id).config
+    assert _events(due.id)[0].event_metadata["synced_items"] == 3
@@ -0,0 +1,93 @@
+"""
+Tests for the invoice line -> time entry link table (invoice_item_time_entries).
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import date, datetime, timedelta
+
+from app import db
+from app.models import Invoice, InvoiceItem, InvoiceItemTimeEntry, TimeEntry
+from app.services import InvoiceService
+from app.utils.invoice_time_entry_links import parse_time_entry_ids, rebuild_invoice_time_entry_links
+
+
+def _links():
+    return {(r.invoice_item_id, r.time_entry_id) for r in InvoiceItemTimeEntry.query.all()}
+
+
+def _entries(user, project, count):
+    entries = []
+    for i in range(count):
+        start = datetime.now() - timedelta(days=i + 1)
+        entries.append(
+            TimeEntry(user_id=user.id, project_id=project.id, start_time=start, end_time=start + timedelta(hours=1))
+        )
+    db.session.add_all(entries)
+    db.session.commit()
+    return entries
+
+
+def _invoice(user, project, test_client):
+    invoice = Invoice(
+        invoice_number=Invoice.generate_invoice_number(),
+        project_id=project.id,
+        client_name=test_client.name,
+        due_date=date.today() + timedelta(days=30),
+        created_by=user.id,
+        client_id=test_client.id,
+    )
+    db.session.add(invoice)
+    db.session.commit()
+    return invoice
+
+
+def test_parse_time_entry_ids():
+    assert parse_time_entry_ids(" 3, 1,,x,3 ") == [3, 1]
+    assert parse_time_entry_ids(None) == []
+
+
+def test_links_follow_invoice_lines(app, user, project, test_client):
+    first, second, third = _entries(user, project, 3)
+    invoice = _invoice(user, project, test_client)
+
+    item = InvoiceItem(invoice.id, "Work", 2, 100, time_entry_ids=f"{first.id},{second.id},999999")
+    db.session.add(item)
+    db.session.commit()
+    # Unknown entry IDs are skipped
+    assert _links() == {(item.id, first.id), (item.id, second.id)}
+
+    item.time_entry_ids = f"{third.id}"
+    db.session.commit()
+    assert _links() == {(item.id, third.id)}
+
+    # A rolled back change leaves the links untouched
+    item.time_entry_ids = f"{first.id}"
+    db.session.flush()
+    db.session.rollback()
+    assert _links() == {(item.id, third.id)}
+
+    db.session.delete(item)
+    db.session.commit()
+    assert _links() == set()
+
+
+def test_unbilled_state_uses_links(app, user, project, test_client):
+    first, second, third = _entries(user, project, 3)
+    invoice = _invoice(user, project, test_client)
+    db.session.add(InvoiceItem(invoice.id, "Billed", 1, 100, time_entry_ids=str(second.id)))
+    db.session.commit()
+
+    service = InvoiceService()
+    state = service._client_unbilled_invoice_state(test_client.id)
+    assert {e.id for e in state["unbilled_entries"]} == {first.id, third.id}
+    assert service._billed_time_entry_ids_for_client(test_client.id, project.id) == {second.id}
+
+    InvoiceItemTimeEntry.query.delete()
+    db.session.commit()
+    assert rebuild_invoice_time_entry_links() == 1
+    db.session.commit()
+    state = service._client_unbilled_invoice_state(test_client.id)
+    assert {e.id for e in state["unbilled_entries"]} == {first.id, third.id}
@@ -0,0 +1,139 @@
+"""
+Tests for the persistent background job queue and the import/export jobs that run on it.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+import os
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from app import db
+from app.models import BackgroundJob, DataImport, TimeEntry
+from app.utils import job_queue
+from app.utils.job_queue import (
+    JobContext,
+    claim_job,
+    enqueue,
+    execute_job,
+    find_due_jobs,
+    job_handler,
+    reap_expired_jobs,
+    run_next_job,
+)
+
+
+@pytest.fixture
+def test_handlers():
+    calls = []
+
+    @job_handler("test_flaky", max_attempts=2)
+    def flaky(job, ctx):
+        calls.append(job.attempts)
+        if len(calls) == 1:
+            raise RuntimeError("temporary outage")
+        return {"ok": True}
+
+    @job_handler("test_long")
+    def long_running(job, ctx):
+        for step in range(3):
+            calls.append(step)
+            ctx.checkpoint(3, step, 0)
+            if step == 0:
+                job_row = db.session.get(BackgroundJob, job.id)
+                job_queue.cancel_job(job_row)
+
+    yield calls
+    job_queue._handlers.pop("test_flaky", None)
+    job_queue._handlers.pop("test_long", None)
+
+
+class TestJobQueue:
+    def test_failed_attempt_is_retried_with_backoff(self, app, test_handlers):
+        job = enqueue("test_flaky", {"api_token": "secret"})
+        assert run_next_job() == job.id
+        db.session.refresh(job)
+        assert job.status == BackgroundJob.STATUS_QUEUED and job.attempts == 1
+        assert "temporary outage" in job.last_error and job.run_after > datetime.utcnow()
+        assert run_next_job() is None
+
+        later = job.run_after + timedelta(seconds=1)
+        assert find_due_jobs(now=later) == [job.id]
+        assert claim_job(job.id, "worker-b", now=later) is True
+        assert execute_job(job.id, "worker-b") == BackgroundJob.STATUS_SUCCEEDED
+        db.session.refresh(job)
+        assert (job.status, job.attempts, job.result) == (BackgroundJob.STATUS_SUCCEEDED, 2, {"ok": True})
+        # Secrets are not kept once the job is final
+        assert "api_token" not in job.payload
+
+    def test_expired_lease_is_reclaimed_or_reaped(self, app, test_handlers):
+        retryable = enqueue("test_flaky")
+        single = enqueue("test_long")
+        now = datetime.utcnow()
+        assert claim_job(retryable.id, "dead-worker", now=now) is True
+        assert claim_job(single.id, "dead-worker", now=now) is True
+        # Leased jobs are not handed to anyone else
+        assert claim_job(retryable.id, "worker-b", now=now) is False
+        assert find_due_jobs(now=now) == []
+
+        expired = now + timedelta(seconds=app.config["JOB_QUEUE_LEASE_SECONDS"] + 1)
+        assert find_due_jobs(now=expired) == [retryable.id]
+        assert reap_expired_jobs(now=expired) == 1
+        db.session.refresh(single)
+        assert single.status == BackgroundJob.STATUS_FAILED and "Worker stopped" in single.last_error
+
+        # The dead worker can no longer heartbeat once another worker holds the lease
+        assert claim_job(retryable.id, "worker-b", now=expired) is True
+        assert JobContext(retryable.id, "dead-worker").heartbeat() is False
+
+    def test_running_job_stops_at_checkpoint_when_cancelled(self, app, test_handlers):
+        job = enqueue("test_long")
+        run_next_job()
+        db.session.refresh(job)
+        assert job.status == BackgroundJob.STATUS_CANCELLED and job.cancel_requested is True
+        assert test_handlers == [0, 1]
+
+
+class TestImportExportJobs:
+    def test_csv_import_is_queued_and_processed_by_worker(self, app, authenticated_client, user, tmp_path):
+        app.config["UPLOAD_FOLDER"] = str(tmp_path)
+        csv_content = (
+            "project_name,client_name,task_name,start_time,end_time,duration_hours,notes,tags,billable\n"
+            "Queued Project,Queued Client,,2024-01-01 09:00:00,2024-01-01 10:00:00,1.0,queued,,true\n"
+        )
+        response = authenticated_client.post(
+            "/api/import/csv",
+            data={"file": (BytesIO(csv_content.encode("utf-8")), "entries.csv")},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body["status_url"] == f"/api/import/status/{body['import_id']}"
+        job = db.session.get(BackgroundJob, body["job_id"])
+        upload = job.payload["path"]
+        assert os.path.exists(upload)
+        assert TimeEntry.query.filter_by(notes="queued").count() == 0
+
+        assert run_next_job() == job.id
+        status = authenticated_client.get(body["status_url"]).get_json()
+        assert status["status"] == "completed" and status["successful_records"] == 1
+        assert status["job"]["status"] == BackgroundJob.STATUS_SUCCEEDED
+        assert TimeEntry.query.filter_by(notes="queued").count() == 1
+        assert not os.path.exists(upload)
+
+    def test_queued_import_can_be_cancelled(self, app, authenticated_client, user):
+        response = authenticated_client.post(
+            "/api/import/toggl",
+            json={"api_token": "tok", "workspace_id": "1", "start_date": "2024-01-01", "end_date": "2024-01-31"},
+        )
+        assert response.status_code == 202
+        body = response.get_json()
+
+        cancel = authenticated_client.post(f"/api/jobs/{body['job_id']}/cancel")
+        assert cancel.status_code == 200
+        assert cancel.get_json()["job"]["status"] == BackgroundJob.STATUS_CANCELLED
+        assert db.session.get(DataImport, body["import_id"]).status == "failed"
+        assert run_next_job() is None
+        assert authenticated_client.post(f"/api/jobs/{body['job_id']}/cancel").status_code == 409
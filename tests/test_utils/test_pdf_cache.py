@@ -0,0 +1,107 @@
+"""
+Tests for the invoice PDF cache and the background PDF renderer.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+import os
+
+from app import db
+from app.models import ApiToken, BackgroundJob, Settings
+from app.utils import pdf_cache
+from app.utils.job_queue import run_next_job
+
+
+@pytest.fixture
+def renders(app, tmp_path, monkeypatch):
+    """Point the cache at a temp directory and count real renders"""
+    from app.utils.pdf_generator import InvoicePDFGenerator
+
+    calls = []
+
+    def fake_generate(self):
+        calls.append(self.invoice.id)
+        return b"%PDF-1.4 invoice " + str(len(calls)).encode()
+
+    monkeypatch.setattr(InvoicePDFGenerator, "generate_pdf", fake_generate)
+    app.config["PDF_CACHE_DIR"] = str(tmp_path)
+    return calls
+
+
+def test_render_reuses_pdf_until_inputs_change(app, invoice_with_items, renders):
+    invoice, items = invoice_with_items
+    settings = Settings.get_settings()
+
+    first, _, _ = pdf_cache.render_invoice_pdf(invoice, settings)
+    again, _, _ = pdf_cache.render_invoice_pdf(invoice, settings)
+    assert again == first
+    assert len(renders) == 1
+
+    item = items[0]
+    item.description = "Changed line"
+    db.session.commit()
+    pdf_cache.render_invoice_pdf(invoice, settings)
+    assert len(renders) == 2
+
+    settings.company_name = "Renamed Ltd"
+    db.session.commit()
+    pdf_cache.render_invoice_pdf(invoice, settings)
+    # Page size is part of the key as well
+    pdf_cache.render_invoice_pdf(invoice, settings, page_size="Letter")
+    pdf_cache.render_invoice_pdf(invoice, settings)
+    assert len(renders) == 4
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    for age, key in enumerate(["newest", "middle", "oldest"]):
+        path = tmp_path / f"{key}.pdf"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1_000_000 - age * 100, 1_000_000 - age * 100))
+
+    # Reading an entry makes it the most recently used
+    assert pdf_cache.read_cached(str(tmp_path), "oldest") == b"x" * 100
+    assert pdf_cache.evict(str(tmp_path), max_bytes=250) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["newest.pdf", "oldest.pdf"]
+
+
+def test_finalized_invoice_is_prerendered_in_background(app, invoice_with_items, renders):
+    invoice, items = invoice_with_items
+    # Drafts are not rendered ahead of time
+    invoice.notes = "Still a draft"
+    db.session.commit()
+    assert BackgroundJob.query.filter_by(job_type="render_invoice_pdfs").count() == 0
+
+    invoice.status = "sent"
+    db.session.commit()
+    job = BackgroundJob.query.filter_by(job_type="render_invoice_pdfs").one()
+    assert job.payload["invoice_ids"] == [invoice.id]
+
+    assert run_next_job() == job.id
+    db.session.refresh(job)
+    assert job.status == BackgroundJob.STATUS_SUCCEEDED
+    assert job.result == {"rendered": 1, "cached": 0, "skipped": [], "failed": []}
+
+    # The download is served from the cache
+    pdf_cache.render_invoice_pdf(invoice, Settings.get_settings())
+    assert len(renders) == 1
+
+
+def test_bulk_render_api_queues_accessible_invoices(app, user, invoice, renders):
+    token, plain_token = ApiToken.create_token(user_id=user.id, name="PDF render", scopes="read:invoices")
+    db.session.add(token)
+    db.session.commit()
+    client_with_token = app.test_client()
+    client_with_token.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {plain_token}"
+
+    response = client_with_token.post("/api/v1/invoices/pdf/render", json={"invoice_ids": [invoice.id, 999999]})
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["invoice_ids"] == [invoice.id]
+
+    assert run_next_job() == body["job_id"]
+    status = client_with_token.get(body["status_url"]).get_json()["job"]
+    assert status["status"] == BackgroundJob.STATUS_SUCCEEDED
+    assert status["result"]["rendered"] == 1
+    assert pdf_cache.is_cached(invoice, Settings.get_settings())
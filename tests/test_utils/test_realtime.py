@@ -0,0 +1,118 @@
+"""
+Tests for room-scoped Socket.IO events and message-queue selection.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from app import db, socketio
+from app.models import User
+from app.utils.realtime import ACTIVITY_FEED_ROOM, project_board_room, resolve_message_queue, user_room
+
+
+@pytest.fixture
+def socket_handlers(app):
+    """Register the API's socket handlers on this app's server.
+
+    ``@socketio.on`` binds handlers to the server that exists when ``app.routes.api`` is
+    imported, i.e. the first app created in the test session.
+    """
+    from app.routes.api import api_legacy_module as api
+
+    for event, handler in {
+        "connect": api.handle_connect,
+        "join_project_board": api.handle_join_project_board,
+        "leave_project_board": api.handle_leave_project_board,
+        "join_activity_feed": api.handle_join_activity_feed,
+    }.items():
+        socketio.on(event)(handler)
+
+
+def _login(app, username):
+    # Fresh app contexts, as in a server: Flask-Login caches the user on ``g``
+    with app.app_context():
+        http = app.test_client()
+        http.post("/login", data={"username": username, "password": "password123"})
+    return http
+
+
+def _socket_for(app, http=None):
+    with app.app_context():
+        return socketio.test_client(app, flask_test_client=http or app.test_client())
+
+
+def _emit(app, sock, event, data):
+    with app.app_context():
+        sock.emit(event, data)
+
+
+def _events(sock, name):
+    return [r["args"][0] for r in sock.get_received() if r["name"] == name]
+
+
+def _participants(room):
+    return list(socketio.server.manager.get_participants("/", room))
+
+
+def test_message_queue_selection():
+    assert resolve_message_queue({"SOCKETIO_MESSAGE_QUEUE": "none"}) is None
+    assert resolve_message_queue({"SOCKETIO_MESSAGE_QUEUE": "amqp://mq//"}) == "amqp://mq//"
+    assert resolve_message_queue({"SOCKETIO_MESSAGE_QUEUE": "auto", "TESTING": True}) is None
+    # Redis that does not answer falls back to in-process delivery
+    unreachable = {
+        "SOCKETIO_MESSAGE_QUEUE": "auto",
+        "REDIS_URL": "redis://127.0.0.1:1/0",
+        "REDIS_SOCKET_TIMEOUT": 0.2,
+    }
+    assert resolve_message_queue(unreachable) is None
+
+
+def test_timer_events_reach_only_the_users_sockets(app, user, project, authenticated_client, socket_handlers):
+    other = User(username="realtime_other", role="user")
+    other.set_password("password123")
+    db.session.add(other)
+    db.session.commit()
+    mine, theirs = _socket_for(app, _login(app, user.username)), _socket_for(app, _login(app, other.username))
+    anonymous = _socket_for(app)
+    try:
+        # Sockets join their user's room on connect
+        assert len(_participants(user_room(user.id))) == 1
+
+        response = authenticated_client.post("/api/timer/start", json={"project_id": project.id})
+        assert response.status_code in (200, 201)
+
+        assert [e["user_id"] for e in _events(mine, "timer_started")] == [user.id]
+        assert _events(theirs, "timer_started") == [] and _events(anonymous, "timer_started") == []
+    finally:
+        for sock in (mine, theirs, anonymous):
+            sock.disconnect()
+
+
+def test_board_and_feed_events_reach_only_subscribers(app, user, project, socket_handlers):
+    http = _login(app, user.username)
+    viewers = [_socket_for(app, http) for _ in range(2)]
+    idle = [_socket_for(app, http) for _ in range(3)]
+    anonymous = _socket_for(app)
+    try:
+        for sock in viewers:
+            _emit(app, sock, "join_project_board", {"project_id": project.id})
+            _emit(app, sock, "join_activity_feed", {})
+        # Anonymous sockets and malformed ids are not subscribed
+        _emit(app, anonymous, "join_project_board", {"project_id": project.id})
+        _emit(app, anonymous, "join_activity_feed", {})
+        _emit(app, idle[0], "join_project_board", {"project_id": "not-a-number"})
+
+        assert len(_participants(project_board_room(project.id))) == 2
+        assert len(_participants(ACTIVITY_FEED_ROOM)) == 2
+        for sock in viewers + idle + [anonymous]:
+            sock.get_received()
+
+        socketio.emit("kanban_columns_updated", {"project_id": project.id}, room=project_board_room(project.id))
+        assert [len(_events(s, "kanban_columns_updated")) for s in viewers + idle + [anonymous]] == [1, 1, 0, 0, 0, 0]
+
+        _emit(app, viewers[0], "leave_project_board", {"project_id": project.id})
+        assert len(_participants(project_board_room(project.id))) == 1
+    finally:
+        for sock in viewers + idle + [anonymous]:
+            sock.disconnect()
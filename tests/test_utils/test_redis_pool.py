@@ -0,0 +1,133 @@
+"""
+Tests for the shared Redis connection pool manager.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from unittest.mock import MagicMock, patch
+
+import redis
+
+from app.utils import redis_pool
+from app.utils.cache import RedisCache
+from app.utils.redis_pool import RedisPoolManager, get_redis_manager
+
+
+def _manager(client, **kwargs):
+    manager = RedisPoolManager("redis://localhost:6379/0", **kwargs)
+    patcher = patch.object(manager, "_client_for", return_value=client)
+    patcher.start()
+    return manager, patcher
+
+
+class TestRedisPoolManager:
+    def test_client_pings_once(self):
+        client = MagicMock()
+        manager, patcher = _manager(client)
+        try:
+            for _ in range(5):
+                assert manager.client() is client
+        finally:
+            patcher.stop()
+
+        client.ping.assert_called_once()
+
+    def test_connection_error_opens_circuit(self):
+        client = MagicMock()
+        client.ping.side_effect = redis.exceptions.ConnectionError("refused")
+        manager, patcher = _manager(client, breaker_seconds=30)
+        try:
+            assert manager.client() is None
+            assert manager.circuit_open
+            assert manager.client() is None
+        finally:
+            patcher.stop()
+
+        # The open circuit short-circuits without touching Redis again
+        client.ping.assert_called_once()
+
+    def test_circuit_closes_after_window(self):
+        client = MagicMock()
+        manager, patcher = _manager(client, breaker_seconds=30)
+        try:
+            with patch.object(redis_pool.time, "monotonic", return_value=1000.0):
+                manager.record_failure(redis.exceptions.TimeoutError("timeout"))
+                assert manager.client() is None
+            with patch.object(redis_pool.time, "monotonic", return_value=1031.0):
+                assert manager.client() is client
+        finally:
+            patcher.stop()
+
+        client.ping.assert_called_once()
+
+    def test_command_errors_do_not_open_circuit(self):
+        manager = RedisPoolManager("redis://localhost:6379/0")
+        manager.record_failure(redis.exceptions.ResponseError("WRONGTYPE"))
+        assert not manager.circuit_open
+
+    def test_mset_with_ttl_uses_single_pipeline(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        manager, patcher = _manager(client)
+        try:
+            assert manager.mset({"a": "1", "b": "2"}, ttl=60) is True
+        finally:
+            patcher.stop()
+
+        client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.setex.call_count == 2
+        pipe.execute.assert_called_once()
+
+    def test_mget_returns_none_when_unavailable(self):
+        manager = RedisPoolManager("redis://localhost:6379/0", enabled=False)
+        assert manager.mget(["a", "b"]) is None
+        assert manager.mset({"a": "1"}) is False
+
+
+class TestSharedManager:
+    def test_manager_is_app_scoped(self, app):
+        with app.app_context():
+            assert get_redis_manager() is get_redis_manager()
+            assert get_redis_manager() is app.extensions["redis_pool"]
+
+    def test_cache_redis_falls_back_when_disabled(self, app):
+        from app.utils.cache_redis import get_cache, get_many_cache, set_cache, set_many_cache
+
+        app.config["REDIS_ENABLED"] = False
+        app.extensions.pop("redis_pool", None)
+        with app.app_context():
+            assert set_cache("k", {"a": 1}) is False
+            assert get_cache("k", default="d") == "d"
+            assert set_many_cache({"k": 1}) is False
+            assert get_many_cache(["k", "j"], default=0) == {"k": 0, "j": 0}
+
+    def test_cache_redis_get_many_deserializes(self, app):
+        from app.utils.cache_redis import get_many_cache
+
+        manager = MagicMock()
+        manager.mget.return_value = ['{"a": 1}', None, "plain"]
+        with patch("app.utils.cache_redis.get_redis_manager", return_value=manager):
+            result = get_many_cache(["x", "y", "z"])
+
+        assert result == {"x": {"a": 1}, "y": None, "z": "plain"}
+
+    def test_redis_cache_uses_fallback_while_circuit_open(self, app):
+        client = MagicMock()
+        manager, patcher = _manager(client)
+        try:
+            with app.app_context():
+                cache = RedisCache("redis://localhost:6379/0", manager=manager)
+                assert cache._connected is True
+
+                client.setex.side_effect = redis.exceptions.ConnectionError("gone")
+                cache.set("k", "v")
+                assert manager.circuit_open
+
+                cache.set("k", "v")
+                assert cache.get("k") == "v"
+        finally:
+            patcher.stop()
+
+        assert client.setex.call_count == 1
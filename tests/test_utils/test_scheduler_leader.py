@@ -0,0 +1,107 @@
+"""
+Tests for scheduler leader election, job run history and missed-run catch-up.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app import db
+from app.models import ScheduledJobRun, SchedulerLease
+from app.utils import scheduler_leader
+from app.utils.scheduled_tasks import register_scheduled_tasks
+from app.utils.scheduler_leader import (
+    HEARTBEAT_JOB_ID,
+    LEASE_NAME,
+    PROCESS_OWNER,
+    leader_only,
+    missed_job_ids,
+    prune_scheduled_job_runs,
+    try_acquire_lease,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_leader_state():
+    scheduler_leader._state["leader"] = False
+    scheduler_leader._leader_job_ids.clear()
+    scheduler_leader._pending_catch_up.clear()
+    yield
+    scheduler_leader._state["leader"] = False
+    scheduler_leader._leader_job_ids.clear()
+    scheduler_leader._pending_catch_up.clear()
+
+
+def _hold_lease(owner, expires_in):
+    db.session.merge(
+        SchedulerLease(
+            name=LEASE_NAME,
+            owner=owner,
+            acquired_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(seconds=expires_in),
+        )
+    )
+    db.session.commit()
+
+
+class TestSchedulerLease:
+    def test_single_holder_and_takeover_after_expiry(self, app):
+        now = datetime(2026, 3, 2, 9, 0)
+        assert try_acquire_lease("test", "a", 60, now=now) is True
+        assert try_acquire_lease("test", "b", 60, now=now + timedelta(seconds=10)) is False
+        # Renewal by the holder extends the lease
+        assert try_acquire_lease("test", "a", 60, now=now + timedelta(seconds=50)) is True
+        assert try_acquire_lease("test", "b", 60, now=now + timedelta(seconds=70)) is False
+        # Holder stopped renewing: the lease expires and another process takes over
+        assert try_acquire_lease("test", "b", 60, now=now + timedelta(seconds=111)) is True
+        assert try_acquire_lease("test", "a", 60, now=now + timedelta(seconds=112)) is False
+        assert db.session.get(SchedulerLease, "test").owner == "b"
+
+    def test_jobs_run_and_are_recorded_only_in_leader(self, app):
+        calls = []
+        job = leader_only("demo_job", lambda: calls.append(1), app)
+
+        _hold_lease("other-process", expires_in=60)
+        assert job() is None
+        assert calls == [] and ScheduledJobRun.query.count() == 0
+
+        _hold_lease("other-process", expires_in=-1)
+        job()
+        assert calls == [1]
+        run = ScheduledJobRun.query.one()
+        assert (run.job_id, run.owner, run.status) == ("demo_job", PROCESS_OWNER, ScheduledJobRun.STATUS_SUCCESS)
+        assert run.finished_at is not None and run.duration_ms is not None
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            leader_only("failing_job", failing, app)()
+        failed = ScheduledJobRun.query.filter_by(job_id="failing_job").one()
+        assert failed.status == ScheduledJobRun.STATUS_ERROR and "boom" in failed.error
+
+    def test_registered_jobs_wrapped_and_missed_cron_runs_detected(self, app):
+        scheduler = BackgroundScheduler(timezone="UTC")
+        register_scheduled_tasks(scheduler, app=app)
+        assert scheduler.get_job(HEARTBEAT_JOB_ID) is not None
+        assert "check_overdue_invoices" in scheduler_leader._leader_job_ids
+        assert HEARTBEAT_JOB_ID not in scheduler_leader._leader_job_ids
+
+        # Daily 9:00 job last ran two days ago: the next day's run was missed
+        now = datetime(2026, 3, 4, 12, 0, tzinfo=timezone.utc)
+        db.session.add_all(
+            [
+                ScheduledJobRun(job_id="check_overdue_invoices", owner="gone", started_at=datetime(2026, 3, 2, 9, 0)),
+                ScheduledJobRun(job_id="send_weekly_summaries", owner="gone", started_at=datetime(2026, 3, 2, 8, 0)),
+            ]
+        )
+        db.session.commit()
+        ids = {"check_overdue_invoices", "send_weekly_summaries", "retry_failed_webhooks"}
+        assert missed_job_ids(scheduler, ids, now=now) == ["check_overdue_invoices"]
+        assert missed_job_ids(scheduler, ids, now=now, max_age=timedelta(hours=12)) == []
+
+        assert prune_scheduled_job_runs(retention_days=0) == 2
@@ -506,3 +506,28 @@ def test_legacy_client_visible_to_view_all_role(app, db_session):
 
         allowed = get_allowed_client_ids(user=mgr)
         assert allowed is None
+
+
+def test_scope_filters_do_not_load_allowed_ids(app, scope_restricted_user, project, test_client, monkeypatch):
+    """Subcontractor scope is a subquery on user_clients / user_project_access, not an ID list."""
+
+    def fail(self):
+        raise AssertionError("scope filter loaded the allowed IDs")
+
+    monkeypatch.setattr(User, "get_allowed_client_ids", fail)
+    monkeypatch.setattr(User, "get_allowed_project_ids", fail)
+    with app.app_context():
+        new_client = Client(name="Newly Assigned", email="assigned@example.com")
+        db.session.add(new_client)
+        db.session.commit()
+        new_project = Project(name="Assigned Later", client_id=new_client.id, status="active")
+        db.session.add(new_project)
+        db.session.add(UserClient(user_id=scope_restricted_user.id, client_id=new_client.id))
+        db.session.commit()
+
+        project_ids = {p.id for p in apply_project_scope(Project, Project.query, user=scope_restricted_user)}
+        assert {project.id, new_project.id} <= project_ids
+        client_ids = {c.id for c in Client.query.filter(apply_client_scope_to_model(Client, scope_restricted_user))}
+        assert {test_client.id, new_client.id} <= client_ids
+        assert user_can_access_project(scope_restricted_user, new_project.id) is True
+        assert user_can_access_client(scope_restricted_user, new_client.id) is True
@@ -0,0 +1,89 @@
+"""
+Tests for the versioned Settings snapshot cache.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from flask import g
+from sqlalchemy import event
+
+from app import db
+from app.models import Settings
+from app.utils import settings_cache
+from app.utils.settings_cache import SettingsSnapshot, get_settings_snapshot
+from app.utils.timezone import get_app_timezone
+
+
+def _count_settings_selects(app):
+    """Attach a statement counter for SELECTs against the settings table."""
+    counter = {"n": 0}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM settings" in statement:
+            counter["n"] += 1
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before)
+    return counter, lambda: event.remove(engine, "before_cursor_execute", _before)
+
+
+class TestSettingsSnapshot:
+    def test_snapshot_is_read_only(self, app):
+        Settings.get_settings()
+        snapshot = get_settings_snapshot()
+
+        assert isinstance(snapshot, SettingsSnapshot)
+        with pytest.raises(AttributeError):
+            snapshot.timezone = "UTC"
+
+    def test_snapshot_exposes_columns_and_model_methods(self, app):
+        settings = Settings.get_settings()
+        snapshot = get_settings_snapshot()
+
+        assert snapshot.id == settings.id
+        assert snapshot.currency == settings.currency
+        assert snapshot.has_logo() == settings.has_logo()
+        assert snapshot.to_dict()["timezone"] == settings.timezone
+
+    def test_steady_state_reads_issue_no_queries(self, app):
+        Settings.get_settings()
+        get_settings_snapshot()
+
+        counter, remove = _count_settings_selects(app)
+        try:
+            for _ in range(50):
+                get_settings_snapshot()
+                get_app_timezone()
+        finally:
+            remove()
+
+        assert counter["n"] == 0
+
+    def test_saving_settings_invalidates_snapshot(self, app):
+        settings = Settings.get_settings()
+        settings.timezone = "UTC"
+        db.session.commit()
+        assert get_app_timezone() == "UTC"
+
+        version_before = settings_cache.get_settings_version()
+        settings.timezone = "America/New_York"
+        db.session.commit()
+
+        assert settings_cache.get_settings_version() > version_before
+        assert get_settings_snapshot().timezone == "America/New_York"
+        assert get_app_timezone() == "America/New_York"
+
+    def test_request_memoizes_snapshot(self, app):
+        Settings.get_settings()
+        with app.test_request_context("/"):
+            first = get_settings_snapshot()
+            assert get_settings_snapshot() is first
+
+    def test_ttl_expiry_reloads(self, app, monkeypatch):
+        Settings.get_settings()
+        first = get_settings_snapshot()
+        g.pop("_settings_snapshot", None)
+        monkeypatch.setitem(app.config, "SETTINGS_CACHE_TTL", 0)
+        assert get_settings_snapshot() is not first
@@ -0,0 +1,116 @@
+"""
+Tests for the streaming time-entry export helpers.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+import csv
+import io
+from datetime import datetime, timedelta
+
+from openpyxl import load_workbook
+
+from app import db
+from app.models import Client, TimeEntry
+from app.utils.excel_export import create_time_entries_excel
+from app.utils.streaming_export import CountingRows, iter_time_entry_export_rows, stream_csv, write_csv_bytes
+
+
+def _entries(user, project, task):
+    start = datetime(2026, 3, 2, 9, 0)
+    direct_client = Client(name="Direct Client")
+    db.session.add(direct_client)
+    db.session.flush()
+    entries = [
+        TimeEntry(
+            user_id=user.id,
+            project_id=project.id,
+            task_id=task.id,
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            notes="with task",
+            billable=True,
+        ),
+        TimeEntry(
+            user_id=user.id,
+            client_id=direct_client.id,
+            start_time=start + timedelta(days=1),
+            end_time=start + timedelta(days=1, minutes=30),
+            billable=False,
+        ),
+    ]
+    db.session.add_all(entries)
+    db.session.commit()
+    return entries
+
+
+class TestStreamingExport:
+    def test_rows_match_orm_attributes(self, app, user, project, task):
+        _entries(user, project, task)
+        query = TimeEntry.query.filter(TimeEntry.user_id == user.id).order_by(TimeEntry.start_time.desc())
+        orm_entries = query.all()
+        rows = list(iter_time_entry_export_rows(query, batch_size=1))
+
+        assert [r.id for r in rows] == [e.id for e in orm_entries]
+        for row, entry in zip(rows, orm_entries):
+            assert row.user.display_name == entry.user.display_name
+            assert (row.project.name if row.project else None) == (entry.project.name if entry.project else None)
+            assert (row.project.client if row.project else None) == (entry.project.client if entry.project else None)
+            assert (row.client.name if row.client else None) == (entry.client.name if entry.client else None)
+            assert (row.task.name if row.task else None) == (entry.task.name if entry.task else None)
+            assert row.duration_hours == entry.duration_hours
+            assert row.duration_formatted == entry.duration_formatted
+            assert (row.billable, row.paid, row.notes) == (entry.billable, entry.paid, entry.notes)
+
+    def test_stream_csv_chunks_and_reports_totals(self, app):
+        done = {}
+        rows = [[i, "x" * 20] for i in range(50)]
+        chunks = list(
+            stream_csv(["id", "text"], rows, chunk_size=100, on_complete=lambda n, b: done.update(rows=n, bytes=b))
+        )
+
+        assert len(chunks) > 1
+        text = "".join(chunks)
+        assert list(csv.reader(io.StringIO(text)))[1:] == [[str(i), "x" * 20] for i in range(50)]
+        assert done == {"rows": 50, "bytes": len(text.encode("utf-8"))}
+        assert write_csv_bytes(["id", "text"], rows).getvalue().decode("utf-8") == text
+
+    def test_excel_from_streamed_rows(self, app, user, project, task):
+        _entries(user, project, task)
+        query = TimeEntry.query.filter(TimeEntry.user_id == user.id).order_by(TimeEntry.start_time.desc())
+        counted = CountingRows(iter_time_entry_export_rows(query))
+
+        output, filename = create_time_entries_excel(counted)
+
+        assert counted.count == 2 and filename.endswith(".xlsx")
+        sheet = load_workbook(output).active
+        values = [[cell.value for cell in row] for row in sheet.iter_rows()]
+        client_col = values[0].index("Client")
+        assert [values[1][client_col], values[2][client_col]] == ["Direct Client", project.client]
+        assert ["Total Hours:", 2.5] in [v[:2] for v in values]
+        assert ["Billable Hours:", 2] in [v[:2] for v in values]
+
+    def test_payroll_export_is_streamed(self, app, user, project, task, client_with_token):
+        _entries(user, project, task)
+        response = client_with_token.get("/api/v1/exports/payroll?start_date=2026-03-01&end_date=2026-03-08")
+
+        assert response.status_code == 200 and response.is_streamed
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[0][:2] == ["user_id", "username"]
+        assert rows[1][0] == str(user.id) and float(rows[1][6]) == 2.5
+
+    def test_calendar_csv_export_is_streamed(self, app, user, project, task, authenticated_client):
+        _entries(user, project, task)
+        response = authenticated_client.get(
+            "/api/calendar/export?start=2026-03-01T00:00:00&end=2026-03-08T00:00:00&format=csv"
+        )
+
+        assert response.status_code == 200 and response.is_streamed
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[0][:3] == ["Date", "Start Time", "End Time"]
+        assert [row[3:6] for row in rows[1:]] == [[project.name, task.name, "2.00"], ["", "", "0.50"]]
+
+        ical = authenticated_client.get("/api/calendar/export?start=2026-03-01T00:00:00&end=2026-03-08T00:00:00")
+        assert ical.status_code == 200 and ical.get_data(as_text=True).count("BEGIN:VEVENT") == 2
@@ -0,0 +1,151 @@
+"""
+Tests for the materialized daily time rollup and the report paths that read it.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import date, datetime, timedelta
+
+from app import db
+from app.models import TimeDailyRollup, TimeEntry
+from app.services.stats_service import compute_value_dashboard_for_tests
+from app.utils.overtime import get_daily_breakdown
+from app.utils.time_daily_rollup import rebuild_time_daily_rollup, seconds_by_day, verify_time_daily_rollup
+
+
+def _entry(user, project, start, hours=None, billable=True):
+    return TimeEntry(
+        user_id=user.id,
+        project_id=project.id,
+        start_time=start,
+        end_time=start + timedelta(hours=hours) if hours is not None else None,
+        billable=billable,
+    )
+
+
+def _rows(user_id):
+    db.session.expire_all()
+    return (
+        TimeDailyRollup.query.filter_by(user_id=user_id).order_by(TimeDailyRollup.day, TimeDailyRollup.billable).all()
+    )
+
+
+class TestTimeDailyRollup:
+    def test_create_update_delete_keep_rollup_current(self, app, user, project):
+        day1 = datetime(2026, 3, 2, 9, 0)
+        day2 = datetime(2026, 3, 3, 9, 0)
+        first = _entry(user, project, day1, hours=2)
+        second = _entry(user, project, day1 + timedelta(hours=3), hours=1, billable=False)
+        db.session.add_all([first, second])
+        db.session.commit()
+
+        rows = _rows(user.id)
+        assert [(r.day, r.billable, r.total_seconds, r.entry_count) for r in rows] == [
+            (day1.date(), False, 3600, 1),
+            (day1.date(), True, 7200, 1),
+        ]
+
+        # Move the billable entry to the next day
+        first = db.session.get(TimeEntry, first.id)
+        first.start_time = day2
+        first.end_time = day2 + timedelta(hours=2)
+        db.session.commit()
+        assert seconds_by_day(user_id=user.id) == {
+            day1.date(): {"seconds": 3600, "billable_seconds": 0, "entries": 1},
+            day2.date(): {"seconds": 7200, "billable_seconds": 7200, "entries": 1},
+        }
+
+        db.session.delete(db.session.get(TimeEntry, second.id))
+        db.session.commit()
+        assert [(r.day, r.entry_count) for r in _rows(user.id)] == [(day2.date(), 1)]
+        assert verify_time_daily_rollup() == []
+
+    def test_running_timer_counted_when_stopped(self, app, user, project):
+        entry = _entry(user, project, datetime.utcnow() - timedelta(hours=1))
+        db.session.add(entry)
+        db.session.commit()
+        assert _rows(user.id) == []
+
+        entry = db.session.get(TimeEntry, entry.id)
+        entry.stop_timer(end_time=entry.start_time + timedelta(minutes=45))
+
+        rows = _rows(user.id)
+        assert len(rows) == 1
+        assert rows[0].total_seconds == entry.duration_seconds
+        assert verify_time_daily_rollup() == []
+
+    def test_expired_entry_update_uses_stored_values(self, app, user, project):
+        entry = _entry(user, project, datetime(2026, 3, 2, 9, 0), hours=1)
+        db.session.add(entry)
+        db.session.commit()
+        db.session.expire(entry)
+
+        # Assigning without reading first: no old value in attribute history
+        entry.billable = False
+        db.session.commit()
+
+        assert verify_time_daily_rollup() == []
+        assert [r.billable for r in _rows(user.id)] == [False]
+
+    def test_rebuild_and_verify(self, app, user, project):
+        db.session.add_all([_entry(user, project, datetime(2026, 3, d, 9, 0), hours=1) for d in range(2, 7)])
+        db.session.commit()
+
+        db.session.execute(db.text("DELETE FROM time_daily_rollup"))
+        db.session.commit()
+        mismatches = verify_time_daily_rollup(user_ids=[user.id])
+        assert len(mismatches) == 5
+        assert mismatches[0]["stored"] == (0, 0)
+
+        assert rebuild_time_daily_rollup(start_day=date(2026, 3, 2), end_day=date(2026, 3, 4)) == 3
+        db.session.commit()
+        assert len(verify_time_daily_rollup()) == 2
+
+        assert rebuild_time_daily_rollup() == 5
+        db.session.commit()
+        assert verify_time_daily_rollup() == []
+
+    def test_total_hours_matches_entry_scan(self, app, user, project):
+        start = datetime(2026, 3, 2, 9, 0)
+        db.session.add_all(
+            [
+                _entry(user, project, start, hours=1.5),
+                _entry(user, project, start + timedelta(days=1), hours=2, billable=False),
+                _entry(user, project, start + timedelta(days=2), hours=0.25),
+            ]
+        )
+        db.session.commit()
+
+        cases = [
+            {"start_date": start.date()},
+            {"start_date": start.date() + timedelta(days=1), "project_id": project.id},
+            {"start_date": start.date(), "user_id": user.id, "billable_only": True},
+            {"start_date": start, "end_date": datetime(2026, 3, 3, 23, 59, 59)},
+        ]
+        for kwargs in cases:
+            app.config["TIME_ROLLUP_ENABLED"] = True
+            from_rollup = TimeEntry.get_total_hours_for_period(**kwargs)
+            app.config["TIME_ROLLUP_ENABLED"] = False
+            from_entries = TimeEntry.get_total_hours_for_period(**kwargs)
+            assert from_rollup == from_entries, kwargs
+
+        app.config["TIME_ROLLUP_ENABLED"] = True
+        assert TimeEntry.get_hours_by_project_for_period(start_date=start.date()) == {project.id: 3.75}
+
+    def test_dashboards_match_entry_scan(self, app, user, project):
+        today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+        db.session.add_all(
+            [_entry(user, project, today - timedelta(days=d), hours=1 + d % 3, billable=d % 2 == 0) for d in range(10)]
+        )
+        db.session.commit()
+
+        results = {}
+        for enabled in (True, False):
+            app.config["TIME_ROLLUP_ENABLED"] = enabled
+            results[enabled] = (
+                compute_value_dashboard_for_tests(user),
+                get_daily_breakdown(user, today.date() - timedelta(days=9), today.date()),
+            )
+        assert results[True] == results[False]
@@ -0,0 +1,73 @@
+"""
+Tests for the pushed timer state and the ETag'd timer status endpoint.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import datetime, timedelta
+
+from app import db, socketio
+from app.models import TimeEntry
+from app.utils.realtime import user_room
+from app.utils.timer_state import TIMER_STATE_EVENT, get_timer_state_version
+
+
+@pytest.fixture
+def pushed(monkeypatch):
+    sent = []
+
+    def fake_emit(event, data=None, **kwargs):
+        if event == TIMER_STATE_EVENT:
+            sent.append((kwargs.get("room"), data))
+
+    monkeypatch.setattr(socketio, "emit", fake_emit)
+    return sent
+
+
+def test_timer_lifecycle_bumps_version_and_pushes(app, user, project, pushed):
+    entry = TimeEntry(user_id=user.id, project_id=project.id, start_time=datetime.now() - timedelta(hours=1))
+    db.session.add(entry)
+    db.session.commit()
+    entry.pause_timer()
+    entry.resume_timer()
+    entry.stop_timer()
+
+    assert [data["event"] for _, data in pushed] == ["started", "paused", "resumed", "stopped"]
+    assert [data["version"] for _, data in pushed] == [1, 2, 3, 4]
+    assert {room for room, _ in pushed} == {user_room(user.id)}
+    assert {data["timer_id"] for _, data in pushed} == {entry.id}
+    assert get_timer_state_version(user.id) == 4
+
+    # Edits of completed entries do not concern the timer
+    entry.notes = "reviewed"
+    db.session.add(
+        TimeEntry(user_id=user.id, project_id=project.id, start_time=entry.start_time, end_time=entry.end_time)
+    )
+    db.session.commit()
+    assert len(pushed) == 4 and get_timer_state_version(user.id) == 4
+
+
+def test_rolled_back_change_is_not_pushed(app, user, project, pushed):
+    db.session.add(TimeEntry(user_id=user.id, project_id=project.id, start_time=datetime.now()))
+    db.session.flush()
+    db.session.rollback()
+
+    assert pushed == []
+    assert get_timer_state_version(user.id) == 0
+
+
+def test_status_is_not_modified_until_the_timer_changes(app, user, project, authenticated_client):
+    first = authenticated_client.get("/timer/status")
+    assert first.status_code == 200 and first.get_json()["active"] is False
+    etag = first.headers["ETag"]
+
+    assert authenticated_client.get("/timer/status", headers={"If-None-Match": etag}).status_code == 304
+
+    db.session.add(TimeEntry(user_id=user.id, project_id=project.id, start_time=datetime.now()))
+    db.session.commit()
+    changed = authenticated_client.get("/timer/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["active"] is True and changed.get_json()["version"] == 1
+    assert changed.headers["ETag"] != etag
@@ -0,0 +1,113 @@
+"""
+Tests for the stored tracked-time and cost totals on tasks and projects.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import date, datetime, timedelta
+
+from app import db
+from app.models import Project, ProjectCost, Task, TimeEntry
+from app.utils.tracked_totals import rebuild_tracked_totals, verify_tracked_totals
+
+
+def _entry(user, project, task=None, hours=1.0, billable=True, hours_ago=5):
+    start = datetime.now() - timedelta(hours=hours_ago)
+    return TimeEntry(
+        user_id=user.id,
+        project_id=project.id,
+        task_id=task.id if task else None,
+        start_time=start,
+        end_time=start + timedelta(hours=hours),
+        billable=billable,
+    )
+
+
+@pytest.fixture
+def task(app, user, project):
+    task = Task(project_id=project.id, name="Tracked task", created_by=user.id, estimated_hours=4)
+    db.session.add(task)
+    db.session.commit()
+    return task
+
+
+def test_time_entries_maintain_task_and_project_seconds(app, user, project, task):
+    billable = _entry(user, project, task, hours=1)
+    other = _entry(user, project, task, hours=0.5, billable=False, hours_ago=8)
+    db.session.add_all([billable, other])
+    db.session.flush()
+    # Readable before commit
+    assert (task.total_hours, task.total_billable_hours) == (1.5, 1.0)
+    db.session.commit()
+    assert task.progress_percentage == 37.5
+    assert (project.total_hours, project.total_billable_hours) == (1.5, 1.0)
+
+    # A running timer does not count until it stops
+    running = TimeEntry(user_id=user.id, project_id=project.id, task_id=task.id, start_time=datetime.now())
+    db.session.add(running)
+    db.session.commit()
+    assert task.tracked_seconds == 5400
+
+    other.task_id = None
+    other.billable = True
+    db.session.delete(billable)
+    db.session.commit()
+    assert (task.tracked_seconds, task.billable_seconds) == (0, 0)
+    assert (project.tracked_seconds, project.billable_seconds) == (1800, 1800)
+    assert verify_tracked_totals() == []
+
+    # Tracked time does not count as an edit of the project
+    stamp = project.updated_at
+    db.session.add(_entry(user, project))
+    db.session.commit()
+    assert project.updated_at == stamp
+
+
+def test_project_costs_maintain_cost_totals(app, user, project, test_client):
+    other_project = Project(name="Cost move", client_id=test_client.id)
+    db.session.add(other_project)
+    db.session.commit()
+
+    travel = ProjectCost(project.id, user.id, "Train", "travel", "120.50", date.today())
+    gear = ProjectCost(project.id, user.id, "Cable", "equipment", "30", date.today(), billable=False)
+    db.session.add_all([travel, gear])
+    db.session.commit()
+    assert (project.total_costs, project.total_billable_costs) == (150.5, 120.5)
+
+    gear.billable = True
+    travel.project_id = other_project.id
+    db.session.commit()
+    assert (project.total_costs, project.total_billable_costs) == (30.0, 30.0)
+    assert other_project.total_costs == 120.5
+
+    db.session.delete(gear)
+    db.session.commit()
+    assert project.total_costs == 0.0
+    assert verify_tracked_totals() == []
+
+
+def test_verify_and_rebuild_after_bulk_update(app, user, project, task):
+    db.session.add(_entry(user, project, task, hours=2))
+    db.session.commit()
+
+    # Bulk updates bypass the flush hooks
+    TimeEntry.query.update({TimeEntry.duration_seconds: 3600}, synchronize_session=False)
+    db.session.commit()
+    mismatches = verify_tracked_totals()
+    assert {(m["kind"], m["column"]) for m in mismatches} == {
+        ("task", "tracked_seconds"),
+        ("task", "billable_seconds"),
+        ("project", "tracked_seconds"),
+        ("project", "billable_seconds"),
+    }
+
+    assert rebuild_tracked_totals(task_ids=[task.id]) == (1, 0)
+    db.session.commit()
+    assert {m["kind"] for m in verify_tracked_totals()} == {"project"}
+
+    rebuild_tracked_totals()
+    db.session.commit()
+    assert verify_tracked_totals() == []
+    assert (task.total_hours, project.total_hours) == (1.0, 1.0)
@@ -0,0 +1,105 @@
+"""
+Tests for the materialized user -> project access table (user_project_access).
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import Project, Task, TimeEntry, User, UserClient, UserProjectAccess
+from app.repositories import TimeEntryRepository
+from app.utils.scope_filter import get_accessible_project_and_client_ids_for_user
+from app.utils.user_project_access import rebuild_user_project_access
+
+
+def _rows():
+    return {
+        (r.user_id, r.project_id): (r.entry_count, r.task_count, r.via_client)
+        for r in UserProjectAccess.query.order_by(UserProjectAccess.user_id, UserProjectAccess.project_id)
+    }
+
+
+def _entry(user, project, hours_ago=2):
+    start = datetime.now() - timedelta(hours=hours_ago)
+    return TimeEntry(user_id=user.id, project_id=project.id, start_time=start, end_time=start + timedelta(hours=1))
+
+
+def test_time_entries_maintain_entry_counts(app, user, project, test_client):
+    other = Project(name="Other project", client_id=test_client.id)
+    db.session.add(other)
+    db.session.commit()
+
+    first, second = _entry(user, project), _entry(user, project, hours_ago=4)
+    db.session.add_all([first, second])
+    db.session.commit()
+    assert _rows() == {(user.id, project.id): (2, 0, False)}
+
+    second.project_id = other.id
+    db.session.commit()
+    assert _rows() == {(user.id, project.id): (1, 0, False), (user.id, other.id): (1, 0, False)}
+    assert sorted(TimeEntryRepository().get_distinct_project_ids_for_user(user.id)) == sorted([project.id, other.id])
+
+    db.session.delete(first)
+    db.session.commit()
+    assert _rows() == {(user.id, other.id): (1, 0, False)}
+
+    # A rolled back flush leaves the table untouched
+    db.session.add(_entry(user, project))
+    db.session.flush()
+    db.session.rollback()
+    assert _rows() == {(user.id, other.id): (1, 0, False)}
+
+
+def test_tasks_and_user_clients_maintain_access(app, user, project, test_client):
+    other = User(username="upa_other", role="user")
+    db.session.add(other)
+    db.session.commit()
+
+    task = Task(project_id=project.id, name="Assigned", assigned_to=user.id, created_by=user.id)
+    db.session.add(task)
+    db.session.commit()
+    assert _rows() == {(user.id, project.id): (0, 1, False)}
+    assert get_accessible_project_and_client_ids_for_user(user.id) == ({project.id}, {test_client.id})
+
+    task.assigned_to = other.id
+    db.session.commit()
+    assert _rows() == {(other.id, project.id): (0, 1, False)}
+
+    db.session.add(UserClient(user_id=user.id, client_id=test_client.id))
+    db.session.commit()
+    # A new project of an assigned client is reachable as soon as it is written
+    later = Project(name="Later project", client_id=test_client.id)
+    db.session.add(later)
+    db.session.commit()
+    assert _rows() == {
+        (user.id, project.id): (0, 0, True),
+        (user.id, later.id): (0, 0, True),
+        (other.id, project.id): (0, 1, False),
+    }
+    # Client links alone do not grant issue-style access
+    assert get_accessible_project_and_client_ids_for_user(user.id) == (set(), set())
+
+    db.session.delete(UserClient.query.filter_by(user_id=user.id).one())
+    db.session.delete(task)
+    db.session.commit()
+    assert _rows() == {}
+
+
+def test_rebuild_matches_incremental_maintenance(app, user, project, test_client):
+    db.session.add_all([_entry(user, project), _entry(user, project, hours_ago=5)])
+    db.session.add(Task(project_id=project.id, name="Mine", assigned_to=user.id, created_by=user.id))
+    db.session.add(UserClient(user_id=user.id, client_id=test_client.id))
+    db.session.commit()
+    maintained = _rows()
+    assert maintained == {(user.id, project.id): (2, 1, True)}
+
+    UserProjectAccess.query.delete()
+    assert rebuild_user_project_access() == 1
+    db.session.commit()
+    assert _rows() == maintained
+
+    assert rebuild_user_project_access([user.id]) == 1
+    assert _rows() == maintained
@@ -0,0 +1,137 @@
+"""
+Tests for the incrementally maintained per-user time-entry rollup.
+"""
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.utils]
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from app.models import DonationInteraction, TimeEntry, UserTimeStats
+from app.utils.user_time_stats import aggregate_user_time_stats, rebuild_user_time_stats
+
+
+def _stats(user_id):
+    db.session.expire_all()
+    return db.session.get(UserTimeStats, user_id)
+
+
+def _entry(user, project, start, hours=None):
+    return TimeEntry(
+        user_id=user.id,
+        project_id=project.id,
+        start_time=start,
+        end_time=start + timedelta(hours=hours) if hours is not None else None,
+    )
+
+
+class TestUserTimeStats:
+    def test_insert_creates_and_increments_row(self, app, user, project):
+        start = datetime(2026, 1, 5, 9, 0)
+        db.session.add(_entry(user, project, start, hours=2))
+        db.session.commit()
+
+        stats = _stats(user.id)
+        assert stats.entry_count == 1
+        assert stats.total_seconds == 7200
+        assert stats.last_entry_at == start
+
+        later = datetime(2026, 1, 6, 9, 0)
+        db.session.add(_entry(user, project, later, hours=1))
+        db.session.add(_entry(user, project, later + timedelta(hours=3)))  # running timer
+        db.session.commit()
+
+        stats = _stats(user.id)
+        assert stats.entry_count == 3
+        assert stats.total_seconds == 3 * 3600
+        assert stats.last_entry_at == later + timedelta(hours=3)
+
+    def test_update_and_delete_adjust_row(self, app, user, project):
+        first = _entry(user, project, datetime(2026, 1, 5, 9, 0), hours=2)
+        second = _entry(user, project, datetime(2026, 1, 6, 9, 0), hours=1)
+        db.session.add_all([first, second])
+        db.session.commit()
+
+        second.end_time = second.start_time + timedelta(hours=4)
+        second.calculate_duration()
+        db.session.commit()
+        assert _stats(user.id).total_seconds == 6 * 3600
+
+        db.session.delete(second)
+        db.session.commit()
+        stats = _stats(user.id)
+        assert stats.entry_count == 1
+        assert stats.total_seconds == 2 * 3600
+        assert stats.last_entry_at == datetime(2026, 1, 5, 9, 0)
+
+    def test_stopping_timer_adds_duration(self, app, user, project):
+        entry = _entry(user, project, datetime.utcnow() - timedelta(hours=1))
+        db.session.add(entry)
+        db.session.commit()
+        assert _stats(user.id).total_seconds == 0
+
+        entry = db.session.get(TimeEntry, entry.id)
+        entry.stop_timer(end_time=entry.start_time + timedelta(minutes=30))
+
+        stats = _stats(user.id)
+        assert stats.entry_count == 1
+        assert stats.total_seconds == entry.duration_seconds
+
+    def test_rollback_discards_delta(self, app, user, project):
+        db.session.add(_entry(user, project, datetime(2026, 1, 5, 9, 0), hours=1))
+        db.session.commit()
+
+        db.session.add(_entry(user, project, datetime(2026, 1, 6, 9, 0), hours=1))
+        db.session.flush()
+        db.session.rollback()
+
+        assert _stats(user.id).entry_count == 1
+
+    def test_rebuild_matches_aggregate(self, app, user, project):
+        db.session.add_all([_entry(user, project, datetime(2026, 1, d, 9, 0), hours=1) for d in range(1, 6)])
+        db.session.commit()
+        db.session.execute(db.text("DELETE FROM user_time_stats"))
+        db.session.commit()
+
+        assert rebuild_user_time_stats() == 1
+        db.session.commit()
+
+        stats = _stats(user.id)
+        expected = aggregate_user_time_stats(db.session.connection(), user.id)
+        assert (stats.entry_count, stats.total_seconds, stats.last_entry_at) == expected
+        assert stats.entry_count == 5
+
+    def test_engagement_metrics_read_rollup_row(self, app, user, project):
+        db.session.add_all([_entry(user, project, datetime(2026, 1, d, 9, 0), hours=1.5) for d in range(1, 4)])
+        db.session.commit()
+        db.session.expire_all()
+
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            metrics = DonationInteraction.get_user_engagement_metrics(user.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        assert metrics["time_entries_count"] == 3
+        assert metrics["total_hours"] == 4.5
+        assert not any("FROM time_entries" in s for s in statements)
+
+    def test_missing_row_falls_back_to_aggregate(self, app, user, project):
+        db.session.add(_entry(user, project, datetime(2026, 1, 5, 9, 0), hours=1))
+        db.session.commit()
+        db.session.execute(db.text("DELETE FROM user_time_stats"))
+        db.session.commit()
+
+        stats = UserTimeStats.get_for_user(user.id)
+        assert stats.entry_count == 1
+        assert stats.total_hours == 1.0
@@ -148,3 +148,113 @@ class TestWebhookService:
         assert retried == 1
         db_session.refresh(delivery)
         assert delivery.status == "success"
+
+
+class TestWebhookOutbox:
+    """Test the webhook outbox and delivery workers"""
+
+    @patch("app.utils.webhook_service.requests.post")
+    def test_dispatch_event_queues_without_sending(self, mock_post, db_session, test_webhook):
+        """dispatch_event writes pending deliveries and performs no HTTP request"""
+        from app.utils.webhook_dispatcher import WebhookDispatcher
+
+        WebhookDispatcher.dispatch_event("project.created", {"id": 1}, event_id="evt-1")
+
+        mock_post.assert_not_called()
+        deliveries = WebhookDelivery.query.filter_by(webhook_id=test_webhook.id).all()
+        assert len(deliveries) == 1
+        assert deliveries[0].status == "pending"
+        assert deliveries[0].event_id == "evt-1"
+
+    def test_dispatch_event_without_commit_joins_caller_transaction(self, db_session, test_webhook):
+        """Queued deliveries roll back with the caller's transaction"""
+        from app.utils.webhook_dispatcher import WebhookDispatcher
+
+        WebhookDispatcher.dispatch_event("project.created", {"id": 1}, commit=False)
+        db_session.rollback()
+
+        assert WebhookDelivery.query.filter_by(webhook_id=test_webhook.id).count() == 0
+
+    def test_claim_delivery_is_exclusive(self, db_session, test_webhook):
+        """Only one claimer wins a due delivery"""
+        delivery = WebhookService.enqueue_delivery(test_webhook, "project.created", {"id": 1})
+        db_session.commit()
+
+        due = WebhookService.find_due_deliveries(limit=10)
+        assert [(d[0], d[1]) for d in due] == [(delivery.id, "pending")]
+
+        assert WebhookService.claim_delivery(delivery.id, "pending") is True
+        assert WebhookService.claim_delivery(delivery.id, "pending") is False
+        assert WebhookService.find_due_deliveries(limit=10) == []
+
+    def test_claim_of_stale_delivering_row_is_exclusive(self, db_session, test_webhook):
+        """Two workers holding the same abandoned delivery leave exactly one owner"""
+        from app.utils.timezone import now_in_app_timezone
+        from datetime import timedelta
+
+        delivery = WebhookService.enqueue_delivery(test_webhook, "project.created", {"id": 1})
+        delivery.status = "delivering"
+        delivery.started_at = now_in_app_timezone() - timedelta(seconds=3600)
+        db_session.commit()
+
+        due = WebhookService.find_due_deliveries(limit=10, lease_seconds=60)
+        assert [(d[0], d[1]) for d in due] == [(delivery.id, "delivering")]
+
+        claims = [WebhookService.claim_delivery(delivery.id, "delivering", lease_seconds=60) for _ in range(2)]
+        assert claims == [True, False]
+
+    def test_claim_skips_delivery_rescheduled_after_it_was_found(self, db_session, test_webhook):
+        """A stale candidate does not claim a row that was moved to a later retry"""
+        from app.utils.timezone import now_in_app_timezone
+        from datetime import timedelta
+
+        delivery = WebhookService.enqueue_delivery(test_webhook, "project.created", {"id": 1})
+        db_session.commit()
+        assert [d[0] for d in WebhookService.find_due_deliveries(limit=10)] == [delivery.id]
+
+        delivery.next_retry_at = now_in_app_timezone() + timedelta(minutes=5)
+        db_session.commit()
+        assert WebhookService.claim_delivery(delivery.id, "pending") is False
+
+    @patch("app.utils.webhook_service.requests.post")
+    def test_retry_failed_deliveries_drains_pending_outbox(self, mock_post, db_session, test_webhook):
+        """The scheduler fallback sends queued deliveries on their first attempt"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = "OK"
+        mock_response.headers = {}
+        mock_post.return_value = mock_response
+
+        delivery = WebhookService.enqueue_delivery(test_webhook, "project.created", {"id": 1})
+        db_session.commit()
+
+        assert WebhookService.retry_failed_deliveries(max_deliveries=10) == 1
+        db_session.refresh(delivery)
+        assert delivery.status == "success"
+        assert delivery.attempt_number == 1
+
+    def test_worker_pool_sends_with_pooled_session(self, app, db_session, test_webhook):
+        """The worker pool claims due rows and sends them through a per-host session"""
+        from app.utils.webhook_worker import WebhookDeliveryWorkerPool
+
+        delivery = WebhookService.enqueue_delivery(test_webhook, "project.created", {"id": 1})
+        db_session.commit()
+        delivery_id = delivery.id
+
+        mock_response = Mock()
+        mock_response.status_code = 204
+        mock_response.text = ""
+        mock_response.headers = {}
+        session = MagicMock()
+        session.request.return_value = mock_response
+
+        pool = WebhookDeliveryWorkerPool(app, workers=1, per_host_limit=1)
+        pool._executor = MagicMock()
+        pool._executor.submit.side_effect = lambda fn, *args: fn(*args)
+        with patch.object(pool, "_session_for", return_value=session):
+            assert pool.run_once() == 1
+
+        session.request.assert_called_once()
+        assert session.request.call_args[0][0] == "POST"
+        db.session.expire_all()
+        assert db.session.get(WebhookDelivery, delivery_id).status == "success"